@@ -0,0 +1,93 @@
+"""
+Compares the size and speed of bundle archives (see archive_util) with gzip
+and zstd members on a synthetic corpus (see synthetic.py).
+
+For each compression, measured:
+    size    the archive size, and the ratio to the exported json of the
+            bundles (Bundle_to_json, indented)
+    add     adding every bundle to a new archive
+    list    opening the archive and listing the incidents, which reads only
+            the table of contents
+    get     reading --lookups random bundles
+Times are the best of --repeat runs. zstd needs the zstandard package and is
+skipped without it.
+
+Usage (from the repository root):
+    python benchmarks/bench_archive.py [--incidents 2000] [--lookups 100] [--repeat 3]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import json_to_Bundle, Bundle_to_json
+from pyiides.utils.archive_util import BundleArchive, ARCHIVE_COMPRESSIONS
+from synthetic import generate_corpus
+from timing import best_of
+
+
+def compressions():
+    try:
+        import zstandard
+    except ImportError:
+        return [compression for compression in ARCHIVE_COMPRESSIONS if compression != "zstd"]
+    return list(ARCHIVE_COMPRESSIONS)
+
+
+def run(incidents=2000, lookups=100, repeat=3, seed=0):
+    """Returns {compression: {"bytes": ..., "ratio": ..., "add": s, "list": s, "get": s}}."""
+    bundles = [json_to_Bundle(data) for data in generate_corpus(incidents, seed)]
+    json_bytes = sum(len(Bundle_to_json(bundle).encode("utf-8")) for bundle in bundles)
+    wanted = random.Random(seed).sample([bundle.id for bundle in bundles], min(lookups, len(bundles)))
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for compression in compressions():
+            path = os.path.join(directory, compression + ".iidesarc")
+
+            def add():
+                with BundleArchive(path, "w", compression=compression) as archive:
+                    for bundle in bundles:
+                        archive.add(bundle)
+
+            def list_incidents():
+                with BundleArchive(path) as archive:
+                    return [incident for member in archive.members for incident in member["incidents"]]
+
+            def get():
+                with BundleArchive(path) as archive:
+                    for bundle_id in wanted:
+                        archive.get(bundle_id)
+
+            result = {"add": best_of(repeat, add)}
+            size = os.path.getsize(path)
+            result.update(bytes=size, ratio=size / json_bytes,
+                          list=best_of(repeat, list_incidents), get=best_of(repeat, get))
+            results[compression] = result
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run(args.incidents, args.lookups, args.repeat, args.seed)
+    print(f"{'compression':>12} {'size':>10} {'of json':>8} {'add':>10} {'list':>10} {'get':>14}")
+    for compression, r in results.items():
+        print(f"{compression:>12} {r['bytes'] / 2**20:8.2f}MiB {r['ratio']:8.1%} {r['add'] * 1000:8.1f}ms "
+              f"{r['list'] * 1000:8.2f}ms {r['get'] / args.lookups * 1000:8.2f}ms/bundle")
@@ -0,0 +1,96 @@
+"""
+Compares the lists of vocabulary codes of a synthetic corpus (see
+synthetic.py) with the CodeMasks of Bundle.compact_codes.
+
+Measured:
+    memory  the memory of the bundles, and how much of it compact_codes
+            saves by replacing the code lists (code_lists of each ObjectType)
+            with masks, from tracemalloc
+    any     counting the incidents whose outcome has any of two codes
+    all     counting the TTPs whose device has all of two codes
+Times are the best of --repeat runs.
+
+Usage (from the repository root):
+    python benchmarks/bench_code_mask.py [--incidents 2000] [--repeat 5]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import json_to_Bundle
+from pyiides.utils.helper_functions import code_mask_type
+from synthetic import generate_corpus
+from timing import best_of
+
+OUTCOMES = ["BR", "DC"]
+DEVICES = ["1", "2"]
+
+
+def list_queries(incidents, ttps):
+    outcomes = set(OUTCOMES)
+    any_count = sum(1 for incident in incidents if not outcomes.isdisjoint(incident.outcome or ()))
+    all_count = sum(1 for ttp in ttps if ttp.device is not None and all(code in ttp.device for code in DEVICES))
+    return any_count, all_count
+
+
+def mask_queries(incidents, ttps):
+    outcomes = code_mask_type("outcome-type-vocab").mask_of(OUTCOMES)
+    devices = code_mask_type("device-vocab").mask_of(DEVICES)
+    any_count = sum(1 for incident in incidents if incident.outcome is not None and incident.outcome.mask & outcomes)
+    all_count = sum(1 for ttp in ttps if ttp.device is not None and ttp.device.mask & devices == devices)
+    return any_count, all_count
+
+
+def run(incidents=2000, repeat=5, seed=0):
+    """Returns {"bundle_bytes": ..., "saved_bytes": ..., "list_query": s, "mask_query": s}."""
+    tracemalloc.start()
+    try:
+        # json_to_Bundle keeps the lists of the json, so the json is dropped first
+        data = list(generate_corpus(incidents, seed))
+        bundles = [json_to_Bundle(bundle) for bundle in data]
+        del data
+        gc.collect()
+        list_bytes = tracemalloc.get_traced_memory()[0]
+        for bundle in bundles:
+            bundle.compact_codes()
+        gc.collect()
+        mask_bytes = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    all_incidents = [incident for bundle in bundles for incident in bundle.objects.get("incident", ())]
+    ttps = [ttp for bundle in bundles for ttp in bundle.objects.get("ttp", ())]
+    mask_query = best_of(repeat, lambda: mask_queries(all_incidents, ttps))
+    answer = mask_queries(all_incidents, ttps)
+    for bundle in bundles:
+        bundle.expand_codes()
+    assert list_queries(all_incidents, ttps) == answer
+    list_query = best_of(repeat, lambda: list_queries(all_incidents, ttps))
+    return {"bundle_bytes": list_bytes, "saved_bytes": list_bytes - mask_bytes,
+            "list_query": list_query, "mask_query": mask_query}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    r = run(args.incidents, args.repeat, args.seed)
+    print(f"bundles  {r['bundle_bytes'] / 2**20:8.2f}MiB, "
+          f"{r['saved_bytes'] / 2**20:.2f}MiB ({r['saved_bytes'] / r['bundle_bytes']:.1%}) saved by compact_codes")
+    print(f"queries  {r['list_query'] * 1000:8.2f}ms with lists, {r['mask_query'] * 1000:.2f}ms with masks")
@@ -0,0 +1,84 @@
+"""
+Measures the in-memory corpus (see corpus_util) on a synthetic corpus (see
+synthetic.py).
+
+Measured:
+    index   building the indexes of a Corpus
+    query   find_incidents for incidents with a TTP technique, an outcome and
+            an organization sector, intersecting the posting sets, compared
+            to scanning every incident and its objects for the same answer
+    append  Incident.append_outcome with and without a Corpus listening, the
+            cost of keeping the indexes current
+Times are the best of --repeat runs.
+
+Usage (from the repository root):
+    python benchmarks/bench_corpus.py [--incidents 2000] [--repeat 3]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides import Incident
+from pyiides.utils.bundle_util import json_to_Bundle
+from pyiides.utils.corpus_util import Corpus
+from synthetic import generate_corpus
+from timing import best_of
+
+CONDITIONS = (("ttp", "technique", "3.2"), ("incident", "outcome", "BR"), ("organization", "industry_sector", "11"))
+
+
+def scan(bundles):
+    """The answer of the query, from every incident."""
+    return {
+        incident for bundle in bundles for incident in bundle.objects.get("incident", ())
+        if "BR" in (incident.outcome or ())
+        and any(ttp.technique == "3.2" for ttp in incident.ttps or ())
+        and any(organization.industry_sector == "11" for organization in incident.organizations or ())
+    }
+
+
+def append_all(incidents):
+    for incident in incidents:
+        incident.append_outcome("BR")
+
+
+def run(incidents=2000, repeat=3, seed=0):
+    """Returns {"index": s, "query": s, "scan": s, "matches": n, "append": s, "append_listened": s}."""
+    bundles = [json_to_Bundle(data) for data in generate_corpus(incidents, seed)]
+
+    def fresh():
+        return [Incident(outcome=[]) for _ in range(incidents)]
+    result = {"append": best_of(repeat, append_all, fresh)}
+    result["index"] = best_of(repeat, lambda: Corpus(bundles))
+    corpus = Corpus(bundles)
+    matches = corpus.find_incidents(*CONDITIONS)
+    assert matches == scan(bundles)
+    result.update(query=best_of(repeat, lambda: corpus.find_incidents(*CONDITIONS)),
+                  scan=best_of(repeat, lambda: scan(bundles)), matches=len(matches),
+                  append_listened=best_of(repeat, append_all, fresh))
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    r = run(args.incidents, args.repeat, args.seed)
+    print(f"index   {r['index'] * 1000:8.1f}ms")
+    print(f"query   {r['query'] * 1000:8.2f}ms ({r['matches']} incidents; scan {r['scan'] * 1000:.2f}ms)")
+    print(f"append  {r['append'] / args.incidents * 1e6:8.2f}us "
+          f"({r['append_listened'] / args.incidents * 1e6:.2f}us with a corpus listening)")
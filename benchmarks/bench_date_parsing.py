@@ -0,0 +1,113 @@
+"""
+Times the date parsing used by json_to_Bundle.
+
+datetime_str_to_obj parses "%Y-%m-%dT%H:%M:%SZ" strings (TTP, Note, Source and
+Detection dates) and date_str_to_obj ISO dates (Job, Stressor and LegalResponse
+dates). Both are wrapped in an LRU cache, and datetime_str_to_obj parses the
+exact layout with fromisoformat before falling back to strptime. Measured, per
+string:
+    strptime            datetime.strptime, which the import used before
+    fast path           datetime_str_to_obj without its cache
+    cached, cold        datetime_str_to_obj on the dates of a synthetic
+                        corpus, starting with an empty cache (the synthetic
+                        timestamps rarely repeat, so these are mostly misses)
+    cached, warm        the same once every date is in the cache, as when
+                        the same dates recur across a corpus
+    date, ...           date_str_to_obj on the corpus ISO dates, without its
+                        cache, cold and warm
+
+Usage (from the repository root):
+    python benchmarks/bench_date_parsing.py [--incidents 200] [--repeat 5]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import datetime
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import date_str_to_obj, datetime_str_to_obj, DATETIME_FORMAT
+from synthetic import generate_corpus
+from timing import best_of
+
+DATETIME_FIELDS = {"ttp": "date", "note": "date", "source": "date", "detection": "first_detected"}
+DATE_FIELDS = {
+    "job": ("hire_date", "departure_date"),
+    "stressor": ("date",),
+    "legal-response": (
+        "law_enforcement_contacted", "insider_arrested", "insider_charged", "insider_pleads",
+        "insider_judgment", "insider_sentenced", "insider_charges_dropped",
+        "insider_charges_dismissed", "insider_settled"),
+}
+
+
+def corpus_dates(incidents, seed=0):
+    """Returns the datetime and date strings of a synthetic corpus, in order."""
+    datetimes, dates = [], []
+    for bundle in generate_corpus(incidents, seed):
+        for json_object in bundle["objects"]:
+            tag = json_object["id"].split("--")[0]
+            if json_object.get(DATETIME_FIELDS.get(tag)):
+                datetimes.append(json_object[DATETIME_FIELDS[tag]])
+            for field in DATE_FIELDS.get(tag, ()):
+                if json_object.get(field):
+                    dates.append(json_object[field])
+    return datetimes, dates
+
+
+def per_string(parse, strings, repeat, cached=None, warm=False):
+    """
+    Best time per string in microseconds. The cache of `cached` is emptied
+    before every run, or filled with the strings first if warm is set.
+    """
+    def parse_all():
+        for s in strings:
+            parse(s)
+
+    def prepare():
+        if cached is not None:
+            cached.cache_clear()
+            if warm:
+                parse_all()
+    return best_of(repeat, lambda _: parse_all(), prepare) / len(strings) * 1e6
+
+
+def run(incidents=200, repeat=5, seed=0):
+    """Returns {"strings": {...}, "per_string_us": {measurement: microseconds}}."""
+    datetimes, dates = corpus_dates(incidents, seed)
+    return {
+        "strings": {"datetime": len(datetimes), "distinct datetime": len(set(datetimes)),
+                    "date": len(dates), "distinct date": len(set(dates))},
+        "per_string_us": {
+            "strptime": per_string(lambda s: datetime.datetime.strptime(s, DATETIME_FORMAT), datetimes, repeat),
+            "fast path": per_string(datetime_str_to_obj.__wrapped__, datetimes, repeat),
+            "cached, cold": per_string(datetime_str_to_obj, datetimes, repeat, datetime_str_to_obj),
+            "cached, warm": per_string(datetime_str_to_obj, datetimes, repeat, datetime_str_to_obj, warm=True),
+            "date, uncached": per_string(date_str_to_obj.__wrapped__, dates, repeat),
+            "date, cold": per_string(date_str_to_obj, dates, repeat, date_str_to_obj),
+            "date, warm": per_string(date_str_to_obj, dates, repeat, date_str_to_obj, warm=True),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run(args.incidents, args.repeat, args.seed)
+    print(", ".join(f"{count} {name}" for name, count in results["strings"].items()))
+    baseline = results["per_string_us"]["strptime"]
+    for name, us in results["per_string_us"].items():
+        print(f"{name:>16} {us:7.2f}us {baseline / us:6.1f}x")
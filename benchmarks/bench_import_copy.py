@@ -0,0 +1,74 @@
+"""
+Measures what the defensive copy of the json used to cost on import.
+
+json_to_Bundle used to rewrite the ids and dates in the dicts it was given,
+so a caller that wanted to keep the parsed json, or import it again, had to
+copy it first. It now only reads its input. On a synthetic corpus this times
+importing every bundle
+    directly            json_to_Bundle(bundle), all that is needed now
+    deepcopy            json_to_Bundle(copy.deepcopy(bundle))
+    json round trip     json_to_Bundle(json.loads(json.dumps(bundle))), the
+                        cheaper copy that benchmarks used
+and reports the best time of --repeat runs and the peak memory traced by
+tracemalloc while importing one bundle after the other.
+
+Usage (from the repository root):
+    python benchmarks/bench_import_copy.py [--incidents 200] [--repeat 3] [--trusted]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import json_to_Bundle
+from synthetic import generate_corpus
+from timing import measure
+
+COPIES = {
+    "directly": lambda bundle: bundle,
+    "deepcopy": copy.deepcopy,
+    "json round trip": lambda bundle: json.loads(json.dumps(bundle)),
+}
+
+
+def import_all(corpus, make_copy, validate):
+    for bundle in corpus:
+        json_to_Bundle(make_copy(bundle), validate)
+
+
+def run(incidents=200, repeat=3, validate=True, seed=0):
+    """Returns {way: {"seconds": ..., "peak_bytes": ...}}."""
+    corpus = generate_corpus(incidents, seed)
+    results = {}
+    for name, make_copy in COPIES.items():
+        result = measure(lambda: corpus, lambda bundles: import_all(bundles, make_copy, validate), len(corpus), repeat)
+        results[name] = {"seconds": result["seconds"], "peak_bytes": result["peak_bytes"]}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trusted", action="store_true", help="import with validate=False")
+    args = parser.parse_args()
+
+    results = run(args.incidents, args.repeat, not args.trusted, args.seed)
+    direct = results["directly"]
+    print(f"{'import':>16} {'time':>10} {'peak':>10}")
+    for name, r in results.items():
+        print(f"{name:>16} {r['seconds'] * 1000:8.1f}ms {r['peak_bytes'] / 2**10:7.0f}KiB"
+              f" {r['seconds'] / direct['seconds']:5.2f}x")
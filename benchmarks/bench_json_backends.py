@@ -0,0 +1,77 @@
+"""
+Times import and export with every json backend that is installed.
+
+The corpus comes from synthetic.py (one bundle per incident). Measured, per
+object, for each backend in JSON_BACKENDS:
+    dumps               Bundle_to_json, indented by 4 spaces
+    dumps canonical     Bundle_to_json(canonical=True)
+    loads               json_str_to_Bundle(validate=False), so that parsing
+                        is a larger part of the time
+The canonical column also checks that every backend gives the same text.
+
+Usage (from the repository root):
+    python benchmarks/bench_json_backends.py [--incidents 200] [--repeat 3]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import json_to_Bundle, json_str_to_Bundle, Bundle_to_json
+from pyiides.utils.helper_functions import JSON_BACKENDS, get_json_backend
+from synthetic import generate_corpus
+from timing import best_of
+
+
+def run(incidents=200, repeat=3, seed=0):
+    """Returns {backend: {"dumps": us, "dumps canonical": us, "loads": us}} per object."""
+    corpus = generate_corpus(incidents, seed)
+    bundles = [json_to_Bundle(bundle) for bundle in corpus]
+    texts = [Bundle_to_json(bundle, json_backend="json") for bundle in bundles]
+    objects = sum(len(bundle["objects"]) for bundle in corpus)
+
+    results = {}
+    canonical = None
+    for name in JSON_BACKENDS:
+        try:
+            get_json_backend(name)
+        except ImportError:
+            continue
+        output = [Bundle_to_json(bundle, json_backend=name, canonical=True) for bundle in bundles]
+        if canonical is None:
+            canonical = output
+        elif output != canonical:
+            raise AssertionError(f"{name} canonical output differs")
+        results[name] = {
+            "dumps": best_of(repeat, lambda: [Bundle_to_json(b, json_backend=name) for b in bundles]),
+            "dumps canonical": best_of(
+                repeat, lambda: [Bundle_to_json(b, json_backend=name, canonical=True) for b in bundles]),
+            "loads": best_of(
+                repeat, lambda: [json_str_to_Bundle(t, validate=False, json_backend=name) for t in texts]),
+        }
+        results[name] = {key: seconds / objects * 1e6 for key, seconds in results[name].items()}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run(args.incidents, args.repeat, args.seed)
+    columns = ("dumps", "dumps canonical", "loads")
+    print(f"{'backend':>10}" + "".join(f" {column:>16}" for column in columns))
+    for name, r in results.items():
+        print(f"{name:>10}" + "".join(f" {r[column]:14.2f}us" for column in columns))
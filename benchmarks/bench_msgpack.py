@@ -0,0 +1,90 @@
+"""
+Compares the size and speed of IIDES json and MessagePack (Bundle.to_msgpack)
+on Examples/example1-4.json.
+
+Sizes, in bytes:
+    file            the example file as it is
+    json            Bundle_to_json, indented by 4 spaces as in an archive
+    compact         Bundle_to_json(canonical=True), on one line
+    msgpack         Bundle.to_msgpack
+    .gz             each of the above compressed with gzip -6
+Times, per bundle (best of --repeat runs of --number calls):
+    export          Bundle_to_json and Bundle.to_msgpack
+    import          json_str_to_Bundle and Bundle.from_msgpack
+    parse           parsing alone, with the json backend and msgpack.unpackb
+Both imports validate every object, as json_to_Bundle does by default; use
+--trusted to skip validation.
+
+Usage (from the repository root):
+    python benchmarks/bench_msgpack.py [--repeat 5] [--number 50] [--trusted]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import gzip
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import msgpack
+from pyiides import Bundle
+from pyiides.utils.bundle_util import json_str_to_Bundle, Bundle_to_json
+from pyiides.utils.helper_functions import get_json_backend
+from timing import best_of
+
+
+def run(repeat=5, number=50, validate=True):
+    """Returns {example: {"sizes": {...}, "times": {...}}}, times in seconds."""
+    backend = get_json_backend()
+    results = {}
+    for i in range(1, 5):
+        with open(os.path.join(REPO_ROOT, "Examples", f"example{i}.json"), "rb") as f:
+            original = f.read()
+        bundle = json_str_to_Bundle(original)
+        encoded = {
+            "file": original,
+            "json": Bundle_to_json(bundle).encode(),
+            "compact": Bundle_to_json(bundle, canonical=True).encode(),
+            "msgpack": bundle.to_msgpack(),
+        }
+        sizes = {name: len(data) for name, data in encoded.items()}
+        sizes.update({name + ".gz": len(gzip.compress(data, 6)) for name, data in encoded.items()})
+
+        json_text, msgpack_data = encoded["json"], encoded["msgpack"]
+        times = {
+            "export json": best_of(repeat, lambda: Bundle_to_json(bundle), number=number),
+            "export msgpack": best_of(repeat, bundle.to_msgpack, number=number),
+            "import json": best_of(repeat, lambda: json_str_to_Bundle(json_text, validate), number=number),
+            "import msgpack": best_of(repeat, lambda: Bundle.from_msgpack(msgpack_data, validate), number=number),
+            "parse json": best_of(repeat, lambda: backend.loads(json_text), number=number),
+            "parse msgpack": best_of(repeat, lambda: msgpack.unpackb(msgpack_data), number=number),
+        }
+        results[f"example{i}"] = {"sizes": sizes, "times": times}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=50)
+    parser.add_argument("--trusted", action="store_true", help="import without validation")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.number, not args.trusted)
+    print(f"json backend: {get_json_backend()!r}")
+    names = list(next(iter(results.values()))["sizes"])
+    print(f"{'size':>10}" + "".join(f" {name:>11}" for name in names))
+    for example, r in results.items():
+        print(f"{example:>10}" + "".join(f" {r['sizes'][name]:10d}B" for name in names))
+    names = list(next(iter(results.values()))["times"])
+    print(f"{'time':>10}" + "".join(f" {name:>15}" for name in names))
+    for example, r in results.items():
+        print(f"{example:>10}" + "".join(f" {r['times'][name] * 1e6:13.0f}us" for name in names))
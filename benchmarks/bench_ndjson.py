@@ -0,0 +1,87 @@
+"""
+Times random access to an NDJSON bundle file written by append_ndjson.
+
+A synthetic corpus (see synthetic.py) is appended to a temporary file, one
+bundle per line (or one object per line, with --objects-per-line). Measured:
+    append_ndjson   writing every bundle and its index entry
+    open            creating an NdjsonReader, i.e. loading the index
+    get             reading --lookups random bundles through the index
+    scan            finding the same bundles by parsing the file line by line
+                    up to each of them, as without an index
+Times are the best of --repeat runs.
+
+Usage (from the repository root):
+    python benchmarks/bench_ndjson.py [--incidents 2000] [--lookups 100] [--objects-per-line] [--repeat 3]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import json_to_Bundle, append_ndjson, NdjsonReader, NDJSON_INDEX_SUFFIX
+from synthetic import generate_corpus
+from timing import best_of
+
+
+def scan(path, bundle_id):
+    """Parses the file up to the bundle, then imports it."""
+    with open(path, "rb") as f:
+        for line in f:
+            record = json.loads(line)
+            if record["id"] == bundle_id:
+                return json_to_Bundle(record)
+
+
+def run(incidents=2000, lookups=100, objects_per_line=False, repeat=3, seed=0):
+    """Returns {benchmark: seconds}."""
+    bundles = [json_to_Bundle(data) for data in generate_corpus(incidents, seed)]
+    wanted = random.Random(seed).sample([bundle.id for bundle in bundles], min(lookups, len(bundles)))
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bundles.ndjson")
+
+        def fresh():
+            for name in (path, path + NDJSON_INDEX_SUFFIX):
+                if os.path.exists(name):
+                    os.remove(name)
+        results["append_ndjson"] = best_of(repeat, lambda _: append_ndjson(path, bundles, objects_per_line), fresh)
+        results["open"] = best_of(repeat, lambda: NdjsonReader(path).close())
+
+        def get_all(reader):
+            with reader:
+                for bundle_id in wanted:
+                    reader.get(bundle_id)
+        results["get"] = best_of(repeat, get_all, lambda: NdjsonReader(path))
+        if not objects_per_line:
+            results["scan"] = best_of(repeat, lambda: [scan(path, f"bundle--{bundle_id}") for bundle_id in wanted])
+        results["file_bytes"] = os.path.getsize(path)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=100)
+    parser.add_argument("--objects-per-line", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run(args.incidents, args.lookups, args.objects_per_line, args.repeat, args.seed)
+    print(f"file: {results.pop('file_bytes') / 2**20:.1f}MiB")
+    for name, seconds in results.items():
+        per = f"{seconds / args.lookups * 1000:8.2f}ms per bundle" if name in ("get", "scan") else ""
+        print(f"{name:>14} {seconds * 1000:9.1f}ms {per}")
@@ -0,0 +1,100 @@
+"""
+Times wiring n children to one parent through the relationship setters, for
+growing n.
+
+The one-to-many side of every relationship is a RelationshipList, which finds
+members through a hash index instead of scanning the list, so the time per
+child should stay flat as n grows. With plain lists it grew with n, making the
+whole wiring O(n^2). Removing in random order is the exception: it may still
+scan the part of the list the object could have moved back over. Measured
+per child:
+    wire        job.organization = org
+    move        job.organization = other_org, which removes it from org first
+    append      incident.append_ttp(ttp)
+    remove      incident.remove_ttp(ttp), in random order
+
+Usage (from the repository root):
+    python benchmarks/bench_relationship_wiring.py [--sizes 1000 4000 16000] [--repeat 3]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides import Incident, Job, Organization, TTP
+from timing import best_of
+
+
+def new_jobs(n, wired=False):
+    """An organization and n jobs, of another organization if wired is set."""
+    jobs = [Job(job_function=None, occupation=None) for _ in range(n)]
+    if wired:
+        wire_jobs((Organization(), jobs))
+    return Organization(), jobs
+
+
+def wire_jobs(state):
+    organization, jobs = state
+    for job in jobs:
+        job.organization = organization
+
+
+def new_ttps(n, appended=False, seed=0):
+    """An incident and n TTPs, in random order and appended to it if appended is set."""
+    incident = Incident()
+    ttps = [TTP() for _ in range(n)]
+    if appended:
+        for ttp in ttps:
+            incident.append_ttp(ttp)
+        random.Random(seed).shuffle(ttps)
+    return incident, ttps
+
+
+def append_ttps(state):
+    incident, ttps = state
+    for ttp in ttps:
+        incident.append_ttp(ttp)
+
+
+def remove_ttps(state):
+    incident, ttps = state
+    for ttp in ttps:
+        incident.remove_ttp(ttp)
+
+
+def run(sizes=(1000, 4000, 16000), repeat=3):
+    """Returns {n: {operation: microseconds per child}}."""
+    results = {}
+    for n in sizes:
+        wire = best_of(repeat, wire_jobs, lambda: new_jobs(n))
+        move = best_of(repeat, wire_jobs, lambda: new_jobs(n, wired=True))
+        append = best_of(repeat, append_ttps, lambda: new_ttps(n))
+        remove = best_of(repeat, remove_ttps, lambda: new_ttps(n, appended=True))
+        results[n] = {
+            name: seconds / n * 1e6
+            for name, seconds in (("wire", wire), ("move", move), ("append", append), ("remove", remove))
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 16000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    print(f"{'children':>10} {'wire':>10} {'move':>10} {'append':>10} {'remove':>10}")
+    for n, r in results.items():
+        print(f"{n:>10} " + " ".join(f"{r[name]:8.2f}us" for name in ("wire", "move", "append", "remove")))
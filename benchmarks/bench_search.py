@@ -0,0 +1,114 @@
+"""
+Measures the full-text index (see search_util) on a synthetic corpus (see
+synthetic.py).
+
+The synthetic texts repeat the same 30 words, so every incident would match
+every query; the incident summaries are replaced with text drawn from a
+vocabulary of made-up words with Zipf-distributed frequencies, closer to
+real narratives.
+
+Measured:
+    index   building the TextIndex of the bundles
+    query   searches for a rare word, a common word, a phrase and a prefix,
+            compared to scanning the text fields of every object for the
+            word as a substring
+    save    TextIndex.save and TextIndex.load, and the size of the file
+Times are the best of --repeat runs.
+
+Usage (from the repository root):
+    python benchmarks/bench_search.py [--incidents 20000] [--repeat 5]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import json_to_Bundle
+from pyiides.utils.search_util import TextIndex, text_fields, tokenize
+from synthetic import generate_corpus
+from timing import best_of
+
+SYLLABLES = [consonant + vowel for consonant in "bdfgklmnprstvz" for vowel in "aeiou"]
+
+
+def vocabulary(rng, size=20000):
+    """Made-up words of two to four syllables, from the most frequent."""
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+
+def summaries(bundles, seed=0, words=60):
+    """Replaces the summary of every incident with words drawn with Zipf frequencies."""
+    rng = random.Random(seed)
+    vocab = vocabulary(rng)
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocab) + 1)))
+    for bundle in bundles:
+        for incident in bundle.objects.get("incident", ()):
+            incident.summary = " ".join(rng.choices(vocab, cum_weights=weights, k=words))
+    return vocab
+
+
+def scan(bundles, word):
+    """The incidents whose objects have the word in a text field, by looking at every object."""
+    found = set()
+    for bundle in bundles:
+        for objects in bundle.objects.values():
+            for obj in objects:
+                for field in text_fields(obj._object_type.tag):
+                    value = getattr(obj, field)
+                    if value and word in value.casefold():
+                        found.add(bundle.id)
+    return found
+
+
+def run(incidents=20000, repeat=5, seed=0):
+    """Returns {"index": s, "queries": {name: (query, s, hits)}, "scan": s, "save": s, "load": s, "size": bytes}."""
+    bundles = [json_to_Bundle(data) for data in generate_corpus(incidents, seed)]
+    vocab = summaries(bundles, seed)
+    result = {"index": best_of(1, lambda: TextIndex(bundles))}
+    index = TextIndex(bundles)
+    phrase = " ".join(tokenize(bundles[0].objects["incident"][0].summary)[10:12])
+    queries = {"rare": vocab[2000], "common": vocab[10], "phrase": f'"{phrase}"', "prefix": vocab[500][:5] + "*"}
+    result["queries"] = {
+        name: (query, best_of(repeat, lambda: index.search(query)), len(index.search(query, limit=None)))
+        for name, query in queries.items()
+    }
+    result["scan"] = best_of(1, lambda: scan(bundles, vocab[2000]))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "incidents.idx")
+        result["save"] = best_of(1, lambda: index.save(path))
+        result["load"] = best_of(1, lambda: TextIndex.load(path))
+        result["size"] = os.path.getsize(path)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    r = run(args.incidents, args.repeat, args.seed)
+    print(f"index   {r['index'] * 1000:8.1f}ms")
+    for name, (query, seconds, hits) in r["queries"].items():
+        print(f"{name:7} {seconds * 1000:8.3f}ms {query} ({hits} incidents)")
+    print(f"scan    {r['scan'] * 1000:8.1f}ms (the rare word as a substring)")
+    print(f"save    {r['save'] * 1000:8.1f}ms, load {r['load'] * 1000:.1f}ms, {r['size'] / 2 ** 20:.1f} MiB")
@@ -0,0 +1,93 @@
+"""
+Reports the memory used per instance of every IIDES class, with and without
+__slots__.
+
+pyiides/pyiides.py declares __slots__ on every class. For comparison the
+classes are merged again with development/join_classes.py --no-slots into a
+temporary module. Each class is instantiated --count times with only its id
+set, and the memory traced by tracemalloc is divided by the count, so the
+numbers are the fixed cost of an instance on top of its attribute values.
+With --trusted the instances are built with from_trusted_dict, as
+json_to_Bundle(data, validate=False) does.
+
+Usage (from the repository root):
+    python benchmarks/bench_slots_memory.py [--count 20000] [--trusted]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import tracemalloc
+from inspect import signature
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'development'))
+
+import pyiides
+from join_classes import merge_python_files
+
+ID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+def load_unslotted(directory):
+    merge_python_files(os.path.join(REPO_ROOT, 'development', 'base'), directory,
+                       'unslotted.py', 'person.py', slots=False)
+    spec = importlib.util.spec_from_file_location(
+        'unslotted', os.path.join(directory, 'unslotted.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bytes_per_instance(cls, count, trusted=False):
+    # every IIDES class accepts None for its required arguments
+    arguments = {
+        name: None
+        for name, param in list(signature(cls.__init__).parameters.items())[1:]
+        if param.default is param.empty and param.kind is param.POSITIONAL_OR_KEYWORD
+    }
+    arguments["id"] = ID
+    instances = [None] * count
+    tracemalloc.start()
+    for i in range(count):
+        instances[i] = cls.from_trusted_dict(arguments) if trusted else cls(**arguments)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / count
+
+
+def run(count=20000, trusted=False):
+    """Returns {class name: {"dict": bytes, "slots": bytes}} per instance."""
+    with tempfile.TemporaryDirectory() as directory:
+        unslotted = load_unslotted(directory)
+        return {
+            name: {
+                "dict": bytes_per_instance(getattr(unslotted, name), count, trusted),
+                "slots": bytes_per_instance(getattr(pyiides, name), count, trusted),
+            }
+            for name in pyiides.__all__
+            if name not in ("Bundle", "Person")
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--trusted", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.count, args.trusted)
+    print(f"{'class':>16} {'__dict__':>10} {'__slots__':>10} {'saved':>12}")
+    for name, r in results.items():
+        saved = r['dict'] - r['slots']
+        print(f"{name:>16} {r['dict']:9.0f}B {r['slots']:9.0f}B {saved:6.0f}B {saved / r['dict']:4.0%}")
@@ -0,0 +1,89 @@
+"""
+Measures the SQLite bundle store (see sqlite_util) on a synthetic corpus
+(see synthetic.py).
+
+Measured:
+    add     storing every bundle in a new database file, in one transaction
+    get     loading --lookups random bundles by id
+    find    the ids of the bundles with a TTP tactic and with an incident
+            type, using the indexes, compared to scanning the bundles in
+            memory for the same answer
+Times are the best of --repeat runs.
+
+Usage (from the repository root):
+    python benchmarks/bench_sqlite.py [--incidents 2000] [--lookups 100] [--repeat 3]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import json_to_Bundle
+from pyiides.utils.sqlite_util import BundleStore
+from synthetic import generate_corpus
+from timing import best_of
+
+
+def scan(bundles):
+    """The answer of find, from the bundles in memory."""
+    tactic = {f"bundle--{bundle.id}" for bundle in bundles
+              if any(ttp.tactic == "3" for ttp in bundle.objects.get("ttp", ()))}
+    incident_type = {f"bundle--{bundle.id}" for bundle in bundles
+                     if any("F" in (incident.incident_type or ()) for incident in bundle.objects.get("incident", ()))}
+    return tactic, incident_type
+
+
+def run(incidents=2000, lookups=100, repeat=3, seed=0):
+    """Returns {"bytes": ..., "add": s, "get": s, "find": s, "scan": s}."""
+    bundles = [json_to_Bundle(data) for data in generate_corpus(incidents, seed)]
+    wanted = random.Random(seed).sample([bundle.id for bundle in bundles], min(lookups, len(bundles)))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bundles.db")
+
+        def add():
+            if os.path.exists(path):
+                os.remove(path)
+            with BundleStore(path) as store:
+                store.add_all(bundles)
+
+        result = {"add": best_of(repeat, add), "bytes": os.path.getsize(path)}
+        with BundleStore(path) as store:
+            def get():
+                for bundle_id in wanted:
+                    store.get(bundle_id)
+
+            def find():
+                return (set(store.find_bundles("ttp", "tactic", "3")),
+                        set(store.find_bundles("incident", "incident_type", "F")))
+
+            assert find() == scan(bundles)
+            result.update(get=best_of(repeat, get), find=best_of(repeat, find),
+                          scan=best_of(repeat, lambda: scan(bundles)))
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    r = run(args.incidents, args.lookups, args.repeat, args.seed)
+    print(f"database {r['bytes'] / 2**20:.2f}MiB")
+    print(f"add      {r['add'] * 1000:8.1f}ms")
+    print(f"get      {r['get'] / args.lookups * 1000:8.2f}ms/bundle")
+    print(f"find     {r['find'] * 1000:8.2f}ms (in-memory scan {r['scan'] * 1000:.2f}ms)")
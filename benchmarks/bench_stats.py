@@ -0,0 +1,95 @@
+"""
+Measures the vectorized corpus statistics (see stats_util) on a synthetic
+corpus (see synthetic.py).
+
+Measured:
+    pack    making a CorpusStats, packing the fields used below and the
+            incident links of their types into arrays and computing the
+            statistics below: everything from the objects to the results
+    stats   the incident counts of TTP tactics, the cross-tabulation of TTP
+            tactics by organization industry sectors and the co-occurrence
+            of incident outcomes, from the packed arrays
+    loop    the same cross-tabulation computed with Python loops over every
+            incident and its TTPs and organizations
+Times are the best of --repeat runs. The target is a pack of 100,000
+incidents in well under a second; with --target the benchmark fails if the
+pack takes longer than that many seconds per 100,000 incidents.
+
+Usage (from the repository root):
+    python benchmarks/bench_stats.py [--incidents 20000] [--repeat 3] [--target 1.0]
+    python benchmarks/bench_stats.py --incidents 100000 --repeat 1 --target 1.0
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import json_to_Bundle
+from pyiides.utils.stats_util import CorpusStats
+from synthetic import generate_corpus
+from timing import best_of
+
+TACTIC, SECTOR = ("ttp", "tactic"), ("organization", "industry_sector")
+
+
+def statistics(stats):
+    return (stats.counts(*TACTIC), stats.crosstab(TACTIC, SECTOR), stats.cooccurrence("incident", "outcome"))
+
+
+def pack(bundles):
+    stats = CorpusStats(bundles)
+    statistics(stats)
+    return stats
+
+
+def loop(bundles):
+    """The cross-tabulation of tactics by sectors, as {(tactic, sector): incidents}."""
+    counts = {}
+    for bundle in bundles:
+        for incident in bundle.objects.get("incident", ()):
+            tactics = {ttp.tactic for ttp in incident.ttps or () if ttp.tactic is not None}
+            sectors = {organization.industry_sector for organization in incident.organizations or ()
+                       if organization.industry_sector is not None}
+            for tactic in tactics:
+                for sector in sectors:
+                    counts[tactic, sector] = counts.get((tactic, sector), 0) + 1
+    return counts
+
+
+def run(incidents=20000, repeat=3, seed=0):
+    """Returns {"pack": s, "stats": s, "loop": s, "incidents": n}."""
+    bundles = [json_to_Bundle(data) for data in generate_corpus(incidents, seed)]
+    stats = pack(bundles)
+    crosstab = statistics(stats)[1].to_dict()
+    assert loop(bundles) == {(tactic, sector): count for tactic, row in crosstab.items()
+                             for sector, count in row.items() if count}
+    return {"pack": best_of(repeat, lambda: pack(bundles)), "stats": best_of(repeat, lambda: statistics(stats)),
+            "loop": best_of(repeat, lambda: loop(bundles)), "incidents": stats.incidents}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", type=float, default=None,
+                        help="the most seconds the pack may take per 100,000 incidents")
+    args = parser.parse_args()
+
+    r = run(args.incidents, args.repeat, args.seed)
+    per_100k = r["pack"] * 100000 / max(r["incidents"], 1)
+    print(f"pack    {r['pack'] * 1000:8.1f}ms ({r['incidents']} incidents, {per_100k * 1000:.0f}ms per 100,000)")
+    print(f"stats   {r['stats'] * 1000:8.1f}ms")
+    print(f"loop    {r['loop'] * 1000:8.1f}ms (the cross-tabulation alone)")
+    if args.target is not None and per_100k > args.target:
+        sys.exit(f"pack takes {per_100k:.2f}s per 100,000 incidents, more than the {args.target}s target")
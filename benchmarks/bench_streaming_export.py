@@ -0,0 +1,82 @@
+"""
+Compares Bundle_to_json with Bundle.dump when writing a large bundle to disk.
+
+The aggregate bundle from bench_streaming_import.py is imported once, then
+written out with both exporters. Peak memory is measured with tracemalloc
+in a separate pass from the timing, and does not include the bundle itself.
+
+Usage (from the repository root):
+    python benchmarks/bench_streaming_export.py [--copies 500]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import Bundle_to_json, json_stream_to_Bundle
+from bench_streaming_import import write_aggregate
+
+
+def write_string(bundle, path):
+    with open(path, "w") as f:
+        f.write(Bundle_to_json(bundle))
+
+
+def write_dump(bundle, path):
+    with open(path, "w") as f:
+        bundle.dump(f, indent=4)
+
+
+def measure(write):
+    start = time.perf_counter()
+    write()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    write()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_bytes": peak}
+
+
+def run(copies=500):
+    """Returns the output size and {writer: {"seconds", "peak_bytes"}}."""
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "aggregate.json")
+        with open(source, "w") as f:
+            write_aggregate(f, copies)
+        with open(source, "rb") as f:
+            bundle = json_stream_to_Bundle(f)
+
+        output = os.path.join(directory, "out.json")
+        results = {
+            "Bundle_to_json": measure(lambda: write_string(bundle, output)),
+            "Bundle.dump": measure(lambda: write_dump(bundle, output)),
+        }
+        results["file_bytes"] = os.path.getsize(output)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--copies", type=int, default=500)
+    args = parser.parse_args()
+
+    results = run(args.copies)
+    print(f"output size: {results.pop('file_bytes') / 2**20:.1f} MiB")
+    print(f"{'writer':>16} {'time':>10} {'peak':>12}")
+    for name, r in results.items():
+        print(f"{name:>16} {r['seconds']:9.2f}s {r['peak_bytes'] / 2**20:9.1f} MiB")
@@ -0,0 +1,110 @@
+"""
+Compares json.load + json_to_Bundle with json_stream_to_Bundle on a large file.
+
+An aggregate bundle is written to a temporary file by repeating the objects of
+Examples/example1-4.json --copies times, each copy with fresh uuids. Both
+readers then import it from disk; peak memory is measured with tracemalloc in
+a separate pass from the timing.
+
+Usage (from the repository root):
+    python benchmarks/bench_streaming_import.py [--copies 500]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import json_to_Bundle, json_stream_to_Bundle
+
+UUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def write_aggregate(fp, copies):
+    """Writes one bundle holding `copies` renamed copies of every example's objects."""
+    texts = []
+    for i in range(1, 5):
+        with open(os.path.join(REPO_ROOT, 'Examples', f'example{i}.json')) as f:
+            objects = json.load(f)["objects"]
+        texts.append(",\n".join(json.dumps(obj, indent=4) for obj in objects))
+
+    fp.write(f'{{"id": "bundle--{uuid.uuid4()}", "objects": [\n')
+    first = True
+    for _ in range(copies):
+        for text in texts:
+            renamed = {}
+            text = UUID_PATTERN.sub(lambda m: renamed.setdefault(m.group(0), str(uuid.uuid4())), text)
+            fp.write(text if first else ",\n" + text)
+            first = False
+    fp.write("\n]}\n")
+
+
+def load_whole(path):
+    with open(path, "rb") as f:
+        return json_to_Bundle(json.load(f))
+
+
+def load_streaming(path, backend):
+    with open(path, "rb") as f:
+        return json_stream_to_Bundle(f, backend=backend)
+
+
+def measure(load):
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_bytes": peak}
+
+
+def run(copies=500):
+    """Returns the file size and {reader: {"seconds", "peak_bytes"}}."""
+    readers = {
+        "json_to_Bundle": load_whole,
+        "stream (json)": lambda path: load_streaming(path, "json"),
+    }
+    try:
+        import ijson
+        readers["stream (ijson)"] = lambda path: load_streaming(path, "ijson")
+    except ImportError:
+        pass
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "aggregate.json")
+        with open(path, "w") as f:
+            write_aggregate(f, copies)
+        results = {"file_bytes": os.path.getsize(path)}
+        for name, load in readers.items():
+            results[name] = measure(lambda: load(path))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--copies", type=int, default=500)
+    args = parser.parse_args()
+
+    results = run(args.copies)
+    print(f"file size: {results.pop('file_bytes') / 2**20:.1f} MiB")
+    print(f"{'reader':>16} {'time':>10} {'peak':>12}")
+    for name, r in results.items():
+        print(f"{name:>16} {r['seconds']:9.2f}s {r['peak_bytes'] / 2**20:9.1f} MiB")
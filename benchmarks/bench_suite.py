@@ -0,0 +1,175 @@
+"""
+Times the main PyIIDES operations on a synthetic corpus and writes the
+results as json.
+
+The corpus comes from synthetic.py (one bundle per incident). Measured:
+    construct.<Class>   calling each class constructor with validation
+    check_vocab         validating single codes and code lists
+    json_to_Bundle      importing every bundle, with and without validation
+    Bundle_to_json      exporting every imported bundle
+    anonymize_bundle    anonymizing every imported bundle
+Each timing is the best of --repeat runs. Peak memory is measured with
+tracemalloc in one extra run, so it does not slow down the timings.
+
+Use --output to save the results and --compare to print the change in time
+per item against results saved earlier, e.g. on another commit.
+
+Usage (from the repository root):
+    python benchmarks/bench_suite.py [--incidents 200] [--repeat 3] [--output results.json] [--compare baseline.json]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+from inspect import signature
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import json_to_Bundle, Bundle_to_json, anonymize_bundle, object_to_class
+from pyiides.utils.helper_functions import check_vocab, instance_dict
+from synthetic import generate_corpus
+from timing import measure
+
+# (tag, field) -> vocabulary, for the check_vocab benchmark
+VOCAB_FIELDS = {
+    ("incident", "cia_effect"): "cia-vocab",
+    ("incident", "incident_type"): "incident-type-vocab",
+    ("incident", "status"): "incident-status-vocab",
+    ("insider", "incident_role"): "incident-role-vocab",
+    ("insider", "motive"): "motive-vocab",
+    ("job", "job_function"): "job-function-vocab",
+    ("job", "occupation"): "occupation-vocab",
+    ("organization", "industry_sector"): "industry-sector-vocab",
+    ("ttp", "tactic"): "tactic-vocab",
+    ("ttp", "technique"): "technique-vocab",
+    ("ttp", "location"): "attack-location-vocab",
+    ("ttp", "device"): "device-vocab",
+    ("target", "sensitivity"): "target-sensitivity-vocab",
+    ("charge", "plea"): "charge-plea-vocab",
+}
+
+
+def constructor_arguments(corpus):
+    """Returns {class: [kwargs, ...]} for every object in the corpus."""
+    arguments = {}
+    for bundle in corpus:
+        for json_object in bundle["objects"]:
+            _, obj = object_to_class(json_object, validate=False)
+            if obj is None:
+                continue
+            cls = type(obj)
+            parameters = signature(cls.__init__).parameters
+            arguments.setdefault(cls, []).append({
+                attr[1:]: value for attr, value in instance_dict(obj).items()
+                if attr[1:] in parameters
+            })
+    return arguments
+
+
+def run(incidents=200, repeat=3, seed=0):
+    """Returns {"meta": {...}, "results": {benchmark: {...}}}."""
+    corpus = generate_corpus(incidents, seed)
+    object_count = sum(len(bundle["objects"]) for bundle in corpus)
+    results = {}
+
+    for cls, argument_list in sorted(constructor_arguments(corpus).items(), key=lambda item: item[0].__name__):
+        def construct(argument_list, cls=cls):
+            return [cls(**kwargs) for kwargs in argument_list]
+        results[f"construct.{cls.__name__}"] = measure(
+            lambda argument_list=argument_list: argument_list, construct, len(argument_list), repeat)
+
+    checks = [
+        (json_object[field], vocab)
+        for bundle in corpus
+        for json_object in bundle["objects"]
+        for (tag, field), vocab in VOCAB_FIELDS.items()
+        if json_object["id"].startswith(tag + "--") and json_object.get(field) is not None
+    ]
+    def check_all(checks):
+        for value, vocab in checks:
+            check_vocab(value, vocab)
+    results["check_vocab"] = measure(lambda: checks, check_all, len(checks), repeat)
+
+    def import_all(bundles, validate=True):
+        return [json_to_Bundle(bundle, validate) for bundle in bundles]
+    results["json_to_Bundle"] = measure(lambda: corpus, import_all, object_count, repeat)
+    results["json_to_Bundle.trusted"] = measure(
+        lambda: corpus, lambda bundles: import_all(bundles, False), object_count, repeat)
+
+    bundles = import_all(corpus)
+    def export_all(bundles):
+        for bundle in bundles:
+            Bundle_to_json(bundle)
+    results["Bundle_to_json"] = measure(lambda: bundles, export_all, object_count, repeat)
+
+    def anonymize_all(bundles):
+        # anonymize_bundle prints every object it changes
+        with contextlib.redirect_stdout(io.StringIO()):
+            for bundle in bundles:
+                anonymize_bundle(bundle)
+    results["anonymize_bundle"] = measure(lambda: bundles, anonymize_all, object_count, repeat)
+
+    return {"meta": metadata(incidents, repeat, seed, object_count), "results": results}
+
+
+def metadata(incidents, repeat, seed, object_count):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "incidents": incidents,
+        "objects": object_count,
+        "repeat": repeat,
+        "seed": seed,
+    }
+
+
+def print_results(results, baseline=None):
+    header = f"{'benchmark':>28} {'time':>10} {'per item':>10} {'peak':>10}"
+    print(header + (f" {'vs baseline':>12}" if baseline else ""))
+    for name, r in results["results"].items():
+        line = f"{name:>28} {r['seconds'] * 1000:8.1f}ms {r['per_item_us']:8.1f}us {r['peak_bytes'] / 2**20:6.1f}MiB"
+        if baseline and name in baseline["results"]:
+            line += f" {r['per_item_us'] / baseline['results'][name]['per_item_us']:11.2f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this json file")
+    parser.add_argument("--compare", help="json results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    results = run(args.incidents, args.repeat, args.seed)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
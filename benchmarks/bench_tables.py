@@ -0,0 +1,84 @@
+"""
+Times the columnar export of table_util on a synthetic corpus (see
+synthetic.py) and how much memory it needs.
+
+Measured:
+    Bundles_to_tables   converting every bundle to in-memory pyarrow Tables
+    write_tables        writing Parquet (or Arrow, with --format arrow) files in
+                        batches of --batch-size rows, reading the bundles from a
+                        generator. Its peak memory, traced with tracemalloc,
+                        depends on the batch size and not on the corpus size.
+    query.python        counting the TTPs per tactic by looping over the bundles
+    query.arrow         the same count, group_by on the ttp table
+Times are the best of --repeat runs. Needs pyarrow.
+
+Usage (from the repository root):
+    python benchmarks/bench_tables.py [--incidents 2000] [--batch-size 10000] [--format parquet] [--repeat 3]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import collections
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import json_to_Bundle
+from pyiides.utils.table_util import Bundles_to_tables, write_tables
+from synthetic import generate_corpus
+from timing import best_of, measure
+
+
+def run(incidents=2000, batch_size=10000, file_format="parquet", repeat=3, seed=0):
+    """Returns {benchmark: {"seconds": ..., "peak_bytes": ...}}."""
+    corpus = generate_corpus(incidents, seed)
+    bundles = [json_to_Bundle(data) for data in corpus]
+    results = {}
+
+    results["Bundles_to_tables"] = {"seconds": best_of(repeat, lambda: Bundles_to_tables(bundles)), "peak_bytes": None}
+    tables = Bundles_to_tables(bundles)
+
+    with tempfile.TemporaryDirectory() as directory:
+        def write(corpus):
+            # one bundle in memory at a time, as when streaming a large corpus
+            return write_tables((json_to_Bundle(data) for data in corpus), directory, file_format, batch_size)
+        result = measure(lambda: corpus, write, len(corpus), repeat)
+        results["write_tables"] = {"seconds": result["seconds"], "peak_bytes": result["peak_bytes"]}
+
+    def count_python():
+        counts = collections.Counter()
+        for bundle in bundles:
+            for ttp in bundle.objects.get("ttp", ()):
+                counts[ttp.tactic] += 1
+        return counts
+    results["query.python"] = {"seconds": best_of(repeat, count_python), "peak_bytes": None}
+    results["query.arrow"] = {
+        "seconds": best_of(repeat, lambda: tables["ttp"].group_by("tactic").aggregate([("id", "count")])),
+        "peak_bytes": None,
+    }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--format", choices=("parquet", "arrow"), default="parquet")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run(args.incidents, args.batch_size, args.format, args.repeat, args.seed)
+    print(f"{'benchmark':>18} {'time':>10} {'peak':>10}")
+    for name, r in results.items():
+        peak = f"{r['peak_bytes'] / 2**20:6.1f}MiB" if r["peak_bytes"] is not None else ""
+        print(f"{name:>18} {r['seconds'] * 1000:8.1f}ms {peak:>10}")
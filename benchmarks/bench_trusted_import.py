@@ -0,0 +1,69 @@
+"""
+Compares json_to_Bundle with and without validation.
+
+Each Examples/example1-4.json bundle is imported --copies times, as if
+re-loading a corpus of bundles that PyIIDES exported and validated itself.
+Parsing the JSON text is done up front and not measured.
+
+Usage (from the repository root):
+    python benchmarks/bench_trusted_import.py [--copies 200]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.bundle_util import json_to_Bundle
+
+
+def load_examples():
+    examples = {}
+    for i in range(1, 5):
+        with open(os.path.join(REPO_ROOT, 'Examples', f'example{i}.json')) as f:
+            examples[f'example{i}'] = f.read()
+    return examples
+
+
+def time_import(text, copies, validate):
+    # json_to_Bundle rewrites the ids of the dicts it is given, so every
+    # copy needs its own parsed tree
+    corpus = [json.loads(text) for _ in range(copies)]
+    start = time.perf_counter()
+    for data in corpus:
+        json_to_Bundle(data, validate=validate)
+    return time.perf_counter() - start
+
+
+def run(copies=200):
+    """Returns {example: {"validated": s, "trusted": s}} for `copies` imports."""
+    results = {}
+    for name, text in load_examples().items():
+        results[name] = {
+            "validated": time_import(text, copies, True),
+            "trusted": time_import(text, copies, False),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--copies", type=int, default=200)
+    args = parser.parse_args()
+
+    results = run(args.copies)
+    print(f"{'bundle':>10} {'validated':>12} {'trusted':>12} {'speedup':>8}")
+    for name, r in results.items():
+        print(f"{name:>10} {r['validated'] * 1000:10.1f}ms {r['trusted'] * 1000:10.1f}ms "
+              f"{r['validated'] / r['trusted']:7.1f}x")
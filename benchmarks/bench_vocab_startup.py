@@ -0,0 +1,65 @@
+"""
+Measures the cold start cost of the vocabulary registry.
+
+Every sample runs in a fresh interpreter and times the first vocabulary
+lookup, once using the precompiled vocab_snapshot module and once parsing
+vocab.json directly.
+
+Usage (from the repository root):
+    python benchmarks/bench_vocab_startup.py [--runs 20]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+CHILD = """
+import time
+from pyiides.utils.helper_functions import VocabRegistry
+start = time.perf_counter()
+registry = VocabRegistry(use_snapshot={use_snapshot})
+registry.constants("incident-type-vocab")
+elapsed = time.perf_counter() - start
+assert registry.loaded_from == {expected!r}, registry.loaded_from
+print(elapsed)
+"""
+
+
+def sample(use_snapshot):
+    code = CHILD.format(use_snapshot=use_snapshot,
+                        expected='snapshot' if use_snapshot else 'json')
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT,
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+
+def run(runs=20):
+    """Returns the median first-load time in seconds for each mode."""
+    # warm up the .pyc cache so that compiling the snapshot is not measured
+    sample(True)
+    return {
+        "json": statistics.median(sample(False) for _ in range(runs)),
+        "snapshot": statistics.median(sample(True) for _ in range(runs)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    for mode, seconds in results.items():
+        print(f"{mode:>10}: {seconds * 1000:8.3f} ms")
+    print(f"   speedup: {results['json'] / results['snapshot']:8.1f}x")
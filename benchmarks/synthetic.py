@@ -0,0 +1,348 @@
+"""
+Generates synthetic IIDES json bundles for the benchmarks.
+
+Every bundle holds one incident with a fan-out similar to the Examples
+folder: one to three insiders with their jobs and stressors, the victim
+organization, a handful of TTPs, targets, impacts, sources and notes, a
+detection, and a response that usually goes on to a court case with
+several charges and sentences. All vocabulary fields use codes taken from
+vocab.json, including valid parent/subtype pairs, so the bundles pass every
+check that json_to_Bundle runs. The output only depends on the seed.
+
+Usage (from the repository root):
+    python benchmarks/synthetic.py [--incidents 100] [--seed 0] [--output corpus.json]
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import uuid
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pyiides.utils.helper_functions import VOCAB
+
+FIRST_NAMES = ["Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Riley", "Jamie"]
+LAST_NAMES = ["Smith", "Johnson", "Lee", "Garcia", "Brown", "Miller", "Davis", "Lopez"]
+WORDS = ("the insider copied files from the internal share to a personal device before "
+         "resigning and later used the data at a competitor after the organization "
+         "noticed unusual access during an audit of the system logs").split()
+
+
+class Generator:
+    """Draws the objects of synthetic bundles from a seeded random.Random."""
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+
+    def new_id(self, tag):
+        return f"{tag}--{uuid.UUID(int=self.rng.getrandbits(128), version=4)}"
+
+    def code(self, vocab):
+        return self.rng.choice(VOCAB.ordered_constants(vocab))
+
+    def codes(self, vocab, low=1, high=3):
+        constants = VOCAB.ordered_constants(vocab)
+        return self.rng.sample(constants, min(len(constants), self.rng.randint(low, high)))
+
+    def code_with_child(self, vocab):
+        """Returns a (parent, child) pair of codes where the parent has children."""
+        parents = [c for c in VOCAB.ordered_constants(vocab) if VOCAB.subtypes.children(vocab, c)]
+        parent = self.rng.choice(parents)
+        return parent, self.rng.choice(sorted(VOCAB.subtypes.children(vocab, parent)))
+
+    def text(self, low=5, high=25):
+        return " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(low, high))).capitalize() + "."
+
+    def date(self, start=datetime.date(1995, 1, 1), days=10000):
+        return start + datetime.timedelta(days=self.rng.randrange(days))
+
+    def timestamp(self, day=None):
+        day = day or self.date()
+        return f"{day.isoformat()}T{self.rng.randrange(24):02d}:{self.rng.randrange(60):02d}:00Z"
+
+    def count(self, mean, low=0, high=None):
+        # geometric-like fan-out: mostly around the mean, occasionally larger
+        n = low + round(self.rng.expovariate(1 / max(mean - low, 0.01)))
+        return min(n, high) if high is not None else n
+
+    def incident(self):
+        incident_type, incident_subtype = self.code_with_child("incident-type-vocab")
+        return {
+            "id": self.new_id("incident"),
+            "cia_effect": self.codes("cia-vocab", 1, 3),
+            "incident_type": [incident_type],
+            "incident_subtype": [incident_subtype],
+            "outcome": self.codes("outcome-type-vocab", 1, 2),
+            "status": self.code("incident-status-vocab"),
+            "summary": self.text(30, 80),
+            "brief_summary": self.text(8, 15),
+        }
+
+    def insider(self):
+        return {
+            "id": self.new_id("insider"),
+            "incident_role": self.code("incident-role-vocab"),
+            "first_name": self.rng.choice(FIRST_NAMES),
+            "last_name": self.rng.choice(LAST_NAMES),
+            "city": "Pittsburgh",
+            "state": self.code("state-vocab-us"),
+            "country": "US",
+            "gender": self.code("gender-vocab"),
+            "age": self.rng.randint(20, 65),
+            "education": self.code("education-vocab"),
+            "marital_status": self.code("marital-status-vocab"),
+            "motive": self.codes("motive-vocab", 1, 2),
+            "substance_use_during_incident": self.rng.random() < 0.1,
+            "psychological_issues": self.codes("psych-issues-vocab", 0, 1),
+            "predispositions": [list(self.code_with_child("predisposition-type-vocab"))
+                                for _ in range(self.count(1, high=3))],
+            "concerning_behaviors": [list(self.code_with_child("concerning-behavior-vocab"))
+                                     for _ in range(self.count(1.5, high=4))],
+        }
+
+    def job(self):
+        job_function, occupation = self.code_with_child("job-function-vocab")
+        hire_date = self.date()
+        return {
+            "id": self.new_id("job"),
+            "job_function": job_function,
+            "occupation": occupation,
+            "title": self.text(1, 3)[:-1],
+            "position_technical": self.rng.random() < 0.5,
+            "access_authorization": self.code("access-auth-vocab"),
+            "employment_type": self.code("employment-type-vocab"),
+            "hire_date": hire_date.isoformat(),
+            "departure_date": (hire_date + datetime.timedelta(days=self.rng.randint(30, 4000))).isoformat(),
+        }
+
+    def organization(self):
+        industry_sector, industry_subsector = self.code_with_child("industry-sector-vocab")
+        return {
+            "id": self.new_id("organization"),
+            "name": f"{self.rng.choice(LAST_NAMES)} Corporation",
+            "city": "Pittsburgh",
+            "state": self.code("state-vocab-us"),
+            "country": "US",
+            "small_business": self.rng.random() < 0.3,
+            "industry_sector": industry_sector,
+            "industry_subsector": industry_subsector,
+            "incident_role": self.code("org-role-vocab"),
+        }
+
+    def stressor(self):
+        category, subcategory = self.code_with_child("stressor-category-vocab")
+        return {
+            "id": self.new_id("stressor"),
+            "date": self.date().isoformat(),
+            "category": category,
+            "subcategory": subcategory,
+            "comment": self.text(),
+        }
+
+    def ttp(self, sequence_num):
+        tactic, technique = self.code_with_child("tactic-vocab")
+        return {
+            "id": self.new_id("ttp"),
+            "date": self.timestamp(),
+            "sequence_num": sequence_num,
+            "observed": self.rng.random() < 0.7,
+            "number_of_times": self.rng.randint(1, 20),
+            "tactic": tactic,
+            "technique": technique,
+            "location": self.codes("attack-location-vocab", 1, 2),
+            "hours": self.codes("attack-hours-vocab", 1, 2),
+            "device": self.codes("device-vocab", 1, 2),
+            "channel": self.codes("channel-vocab", 1, 2),
+            "description": self.text(),
+        }
+
+    def target(self):
+        asset_type, category = self.code_with_child("target-asset-vocab")
+        while not VOCAB.subtypes.children("target-category-vocab", category):
+            asset_type, category = self.code_with_child("target-asset-vocab")
+        subcategory = self.rng.choice(sorted(VOCAB.subtypes.children("target-category-vocab", category)))
+        return {
+            "id": self.new_id("target"),
+            "asset_type": asset_type,
+            "category": category,
+            "subcategory": subcategory,
+            "format": self.code("target-format-vocab"),
+            "owner": self.code("target-owner-vocab"),
+            "sensitivity": self.codes("target-sensitivity-vocab", 1, 2),
+            "description": self.text(),
+        }
+
+    def impact(self):
+        high = round(self.rng.uniform(1000, 5000000), 2)
+        return {
+            "id": self.new_id("impact"),
+            "high": high,
+            "low": round(high * self.rng.uniform(0.1, 1.0), 2),
+            "metric": self.code("impact-metric-vocab"),
+            "estimated": self.rng.random() < 0.5,
+            "comment": self.text(),
+        }
+
+    def detection(self):
+        return {
+            "id": self.new_id("detection"),
+            "first_detected": self.timestamp(),
+            "who_detected": self.codes("detection-team-vocab", 1, 2),
+            "detected_method": self.codes("detection-method-vocab", 1, 2),
+            "logs": self.codes("detection-log-vocab", 0, 3),
+            "comment": self.text(),
+        }
+
+    def response(self):
+        return {
+            "id": self.new_id("response"),
+            "technical_controls": [[code, self.date().isoformat()] for code in self.codes("technical-control-vocab", 0, 2)],
+            "behavioral_controls": [[code, self.date().isoformat()] for code in self.codes("behavioral-control-vocab", 0, 2)],
+            "investigated_by": self.codes("investigator-vocab", 1, 2),
+            "investigation_events": [[code, self.date().isoformat()] for code in self.codes("investigation-vocab", 1, 3)],
+            "comment": self.text(),
+        }
+
+    def legal_response(self):
+        day = self.date()
+        dates = {}
+        for field in ("law_enforcement_contacted", "insider_arrested", "insider_charged",
+                      "insider_pleads", "insider_judgment", "insider_sentenced"):
+            day += datetime.timedelta(days=self.rng.randint(1, 200))
+            dates[field] = day.isoformat()
+        return {"id": self.new_id("legal-response"), **dates, "comment": self.text()}
+
+    def court_case(self, defendant):
+        return {
+            "id": self.new_id("court-case"),
+            "case_number": f"{self.rng.randint(1, 9)}:{self.rng.randint(10, 99)}-cr-{self.rng.randint(10000, 99999)}",
+            "case_title": f"USA v. {defendant}",
+            "court_country": "US",
+            "court_state": self.code("state-vocab-us"),
+            "court_district": "Western District",
+            "court_type": self.code("court-type-vocab"),
+            "case_type": self.code("case-type-vocab"),
+            "defendant": [defendant],
+            "plaintiff": ["United States of America"],
+        }
+
+    def charge(self):
+        return {
+            "id": self.new_id("charge"),
+            "title": self.text(2, 6)[:-1],
+            "section": f"18 U.S.C. {self.rng.randint(1000, 2000)}",
+            "nature_of_offense": self.text(2, 5)[:-1],
+            "count": self.rng.randint(1, 5),
+            "plea": self.code("charge-plea-vocab"),
+            "plea_bargain": self.rng.random() < 0.5,
+            "disposition": self.code("charge-disposition-vocab"),
+        }
+
+    def sentence(self):
+        return {
+            "id": self.new_id("sentence"),
+            "sentence_type": self.code("sentence-type-vocab"),
+            "quantity": self.rng.randint(1, 60),
+            "metric": self.code("sentence-metric-vocab"),
+            "concurrency": self.rng.random() < 0.5,
+        }
+
+    def source(self):
+        return {
+            "id": self.new_id("source"),
+            "title": self.text(3, 8)[:-1],
+            "source_type": "Court Document",
+            "file_type": "pdf",
+            "date": self.timestamp(),
+            "public": self.rng.random() < 0.8,
+            "document": "https://www.example.com/document.pdf",
+        }
+
+    def note(self):
+        return {
+            "id": self.new_id("note"),
+            "author": self.rng.choice(FIRST_NAMES),
+            "date": self.timestamp(),
+            "comment": self.text(),
+        }
+
+    def bundle(self):
+        """Returns one IIDES json bundle, as json.load would."""
+        objects = []
+        relationships = []
+
+        def add(obj, parent=None):
+            objects.append(obj)
+            if parent is not None:
+                relationships.append((parent["id"], obj["id"]))
+            return obj
+
+        incident = add(self.incident())
+        organization = add(self.organization(), incident)
+        insiders = [add(self.insider(), incident) for _ in range(self.count(1.3, low=1, high=3))]
+        for insider in insiders:
+            for _ in range(self.count(1.2, low=1, high=3)):
+                job = add(self.job(), insider)
+                relationships.append((organization["id"], job["id"]))
+            for _ in range(self.count(0.5, high=2)):
+                add(self.stressor(), insider)
+
+        for sequence_num in range(self.count(4, low=1, high=15)):
+            add(self.ttp(sequence_num), incident)
+        for _ in range(self.count(1.5, low=1, high=4)):
+            add(self.target(), incident)
+        for _ in range(self.count(1, high=3)):
+            add(self.impact(), incident)
+        add(self.detection(), incident)
+
+        response = add(self.response(), incident)
+        if self.rng.random() < 0.7:
+            legal_response = add(self.legal_response(), response)
+            defendant = f"{insiders[0]['first_name']} {insiders[0]['last_name']}"
+            court_case = add(self.court_case(defendant), legal_response)
+            for _ in range(self.count(3, low=1, high=12)):
+                add(self.charge(), court_case)
+            for _ in range(self.count(1.5, low=1, high=4)):
+                add(self.sentence(), court_case)
+
+        for _ in range(self.count(3, low=1, high=8)):
+            add(self.source(), incident)
+        for _ in range(self.count(0.5, high=3)):
+            add(self.note(), incident)
+
+        for object1, object2 in relationships:
+            objects.append({"id": self.new_id("relationship"), "object1": object1, "object2": object2})
+        return {"id": self.new_id("bundle"), "objects": objects}
+
+
+def generate_corpus(incidents, seed=0):
+    """Returns a list of `incidents` json bundles, one incident each."""
+    generator = Generator(seed)
+    return [generator.bundle() for _ in range(incidents)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="-", help="file to write the bundles to, as a json list")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.incidents, args.seed)
+    if args.output == "-":
+        json.dump(corpus, sys.stdout, indent=4)
+    else:
+        with open(args.output, "w") as f:
+            json.dump(corpus, f, indent=4)
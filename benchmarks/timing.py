@@ -0,0 +1,53 @@
+"""
+Timing helpers shared by the benchmarks.
+
+best_of times an operation and keeps the best of several runs, which is the
+least disturbed by the rest of the machine. measure does the same and adds
+the peak memory of one extra run, measured with tracemalloc so that it does
+not slow down the timed runs.
+
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import time
+import tracemalloc
+
+
+def best_of(repeat, operation, setup=None, number=1):
+    """
+    Returns the best time in seconds of `repeat` runs of operation(). With
+    setup, each run calls operation(setup()) and only the operation is
+    timed. With number, each run calls the operation that many times and
+    the time is per call.
+    """
+    best = None
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        for _ in range(number):
+            operation(*args)
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure(setup, operation, items, repeat):
+    """Returns the best time of `repeat` runs of operation(setup()) and the peak memory of one more."""
+    best = best_of(repeat, operation, setup)
+
+    state = setup()
+    tracemalloc.start()
+    operation(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": best,
+        "items": items,
+        "per_item_us": best / items * 1e6 if items else None,
+        "peak_bytes": peak,
+    }
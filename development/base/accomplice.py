@@ -17,10 +17,12 @@ use and distribution.
 DM24-1597
 """
 import uuid
-from pyiides.utils.helper_functions import check_uuid, check_type, check_vocab
+from pyiides.utils.helper_functions import check_uuid, check_type, check_vocab, instance_dict, RelationshipList, iides_object, export_fields
 from .person import Person
 
 
+@iides_object("accomplice", vocabs={"relationship_to_insider": "insider-relationship-vocab"},
+               parents=("insider", "sponsor"))
 class Accomplice(Person):
     """
     Initialize an Accomplice instance, inheriting from Person.
@@ -76,22 +78,13 @@ class Accomplice(Person):
         """
         returns tuple: (dict of class itself, list containing child id's to connect)
         """
-        class_dict_copy = self.__dict__.copy()
-
         relationships = {'_insider', '_jobs', '_sponsor'}
 
         children_ids = None
         if self.jobs != None:
-            children_ids = ["jobs--" + x.id for x in self.jobs]
+            children_ids = ["job--" + x.id for x in self.jobs]
 
-        class_dict_copy["_id"] = f"accomplice--{self.id}"
-        return ({
-                    key.lstrip('_'): value
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                },
-                children_ids
-                )
+        return (export_fields(self, relationships), children_ids)
 
     @property
     def id(self):
@@ -160,6 +153,9 @@ class Accomplice(Person):
             
             check_type(obj, Job, allow_none=False)
 
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new job list
         # making sure to remove old relationships first if they exist
         if self._jobs != None:
@@ -177,7 +173,7 @@ class Accomplice(Person):
         check_type(item, Job, allow_none=False)
 
         if self._jobs == None:
-            self._jobs = [item]
+            self._jobs = RelationshipList([item])
         else:
             self._jobs.append(item)
 
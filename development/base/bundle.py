@@ -17,7 +17,8 @@ use and distribution.
 DM24-1597
 """
 import uuid
-from pyiides.utils.helper_functions import check_uuid
+from pyiides.utils.helper_functions import (check_uuid, check_iides, trusted_instance, instance_dict, get_json_backend,
+                                           CodeMask, compact_codes, expand_codes)
 
 
 class Bundle:
@@ -28,6 +29,17 @@ class Bundle:
         id (str): A unique identifier for the Bundle instance. If not provided,
             a new UUID is generated.
         objects (list): A list of objects contained within the bundle.
+
+    Objects can be looked up by their full IIDES id with get(), which uses an
+    index from (tag, id) to object. Objects appended to the lists of the
+    bundle are indexed when an id is not found, and the index is rebuilt when
+    the lists changed otherwise, e.g. an object was inserted or a list
+    replaced; call reindex() after removing objects from the bundle,
+    replacing one object with another or changing the id of an object.
+
+    Example:
+        >>> bundle = json_to_Bundle(data)
+        >>> bundle.get("ttp--6e2a3d2b-0c8e-4c5c-8a8f-1f0e1d2c3b4a")
     """
 
     def __init__(self, id=None, objects=None):
@@ -41,6 +53,254 @@ class Bundle:
         check_iides(objects)
         self._objects = objects
 
+        self._index = None
+        self._indexed = None
+
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
+    def reindex(self, index=None):
+        """
+        Rebuilds the (tag, id) -> object index, or installs one that was
+        already built, e.g. by json_to_Bundle.
+        """
+        if index is None:
+            index = {
+                (tag, obj.id): obj
+                for tag, class_list in (self._objects or {}).items()
+                for obj in class_list
+            }
+        self._index = index
+        self._indexed = self._snapshot()
+
+    def _snapshot(self):
+        # the (list, length, last object) of each tag, to tell how the lists
+        # changed since the index was built
+        return {
+            tag: (class_list, len(class_list), class_list[-1] if class_list else None)
+            for tag, class_list in (self._objects or {}).items()
+        }
+
+    def _update_index(self):
+        """
+        Indexes the objects appended to the lists of the bundle since the
+        index was built, or rebuilds it if the lists changed otherwise.
+        Returns False if they did not change, in time proportional to the
+        number of tags.
+        """
+        objects = self._objects or {}
+        indexed = self._indexed
+        appended = []
+        for tag, class_list in objects.items():
+            indexed_list, length, last = indexed.get(tag, (None, 0, None))
+            if indexed_list is class_list and len(class_list) == length and (not length or class_list[-1] is last):
+                continue
+            if indexed_list is None or (indexed_list is class_list and len(class_list) > length
+                                        and (not length or class_list[length - 1] is last)):
+                appended.append((tag, class_list[length:]))
+            else:
+                self.reindex()
+                return True
+        if not indexed.keys() <= objects.keys():
+            # a list was removed
+            self.reindex()
+            return True
+        if not appended:
+            return False
+        index = self._index
+        for tag, new_objects in appended:
+            for obj in new_objects:
+                index[(tag, obj.id)] = obj
+        self._indexed = self._snapshot()
+        return True
+
+    def get(self, full_id):
+        """
+        Returns the object with the given IIDES id ("<tag>--<uuid>"), or None
+        if the bundle does not hold it.
+        """
+        separator_index = full_id.find("--")
+        key = (full_id[:separator_index], full_id[separator_index + 2:])
+
+        if self._index is None:
+            self.reindex()
+        obj = self._index.get(key)
+        if obj is None:
+            # objects may have been added since the index was built
+            if self._update_index():
+                obj = self._index.get(key)
+        elif obj.id != key[1]:
+            # the object's id changed since it was indexed
+            self.reindex()
+            obj = self._index.get(key)
+        return obj
+
+    def clone(self):
+        """
+        Returns a copy of the bundle that shares its field values with this one.
+
+        Every object in the bundle is copied, and the relationships between
+        them point to the copies, but the values the objects hold (strings,
+        dates, tuples, ...) are shared instead of duplicated the way
+        copy.deepcopy would. Lists are copied, without their items, so that
+        appending to or removing from a list of the clone leaves this bundle
+        unchanged; the same goes for CodeMasks. Assigning a new value to a
+        field of a cloned object only replaces it in the clone.
+
+        Objects outside the bundle that are related to objects in it are not
+        copied; the clones refer to the same ones.
+
+        Returns:
+            Bundle: The clone, with the same id as this bundle.
+        """
+        objects = self._objects or {}
+        clones = {
+            id(obj): obj.__class__.__new__(obj.__class__)
+            for class_list in objects.values()
+            for obj in class_list
+        }
+
+        for class_list in objects.values():
+            for obj in class_list:
+                clone = clones[id(obj)]
+                for attr, value in instance_dict(obj).items():
+                    if isinstance(value, list):
+                        # keeps the type, relationships are RelationshipLists
+                        value = value.__class__(clones.get(id(item), item) for item in value)
+                    elif isinstance(value, CodeMask):
+                        value = value.copy()
+                    else:
+                        value = clones.get(id(value), value)
+                    setattr(clone, attr, value)
+
+        return Bundle.from_trusted_dict({
+            "id": self.id,
+            "objects": {
+                tag: [clones[id(obj)] for obj in class_list]
+                for tag, class_list in objects.items()
+            }
+        })
+
+    def compact_codes(self):
+        """
+        Stores the lists of vocabulary codes of every object, e.g.
+        Incident.outcome, as integer bitmasks (see
+        helper_functions.compact_codes) to save memory. The bundle exports
+        to the same json, with the codes in vocabulary order.
+        """
+        for class_list in (self._objects or {}).values():
+            for obj in class_list:
+                if hasattr(obj, "_object_type"):
+                    compact_codes(obj)
+
+    def expand_codes(self):
+        """Turns the bitmasks of compact_codes back into lists."""
+        for class_list in (self._objects or {}).values():
+            for obj in class_list:
+                if hasattr(obj, "_object_type"):
+                    expand_codes(obj)
+
+    def dump(self, fp, indent=None, deterministic_ids=False, json_backend=None, canonical=False):
+        """
+        Writes the bundle as IIDES json to a text file object.
+
+        Objects are serialized and written one at a time, together with a
+        relationship record for each of their children, so the whole document
+        is never held in memory.
+
+        Args:
+            fp: A file object opened for writing text.
+            indent (int or str): Indentation, as for json.dump. None writes
+                the bundle on a single line.
+            deterministic_ids (bool): Derive each relationship id from the
+                ids it connects, as uuid5(object1_id + object2_id), instead of
+                generating a random one. Exports of an unchanged bundle are
+                then identical byte for byte.
+            json_backend (str): The json library to encode with, see
+                get_json_backend. By default the text is as json writes
+                it, whatever is installed.
+            canonical (bool): Write the same text whichever json backend is
+                used: on a single line, with sorted keys and deterministic
+                relationship ids. `indent` is ignored.
+        """
+        backend = get_json_backend(json_backend)
+        if canonical:
+            indent, deterministic_ids = None, True
+            item_separator, key_separator = ",", ":"
+        elif indent is None:
+            item_separator, key_separator = backend.separators
+        else:
+            item_separator, key_separator = ",", ": "
+        if indent is None:
+            newline = ""
+        else:
+            if not isinstance(indent, str):
+                indent = " " * indent
+            newline = "\n"
+        object_newline = newline + indent * 2 if newline else ""
+
+        fp.write("{" + newline + (indent or "") + '"id"' + key_separator
+                 + backend.dumps(f"bundle--{self.id}", canonical=canonical) + item_separator)
+        fp.write(newline + (indent or "") + '"objects"' + key_separator + '[')
+
+        first = True
+        for record in self.records(deterministic_ids):
+            if not first:
+                fp.write(item_separator)
+            first = False
+            text = backend.dumps(record, indent, canonical)
+            if object_newline:
+                text = text.replace("\n", object_newline)
+            fp.write(object_newline + text)
+
+        if not first:
+            fp.write(newline + (indent or ""))
+        fp.write("]" + newline + "}")
+
+    def records(self, deterministic_ids=False):
+        """
+        Yields the items of the bundle's json `objects` array one at a time:
+        the json of each object followed by a relationship record for each
+        of its children. This is what dump writes.
+
+        Args:
+            deterministic_ids (bool): As for dump.
+        """
+        for class_list in (self._objects or {}).values():
+            for class_instance in class_list:
+                json_object, relationships = class_instance.to_dict()
+                yield json_object
+
+                object1_id = json_object.get("id")
+                for object2_id in relationships or ():
+                    if deterministic_ids:
+                        relationship_id = uuid.uuid5(uuid.NAMESPACE_OID, object1_id + object2_id)
+                    else:
+                        relationship_id = uuid.uuid4()
+                    yield {
+                        "id": f"relationship--{relationship_id}",
+                        "object1": object1_id,
+                        "object2": object2_id
+                    }
+
+    def to_msgpack(self):
+        """
+        Returns the bundle as MessagePack bytes, a compact binary form of its
+        json. See bundle_util.Bundle_to_msgpack; needs the msgpack package.
+        """
+        from pyiides.utils.bundle_util import Bundle_to_msgpack
+        return Bundle_to_msgpack(self)
+
+    @classmethod
+    def from_msgpack(cls, data, validate=True):
+        """
+        Reads a bundle written by to_msgpack. See
+        bundle_util.msgpack_to_Bundle; needs the msgpack package.
+        """
+        from pyiides.utils.bundle_util import msgpack_to_Bundle
+        return msgpack_to_Bundle(data, validate)
+
     @property
     def id(self):
         return self._id
@@ -58,7 +318,11 @@ class Bundle:
     def objects(self, value):
         check_iides(value)
         self._objects = value
+        self._index = None
+        self._indexed = None
 
     @objects.deleter
     def objects(self):
         self._objects = None
+        self._index = None
+        self._indexed = None
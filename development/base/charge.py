@@ -19,6 +19,8 @@ DM24-1597
 from pyiides.utils.helper_functions import *
 
 
+@iides_object("charge", vocabs={"plea": "charge-plea-vocab", "disposition": "charge-disposition-vocab"},
+               kinds={"count": "int", "plea_bargain": "bool"}, parents=("court_case",))
 class Charge:
     """
     Initializes a Charge instance
@@ -89,6 +91,10 @@ class Charge:
         # relationships
         self._court_case = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Charge(id={self.id}, "
                 f"title={self.title}, "
@@ -99,15 +105,9 @@ class Charge:
                 f"disposition={self.disposition})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_court_case'}
-        class_dict_copy["_id"] = f"charge--{self.id}"
-        return ({ 
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items() 
-                    if key not in relationships
-                }, None)  
-    
+        return (export_fields(self, relationships), None)
+
     @property
     def id(self):
         return self._id
@@ -19,6 +19,8 @@ DM24-1597
 from pyiides.utils.helper_functions import *
 
 
+@iides_object("collusion", references={"insider1": "insider", "insider2": "insider"},
+               vocabs={"relationship": "insider-relationship-vocab", "recruitment": "recruitment-vocab"})
 class Collusion:
     """
     Initializes a Collusion instance
@@ -30,7 +32,7 @@ class Collusion:
         relationship (required) (string) : The relationship between the two insiders.
             A constant from `insider-relationship-vocab <./vocab/insider-relationship-vocab.html>`_.
         recruitment (required) (string) : The recruitment method or relationship between the insiders.
-            A constant from `insider-recruitment-vocab <./vocab/insider-recruitment-vocab.html>`_.
+            A constant from `recruitment-vocab <./vocab/recruitment-vocab.html>`_.
     
     Raises:
         TypeError: If any provided attribute is of the incorrect type.
@@ -71,9 +73,13 @@ class Collusion:
         self._relationship = relationship
 
         check_type(recruitment, str)
-        check_vocab(recruitment, 'insider-recruitment-vocab')
+        check_vocab(recruitment, 'recruitment-vocab')
         self._recruitment = recruitment 
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Collusion(id={self.id}, "
                 f"insider1={self.insider1!r}, "
@@ -82,11 +88,7 @@ class Collusion:
                 f"recruitment={self.recruitment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-        class_dict_copy["_id"] = f"collusion--{self.id}"
-        return ({ 
-                    key.lstrip('_'): value for key, value in class_dict_copy.items() 
-                }, None)
+        return (export_fields(self), None)
 
     @property
     def id(self):
@@ -146,7 +148,7 @@ class Collusion:
     @recruitment.setter
     def recruitment(self, value):
         check_type(value, str)
-        check_vocab(value, 'insider-recruitment-vocab')
+        check_vocab(value, 'recruitment-vocab')
         self._recruitment = value
 
     @recruitment.deleter
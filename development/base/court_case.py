@@ -18,6 +18,10 @@ DM24-1597
 """
 from pyiides.utils.helper_functions import *
 
+@iides_object("court-case", vocabs={
+    "court_country": "country-vocab", "court_state": "state-vocab-us", "court_type": "court-type-vocab",
+    "case_type": "case-type-vocab"},
+               kinds={"defendant": "list", "plaintiff": "list"}, parents=("legal_response",))
 class CourtCase:
     """
     Initializes a CourtCase instance
@@ -117,6 +121,10 @@ class CourtCase:
         self._sentences = None
         self._charges = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"CourtCase(id={self.id}, "
                 f"case_number={self.case_number}, "
@@ -131,8 +139,6 @@ class CourtCase:
                 f"comment={self.comment}) ")
     
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-
         relationships = {'_legal_response', '_sentences', '_charges'}
 
         children_ids = None 
@@ -146,13 +152,8 @@ class CourtCase:
                 children_ids = sentences
             else:
                 children_ids.extend(sentences)
-        
-        class_dict_copy["_id"] = f"court-case--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, children_ids)
+
+        return (export_fields(self, relationships), children_ids)
 
     @property
     def id(self):
@@ -352,6 +353,9 @@ class CourtCase:
             
             check_type(obj, Sentence, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new sentences list:
         # if it is not None, we need to remove 
         # the old relationships first
@@ -371,7 +375,7 @@ class CourtCase:
         check_type(item, Sentence, allow_none=False)
         
         if self._sentences == None:
-            self._sentences = [item]
+            self._sentences = RelationshipList([item])
         else:
             self._sentences.append(item)
         
@@ -406,6 +410,9 @@ class CourtCase:
             
             check_type(obj, Charge, allow_none=False)
 
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the charges list
         # if it is not None, we need to remove 
         # the old relationships first
@@ -426,7 +433,7 @@ class CourtCase:
         check_type(item, Charge, allow_none=False)
           
         if self._charges == None:
-            self._charges = [item]
+            self._charges = RelationshipList([item])
         else:
             self._charges.append(item)
         
@@ -20,6 +20,10 @@ from pyiides.utils.helper_functions import *
 from datetime import datetime
 
 
+@iides_object("detection", datetimes=("first_detected",),
+               code_lists=("who_detected", "detected_method", "logs"), vocabs={
+    "who_detected": "detection-team-vocab", "detected_method": "detection-method-vocab", "logs": "detection-log-vocab"},
+               parents=("incident",))
 class Detection:
     """
     Initialize a Detection instance.
@@ -81,6 +85,10 @@ class Detection:
         # RELATIONSHIPS
         self._incident = None  # belongs to incident
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Detection(id={self.id}, "
                 f"first_detected={self.first_detected}, "
@@ -90,18 +98,8 @@ class Detection:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-
         relationships = {'_incident'}
-
-        class_dict_copy["_id"] = f"detection--{self.id}"
-        if self.first_detected != None:
-            class_dict_copy["_first_detected"] = str(self.first_detected)
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
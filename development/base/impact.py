@@ -19,6 +19,8 @@ DM24-1597
 from pyiides.utils.helper_functions import *
 
 
+@iides_object("impact", vocabs={"metric": "impact-metric-vocab"},
+               kinds={"high": "float", "estimated": "bool", "low": "float"}, parents=("incident",))
 class Impact:
     """
     Initialize an Impact instance
@@ -76,6 +78,10 @@ class Impact:
 
         self._incident = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Impact(id={self.id}, "
                 f"high={self.high}, "
@@ -85,14 +91,8 @@ class Impact:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_incident'}
-        class_dict_copy["_id"] = f"impact--{self.id}"
-        return ({
-                    key.lstrip('_'): value
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -19,6 +19,10 @@ DM24-1597
 from pyiides.utils.helper_functions import *
 import json
 
+@iides_object("incident", code_lists=("cia_effect", "incident_type", "incident_subtype", "outcome"), vocabs={
+    "cia_effect": "cia-vocab", "incident_type": "incident-type-vocab", "incident_subtype": "incident-subtype-vocab",
+    "outcome": "outcome-type-vocab", "status": "incident-status-vocab"},
+               parents=("detection", "response"))
 class Incident:
     """
     Initialize an Incident instance.
@@ -115,6 +119,10 @@ class Incident:
         self._notes = None
         self._sources = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Incident(id={self.id}, "
                 f"cia_effect={self.cia_effect}, "
@@ -127,14 +135,8 @@ class Incident:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_detection', '_response', '_ttps', '_organizations', '_insiders', '_impacts', '_targets', '_notes', '_sources'}
-        class_dict_copy["_id"] = f"incident--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -329,6 +331,9 @@ class Incident:
         for obj in value:
             check_type(obj, TTP, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the ttps attribute to the new list
         # if it isn't None, we want to remove all old 
         # relationships before setting the new ones
@@ -349,7 +354,7 @@ class Incident:
         check_type(item, TTP, allow_none=False)
          
         if self._ttps == None:
-            self._ttps = [item]
+            self._ttps = RelationshipList([item])
         else:
             self._ttps.append(item)
 
@@ -383,6 +388,9 @@ class Incident:
             
             check_type(obj, Organization, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the organizations list
         # if it is not None, then we want to remove all the old 
         # relationships
@@ -402,7 +410,7 @@ class Incident:
         
         check_type(item, Organization)
         if self._organizations == None:
-            self._organizations = [item]
+            self._organizations = RelationshipList([item])
         else:
             self._organizations.append(item)
 
@@ -437,6 +445,9 @@ class Incident:
             
             check_type(obj, Insider, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new insider list:
         # if a insiders list already exists, we want
         # to remove the relationships before setting  
@@ -457,7 +468,7 @@ class Incident:
         
         check_type(item, Insider, allow_none=False)
         if self._insiders == None:
-            self._insiders = [item]
+            self._insiders = RelationshipList([item])
         else:
             self._insiders.append(item)
         
@@ -492,6 +503,9 @@ class Incident:
             
             check_type(obj, Impact, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new impact list:
         # making sure to remove all old relationships first
         if self._impacts != None:
@@ -509,7 +523,7 @@ class Incident:
         
         check_type(item, Impact, allow_none=False)
         if self._impacts == None:
-            self._impacts = [item]
+            self._impacts = RelationshipList([item])
         else:
             self._impacts.append(item)
         
@@ -543,6 +557,9 @@ class Incident:
             
             check_type(obj, Target, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new targets list:
         # making sure to remove old relationships first
         if self._targets != None:
@@ -560,7 +577,7 @@ class Incident:
         
         check_type(item, Target, allow_none=False)
         if self._targets == None:
-            self._targets = [item]
+            self._targets = RelationshipList([item])
         else:
             self._targets.append(item)
         
@@ -596,6 +613,9 @@ class Incident:
             
             check_type(obj, Note, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new notes list:
         # making sure to remove old relationships first
         if self._notes != None:
@@ -613,7 +633,7 @@ class Incident:
         
         check_type(item, Note, allow_none=False)
         if self._notes == None:
-            self._notes = [item]
+            self._notes = RelationshipList([item])
         else:
             self._notes.append(item)
         
@@ -648,6 +668,9 @@ class Incident:
             
             check_type(obj, Source, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new sources list:
         # making sure to remove old relationships first
         if self._sources != None:
@@ -665,7 +688,7 @@ class Incident:
         
         check_type(item, Source, allow_none=False)
         if self._sources == None:
-            self._sources = [item]
+            self._sources = RelationshipList([item])
         else:
             self._sources.append(item)
         
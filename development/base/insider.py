@@ -19,6 +19,12 @@ DM24-1597
 from .person import Person
 from pyiides.utils.helper_functions import *
 
+@iides_object("insider", tuples=("predispositions", "concerning_behaviors"),
+               code_lists=("motive", "psychological_issues"), vocabs={
+    "incident_role": "incident-role-vocab", "motive": "motive-vocab", "psychological_issues": "psych-issues-vocab",
+    "predispositions": ("predisposition-type-vocab", "predisposition-subtype-vocab"),
+    "concerning_behaviors": ("concerning-behavior-vocab", "cb-subtype-vocab")},
+               kinds={"substance_use_during_incident": "bool"}, parents=("incident", "sponsor"))
 class Insider(Person):
     """
     Initialize an Insider instance.
@@ -105,8 +111,6 @@ class Insider(Person):
                 f"concerning_behaviors={self.concerning_behaviors}) ")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-
         relationships = {'_incident', '_sponsor', '_jobs', '_stressors', '_accomplices'}
 
         children_ids = None 
@@ -128,12 +132,7 @@ class Insider(Person):
             else:
                 children_ids.extend(accomplices)
 
-        class_dict_copy["_id"] = f"insider--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, children_ids)
+        return (export_fields(self, relationships), children_ids)
 
     @property
     def id(self):
@@ -315,6 +314,9 @@ class Insider(Person):
             
             check_type(obj, Job, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new job list 
         # making sure to remove old relationships first
         if self._jobs != None:
@@ -334,7 +336,7 @@ class Insider(Person):
         check_type(item, Job, allow_none=False)
          
         if self._jobs == None:
-            self._jobs = [item]
+            self._jobs = RelationshipList([item])
         else:
             self._jobs.append(item)
         
@@ -368,6 +370,9 @@ class Insider(Person):
             
             check_type(obj, Stressor, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new stressor list 
         # making sure to remove old relationships first
         if self._stressors != None:
@@ -386,7 +391,7 @@ class Insider(Person):
         check_type(item, Stressor, allow_none=False)
           
         if self._stressors == None:
-            self._stressors = [item]
+            self._stressors = RelationshipList([item])
         else:
             self._stressors.append(item)
 
@@ -421,6 +426,9 @@ class Insider(Person):
             
             check_type(obj, Accomplice, allow_none=False)
 
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the accomplices list
         # making sure to remove any old relationships first
         if self._accomplices != None:
@@ -438,7 +446,7 @@ class Insider(Person):
         check_type(item, Accomplice, allow_none=False)
         
         if self._accomplices == None:
-            self._accomplices = [item]
+            self._accomplices = RelationshipList([item])
         else:
             self._accomplices.append(item)
         
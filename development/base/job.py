@@ -20,6 +20,10 @@ from pyiides.utils.helper_functions import *
 from datetime import date as dt
 from datetime import timedelta
 
+@iides_object("job", dates=("hire_date", "departure_date"), durations=("tenure",), derive=derive_tenure, vocabs={
+    "job_function": "job-function-vocab", "occupation": "occupation-vocab", "access_authorization": "access-auth-vocab",
+    "employment_type": "employment-type-vocab"},
+               kinds={"position_technical": "bool"}, parents=("organization", "insider", "accomplice"))
 class Job:
     """
     Initialize a Job instance.
@@ -114,6 +118,10 @@ class Job:
         self._insider = None
         self._accomplice = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Job(id={self.id}, "
                 f"job_function={self.job_function}, "
@@ -128,24 +136,8 @@ class Job:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_organization', '_insider', '_accomplice'}
-        self.__dict__["id"] = f"job--{self.id}"
-
-        if self.hire_date != None:
-            class_dict_copy["_hire_date"] = str(self.hire_date)
-        
-        if self.departure_date != None:
-            class_dict_copy["_departure_date"] = str(self.departure_date)
-
-        if self.tenure != None:
-            class_dict_copy["_tenure"] = str(self.tenure)
-
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
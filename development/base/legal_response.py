@@ -19,6 +19,10 @@ DM24-1597
 from pyiides.utils.helper_functions import *
 from datetime import date as dt
 
+@iides_object("legal-response", dates=(
+    "law_enforcement_contacted", "insider_arrested", "insider_charged", "insider_pleads", "insider_judgment",
+    "insider_sentenced", "insider_charges_dropped", "insider_charges_dismissed", "insider_settled"),
+               parents=("response",))
 class LegalResponse:
     """
     Initializes a LegalResponse instance
@@ -100,6 +104,10 @@ class LegalResponse:
         self._response = None
         self._court_cases = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"LegalResponse(id={self.id}, "
                 f"law_enforcement_contacted={self.law_enforcement_contacted}, "
@@ -114,42 +122,8 @@ class LegalResponse:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_response', '_court_cases'}
-
-        if self.law_enforcement_contacted != None:
-            class_dict_copy["_law_enforcement_contacted"] = str(self.law_enforcement_contacted)
-
-        if self.insider_arrested != None:
-            class_dict_copy["_insider_arrested"] = str(self.insider_arrested)
-
-        if self.insider_charged != None:
-            class_dict_copy["_insider_charged"] = str(self.insider_charged)
-
-        if self.insider_pleads != None:
-            class_dict_copy["_insider_pleads"] = str(self.insider_pleads)
-
-        if self.insider_judgment != None:
-            class_dict_copy["_insider_judgment"] = str(self.insider_judgment)
-
-        if self.insider_sentenced != None:
-            class_dict_copy["_insider_sentenced"] = str(self.insider_sentenced)
-
-        if self.insider_charges_dropped != None:
-            class_dict_copy["_insider_charges_dropped"] = str(self.insider_charges_dropped)
-
-        if self.insider_charges_dismissed != None:
-            class_dict_copy["_insider_charges_dismissed"] = str(self.insider_charges_dismissed)
-
-        if self.insider_settled != None:
-            class_dict_copy["_insider_settled"] = str(self.insider_settled)
-
-        class_dict_copy["_id"] = f"legal-response--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -323,6 +297,9 @@ class LegalResponse:
             
             check_type(obj, CourtCase, allow_none=False)
 
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set new court case list
         # making sure to remove older relationships before
         # setting the new ones 
@@ -342,7 +319,7 @@ class LegalResponse:
         check_type(item, CourtCase, allow_none=False)
 
         if self._court_cases == None:
-            self._court_cases = [item]
+            self._court_cases = RelationshipList([item])
         else:
             self._court_cases.append(item)
 
@@ -20,6 +20,8 @@ from pyiides.utils.helper_functions import *
 from datetime import date as dt
 
 
+@iides_object("note", datetimes=("date",),
+               kinds={"date": "date"}, parents=("incident",))
 class Note:
     """
     Initialize a Note instance
@@ -71,6 +73,10 @@ class Note:
         # Relationships
         self._incident = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Note(id={self.id}, "
                 f"author={self.author}, "
@@ -78,18 +84,8 @@ class Note:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_incident'}
-
-        if self.date != None:
-            class_dict_copy["_date"] = str(self.date)
-
-        class_dict_copy["_id"] = f"note--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
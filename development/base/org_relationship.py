@@ -18,6 +18,8 @@ DM24-1597
 """
 from pyiides.utils.helper_functions import *
 
+@iides_object("org-relationship", references={"org1": "organization", "org2": "organization"},
+               vocabs={"relationship": "org-relationship-vocab"})
 class OrgRelationship:
     """
     Initializes an OrgRelationship instance
@@ -67,6 +69,10 @@ class OrgRelationship:
         check_vocab(relationship, 'org-relationship-vocab')
         self._relationship = relationship
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"OrgRelationship(id={self.id}, "
                 f"org1={self.org1}, "
@@ -74,11 +80,7 @@ class OrgRelationship:
                 f"relationship={self.relationship})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-        class_dict_copy["_id"] = f"org-relationship--{self.id}"
-        return ({
-                    key.lstrip('_'): value for key, value in class_dict_copy.items()
-                }, None)
+        return (export_fields(self), None)
 
     @property
     def id(self):
@@ -91,7 +93,7 @@ class OrgRelationship:
     
     @property
     def org1(self):
-        return self.org1
+        return self._org1
 
     @org1.setter
     def org1(self, value):
@@ -105,7 +107,7 @@ class OrgRelationship:
     
     @property
     def org2(self):
-        return self.org2
+        return self._org2
 
     @org2.setter
     def org2(self, value):
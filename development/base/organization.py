@@ -18,6 +18,10 @@ DM24-1597
 """
 from pyiides.utils.helper_functions import *
 
+@iides_object("organization", vocabs={
+    "state": "state-vocab-us", "country": "country-vocab", "industry_sector": "industry-sector-vocab",
+    "industry_subsector": "industry-subsector-vocab", "incident_role": "org-role-vocab"},
+               kinds={"postal_code": "int", "small_business": "bool"}, parents=("incident",))
 class Organization:
     """
     Initialize an Organization instance.
@@ -122,6 +126,10 @@ class Organization:
         self._jobs = None
         self._stressors = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Organization(id={self.id}, "
                 f"name={self.name}, "
@@ -137,8 +145,6 @@ class Organization:
                 f"incident_role={self.incident_role})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-
         relationships = {'_incident', '_jobs', '_stressors'}
 
         children_ids = None 
@@ -152,13 +158,8 @@ class Organization:
                 children_ids = stressors 
             else:
                 children_ids.extend(stressors)
-        
-        class_dict_copy["_id"] = f"organization--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, children_ids)
+
+        return (export_fields(self, relationships), children_ids)
 
     @property
     def id(self):
@@ -360,6 +361,9 @@ class Organization:
             
             check_type(obj, Job, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set new job list
         # making sure to remove any old relationships first
         if self._jobs != None:
@@ -379,7 +383,7 @@ class Organization:
         check_type(item, Job)
         
         if self._jobs == None:
-            self._jobs = [item]
+            self._jobs = RelationshipList([item])
         else:
             self._jobs.append(item)
         
@@ -413,6 +417,9 @@ class Organization:
             
             check_type(obj, Stressor, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new stressor value 
         # making sure to delete any old relationships first
         if self._stressors != None:
@@ -431,7 +438,7 @@ class Organization:
         check_type(item, Stressor)
         
         if self._stressors == None:
-            self._stressors = [item]
+            self._stressors = RelationshipList([item])
         else:
             self._stressors.append(item)
         
@@ -16,9 +16,14 @@ and unlimited distribution.  Please see Copyright notice for non-US Government
 use and distribution.
 DM24-1597
 """
-from pyiides.utils.helper_functions import check_type, check_vocab
+from pyiides.utils.helper_functions import check_type, check_vocab, trusted_instance, instance_dict, iides_object, export_fields
 
 
+@iides_object("person", vocabs={
+    "suffix": "suffix-vocab", "state": "state-vocab-us", "country": "country-vocab", "residency": "residency-vocab",
+    "gender": "gender-vocab", "education": "education-vocab", "marital_status": "marital-status-vocab"},
+               kinds={"alias": "list", "postal_code": "int", "country_of_citizenship": "list", "nationality": "list",
+                      "age": "int", "number_of_children": "int"})
 class Person:
     """
     Initialize a Person instance.
@@ -137,6 +142,10 @@ class Person:
         check_type(comment, str)
         self._comment = comment
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Person("
                 f"first_name={self.first_name}, "
@@ -159,10 +168,7 @@ class Person:
                 f"comment={self.comment})")
     
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-        return ({
-                    key.lstrip('_'): value for key, value in class_dict_copy.items()
-                }, None)
+        return (export_fields(self), None)
 
     @property
     def first_name(self):
@@ -18,6 +18,11 @@ DM24-1597
 """
 from pyiides.utils.helper_functions import *
 
+@iides_object("response", dated_pairs=("technical_controls", "behavioral_controls", "investigation_events"),
+               code_lists=("investigated_by",), vocabs={
+    "technical_controls": "technical-control-vocab", "behavioral_controls": "behavioral-control-vocab",
+    "investigated_by": "investigator-vocab", "investigation_events": "investigation-vocab"},
+               parents=("incident", "legal_response"))
 class Response:
     """
     Initialize a Response instance.
@@ -84,6 +89,10 @@ class Response:
         self._incident = None    # belongs to incident
         self._legal_response = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Response(id={self.id}, "
                 f"technical_controls={self.technical_controls}, "
@@ -93,27 +102,8 @@ class Response:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_incident', '_legal_response'}
-
-        if self.technical_controls != None:
-            for (_, date) in class_dict_copy["_technical_controls"]:
-                date = str(date)
-                
-        if self.behavioral_controls != None:
-            for (_, date) in class_dict_copy["_behavioral_controls"]:
-                date = str(date)
-        
-        if self.investigation_events != None:
-            for (_, date) in class_dict_copy["_investigation_events"]:
-                date = str(date)
-
-        class_dict_copy["_id"] = f"response--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
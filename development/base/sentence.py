@@ -18,6 +18,8 @@ DM24-1597
 """
 from pyiides.utils.helper_functions import *
 
+@iides_object("sentence", vocabs={"sentence_type": "sentence-type-vocab", "metric": "sentence-metric-vocab"},
+               kinds={"quantity": "int", "concurrency": "bool"}, parents=("court_case",))
 class Sentence:
     """
     Initializes a Sentence instance
@@ -77,6 +79,10 @@ class Sentence:
         # relationships
         self._court_case = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Sentence(id={self.id}, "
                 f"sentence_type={self.sentence_type}, "
@@ -85,14 +91,8 @@ class Sentence:
                 f"concurrency={self.concurrency})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_court_case'}
-        class_dict_copy["_id"] = f"sentence--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
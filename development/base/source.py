@@ -20,6 +20,8 @@ from pyiides.utils.helper_functions import *
 from datetime import datetime
 
 
+@iides_object("source", datetimes=("date",),
+               kinds={"public": "bool"}, parents=("incident",))
 class Source:
     """
     Initializes a Source instance
@@ -85,6 +87,10 @@ class Source:
         # relationships
         self._incident = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Source(id={self.id}, "
                 f"title={self.title}, "
@@ -96,18 +102,8 @@ class Source:
                 f"comment={self.comment}")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_incident'}
-
-        if self.date != None:
-            class_dict_copy["_date"] = str(self.date)
-
-        class_dict_copy["_id"] = f"source--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -18,6 +18,7 @@ DM24-1597
 """
 from pyiides.utils.helper_functions import *
 
+@iides_object("sponsor", vocabs={"sponsor_type": "sponsor-type-vocab"})
 class Sponsor:
     """
     Initializes a Sponsor instance
@@ -62,14 +63,16 @@ class Sponsor:
         self._accomplices = None
         self._insiders = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Sponsor(id={self.id}, "
                 f"name={self.name}, "
                 f"sponsor_type={self.sponsor_type})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-
         relationships = {'_accomplices', '_insiders'}
 
         children_ids = None
@@ -84,12 +87,8 @@ class Sponsor:
             else:
                 children_ids.extend(insiders)
 
-        class_dict_copy["_id"] = f"sponsor--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, children_ids)
+        return (export_fields(self, relationships), children_ids)
+
     @property
     def id(self):
         return self._id  
@@ -141,6 +140,9 @@ class Sponsor:
             
             check_type(obj, Accomplice, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set to new accomplice list
         # making sure to remove old relationships first
         if self._accomplices != None:
@@ -158,7 +160,7 @@ class Sponsor:
         
         check_type(item, Accomplice, allow_none=False)
         if self._accomplices == None:
-            self._accomplices = [item]
+            self._accomplices = RelationshipList([item])
         else:
             self._accomplices.append(item)
 
@@ -193,6 +195,9 @@ class Sponsor:
             
             check_type(obj, Insider, allow_none=False)
 
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set new insider list
         # making sure to remove the old relationships first
         if self._insiders != None:
@@ -210,7 +215,7 @@ class Sponsor:
         
         check_type(item, Insider, allow_none=False)
         if self._insiders == None:
-            self._insiders = [item]
+            self._insiders = RelationshipList([item])
         else:
             self._insiders.append(item)
         
@@ -20,6 +20,9 @@ from pyiides.utils.helper_functions import *
 from datetime import date as dt
 
 
+@iides_object("stressor", dates=("date",), vocabs={
+    "category": "stressor-category-vocab", "subcategory": "stressor-subcategory-vocab"},
+               parents=("organization", "insider"))
 class Stressor:
     """
     Initialize a Stressor instance
@@ -79,6 +82,10 @@ class Stressor:
         self._organization = None
         self._insider = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Stressor(id={self.id}, "
                 f"date={self.date}, "
@@ -87,18 +94,8 @@ class Stressor:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_organization', '_insider'}
-
-        if self.date != None:
-            class_dict_copy["date"] = str(self.date)
-
-        class_dict_copy["_id"] = f"stressor--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
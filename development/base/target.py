@@ -18,6 +18,10 @@ DM24-1597
 """
 from pyiides.utils.helper_functions import *
 
+@iides_object("target", code_lists=("sensitivity",), vocabs={
+    "asset_type": "target-asset-vocab", "category": "target-category-vocab", "subcategory": "target-subcategory-vocab",
+    "format": "target-format-vocab", "owner": "target-owner-vocab", "sensitivity": "target-sensitivity-vocab"},
+               parents=("incident",))
 class Target:
     """
     Initializes a Target instance 
@@ -103,6 +107,10 @@ class Target:
         # relationships
         self._incident = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Target(id={self.id}, "
                 f"assert_type={self.asset_type}, "
@@ -114,14 +122,8 @@ class Target:
                 f"description={self.description})")
     
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_incident'}
-        class_dict_copy["_id"] = f"target--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -17,9 +17,13 @@ use and distribution.
 DM24-1597
 """
 from datetime import datetime
-from pyiides.utils.helper_functions import check_uuid, check_type, check_vocab
+from pyiides.utils.helper_functions import check_uuid, check_type, check_vocab, trusted_instance, instance_dict, iides_object, export_fields
 
 
+@iides_object("ttp", datetimes=("date",), code_lists=("location", "hours", "device", "channel"), vocabs={
+    "tactic": "tactic-vocab", "technique": "technique-vocab", "location": "attack-location-vocab",
+    "hours": "attack-hours-vocab", "device": "device-vocab", "channel": "channel-vocab"},
+               kinds={"sequence_num": "int", "observed": "bool", "number_of_times": "int"}, parents=("incident",))
 class TTP:
     """
     Initialize a TTP instance.
@@ -120,6 +124,10 @@ class TTP:
         # RELATIONSHIPS 
         self._incident = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"TTP(id={self.id}, "
                 f"date={self.date}, "
@@ -136,18 +144,8 @@ class TTP:
                 f"description={self.description})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_incident'}
-
-        if self.date != None:
-            class_dict_copy["date"] = str(self.date)
-
-        class_dict_copy["_id"] = f"ttp--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -23,9 +23,9 @@ and unlimited distribution.  Please see Copyright notice for non-US Government
 use and distribution.
 DM24-1597
 """
+import argparse
+import hashlib
 import json
-import requests
-import certifi
 
 
 SCHEMA_URL = 'https://raw.githubusercontent.com/cmu-sei/iides/refs/heads/main/json/'
@@ -60,9 +60,55 @@ SCHEMA_FILES = [
 ]
 
 
+SNAPSHOT_HEADER = '''"""
+Precompiled snapshot of the constants in vocab.json.
+
+Generated by development/gen_vocab.py, do not edit by hand. VOCAB_SHA256 is
+the hash of the vocab.json this snapshot was built from; the vocabulary
+registry ignores the snapshot whenever the hash does not match.
+"""
+'''
+
+
+def write_snapshot(vocab_json, snapshot_py):
+    """
+    Writes a python module holding the constants of every vocabulary in
+    vocab_json, in file order, along with the sha256 of vocab_json.
+    """
+    with open(vocab_json, "rb") as f:
+        raw = f.read()
+    vocabulary = json.loads(raw)
+
+    lines = [SNAPSHOT_HEADER]
+    lines.append(f"VOCAB_SHA256 = {hashlib.sha256(raw).hexdigest()!r}\n")
+    lines.append("CONSTANTS = {")
+    for vocab_name, vocab_list in vocabulary.items():
+        consts = tuple(item["const"] for item in vocab_list)
+        lines.append(f"    {vocab_name!r}: {consts!r},")
+    lines.append("}\n")
+
+    with open(snapshot_py, "w") as f:
+        f.write("\n".join(lines))
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile the IIDES vocabulary into vocab.json.")
+    parser.add_argument("--snapshot-only", action="store_true",
+                        help="only rebuild vocab_snapshot.py from the local vocab.json")
+    args = parser.parse_args()
+
     # Define the directory containing JSON files (replace with your path)
     vocab_json = "pyiides/utils/vocab.json"
+    vocab_snapshot = "pyiides/utils/vocab_snapshot.py"
+
+    if args.snapshot_only:
+        write_snapshot(vocab_json, vocab_snapshot)
+        print("Successfuly made vocab snapshot.")
+        raise SystemExit(0)
+
+    # Only needed when pulling the schema from GitHub
+    import requests
+    import certifi
 
     # Create an empty dictionary to store vocabulary data
     vocabulary = {}
@@ -87,4 +133,5 @@ if __name__ == "__main__":
     f = open(f"{vocab_json}", "w")
     f.write(json.dumps(vocabulary, indent=4))
     f.close()
+    write_snapshot(vocab_json, vocab_snapshot)
     print("Successfuly made vocab.")
@@ -17,7 +17,10 @@ use and distribution.
 DM24-1597
 '''
 
+import argparse
+import ast
 import os
+import textwrap
 
 LICENSE = (
 """
@@ -40,21 +43,79 @@ DM24-1597
 """
 )
 IMPORTS = [
+    "import json",
     "import uuid",
     "from datetime import datetime, timedelta",
     "from datetime import date as dt",
-    "from pyiides.utils.helper_functions import (\n    check_tenure, check_subtype, check_subtype_list, check_uuid, check_type, check_vocab, check_iides, check_tuple_list)",
+    "from pyiides.utils.helper_functions import (\n    check_tenure, check_subtype, check_subtype_list, check_uuid, check_type, check_vocab, check_iides, check_tuple_list,\n    trusted_instance, instance_dict, RelationshipList, iides_object, export_fields, derive_tenure,\n    get_json_backend, CodeMask, compact_codes, expand_codes)",
 ]
 
 
 def skip_license(lines):
-    '''Returns the index of the first line with code'''
+    '''Returns the index of the first line with code, the class or its decorators'''
     for index, line in enumerate(lines):
-        if line.startswith("class "):
+        if line.startswith(("class ", "@")):
             return index
 
 
-def merge_python_files(src_dir, output_dir, output_file, priority_file):
+def init_attributes(class_node):
+    '''Returns the self._<name> attributes assigned in __init__, in source order'''
+    def walk(node):
+        for child in ast.iter_child_nodes(node):
+            yield child
+            yield from walk(child)
+
+    attributes = []
+    for item in class_node.body:
+        if isinstance(item, ast.FunctionDef) and item.name == "__init__":
+            for node in walk(item):
+                targets = node.targets if isinstance(node, ast.Assign) else [getattr(node, "target", None)]
+                for target in targets:
+                    if (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                            and target.value.id == "self" and target.attr.startswith("_")
+                            and target.attr not in attributes):
+                        attributes.append(target.attr)
+    return attributes
+
+
+def collect_slots(src_dir, filenames):
+    '''
+    Returns {filename: (class node, slot names)} for every class file.
+
+    The slots of a class are the attributes its __init__ assigns that no base
+    class in src_dir already has a slot for. Root classes also get a __dict__
+    slot, so that extra attributes can still be set on instances (it is only
+    allocated when one is), and a __weakref__ slot, so that instances can be
+    weakly referenced, e.g. held in a WeakSet.
+    '''
+    classes = {}
+    for filename in filenames:
+        with open(os.path.join(src_dir, filename), 'r') as infile:
+            tree = ast.parse(infile.read())
+        class_node = next(node for node in tree.body if isinstance(node, ast.ClassDef))
+        classes[class_node.name] = (filename, class_node)
+
+    slots = {}
+    for name, (filename, class_node) in classes.items():
+        inherited = set()
+        bases = [base.id for base in class_node.bases if isinstance(base, ast.Name) and base.id in classes]
+        for base in bases:
+            inherited.update(init_attributes(classes[base][1]))
+        names = [attr for attr in init_attributes(class_node) if attr not in inherited]
+        if not bases:
+            names.extend(["__dict__", "__weakref__"])
+        slots[filename] = (class_node, names)
+    return slots
+
+
+def slots_lines(names):
+    '''Returns the source lines of a __slots__ declaration'''
+    body = textwrap.wrap(", ".join(repr(name) for name in names) + ",", width=72,
+                         initial_indent=" " * 8, subsequent_indent=" " * 8, break_on_hyphens=False)
+    return ["    __slots__ = (\n"] + [line + "\n" for line in body] + ["    )\n"]
+
+
+def merge_python_files(src_dir, output_dir, output_file, priority_file, slots=True):
     if not os.path.isdir(src_dir):
         raise ValueError(f"Source directory {src_dir} does not exist.")
 
@@ -65,10 +126,25 @@ def merge_python_files(src_dir, output_dir, output_file, priority_file):
     other_code = []
     priority_code = []
 
+    filenames = [
+        filename for filename in os.listdir(src_dir)
+        if filename.endswith('.py') and filename != '__init__.py'
+    ]
+    class_slots = collect_slots(src_dir, filenames) if slots else {}
+
     # Function to process a file and collect imports and other code
     def process_file(file_path, code_list):
         with open(file_path, 'r') as infile:
             lines = infile.readlines()
+            if os.path.basename(file_path) in class_slots:
+                # declare the slots right after the class docstring
+                class_node, names = class_slots[os.path.basename(file_path)]
+                docstring = class_node.body[0]
+                insert_at = docstring.end_lineno if isinstance(docstring, ast.Expr) else class_node.lineno
+                declaration = ["\n"] + slots_lines(names)
+                if lines[insert_at].strip():
+                    declaration.append("\n")
+                lines[insert_at:insert_at] = declaration
             for line in lines[skip_license(lines):]:
                 code_list.append(line)
             code_list.append("\n\n")
@@ -82,8 +158,8 @@ def merge_python_files(src_dir, output_dir, output_file, priority_file):
             f"Priority file {priority_file} does not exist in {src_dir}.")
 
     # Process all other files
-    for filename in os.listdir(src_dir):
-        if filename.endswith('.py') and filename != '__init__.py' and filename != priority_file:
+    for filename in filenames:
+        if filename != priority_file:
             file_path = os.path.join(src_dir, filename)
             process_file(file_path, other_code)
 
@@ -106,6 +182,10 @@ def merge_python_files(src_dir, output_dir, output_file, priority_file):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merges the classes in development/base into pyiides/pyiides.py")
+    parser.add_argument("--no-slots", action="store_true",
+                        help="do not declare __slots__, so instances keep all attributes in their __dict__")
+    args = parser.parse_args()
 
     pyiides_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 
@@ -115,6 +195,6 @@ if __name__ == "__main__":
     priority_filename = 'person.py'  # Priority file containing the Person class
 
     merge_python_files(
-        src_directory, output_directory, output_filename, priority_filename)
+        src_directory, output_directory, output_filename, priority_filename, slots=not args.no_slots)
     print(
         f"Merged all Python files from {src_directory} into {os.path.join(output_directory, output_filename)}, with {priority_filename} content first.")
@@ -16,14 +16,22 @@ and unlimited distribution.  Please see Copyright notice for non-US Government
 use and distribution.
 DM24-1597
 """
+import json
 import uuid
 from datetime import datetime, timedelta
 from datetime import date as dt
 from pyiides.utils.helper_functions import (
-    check_tenure, check_subtype, check_subtype_list, check_uuid, check_type, check_vocab, check_iides, check_tuple_list)
+    check_tenure, check_subtype, check_subtype_list, check_uuid, check_type, check_vocab, check_iides, check_tuple_list,
+    trusted_instance, instance_dict, RelationshipList, iides_object, export_fields, derive_tenure,
+    get_json_backend, CodeMask, compact_codes, expand_codes)
 
 
 # --- Priority Content ---
+@iides_object("person", vocabs={
+    "suffix": "suffix-vocab", "state": "state-vocab-us", "country": "country-vocab", "residency": "residency-vocab",
+    "gender": "gender-vocab", "education": "education-vocab", "marital_status": "marital-status-vocab"},
+               kinds={"alias": "list", "postal_code": "int", "country_of_citizenship": "list", "nationality": "list",
+                      "age": "int", "number_of_children": "int"})
 class Person:
     """
     Initialize a Person instance.
@@ -71,6 +79,15 @@ class Person:
         >>> print(person.city)
         New York
     """
+
+    __slots__ = (
+        '_first_name', '_middle_name', '_last_name', '_suffix',
+        '_alias', '_city', '_state', '_country', '_postal_code',
+        '_country_of_citizenship', '_nationality', '_residency',
+        '_gender', '_age', '_education', '_marital_status',
+        '_number_of_children', '_comment', '__dict__', '__weakref__',
+    )
+
     def __init__(self, first_name=None, middle_name=None, last_name=None, suffix=None, alias=None, city=None, state=None, country=None, postal_code=None, country_of_citizenship=None, nationality=None, residency=None, gender=None, age=None, education=None, marital_status=None, number_of_children=None, comment=None, **kwargs):
         check_type(first_name, str)
         self._first_name = first_name
@@ -142,6 +159,10 @@ class Person:
         check_type(comment, str)
         self._comment = comment
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Person("
                 f"first_name={self.first_name}, "
@@ -164,10 +185,7 @@ class Person:
                 f"comment={self.comment})")
     
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-        return ({
-                    key.lstrip('_'): value for key, value in class_dict_copy.items()
-                }, None)
+        return (export_fields(self), None)
 
     @property
     def first_name(self):
@@ -439,8 +457,24 @@ class Bundle:
         id (str): A unique identifier for the Bundle instance. If not provided,
             a new UUID is generated.
         objects (list): A list of objects contained within the bundle.
+
+    Objects can be looked up by their full IIDES id with get(), which uses an
+    index from (tag, id) to object. Objects appended to the lists of the
+    bundle are indexed when an id is not found, and the index is rebuilt when
+    the lists changed otherwise, e.g. an object was inserted or a list
+    replaced; call reindex() after removing objects from the bundle,
+    replacing one object with another or changing the id of an object.
+
+    Example:
+        >>> bundle = json_to_Bundle(data)
+        >>> bundle.get("ttp--6e2a3d2b-0c8e-4c5c-8a8f-1f0e1d2c3b4a")
     """
 
+    __slots__ = (
+        '_id', '_objects', '_index', '_indexed', '__dict__',
+        '__weakref__',
+    )
+
     def __init__(self, id=None, objects=None):
         if id is None:
             id = str(uuid.uuid4())
@@ -452,6 +486,254 @@ class Bundle:
         check_iides(objects)
         self._objects = objects
 
+        self._index = None
+        self._indexed = None
+
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
+    def reindex(self, index=None):
+        """
+        Rebuilds the (tag, id) -> object index, or installs one that was
+        already built, e.g. by json_to_Bundle.
+        """
+        if index is None:
+            index = {
+                (tag, obj.id): obj
+                for tag, class_list in (self._objects or {}).items()
+                for obj in class_list
+            }
+        self._index = index
+        self._indexed = self._snapshot()
+
+    def _snapshot(self):
+        # the (list, length, last object) of each tag, to tell how the lists
+        # changed since the index was built
+        return {
+            tag: (class_list, len(class_list), class_list[-1] if class_list else None)
+            for tag, class_list in (self._objects or {}).items()
+        }
+
+    def _update_index(self):
+        """
+        Indexes the objects appended to the lists of the bundle since the
+        index was built, or rebuilds it if the lists changed otherwise.
+        Returns False if they did not change, in time proportional to the
+        number of tags.
+        """
+        objects = self._objects or {}
+        indexed = self._indexed
+        appended = []
+        for tag, class_list in objects.items():
+            indexed_list, length, last = indexed.get(tag, (None, 0, None))
+            if indexed_list is class_list and len(class_list) == length and (not length or class_list[-1] is last):
+                continue
+            if indexed_list is None or (indexed_list is class_list and len(class_list) > length
+                                        and (not length or class_list[length - 1] is last)):
+                appended.append((tag, class_list[length:]))
+            else:
+                self.reindex()
+                return True
+        if not indexed.keys() <= objects.keys():
+            # a list was removed
+            self.reindex()
+            return True
+        if not appended:
+            return False
+        index = self._index
+        for tag, new_objects in appended:
+            for obj in new_objects:
+                index[(tag, obj.id)] = obj
+        self._indexed = self._snapshot()
+        return True
+
+    def get(self, full_id):
+        """
+        Returns the object with the given IIDES id ("<tag>--<uuid>"), or None
+        if the bundle does not hold it.
+        """
+        separator_index = full_id.find("--")
+        key = (full_id[:separator_index], full_id[separator_index + 2:])
+
+        if self._index is None:
+            self.reindex()
+        obj = self._index.get(key)
+        if obj is None:
+            # objects may have been added since the index was built
+            if self._update_index():
+                obj = self._index.get(key)
+        elif obj.id != key[1]:
+            # the object's id changed since it was indexed
+            self.reindex()
+            obj = self._index.get(key)
+        return obj
+
+    def clone(self):
+        """
+        Returns a copy of the bundle that shares its field values with this one.
+
+        Every object in the bundle is copied, and the relationships between
+        them point to the copies, but the values the objects hold (strings,
+        dates, tuples, ...) are shared instead of duplicated the way
+        copy.deepcopy would. Lists are copied, without their items, so that
+        appending to or removing from a list of the clone leaves this bundle
+        unchanged; the same goes for CodeMasks. Assigning a new value to a
+        field of a cloned object only replaces it in the clone.
+
+        Objects outside the bundle that are related to objects in it are not
+        copied; the clones refer to the same ones.
+
+        Returns:
+            Bundle: The clone, with the same id as this bundle.
+        """
+        objects = self._objects or {}
+        clones = {
+            id(obj): obj.__class__.__new__(obj.__class__)
+            for class_list in objects.values()
+            for obj in class_list
+        }
+
+        for class_list in objects.values():
+            for obj in class_list:
+                clone = clones[id(obj)]
+                for attr, value in instance_dict(obj).items():
+                    if isinstance(value, list):
+                        # keeps the type, relationships are RelationshipLists
+                        value = value.__class__(clones.get(id(item), item) for item in value)
+                    elif isinstance(value, CodeMask):
+                        value = value.copy()
+                    else:
+                        value = clones.get(id(value), value)
+                    setattr(clone, attr, value)
+
+        return Bundle.from_trusted_dict({
+            "id": self.id,
+            "objects": {
+                tag: [clones[id(obj)] for obj in class_list]
+                for tag, class_list in objects.items()
+            }
+        })
+
+    def compact_codes(self):
+        """
+        Stores the lists of vocabulary codes of every object, e.g.
+        Incident.outcome, as integer bitmasks (see
+        helper_functions.compact_codes) to save memory. The bundle exports
+        to the same json, with the codes in vocabulary order.
+        """
+        for class_list in (self._objects or {}).values():
+            for obj in class_list:
+                if hasattr(obj, "_object_type"):
+                    compact_codes(obj)
+
+    def expand_codes(self):
+        """Turns the bitmasks of compact_codes back into lists."""
+        for class_list in (self._objects or {}).values():
+            for obj in class_list:
+                if hasattr(obj, "_object_type"):
+                    expand_codes(obj)
+
+    def dump(self, fp, indent=None, deterministic_ids=False, json_backend=None, canonical=False):
+        """
+        Writes the bundle as IIDES json to a text file object.
+
+        Objects are serialized and written one at a time, together with a
+        relationship record for each of their children, so the whole document
+        is never held in memory.
+
+        Args:
+            fp: A file object opened for writing text.
+            indent (int or str): Indentation, as for json.dump. None writes
+                the bundle on a single line.
+            deterministic_ids (bool): Derive each relationship id from the
+                ids it connects, as uuid5(object1_id + object2_id), instead of
+                generating a random one. Exports of an unchanged bundle are
+                then identical byte for byte.
+            json_backend (str): The json library to encode with, see
+                get_json_backend. By default the text is as json writes
+                it, whatever is installed.
+            canonical (bool): Write the same text whichever json backend is
+                used: on a single line, with sorted keys and deterministic
+                relationship ids. `indent` is ignored.
+        """
+        backend = get_json_backend(json_backend)
+        if canonical:
+            indent, deterministic_ids = None, True
+            item_separator, key_separator = ",", ":"
+        elif indent is None:
+            item_separator, key_separator = backend.separators
+        else:
+            item_separator, key_separator = ",", ": "
+        if indent is None:
+            newline = ""
+        else:
+            if not isinstance(indent, str):
+                indent = " " * indent
+            newline = "\n"
+        object_newline = newline + indent * 2 if newline else ""
+
+        fp.write("{" + newline + (indent or "") + '"id"' + key_separator
+                 + backend.dumps(f"bundle--{self.id}", canonical=canonical) + item_separator)
+        fp.write(newline + (indent or "") + '"objects"' + key_separator + '[')
+
+        first = True
+        for record in self.records(deterministic_ids):
+            if not first:
+                fp.write(item_separator)
+            first = False
+            text = backend.dumps(record, indent, canonical)
+            if object_newline:
+                text = text.replace("\n", object_newline)
+            fp.write(object_newline + text)
+
+        if not first:
+            fp.write(newline + (indent or ""))
+        fp.write("]" + newline + "}")
+
+    def records(self, deterministic_ids=False):
+        """
+        Yields the items of the bundle's json `objects` array one at a time:
+        the json of each object followed by a relationship record for each
+        of its children. This is what dump writes.
+
+        Args:
+            deterministic_ids (bool): As for dump.
+        """
+        for class_list in (self._objects or {}).values():
+            for class_instance in class_list:
+                json_object, relationships = class_instance.to_dict()
+                yield json_object
+
+                object1_id = json_object.get("id")
+                for object2_id in relationships or ():
+                    if deterministic_ids:
+                        relationship_id = uuid.uuid5(uuid.NAMESPACE_OID, object1_id + object2_id)
+                    else:
+                        relationship_id = uuid.uuid4()
+                    yield {
+                        "id": f"relationship--{relationship_id}",
+                        "object1": object1_id,
+                        "object2": object2_id
+                    }
+
+    def to_msgpack(self):
+        """
+        Returns the bundle as MessagePack bytes, a compact binary form of its
+        json. See bundle_util.Bundle_to_msgpack; needs the msgpack package.
+        """
+        from pyiides.utils.bundle_util import Bundle_to_msgpack
+        return Bundle_to_msgpack(self)
+
+    @classmethod
+    def from_msgpack(cls, data, validate=True):
+        """
+        Reads a bundle written by to_msgpack. See
+        bundle_util.msgpack_to_Bundle; needs the msgpack package.
+        """
+        from pyiides.utils.bundle_util import msgpack_to_Bundle
+        return msgpack_to_Bundle(data, validate)
+
     @property
     def id(self):
         return self._id
@@ -469,12 +751,20 @@ class Bundle:
     def objects(self, value):
         check_iides(value)
         self._objects = value
+        self._index = None
+        self._indexed = None
 
     @objects.deleter
     def objects(self):
         self._objects = None
+        self._index = None
+        self._indexed = None
 
 
+@iides_object("detection", datetimes=("first_detected",),
+               code_lists=("who_detected", "detected_method", "logs"), vocabs={
+    "who_detected": "detection-team-vocab", "detected_method": "detection-method-vocab", "logs": "detection-log-vocab"},
+               parents=("incident",))
 class Detection:
     """
     Initialize a Detection instance.
@@ -508,6 +798,12 @@ class Detection:
         >>> print(detection.first_detected)
         2023-01-1 00:00:00
     """
+
+    __slots__ = (
+        '_id', '_first_detected', '_who_detected', '_detected_method',
+        '_logs', '_comment', '_incident', '__dict__', '__weakref__',
+    )
+
     def __init__(self, id=None, first_detected=None, who_detected=None, detected_method=None, logs=None, comment=None, **kwargs):
         if id == None:
             id = str(uuid.uuid4())
@@ -536,6 +832,10 @@ class Detection:
         # RELATIONSHIPS
         self._incident = None  # belongs to incident
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Detection(id={self.id}, "
                 f"first_detected={self.first_detected}, "
@@ -545,18 +845,8 @@ class Detection:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-
         relationships = {'_incident'}
-
-        class_dict_copy["_id"] = f"detection--{self.id}"
-        if self.first_detected != None:
-            class_dict_copy["_first_detected"] = str(self.first_detected)
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -671,6 +961,8 @@ class Detection:
             del temp.detection
 
 
+@iides_object("collusion", references={"insider1": "insider", "insider2": "insider"},
+               vocabs={"relationship": "insider-relationship-vocab", "recruitment": "recruitment-vocab"})
 class Collusion:
     """
     Initializes a Collusion instance
@@ -682,7 +974,7 @@ class Collusion:
         relationship (required) (string) : The relationship between the two insiders.
             A constant from `insider-relationship-vocab <./vocab/insider-relationship-vocab.html>`_.
         recruitment (required) (string) : The recruitment method or relationship between the insiders.
-            A constant from `insider-recruitment-vocab <./vocab/insider-recruitment-vocab.html>`_.
+            A constant from `recruitment-vocab <./vocab/recruitment-vocab.html>`_.
     
     Raises:
         TypeError: If any provided attribute is of the incorrect type.
@@ -704,6 +996,12 @@ class Collusion:
         >>> print(collusion.recruitment)
         2
     """
+
+    __slots__ = (
+        '_id', '_insider1', '_insider2', '_relationship',
+        '_recruitment', '__dict__', '__weakref__',
+    )
+
     def __init__(self, insider1, insider2, relationship, recruitment, id=None):
         if id == None:
             id = str(uuid.uuid4())
@@ -723,9 +1021,13 @@ class Collusion:
         self._relationship = relationship
 
         check_type(recruitment, str)
-        check_vocab(recruitment, 'insider-recruitment-vocab')
+        check_vocab(recruitment, 'recruitment-vocab')
         self._recruitment = recruitment 
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Collusion(id={self.id}, "
                 f"insider1={self.insider1!r}, "
@@ -734,11 +1036,7 @@ class Collusion:
                 f"recruitment={self.recruitment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-        class_dict_copy["_id"] = f"collusion--{self.id}"
-        return ({ 
-                    key.lstrip('_'): value for key, value in class_dict_copy.items() 
-                }, None)
+        return (export_fields(self), None)
 
     @property
     def id(self):
@@ -798,7 +1096,7 @@ class Collusion:
     @recruitment.setter
     def recruitment(self, value):
         check_type(value, str)
-        check_vocab(value, 'insider-recruitment-vocab')
+        check_vocab(value, 'recruitment-vocab')
         self._recruitment = value
 
     @recruitment.deleter
@@ -806,6 +1104,10 @@ class Collusion:
         self._recruitment = None
 
 
+@iides_object("legal-response", dates=(
+    "law_enforcement_contacted", "insider_arrested", "insider_charged", "insider_pleads", "insider_judgment",
+    "insider_sentenced", "insider_charges_dropped", "insider_charges_dismissed", "insider_settled"),
+               parents=("response",))
 class LegalResponse:
     """
     Initializes a LegalResponse instance
@@ -847,6 +1149,15 @@ class LegalResponse:
         >>> print(legal_response.comment)
         This is a sample comment.
     """
+
+    __slots__ = (
+        '_id', '_law_enforcement_contacted', '_insider_arrested',
+        '_insider_charged', '_insider_pleads', '_insider_judgment',
+        '_insider_sentenced', '_insider_charges_dropped',
+        '_insider_charges_dismissed', '_insider_settled', '_comment',
+        '_response', '_court_cases', '__dict__', '__weakref__',
+    )
+
     def __init__(self, id=None, law_enforcement_contacted=None, insider_arrested=None, insider_charged=None, insider_pleads=None, insider_judgment=None, insider_sentenced=None, insider_charges_dropped=None, insider_charges_dismissed=None, insider_settled=None, comment=None):
         if id is None:
             id = str(uuid.uuid4())
@@ -887,6 +1198,10 @@ class LegalResponse:
         self._response = None
         self._court_cases = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"LegalResponse(id={self.id}, "
                 f"law_enforcement_contacted={self.law_enforcement_contacted}, "
@@ -901,42 +1216,8 @@ class LegalResponse:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_response', '_court_cases'}
-
-        if self.law_enforcement_contacted != None:
-            class_dict_copy["_law_enforcement_contacted"] = str(self.law_enforcement_contacted)
-
-        if self.insider_arrested != None:
-            class_dict_copy["_insider_arrested"] = str(self.insider_arrested)
-
-        if self.insider_charged != None:
-            class_dict_copy["_insider_charged"] = str(self.insider_charged)
-
-        if self.insider_pleads != None:
-            class_dict_copy["_insider_pleads"] = str(self.insider_pleads)
-
-        if self.insider_judgment != None:
-            class_dict_copy["_insider_judgment"] = str(self.insider_judgment)
-
-        if self.insider_sentenced != None:
-            class_dict_copy["_insider_sentenced"] = str(self.insider_sentenced)
-
-        if self.insider_charges_dropped != None:
-            class_dict_copy["_insider_charges_dropped"] = str(self.insider_charges_dropped)
-
-        if self.insider_charges_dismissed != None:
-            class_dict_copy["_insider_charges_dismissed"] = str(self.insider_charges_dismissed)
-
-        if self.insider_settled != None:
-            class_dict_copy["_insider_settled"] = str(self.insider_settled)
-
-        class_dict_copy["_id"] = f"legal-response--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -1110,6 +1391,9 @@ class LegalResponse:
             
             check_type(obj, CourtCase, allow_none=False)
 
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set new court case list
         # making sure to remove older relationships before
         # setting the new ones 
@@ -1129,7 +1413,7 @@ class LegalResponse:
         check_type(item, CourtCase, allow_none=False)
 
         if self._court_cases == None:
-            self._court_cases = [item]
+            self._court_cases = RelationshipList([item])
         else:
             self._court_cases.append(item)
 
@@ -1151,6 +1435,9 @@ class LegalResponse:
         self._court_cases = None
 
 
+@iides_object("stressor", dates=("date",), vocabs={
+    "category": "stressor-category-vocab", "subcategory": "stressor-subcategory-vocab"},
+               parents=("organization", "insider"))
 class Stressor:
     """
     Initialize a Stressor instance
@@ -1183,6 +1470,12 @@ class Stressor:
         >>> print(stressor.comment)
         High-pressure project deadline
     """
+
+    __slots__ = (
+        '_id', '_date', '_subcategory', '_category', '_comment',
+        '_organization', '_insider', '__dict__', '__weakref__',
+    )
+
     def __init__(self, id=None, date=None, category=None, subcategory=None, comment=None):
         if id == None:
             id = str(uuid.uuid4())
@@ -1210,6 +1503,10 @@ class Stressor:
         self._organization = None
         self._insider = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Stressor(id={self.id}, "
                 f"date={self.date}, "
@@ -1218,18 +1515,8 @@ class Stressor:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_organization', '_insider'}
-
-        if self.date != None:
-            class_dict_copy["date"] = str(self.date)
-
-        class_dict_copy["_id"] = f"stressor--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -1353,6 +1640,10 @@ class Stressor:
             self._insider = None
 
 
+@iides_object("organization", vocabs={
+    "state": "state-vocab-us", "country": "country-vocab", "industry_sector": "industry-sector-vocab",
+    "industry_subsector": "industry-subsector-vocab", "incident_role": "org-role-vocab"},
+               kinds={"postal_code": "int", "small_business": "bool"}, parents=("incident",))
 class Organization:
     """
     Initialize an Organization instance.
@@ -1407,6 +1698,14 @@ class Organization:
         >>> print(organization.name)
         Company XYZ, Inc.
     """
+
+    __slots__ = (
+        '_id', '_name', '_city', '_state', '_country', '_postal_code',
+        '_small_business', '_industry_sector', '_industry_subsector',
+        '_business', '_parent_company', '_incident_role', '_incident',
+        '_jobs', '_stressors', '__dict__', '__weakref__',
+    )
+
     def __init__(self, id=None, name=None, city=None, state=None, country=None, postal_code=None, small_business=None, industry_sector=None, industry_subsector=None, business=None, parent_company=None, incident_role=None, **kwargs):
         if id is None:
             id = str(uuid.uuid4())
@@ -1457,6 +1756,10 @@ class Organization:
         self._jobs = None
         self._stressors = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Organization(id={self.id}, "
                 f"name={self.name}, "
@@ -1472,8 +1775,6 @@ class Organization:
                 f"incident_role={self.incident_role})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-
         relationships = {'_incident', '_jobs', '_stressors'}
 
         children_ids = None 
@@ -1487,13 +1788,8 @@ class Organization:
                 children_ids = stressors 
             else:
                 children_ids.extend(stressors)
-        
-        class_dict_copy["_id"] = f"organization--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, children_ids)
+
+        return (export_fields(self, relationships), children_ids)
 
     @property
     def id(self):
@@ -1695,6 +1991,9 @@ class Organization:
             
             check_type(obj, Job, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set new job list
         # making sure to remove any old relationships first
         if self._jobs != None:
@@ -1714,7 +2013,7 @@ class Organization:
         check_type(item, Job)
         
         if self._jobs == None:
-            self._jobs = [item]
+            self._jobs = RelationshipList([item])
         else:
             self._jobs.append(item)
         
@@ -1748,6 +2047,9 @@ class Organization:
             
             check_type(obj, Stressor, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new stressor value 
         # making sure to delete any old relationships first
         if self._stressors != None:
@@ -1766,7 +2068,7 @@ class Organization:
         check_type(item, Stressor)
         
         if self._stressors == None:
-            self._stressors = [item]
+            self._stressors = RelationshipList([item])
         else:
             self._stressors.append(item)
         
@@ -1788,6 +2090,10 @@ class Organization:
         self._stressors = None
 
 
+@iides_object("incident", code_lists=("cia_effect", "incident_type", "incident_subtype", "outcome"), vocabs={
+    "cia_effect": "cia-vocab", "incident_type": "incident-type-vocab", "incident_subtype": "incident-subtype-vocab",
+    "outcome": "outcome-type-vocab", "status": "incident-status-vocab"},
+               parents=("detection", "response"))
 class Incident:
     """
     Initialize an Incident instance.
@@ -1836,6 +2142,15 @@ class Incident:
         >>> print(incident.incident_type)
         ['F']
     """
+
+    __slots__ = (
+        '_id', '_cia_effect', '_incident_type', '_incident_subtype',
+        '_outcome', '_status', '_summary', '_brief_summary', '_comment',
+        '_detection', '_response', '_ttps', '_organizations',
+        '_insiders', '_impacts', '_targets', '_notes', '_sources',
+        '__dict__', '__weakref__',
+    )
+
     def __init__(self, id=None, cia_effect=None, incident_type=None, incident_subtype=None, outcome=None, status=None, summary=None, brief_summary=None, comment=None, **kwargs):
         if id == None:
             id = str(uuid.uuid4())
@@ -1884,6 +2199,10 @@ class Incident:
         self._notes = None
         self._sources = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Incident(id={self.id}, "
                 f"cia_effect={self.cia_effect}, "
@@ -1896,14 +2215,8 @@ class Incident:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_detection', '_response', '_ttps', '_organizations', '_insiders', '_impacts', '_targets', '_notes', '_sources'}
-        class_dict_copy["_id"] = f"incident--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -2098,6 +2411,9 @@ class Incident:
         for obj in value:
             check_type(obj, TTP, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the ttps attribute to the new list
         # if it isn't None, we want to remove all old 
         # relationships before setting the new ones
@@ -2118,7 +2434,7 @@ class Incident:
         check_type(item, TTP, allow_none=False)
          
         if self._ttps == None:
-            self._ttps = [item]
+            self._ttps = RelationshipList([item])
         else:
             self._ttps.append(item)
 
@@ -2152,6 +2468,9 @@ class Incident:
             
             check_type(obj, Organization, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the organizations list
         # if it is not None, then we want to remove all the old 
         # relationships
@@ -2171,7 +2490,7 @@ class Incident:
         
         check_type(item, Organization)
         if self._organizations == None:
-            self._organizations = [item]
+            self._organizations = RelationshipList([item])
         else:
             self._organizations.append(item)
 
@@ -2206,6 +2525,9 @@ class Incident:
             
             check_type(obj, Insider, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new insider list:
         # if a insiders list already exists, we want
         # to remove the relationships before setting  
@@ -2226,7 +2548,7 @@ class Incident:
         
         check_type(item, Insider, allow_none=False)
         if self._insiders == None:
-            self._insiders = [item]
+            self._insiders = RelationshipList([item])
         else:
             self._insiders.append(item)
         
@@ -2261,6 +2583,9 @@ class Incident:
             
             check_type(obj, Impact, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new impact list:
         # making sure to remove all old relationships first
         if self._impacts != None:
@@ -2278,7 +2603,7 @@ class Incident:
         
         check_type(item, Impact, allow_none=False)
         if self._impacts == None:
-            self._impacts = [item]
+            self._impacts = RelationshipList([item])
         else:
             self._impacts.append(item)
         
@@ -2312,6 +2637,9 @@ class Incident:
             
             check_type(obj, Target, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new targets list:
         # making sure to remove old relationships first
         if self._targets != None:
@@ -2329,7 +2657,7 @@ class Incident:
         
         check_type(item, Target, allow_none=False)
         if self._targets == None:
-            self._targets = [item]
+            self._targets = RelationshipList([item])
         else:
             self._targets.append(item)
         
@@ -2365,6 +2693,9 @@ class Incident:
             
             check_type(obj, Note, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new notes list:
         # making sure to remove old relationships first
         if self._notes != None:
@@ -2382,7 +2713,7 @@ class Incident:
         
         check_type(item, Note, allow_none=False)
         if self._notes == None:
-            self._notes = [item]
+            self._notes = RelationshipList([item])
         else:
             self._notes.append(item)
         
@@ -2417,6 +2748,9 @@ class Incident:
             
             check_type(obj, Source, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new sources list:
         # making sure to remove old relationships first
         if self._sources != None:
@@ -2434,7 +2768,7 @@ class Incident:
         
         check_type(item, Source, allow_none=False)
         if self._sources == None:
-            self._sources = [item]
+            self._sources = RelationshipList([item])
         else:
             self._sources.append(item)
         
@@ -2456,6 +2790,10 @@ class Incident:
         self._sources = None
 
 
+@iides_object("job", dates=("hire_date", "departure_date"), durations=("tenure",), derive=derive_tenure, vocabs={
+    "job_function": "job-function-vocab", "occupation": "occupation-vocab", "access_authorization": "access-auth-vocab",
+    "employment_type": "employment-type-vocab"},
+               kinds={"position_technical": "bool"}, parents=("organization", "insider", "accomplice"))
 class Job:
     """
     Initialize a Job instance.
@@ -2503,6 +2841,15 @@ class Job:
         >>> print(access_authorization)
         2
     """
+
+    __slots__ = (
+        '_id', '_job_function', '_occupation', '_title',
+        '_position_technical', '_access_authorization',
+        '_employment_type', '_hire_date', '_departure_date', '_tenure',
+        '_comment', '_organization', '_insider', '_accomplice',
+        '__dict__', '__weakref__',
+    )
+
     def __init__(self, id=None, job_function=None, occupation=None, title=None, position_technical=None, access_authorization=None, employment_type=None, hire_date=None, departure_date=None, tenure=None, comment=None, **kwargs):
         if id is None:
             id = str(uuid.uuid4())
@@ -2550,6 +2897,10 @@ class Job:
         self._insider = None
         self._accomplice = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Job(id={self.id}, "
                 f"job_function={self.job_function}, "
@@ -2564,24 +2915,8 @@ class Job:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_organization', '_insider', '_accomplice'}
-        self.__dict__["id"] = f"job--{self.id}"
-
-        if self.hire_date != None:
-            class_dict_copy["_hire_date"] = str(self.hire_date)
-        
-        if self.departure_date != None:
-            class_dict_copy["_departure_date"] = str(self.departure_date)
-
-        if self.tenure != None:
-            class_dict_copy["_tenure"] = str(self.tenure)
-
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -2818,6 +3153,12 @@ class Job:
             self._accomplice = None
 
 
+@iides_object("insider", tuples=("predispositions", "concerning_behaviors"),
+               code_lists=("motive", "psychological_issues"), vocabs={
+    "incident_role": "incident-role-vocab", "motive": "motive-vocab", "psychological_issues": "psych-issues-vocab",
+    "predispositions": ("predisposition-type-vocab", "predisposition-subtype-vocab"),
+    "concerning_behaviors": ("concerning-behavior-vocab", "cb-subtype-vocab")},
+               kinds={"substance_use_during_incident": "bool"}, parents=("incident", "sponsor"))
 class Insider(Person):
     """
     Initialize an Insider instance.
@@ -2855,6 +3196,14 @@ class Insider(Person):
         >>> print(insider.incident_role)
         1
     """
+
+    __slots__ = (
+        '_id', '_incident_role', '_motive',
+        '_substance_use_during_incident', '_psychological_issues',
+        '_predispositions', '_concerning_behaviors', '_incident',
+        '_sponsor', '_jobs', '_stressors', '_accomplices',
+    )
+
     def __init__(self, incident_role, id=None, motive=None, substance_use_during_incident=None, psychological_issues=None, predispositions=None, concerning_behaviors=None, **kwargs):
         # inherit everything from Person
         super().__init__(**kwargs)
@@ -2904,8 +3253,6 @@ class Insider(Person):
                 f"concerning_behaviors={self.concerning_behaviors}) ")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-
         relationships = {'_incident', '_sponsor', '_jobs', '_stressors', '_accomplices'}
 
         children_ids = None 
@@ -2927,12 +3274,7 @@ class Insider(Person):
             else:
                 children_ids.extend(accomplices)
 
-        class_dict_copy["_id"] = f"insider--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, children_ids)
+        return (export_fields(self, relationships), children_ids)
 
     @property
     def id(self):
@@ -3114,6 +3456,9 @@ class Insider(Person):
             
             check_type(obj, Job, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new job list 
         # making sure to remove old relationships first
         if self._jobs != None:
@@ -3133,7 +3478,7 @@ class Insider(Person):
         check_type(item, Job, allow_none=False)
          
         if self._jobs == None:
-            self._jobs = [item]
+            self._jobs = RelationshipList([item])
         else:
             self._jobs.append(item)
         
@@ -3167,6 +3512,9 @@ class Insider(Person):
             
             check_type(obj, Stressor, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new stressor list 
         # making sure to remove old relationships first
         if self._stressors != None:
@@ -3185,7 +3533,7 @@ class Insider(Person):
         check_type(item, Stressor, allow_none=False)
           
         if self._stressors == None:
-            self._stressors = [item]
+            self._stressors = RelationshipList([item])
         else:
             self._stressors.append(item)
 
@@ -3220,6 +3568,9 @@ class Insider(Person):
             
             check_type(obj, Accomplice, allow_none=False)
 
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the accomplices list
         # making sure to remove any old relationships first
         if self._accomplices != None:
@@ -3237,7 +3588,7 @@ class Insider(Person):
         check_type(item, Accomplice, allow_none=False)
         
         if self._accomplices == None:
-            self._accomplices = [item]
+            self._accomplices = RelationshipList([item])
         else:
             self._accomplices.append(item)
         
@@ -3259,6 +3610,8 @@ class Insider(Person):
         self._accomplices = None
 
 
+@iides_object("charge", vocabs={"plea": "charge-plea-vocab", "disposition": "charge-disposition-vocab"},
+               kinds={"count": "int", "plea_bargain": "bool"}, parents=("court_case",))
 class Charge:
     """
     Initializes a Charge instance
@@ -3296,6 +3649,13 @@ class Charge:
         >>> print(charge.section)
         1343
     """
+
+    __slots__ = (
+        '_id', '_title', '_section', '_nature_of_offense', '_count',
+        '_plea', '_plea_bargain', '_disposition', '_court_case',
+        '__dict__', '__weakref__',
+    )
+
     def __init__(self, title, id=None, section=None, nature_of_offense=None, count=None, plea=None, plea_bargain=None, disposition=None):
         if id == None:
             id = str(uuid.uuid4())
@@ -3329,6 +3689,10 @@ class Charge:
         # relationships
         self._court_case = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Charge(id={self.id}, "
                 f"title={self.title}, "
@@ -3339,15 +3703,9 @@ class Charge:
                 f"disposition={self.disposition})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_court_case'}
-        class_dict_copy["_id"] = f"charge--{self.id}"
-        return ({ 
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items() 
-                    if key not in relationships
-                }, None)  
-    
+        return (export_fields(self, relationships), None)
+
     @property
     def id(self):
         return self._id
@@ -3480,6 +3838,11 @@ class Charge:
             self._court_case = None
 
 
+@iides_object("response", dated_pairs=("technical_controls", "behavioral_controls", "investigation_events"),
+               code_lists=("investigated_by",), vocabs={
+    "technical_controls": "technical-control-vocab", "behavioral_controls": "behavioral-control-vocab",
+    "investigated_by": "investigator-vocab", "investigation_events": "investigation-vocab"},
+               parents=("incident", "legal_response"))
 class Response:
     """
     Initialize a Response instance.
@@ -3516,6 +3879,13 @@ class Response:
         >>> print(response.technical_controls)
         [("1", "2023-01-01")]
     """
+
+    __slots__ = (
+        '_id', '_technical_controls', '_behavioral_controls',
+        '_investigated_by', '_investigation_events', '_comment',
+        '_incident', '_legal_response', '__dict__', '__weakref__',
+    )
+
     def __init__(self, id=None, technical_controls=None, behavioral_controls=None, investigated_by=None, investigation_events=None, comment=None, **kwargs):
         if id == None:
             id = str(uuid.uuid4())
@@ -3546,6 +3916,10 @@ class Response:
         self._incident = None    # belongs to incident
         self._legal_response = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Response(id={self.id}, "
                 f"technical_controls={self.technical_controls}, "
@@ -3555,27 +3929,8 @@ class Response:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_incident', '_legal_response'}
-
-        if self.technical_controls != None:
-            for (_, date) in class_dict_copy["_technical_controls"]:
-                date = str(date)
-                
-        if self.behavioral_controls != None:
-            for (_, date) in class_dict_copy["_behavioral_controls"]:
-                date = str(date)
-        
-        if self.investigation_events != None:
-            for (_, date) in class_dict_copy["_investigation_events"]:
-                date = str(date)
-
-        class_dict_copy["_id"] = f"response--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -3715,6 +4070,10 @@ class Response:
             del temp.response
 
 
+@iides_object("ttp", datetimes=("date",), code_lists=("location", "hours", "device", "channel"), vocabs={
+    "tactic": "tactic-vocab", "technique": "technique-vocab", "location": "attack-location-vocab",
+    "hours": "attack-hours-vocab", "device": "device-vocab", "channel": "channel-vocab"},
+               kinds={"sequence_num": "int", "observed": "bool", "number_of_times": "int"}, parents=("incident",))
 class TTP:
     """
     Initialize a TTP instance.
@@ -3764,6 +4123,14 @@ class TTP:
         >>> print(ttp.date)
         2020-01-01 00:00:00
     """
+
+    __slots__ = (
+        '_id', '_date', '_sequence_num', '_observed',
+        '_number_of_times', '_ttp_vocab', '_tactic', '_technique',
+        '_location', '_hours', '_device', '_channel', '_description',
+        '_incident', '__dict__', '__weakref__',
+    )
+
     def __init__(self, id=None, date=None, sequence_num=None, observed=None, number_of_times=None, ttp_vocab=None, tactic=None, technique=None, location=None, hours=None, device=None, channel=None, description=None, **kwargs):
         if id is None:
             id = str(uuid.uuid4())
@@ -3815,6 +4182,10 @@ class TTP:
         # RELATIONSHIPS 
         self._incident = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"TTP(id={self.id}, "
                 f"date={self.date}, "
@@ -3831,18 +4202,8 @@ class TTP:
                 f"description={self.description})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_incident'}
-
-        if self.date != None:
-            class_dict_copy["date"] = str(self.date)
-
-        class_dict_copy["_id"] = f"ttp--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -4065,6 +4426,8 @@ class TTP:
             self._incident = None
 
 
+@iides_object("sentence", vocabs={"sentence_type": "sentence-type-vocab", "metric": "sentence-metric-vocab"},
+               kinds={"quantity": "int", "concurrency": "bool"}, parents=("court_case",))
 class Sentence:
     """
     Initializes a Sentence instance
@@ -4098,6 +4461,12 @@ class Sentence:
         >>> print(sentence.quantity)
         5
     """
+
+    __slots__ = (
+        '_id', '_sentence_type', '_quantity', '_metric', '_concurrency',
+        '_court_case', '__dict__', '__weakref__',
+    )
+
     def __init__(self, sentence_type, id=None, quantity=None, metric=None, concurrency=None) -> None:
         if id is None:
             id = str(uuid.uuid4())
@@ -4124,6 +4493,10 @@ class Sentence:
         # relationships
         self._court_case = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Sentence(id={self.id}, "
                 f"sentence_type={self.sentence_type}, "
@@ -4132,14 +4505,8 @@ class Sentence:
                 f"concurrency={self.concurrency})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_court_case'}
-        class_dict_copy["_id"] = f"sentence--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -4250,6 +4617,10 @@ class Sentence:
             self._court_case = None
 
 
+@iides_object("target", code_lists=("sensitivity",), vocabs={
+    "asset_type": "target-asset-vocab", "category": "target-category-vocab", "subcategory": "target-subcategory-vocab",
+    "format": "target-format-vocab", "owner": "target-owner-vocab", "sensitivity": "target-sensitivity-vocab"},
+               parents=("incident",))
 class Target:
     """
     Initializes a Target instance 
@@ -4298,6 +4669,13 @@ class Target:
         >>> print(target.format)
         1
     """
+
+    __slots__ = (
+        '_id', '_asset_type', '_category', '_subcategory', '_format',
+        '_owner', '_sensitivity', '_description', '_incident',
+        '__dict__', '__weakref__',
+    )
+
     def __init__(self, asset_type, category, subcategory, format, owner, sensitivity, id=None, description=None):
         if id is None:
             id = str(uuid.uuid4())
@@ -4335,6 +4713,10 @@ class Target:
         # relationships
         self._incident = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Target(id={self.id}, "
                 f"assert_type={self.asset_type}, "
@@ -4346,14 +4728,8 @@ class Target:
                 f"description={self.description})")
     
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_incident'}
-        class_dict_copy["_id"] = f"target--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -4494,6 +4870,8 @@ class Target:
             self._incident = None
 
 
+@iides_object("accomplice", vocabs={"relationship_to_insider": "insider-relationship-vocab"},
+               parents=("insider", "sponsor"))
 class Accomplice(Person):
     """
     Initialize an Accomplice instance, inheriting from Person.
@@ -4522,6 +4900,12 @@ class Accomplice(Person):
         >>> print(accomplice.relationship_to_insider)
         1
     """
+
+    __slots__ = (
+        '_id', '_relationship_to_insider', '_insider', '_jobs',
+        '_sponsor',
+    )
+
     def __init__(self, id=None, relationship_to_insider=None, **kwargs):
         # inherit everything from Person
         super().__init__(**kwargs)
@@ -4549,22 +4933,13 @@ class Accomplice(Person):
         """
         returns tuple: (dict of class itself, list containing child id's to connect)
         """
-        class_dict_copy = self.__dict__.copy()
-
         relationships = {'_insider', '_jobs', '_sponsor'}
 
         children_ids = None
         if self.jobs != None:
-            children_ids = ["jobs--" + x.id for x in self.jobs]
+            children_ids = ["job--" + x.id for x in self.jobs]
 
-        class_dict_copy["_id"] = f"accomplice--{self.id}"
-        return ({
-                    key.lstrip('_'): value
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                },
-                children_ids
-                )
+        return (export_fields(self, relationships), children_ids)
 
     @property
     def id(self):
@@ -4633,6 +5008,9 @@ class Accomplice(Person):
             
             check_type(obj, Job, allow_none=False)
 
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new job list
         # making sure to remove old relationships first if they exist
         if self._jobs != None:
@@ -4650,7 +5028,7 @@ class Accomplice(Person):
         check_type(item, Job, allow_none=False)
 
         if self._jobs == None:
-            self._jobs = [item]
+            self._jobs = RelationshipList([item])
         else:
             self._jobs.append(item)
 
@@ -4699,6 +5077,8 @@ class Accomplice(Person):
             self._sponsor = None
 
 
+@iides_object("org-relationship", references={"org1": "organization", "org2": "organization"},
+               vocabs={"relationship": "org-relationship-vocab"})
 class OrgRelationship:
     """
     Initializes an OrgRelationship instance
@@ -4730,6 +5110,12 @@ class OrgRelationship:
         >>> print(org_relationship.relationship)
         C
     """
+
+    __slots__ = (
+        '_id', '_org1', '_org2', '_relationship', '__dict__',
+        '__weakref__',
+    )
+
     def __init__(self, org1, org2, relationship, id=None):
         if id == None:
             id = str(uuid.uuid4())
@@ -4748,6 +5134,10 @@ class OrgRelationship:
         check_vocab(relationship, 'org-relationship-vocab')
         self._relationship = relationship
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"OrgRelationship(id={self.id}, "
                 f"org1={self.org1}, "
@@ -4755,11 +5145,7 @@ class OrgRelationship:
                 f"relationship={self.relationship})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-        class_dict_copy["_id"] = f"org-relationship--{self.id}"
-        return ({
-                    key.lstrip('_'): value for key, value in class_dict_copy.items()
-                }, None)
+        return (export_fields(self), None)
 
     @property
     def id(self):
@@ -4772,7 +5158,7 @@ class OrgRelationship:
     
     @property
     def org1(self):
-        return self.org1
+        return self._org1
 
     @org1.setter
     def org1(self, value):
@@ -4786,7 +5172,7 @@ class OrgRelationship:
     
     @property
     def org2(self):
-        return self.org2
+        return self._org2
 
     @org2.setter
     def org2(self, value):
@@ -4813,6 +5199,7 @@ class OrgRelationship:
         self._relationship = None
 
 
+@iides_object("sponsor", vocabs={"sponsor_type": "sponsor-type-vocab"})
 class Sponsor:
     """
     Initializes a Sponsor instance
@@ -4839,6 +5226,11 @@ class Sponsor:
         >>> print(sponsor.sponsor_type)
         SS
     """
+
+    __slots__ = (
+        '_id', '_name', '_sponsor_type', '_accomplices', '_insiders',
+        '__dict__', '__weakref__',
+    )
     
     def __init__(self, id=None, name=None, sponsor_type=None):  
         if id is None:
@@ -4857,14 +5249,16 @@ class Sponsor:
         self._accomplices = None
         self._insiders = None
     
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Sponsor(id={self.id}, "
                 f"name={self.name}, "
                 f"sponsor_type={self.sponsor_type})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-
         relationships = {'_accomplices', '_insiders'}
 
         children_ids = None
@@ -4879,12 +5273,8 @@ class Sponsor:
             else:
                 children_ids.extend(insiders)
 
-        class_dict_copy["_id"] = f"sponsor--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, children_ids)
+        return (export_fields(self, relationships), children_ids)
+
     @property
     def id(self):
         return self._id  
@@ -4936,6 +5326,9 @@ class Sponsor:
             
             check_type(obj, Accomplice, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set to new accomplice list
         # making sure to remove old relationships first
         if self._accomplices != None:
@@ -4953,7 +5346,7 @@ class Sponsor:
         
         check_type(item, Accomplice, allow_none=False)
         if self._accomplices == None:
-            self._accomplices = [item]
+            self._accomplices = RelationshipList([item])
         else:
             self._accomplices.append(item)
 
@@ -4988,6 +5381,9 @@ class Sponsor:
             
             check_type(obj, Insider, allow_none=False)
 
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set new insider list
         # making sure to remove the old relationships first
         if self._insiders != None:
@@ -5005,7 +5401,7 @@ class Sponsor:
         
         check_type(item, Insider, allow_none=False)
         if self._insiders == None:
-            self._insiders = [item]
+            self._insiders = RelationshipList([item])
         else:
             self._insiders.append(item)
         
@@ -5028,6 +5424,10 @@ class Sponsor:
         self._insiders = None
 
 
+@iides_object("court-case", vocabs={
+    "court_country": "country-vocab", "court_state": "state-vocab-us", "court_type": "court-type-vocab",
+    "case_type": "case-type-vocab"},
+               kinds={"defendant": "list", "plaintiff": "list"}, parents=("legal_response",))
 class CourtCase:
     """
     Initializes a CourtCase instance
@@ -5075,6 +5475,14 @@ class CourtCase:
         >>> print(court_case.court_country)
         US
     """
+
+    __slots__ = (
+        '_id', '_case_number', '_case_title', '_court_country',
+        '_court_state', '_court_district', '_court_type', '_case_type',
+        '_defendant', '_plaintiff', '_comment', '_legal_response',
+        '_sentences', '_charges', '__dict__', '__weakref__',
+    )
+
     def __init__(self, id=None, case_number=None, case_title=None, court_country=None, court_state=None, court_district=None, court_type=None, case_type=None, defendant=None, plaintiff=None, comment=None):
         if id == None:
             id = str(uuid.uuid4())
@@ -5127,6 +5535,10 @@ class CourtCase:
         self._sentences = None
         self._charges = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"CourtCase(id={self.id}, "
                 f"case_number={self.case_number}, "
@@ -5141,8 +5553,6 @@ class CourtCase:
                 f"comment={self.comment}) ")
     
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
-
         relationships = {'_legal_response', '_sentences', '_charges'}
 
         children_ids = None 
@@ -5156,13 +5566,8 @@ class CourtCase:
                 children_ids = sentences
             else:
                 children_ids.extend(sentences)
-        
-        class_dict_copy["_id"] = f"court-case--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, children_ids)
+
+        return (export_fields(self, relationships), children_ids)
 
     @property
     def id(self):
@@ -5362,6 +5767,9 @@ class CourtCase:
             
             check_type(obj, Sentence, allow_none=False)
         
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the new sentences list:
         # if it is not None, we need to remove 
         # the old relationships first
@@ -5381,7 +5789,7 @@ class CourtCase:
         check_type(item, Sentence, allow_none=False)
         
         if self._sentences == None:
-            self._sentences = [item]
+            self._sentences = RelationshipList([item])
         else:
             self._sentences.append(item)
         
@@ -5416,6 +5824,9 @@ class CourtCase:
             
             check_type(obj, Charge, allow_none=False)
 
+        # copy first, value may be the list that is about to be emptied
+        value = RelationshipList(value)
+
         # set the charges list
         # if it is not None, we need to remove 
         # the old relationships first
@@ -5436,7 +5847,7 @@ class CourtCase:
         check_type(item, Charge, allow_none=False)
           
         if self._charges == None:
-            self._charges = [item]
+            self._charges = RelationshipList([item])
         else:
             self._charges.append(item)
         
@@ -5458,6 +5869,8 @@ class CourtCase:
         self._charges = None
 
 
+@iides_object("source", datetimes=("date",),
+               kinds={"public": "bool"}, parents=("incident",))
 class Source:
     """
     Initializes a Source instance
@@ -5493,6 +5906,13 @@ class Source:
         >>> print(source.date)
         2023-01-01 00:00:00
     """
+
+    __slots__ = (
+        '_id', '_title', '_source_type', '_file_type', '_date',
+        '_public', '_document', '_comment', '_incident', '__dict__',
+        '__weakref__',
+    )
+
     def __init__(self, title, id=None, source_type=None, file_type=None, date=None, public=None, document=None, comment=None):
         if id is None:
             id = str(uuid.uuid4())
@@ -5523,6 +5943,10 @@ class Source:
         # relationships
         self._incident = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Source(id={self.id}, "
                 f"title={self.title}, "
@@ -5534,18 +5958,8 @@ class Source:
                 f"comment={self.comment}")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_incident'}
-
-        if self.date != None:
-            class_dict_copy["_date"] = str(self.date)
-
-        class_dict_copy["_id"] = f"source--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -5679,6 +6093,8 @@ class Source:
             self._incident = None
 
 
+@iides_object("note", datetimes=("date",),
+               kinds={"date": "date"}, parents=("incident",))
 class Note:
     """
     Initialize a Note instance
@@ -5710,6 +6126,12 @@ class Note:
         >>> print(note.date)
         2023-01-01
     """
+
+    __slots__ = (
+        '_id', '_author', '_date', '_comment', '_incident', '__dict__',
+        '__weakref__',
+    )
+
     def __init__(self, author, date, comment, id=None):
         if id == None:
             id = str(uuid.uuid4())
@@ -5730,6 +6152,10 @@ class Note:
         # Relationships
         self._incident = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Note(id={self.id}, "
                 f"author={self.author}, "
@@ -5737,18 +6163,8 @@ class Note:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_incident'}
-
-        if self.date != None:
-            class_dict_copy["_date"] = str(self.date)
-
-        class_dict_copy["_id"] = f"note--{self.id}"
-        return ({
-                    key.lstrip('_'): value 
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
@@ -5830,6 +6246,8 @@ class Note:
             self._incident = None
 
 
+@iides_object("impact", vocabs={"metric": "impact-metric-vocab"},
+               kinds={"high": "float", "estimated": "bool", "low": "float"}, parents=("incident",))
 class Impact:
     """
     Initialize an Impact instance
@@ -5860,6 +6278,12 @@ class Impact:
         >>> print(impact.estimated)
         True
     """
+
+    __slots__ = (
+        '_id', '_high', '_low', '_metric', '_estimated', '_comment',
+        '_incident', '__dict__', '__weakref__',
+    )
+
     def __init__(self, high, metric, estimated, id=None, low=None, comment=None):
         if id == None:
             id = str(uuid.uuid4())
@@ -5887,6 +6311,10 @@ class Impact:
 
         self._incident = None
 
+    @classmethod
+    def from_trusted_dict(cls, values):
+        return trusted_instance(cls, values)
+
     def __repr__(self):
         return (f"Impact(id={self.id}, "
                 f"high={self.high}, "
@@ -5896,14 +6324,8 @@ class Impact:
                 f"comment={self.comment})")
 
     def to_dict(self):
-        class_dict_copy = self.__dict__.copy()
         relationships = {'_incident'}
-        class_dict_copy["_id"] = f"impact--{self.id}"
-        return ({
-                    key.lstrip('_'): value
-                    for key, value in class_dict_copy.items()
-                    if key not in relationships
-                }, None)
+        return (export_fields(self, relationships), None)
 
     @property
     def id(self):
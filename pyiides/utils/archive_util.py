@@ -0,0 +1,355 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import gzip
+import io
+import json
+import os
+import struct
+
+from pyiides.utils.helper_functions import get_json_backend
+from pyiides.utils.bundle_util import objects_to_Bundle, iter_json_objects, full_id, split_id, _replace_entry
+
+"""
+- - - - - - - - - - - - - - - - - - - - -
+
+        Bundle Archives
+
+- - - - - - - - - - - - - - - - - - - - -
+"""
+
+# Layout of an archive, see BundleArchive
+ARCHIVE_MAGIC = b"IIDESARC"
+ARCHIVE_VERSION = 1
+ARCHIVE_COMPRESSIONS = ("gzip", "zstd")
+
+# magic and version at the start of the file
+_HEADER = struct.Struct("<8sH")
+# offset and length of the table of contents, and magic, at the end
+_FOOTER = struct.Struct("<QQ8s")
+
+# Members whose json is larger than this many bytes are parsed as they are
+# decompressed, one object at a time, instead of decompressed and parsed whole
+STREAM_SIZE = 1 << 20
+
+# the json text of a bundle is compressed in chunks of about this many bytes
+_WRITE_CHUNK = 1 << 16
+
+
+class BundleArchive:
+    """
+    A file of many IIDES bundles, each stored as its json (as written by
+    Bundle.dump) and compressed on its own with gzip or zstd, like the
+    members of a zip file. A table of contents at the end of the file lists
+    the members with their bundle id, object counts and incident ids, so
+    listing the archive reads only the table, and reading one bundle
+    decompresses only its member. Members larger than STREAM_SIZE are
+    decompressed and parsed as a stream, one object at a time, as
+    json_stream_to_Bundle does.
+
+    The file is the header (ARCHIVE_MAGIC and ARCHIVE_VERSION), the members,
+    the table of contents as json, {"members": [member, ...]}, and a footer
+    with the offset and length of the table. Each member is
+        {"bundle": "bundle--<uuid>", "offset": <byte offset>, "length": <compressed bytes>,
+         "size": <json bytes>, "compression": "gzip" or "zstd",
+         "objects": {tag: count}, "incidents": ["incident--<uuid>", ...]}
+    Appending writes the new members over the old table of contents and the
+    new table after them, so as with zip files an interrupted append can
+    leave the archive unreadable.
+
+    zstd needs the zstandard package.
+
+    Args:
+        path (str): The archive file.
+        mode (str): "r" to read, "w" to create (replacing an existing file)
+            or "a" to add to an existing archive (or create it).
+        compression (str): The default compression of added bundles, one of
+            ARCHIVE_COMPRESSIONS.
+        level (int): The compression level. Defaults to 6 for gzip and 3 for
+            zstd.
+        json_backend (str): The json library to encode and parse with, see
+            get_json_backend.
+
+    Raises:
+        ValueError: If the file is not a bundle archive, or the mode or
+            compression is unknown.
+
+    Example:
+        >>> with BundleArchive("incidents.iidesarc", "w", compression="zstd") as archive:
+        ...     for bundle in bundles:
+        ...         archive.add(bundle)
+        >>> with BundleArchive("incidents.iidesarc") as archive:
+        ...     bundle = archive.find_incident("123e4567-e89b-12d3-a456-426614174000")
+    """
+
+    def __init__(self, path, mode="r", compression="gzip", level=None, json_backend=None):
+        if mode not in ("r", "w", "a"):
+            raise ValueError(f"Unknown archive mode {mode!r}, expected 'r', 'w' or 'a'")
+        _check_compression(compression)
+        self.path = path
+        self.mode = mode
+        self.compression = compression
+        self.level = level
+        self.json_backend = json_backend
+        self.members = []
+
+        if mode == "a" and not os.path.exists(path):
+            mode = "w"
+        if mode == "w":
+            self._fp = open(path, "w+b")
+            self._fp.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION))
+        else:
+            self._fp = open(path, "rb" if mode == "r" else "r+b")
+            try:
+                toc_offset = self._read_toc()
+            except Exception:
+                self._fp.close()
+                raise
+            if mode == "a":
+                self._fp.seek(toc_offset)
+                self._fp.truncate()
+        self._index()
+
+    def _read_toc(self):
+        fp = self._fp
+        magic, version = _HEADER.unpack(fp.read(_HEADER.size).ljust(_HEADER.size, b"\0"))
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f"{self.path} is not a bundle archive")
+        if version != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported bundle archive version {version}, expected {ARCHIVE_VERSION}")
+        fp.seek(0, os.SEEK_END)
+        if fp.tell() < _HEADER.size + _FOOTER.size:
+            raise ValueError(f"{self.path} is truncated")
+        fp.seek(-_FOOTER.size, os.SEEK_END)
+        toc_offset, toc_length, magic = _FOOTER.unpack(fp.read(_FOOTER.size))
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f"{self.path} is truncated")
+        fp.seek(toc_offset)
+        self.members = json.loads(fp.read(toc_length))["members"]
+        return toc_offset
+
+    def _index(self):
+        self._bundles = {}
+        self._incidents = {}
+        for member in self.members:
+            self._add_to_index(member)
+
+    def _add_to_index(self, member):
+        # a bundle added again replaces the earlier copy, which stays in the
+        # file and in members but is no longer read
+        _replace_entry(self._bundles, self._incidents, member)
+
+    def __len__(self):
+        return len(self._bundles)
+
+    def __iter__(self):
+        """
+        Yields every bundle in the archive, in the order they were added; a
+        bundle added again is read once, its latest copy, at its place.
+        """
+        for member in list(self._bundles.values()):
+            yield self._read(member)
+
+    def __contains__(self, bundle_id):
+        return full_id("bundle", bundle_id) in self._bundles
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Writes the table of contents, unless the archive is open for reading, and closes the file."""
+        if self._fp.closed:
+            return
+        try:
+            if self.mode != "r":
+                toc = json.dumps({"members": self.members}, separators=(",", ":")).encode("utf-8")
+                toc_offset = self._fp.seek(0, os.SEEK_END)
+                self._fp.write(toc)
+                self._fp.write(_FOOTER.pack(toc_offset, len(toc), ARCHIVE_MAGIC))
+        finally:
+            self._fp.close()
+
+    def bundle_ids(self):
+        """Returns the ids of the bundles in the archive ("bundle--<uuid>")."""
+        return list(self._bundles)
+
+    def member(self, bundle_id):
+        """
+        Returns the table of contents entry of a bundle.
+
+        Args:
+            bundle_id (str): Its id, with or without the "bundle--" tag.
+
+        Raises:
+            KeyError: If the archive has no such bundle.
+        """
+        return self._bundles[full_id("bundle", bundle_id)]
+
+    def open(self, bundle_id):
+        """
+        Returns a binary file object that decompresses the json of a bundle
+        as it is read, e.g. for json_stream_to_Bundle or to extract it to a
+        file.
+
+        Raises:
+            KeyError: If the archive has no such bundle.
+        """
+        return self._open(self.member(bundle_id))
+
+    def get(self, bundle_id, validate=True):
+        """
+        Reads one bundle, decompressing only its member.
+
+        Args:
+            bundle_id (str): Its id, with or without the "bundle--" tag.
+            validate (bool): As for json_to_Bundle.
+
+        Raises:
+            KeyError: If the archive has no such bundle.
+        """
+        return self._read(self.member(bundle_id), validate)
+
+    def find_incident(self, incident_id, validate=True):
+        """
+        Reads the bundle that has an incident.
+
+        Args:
+            incident_id (str): The incident's id, with or without the
+                "incident--" tag.
+            validate (bool): As for json_to_Bundle.
+
+        Raises:
+            KeyError: If no bundle in the archive has the incident.
+        """
+        return self._read(self._incidents[full_id("incident", incident_id)], validate)
+
+    def add(self, bundle, compression=None, level=None):
+        """
+        Compresses a bundle into the archive. The json is compressed as
+        Bundle.dump writes it, so it is never held in memory as a whole.
+
+        Args:
+            bundle (Bundle): The bundle.
+            compression (str): Overrides the archive's compression.
+            level (int): Overrides the archive's compression level.
+
+        Returns:
+            dict: The table of contents entry of the bundle.
+
+        Raises:
+            ValueError: If the archive is open for reading.
+        """
+        if self.mode == "r":
+            raise ValueError("The archive is open for reading")
+        compression = compression or self.compression
+        _check_compression(compression)
+        if level is None and compression == self.compression:
+            level = self.level
+
+        # reading members moves the file position
+        offset = self._fp.seek(0, os.SEEK_END)
+        compressor = _compressor(compression, self._fp, level)
+        writer = _TextWriter(compressor)
+        bundle.dump(writer, json_backend=self.json_backend)
+        writer.flush()
+        compressor.close()
+
+        objects = bundle.objects or {}
+        member = {
+            "bundle": f"bundle--{bundle.id}",
+            "offset": offset,
+            "length": self._fp.tell() - offset,
+            "size": writer.size,
+            "compression": compression,
+            "objects": {tag: len(class_list) for tag, class_list in objects.items() if class_list},
+            "incidents": [f"incident--{incident.id}" for incident in objects.get("incident", ())],
+        }
+        self.members.append(member)
+        self._add_to_index(member)
+        return member
+
+    def _open(self, member):
+        window = _Window(self._fp, member["offset"], member["length"])
+        if member["compression"] == "gzip":
+            return gzip.GzipFile(fileobj=window, mode="rb")
+        if member["compression"] == "zstd":
+            import zstandard
+            return zstandard.ZstdDecompressor().stream_reader(window)
+        raise ValueError(f"Unknown compression {member['compression']!r}")
+
+    def _read(self, member, validate=True):
+        bundle_id = split_id(member["bundle"])[1]
+        with self._open(member) as stream:
+            if member["size"] > STREAM_SIZE:
+                return objects_to_Bundle(iter_json_objects(stream), validate, bundle_id)
+            # parsing the whole document at once is faster for small bundles
+            data = get_json_backend(self.json_backend).loads(stream.read())
+            return objects_to_Bundle(data.get("objects"), validate, bundle_id)
+
+
+def _check_compression(compression):
+    if compression not in ARCHIVE_COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression!r}, expected one of {ARCHIVE_COMPRESSIONS}")
+
+
+def _compressor(compression, fp, level):
+    """Returns a binary file object that compresses into fp; closing it leaves fp open."""
+    if compression == "gzip":
+        # mtime=0 so that the same bundle is always compressed to the same bytes
+        return gzip.GzipFile(fileobj=fp, mode="wb", compresslevel=6 if level is None else level, mtime=0)
+    import zstandard
+    return zstandard.ZstdCompressor(level=3 if level is None else level).stream_writer(fp, closefd=False)
+
+
+class _TextWriter:
+    """The text file object Bundle.dump writes to: encodes to UTF-8 and compresses in chunks."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.size = 0
+        self._chunks = []
+        self._buffered = 0
+
+    def write(self, text):
+        self._chunks.append(text)
+        self._buffered += len(text)
+        if self._buffered >= _WRITE_CHUNK:
+            self.flush()
+
+    def flush(self):
+        data = "".join(self._chunks).encode("utf-8")
+        self.size += len(data)
+        self.raw.write(data)
+        self._chunks.clear()
+        self._buffered = 0
+
+
+class _Window(io.RawIOBase):
+    """Reads `length` bytes of a file from `offset`, without moving other readers of it."""
+
+    def __init__(self, fp, offset, length):
+        self._fp = fp
+        self._position = offset
+        self._end = offset + length
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._end - self._position)
+        if size <= 0:
+            return 0
+        self._fp.seek(self._position)
+        data = self._fp.read(size)
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
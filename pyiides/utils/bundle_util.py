@@ -7,12 +7,17 @@ Licensed under a MIT (SEI)-style license, please see license.txt or contact perm
 [DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
 DM24-1597
 """
+import io
+import os
 import json
+import codecs
 import uuid
 import datetime
+import functools
 import random
 import string
 import copy
+from inspect import signature
 
 from pyiides import (
     Bundle,
@@ -38,15 +43,21 @@ from pyiides import (
     Collusion,
     OrgRelationship,
 )
-def json_to_Bundle(data):
+from pyiides.utils.helper_functions import OBJECT_TYPES, get_json_backend
+
+def json_to_Bundle(data, validate=True):
     """
     Converts JSON objects in the `objects` attribute to Python classes.
 
     This method iterates over the JSON objects, converts them to corresponding Python classes,
     and handles special relationships (collusion, orgRelationship) between the objects.
+    `data` is only read, so there is no need to copy it first to keep it or import it again.
 
     Args:
         data (json.loads): Loaded json data from an IIDES json bundle.
+        validate (bool): Run the type, vocabulary and uuid checks on every object. Pass False
+            only for bundles that were already validated, e.g. ones exported by PyIIDES, to
+            skip the checks and fill the objects directly.
 
     Returns:
         Bundle: The Bundle instance with all initializations and relationships set.
@@ -56,54 +67,67 @@ def json_to_Bundle(data):
     """
     
     # Get the objects from the Json
-    json_objects = data.get("objects")
-    
+    return objects_to_Bundle(data.get("objects"), validate)
+
+def json_stream_to_Bundle(fp, validate=True, backend=None):
+    """
+    Reads an IIDES json bundle from a file object without loading the whole document.
+
+    The `objects` array is walked one item at a time and each object is built as soon as it
+    is read, so only the objects themselves and the relationship records (which are wired
+    up once every object exists) are held in memory.
+
+    Args:
+        fp: A file object opened in text or binary mode.
+        validate (bool): See json_to_Bundle.
+        backend (str): "json" for the standard library reader or "ijson" to use ijson.
+            Defaults to ijson when it is installed.
+
+    Returns:
+        Bundle: The Bundle instance with all initializations and relationships set.
+
+    Example:
+        with open("Examples/example1.json", "rb") as f:
+            b = json_stream_to_Bundle(f)
+    """
+    return objects_to_Bundle(iter_json_objects(fp, backend), validate)
+
+def objects_to_Bundle(json_objects, validate=True, bundle_id=None):
+    """
+    Builds a Bundle from an iterable of IIDES json objects, as found in a bundle's
+    `objects` array.
+
+    Args:
+        json_objects (iterable): The json objects, as dicts. They are consumed once.
+        validate (bool): See json_to_Bundle.
+        bundle_id (str): The uuid of the bundle. Defaults to a new one.
+
+    Returns:
+        Bundle: The Bundle instance with all initializations and relationships set.
+    """
     all_classes = {}
+    index = {}
     relationships = []
     special_relationships = []
 
     # Iterate through each object in the bundle's objects
     for json_object in json_objects:
-        tag, pyiides_class = object_to_class(json_object)
+        tag, pyiides_class = object_to_class(json_object, validate)
         if tag == "Other":
             special_relationships.append(json_object)
         elif tag == "relationship":
             relationships.append(json_object)
         else:
             all_classes.setdefault(tag, []).append(pyiides_class)
+            index[(tag, pyiides_class.id)] = pyiides_class
     
-    # Handle special relationships (e.g., collusion, orgRelationship)
+    # Handle special relationships (e.g., collusion, orgRelationship), which
+    # refer to objects that have to exist first
     for special_relationship in special_relationships:
-        full_id = special_relationship.get("id")
-        index = full_id.find("--")
-        tag = full_id[:index]
-        relationship_id = full_id[index + 2:]
-
-        if tag == "collusion":
-            insiders = []
-            for class_list in all_classes.values():
-                for class_instance in class_list:
-                    if len(insiders) == 2:
-                        break
-                    if isinstance(class_instance, Insider) and (class_instance.id == special_relationship.get("insider1").id or class_instance.id == special_relationship.get("insider2").id):
-                        #TODO: The indexing above fails.
-                        insiders.append(class_instance)
-            if len(insiders) == 2:
-                collusion = Collusion(id=relationship_id, insider1=insiders[0], insider2=insiders[1], relationship=special_relationship.get("relationship"), recruitment=special_relationship.get("recruitment"))
-                all_classes.setdefault(tag, []).append(collusion)
-        else:
-            organizations = []
-            for class_list in all_classes.values():
-                for class_instance in class_list:
-                    if len(organizations) == 2:
-                        break
-                    org1 = special_relationship.get("org1")
-                    org2 = special_relationship.get("org2")
-                    if isinstance(class_instance, Organization) and (class_instance.id == org1[0:org1.find("--")] or class_instance.id == org2[0:org2.find("--")]):
-                        organizations.append(class_instance)
-            if len(organizations) == 2:
-                org_relationship = OrgRelationship(id=relationship_id, org1=organizations[0], org2=organizations[1], relationship=special_relationship.get("relationship"))
-                all_classes.setdefault(tag, []).append(org_relationship)
+        tag, pyiides_class = reference_to_class(special_relationship, index, validate)
+        if pyiides_class is not None:
+            all_classes.setdefault(tag, []).append(pyiides_class)
+            index[(tag, pyiides_class.id)] = pyiides_class
 
     # Establish relationships if incident exists
     incident = all_classes.get("incident", [None])[0]
@@ -168,184 +192,861 @@ def json_to_Bundle(data):
     for relationship in relationships:
         object1_id = relationship.get("object1")
         object2_id = relationship.get("object2")
-        add_relation(all_classes, object1_id, object2_id)
+        add_relation(all_classes, object1_id, object2_id, index)
     
-    return Bundle(objects=all_classes)
+    fields = {"objects": all_classes}
+    if bundle_id is not None:
+        fields["id"] = bundle_id
+    if not validate:
+        bundle = Bundle.from_trusted_dict(fields)
+    else:
+        bundle = Bundle(**fields)
+    bundle.reindex(index)
+    return bundle
+
+def Bundle_to_json(bundle, deterministic_ids=False, json_backend=None, canonical=False):
+    """
+    Converts Python classes in the `objects` attribute back to JSON objects.
+
+    This method processes the Python classes in the `objects` attribute, converting them back into JSON objects, including any relationships between them. Use Bundle.dump to write large bundles straight to a file instead.
+
+    Args:
+        bundle (Bundle): The bundle to convert.
+        deterministic_ids (bool): Derive relationship ids from the ids they connect instead of
+            generating random ones, so that exporting an unchanged bundle gives the same text.
+        json_backend (str): The json library to encode with, see get_json_backend. By default
+            the text is as json writes it, whatever is installed.
+        canonical (bool): Return the same text whichever json backend is used, on a single line
+            with sorted keys and deterministic relationship ids (see Bundle.dump).
+
+    Returns:
+        str: The JSON representation of the bundle, indented by 4 spaces unless canonical.
+    """
+    json_string = io.StringIO()
+    bundle.dump(json_string, indent=4, deterministic_ids=deterministic_ids,
+                json_backend=json_backend, canonical=canonical)
+    return json_string.getvalue()
+
+
+def json_str_to_Bundle(s, validate=True, json_backend=None):
+    """
+    Parses an IIDES json document and converts it to a Bundle, as
+    json_to_Bundle(json.loads(s)) but with the fastest json library installed.
+
+    Args:
+        s (str or bytes): The json text, e.g. the contents of an IIDES json file.
+        validate (bool): As for json_to_Bundle.
+        json_backend (str): The json library to parse with, see get_json_backend.
 
-def Bundle_to_json(bundle):
+    Returns:
+        Bundle: The bundle.
     """
-    Converts Python classes in the `objects` attribute back to JSON objects and writes to a file.
+    return json_to_Bundle(get_json_backend(json_backend).loads(s), validate)
 
-    This method processes the Python classes in the `objects` attribute, converting them back into JSON objects, including any relationships between them, and writes the JSON representation to a specified file.
+
+def iter_json_objects(fp, backend=None):
+    """
+    Yields the items of the top level `objects` array of a json bundle, one at a time.
 
     Args:
-        path (str): The file path where the JSON object will be written.
+        fp: A file object opened in text or binary mode.
+        backend (str): "json" or "ijson". Defaults to ijson when it is installed.
+
+    Raises:
+        ImportError: If backend is "ijson" and ijson is not installed.
+        ValueError: If backend is unknown or the document is not a json object.
     """
-    json_objects = []
-    all_instances = []
+    if backend is None:
+        try:
+            import ijson
+            backend = "ijson"
+        except ImportError:
+            backend = "json"
+
+    if backend == "ijson":
+        import ijson
+        return ijson.items(fp, "objects.item", use_float=True)
+    if backend == "json":
+        return _JsonObjectsReader(fp).items()
+    raise ValueError(f"Unknown json backend {backend!r}, expected 'json' or 'ijson'")
+
+
+class _JsonObjectsReader:
+    """
+    Incremental reader for the `objects` array of a json bundle using only the json module.
+
+    The document is read in chunks and every top level value, and every item of `objects`,
+    is decoded on its own with JSONDecoder.raw_decode. Values that run past the end of the
+    buffer are retried once more text has been read.
+    """
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, fp):
+        self._fp = fp
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = None
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def items(self):
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == "objects":
+                yield from self._array()
+            else:
+                self._value()
+            if self._next() == "}":
+                return
+            self._back()
+            self._expect(",")
+
+    def _array(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self._next()
+            return
+        while True:
+            yield self._value()
+            if self._next() == "]":
+                return
+            self._back()
+            self._expect(",")
+
+    def _read(self):
+        if self._eof:
+            return False
+        chunk = self._fp.read(self.CHUNK_SIZE)
+        if isinstance(chunk, bytes):
+            if self._text_decoder is None:
+                self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+            chunk = self._text_decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            self._eof = True
+            return False
+        # drop what has already been decoded before growing the buffer
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _skip_whitespace(self):
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\n\r":
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._read():
+                return
+
+    def _peek(self):
+        self._skip_whitespace()
+        if self._pos >= len(self._buffer):
+            raise ValueError("Unexpected end of json bundle")
+        return self._buffer[self._pos]
+
+    def _next(self):
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _back(self):
+        self._pos -= 1
+
+    def _expect(self, char):
+        found = self._next()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at offset {self._pos - 1} of the buffered json, found {found!r}")
+
+    def _value(self):
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._read():
+                    raise
+                continue
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._read():
+                continue
+            self._pos = end
+            return value
+
+
+# Layout of a bundle in MessagePack, see Bundle_to_msgpack
+MSGPACK_FORMAT = "iides-msgpack"
+MSGPACK_VERSION = 1
+
+# how each field is stored, listed per type in the type table
+_PLAIN, _ID, _CODES, _PAIR_CODES, _REFERENCE = range(5)
+
+
+class _NotCompact(Exception):
+    """A value that _pack_object cannot store in compact form."""
+
+
+def Bundle_to_msgpack(bundle):
+    """
+    Converts a bundle to MessagePack, a compact binary form of its IIDES json that
+    msgpack_to_Bundle reads back. Needs the msgpack package.
+
+    The document is the array [MSGPACK_FORMAT, MSGPACK_VERSION, bundle id, codes, types,
+    objects, relationships]:
+        codes           every vocabulary constant used, once. The vocabulary fields of the
+                        objects (see ObjectType.vocabs) hold indexes into this list.
+        types           [tag, field names, field kinds] for every type of object, so that
+                        the names are not repeated in each object.
+        objects         [type index, value, ...] with the values in the order of the type's
+                        field names. Ids are stored as 16 uuid bytes, and references such as
+                        Collusion.insider1 as the index of the object. An object whose values
+                        do not fit this, e.g. an id that is not a uuid, is stored as its json
+                        map instead.
+        relationships   The relationship records as a flat list of object1, object2 pairs,
+                        by object index (or id, for objects not in the bundle).
+    Relationship ids are not stored: like json_to_Bundle, the bundle does not keep them, and
+    exporting it to json generates them again (see Bundle.dump's deterministic_ids).
+
+    Args:
+        bundle (Bundle): The bundle to convert.
+
+    Returns:
+        bytes: The MessagePack document.
+
+    Raises:
+        ImportError: If msgpack is not installed.
+    """
+    import msgpack
+
+    records = []
+    positions = {}
+    for class_list in (bundle.objects or {}).values():
+        for class_instance in class_list:
+            json_object, children = class_instance.to_dict()
+            positions.setdefault(json_object.get("id"), len(records))
+            records.append((class_instance._object_type, json_object, children))
+
+    codes = {}
+    types = {}
+    objects = []
+    relationships = []
+    for position, (object_type, json_object, children) in enumerate(records):
+        objects.append(_pack_object(object_type, json_object, types, codes, positions))
+        for child in children or ():
+            relationships += (position, positions.get(child, child))
+
+    return msgpack.packb([
+        MSGPACK_FORMAT,
+        MSGPACK_VERSION,
+        _pack_uuid(bundle.id),
+        list(codes),
+        [[tag, fields, kinds] for tag, (_, fields, kinds, _) in types.items()],
+        objects,
+        relationships,
+    ], use_bin_type=True)
+
+
+def _pack_object(object_type, json_object, types, codes, positions):
+    tag = object_type.tag
+    if tag not in types:
+        fields = list(json_object)
+        kinds = [_field_kind(object_type, field) for field in fields]
+        special = [(position, kind) for position, kind in enumerate(kinds, 1) if kind != _PLAIN]
+        types[tag] = (len(types), fields, kinds, special)
+    type_index, fields, _, special = types[tag]
+    if list(json_object) != fields:
+        return json_object
+
+    def code(value):
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            raise _NotCompact
+        index = codes.get(value)
+        if index is None:
+            index = codes[value] = len(codes)
+        return index
+
+    # plain values are copied as they are, only the others are converted
+    record = [type_index, *json_object.values()]
+    try:
+        for position, kind in special:
+            value = record[position]
+            if value is None:
+                continue
+            if kind == _ID:
+                object_tag, object_id = split_id(value)
+                value = _pack_uuid(object_id)
+                if object_tag != tag or isinstance(value, str):
+                    raise _NotCompact
+            elif kind == _REFERENCE:
+                if not isinstance(value, str):
+                    raise _NotCompact
+                value = positions.get(value, value)
+            elif isinstance(value, str):
+                value = code(value)
+            elif not isinstance(value, (list, tuple)):
+                raise _NotCompact
+            elif kind == _PAIR_CODES:
+                value = [[code(constant) for constant in pair] for pair in value]
+            else:
+                # codes, or dated pairs [code, date]
+                value = [
+                    [code(item[0]), *item[1:]] if isinstance(item, (list, tuple)) and item else code(item)
+                    for item in value
+                ]
+            record[position] = value
+    except _NotCompact:
+        return json_object
+    return record
+
+
+def _field_kind(object_type, field):
+    if field == "id":
+        return _ID
+    if field in object_type.references:
+        return _REFERENCE
+    vocab = object_type.vocabs.get(field)
+    if vocab is None:
+        return _PLAIN
+    return _PAIR_CODES if isinstance(vocab, tuple) else _CODES
+
+
+def _pack_uuid(value):
+    """Returns the 16 bytes of a uuid string, or the string if they would not give it back."""
+    try:
+        packed = bytes.fromhex(value.replace("-", ""))
+    except (TypeError, ValueError, AttributeError):
+        return value
+    return packed if len(packed) == 16 and _unpack_uuid(packed) == value else value
+
+
+def _unpack_uuid(value):
+    if not isinstance(value, bytes):
+        return value
+    value = value.hex()
+    return f"{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}"
+
+
+def msgpack_to_Bundle(data, validate=True):
+    """
+    Converts a MessagePack document written by Bundle_to_msgpack back to a Bundle.
+    Needs the msgpack package.
+
+    Args:
+        data (bytes): The MessagePack document.
+        validate (bool): See json_to_Bundle.
 
-    # Collect all class instances from the dictionary
-    for obj in bundle.objects.values():
-        all_instances.extend(obj)
+    Returns:
+        Bundle: The Bundle instance with all initializations and relationships set, and the
+        id it was written with.
+
+    Raises:
+        ImportError: If msgpack is not installed.
+        ValueError: If data is not an IIDES MessagePack document of a known version.
+    """
+    import msgpack
+
+    document = msgpack.unpackb(data)
+    if not (isinstance(document, list) and len(document) == 7 and document[0] == MSGPACK_FORMAT):
+        raise ValueError("Not an IIDES MessagePack bundle")
+    _, version, bundle_id, codes, types, objects, relationships = document
+    if version != MSGPACK_VERSION:
+        raise ValueError(f"Unsupported IIDES MessagePack version {version!r}, expected {MSGPACK_VERSION}")
+
+    # index -> constant, and None -> None, so that lists decode with map()
+    constant = dict(enumerate(codes))
+    constant[None] = None
+    constant = constant.__getitem__
+
+    # tag, field names, and the names of the fields of each kind
+    type_fields = []
+    for tag, fields, kinds in types:
+        by_kind = ([], [], [], [], [])
+        for field, kind in zip(fields, kinds):
+            by_kind[kind].append(field)
+        type_fields.append((tag, fields, by_kind[_ID], by_kind[_CODES], by_kind[_PAIR_CODES], by_kind[_REFERENCE]))
 
-    # Convert each class instance to a JSON object
-    for class_instance in all_instances:
-        json_object, relationships = class_instance.to_dict()
+    json_objects = []
+    references = []
+    for record in objects:
+        if isinstance(record, dict):
+            json_objects.append(record)
+            continue
+        tag, fields, id_fields, code_fields, pair_fields, reference_fields = type_fields[record[0]]
+        json_object = dict(zip(fields, record[1:]))
+        for field in id_fields:
+            value = json_object[field]
+            if value is not None:
+                json_object[field] = f"{tag}--{_unpack_uuid(value)}"
+        for field in code_fields:
+            value = json_object[field]
+            if value is None:
+                continue
+            if value.__class__ is int:
+                json_object[field] = constant(value)
+                continue
+            try:
+                json_object[field] = list(map(constant, value))
+            except TypeError:
+                # dated pairs [code, date]
+                json_object[field] = [
+                    [constant(item[0]), *item[1:]] if isinstance(item, list) and item else constant(item)
+                    for item in value
+                ]
+        for field in pair_fields:
+            value = json_object[field]
+            if value is not None:
+                json_object[field] = [list(map(constant, pair)) for pair in value]
+        for field in reference_fields:
+            if json_object[field].__class__ is int:
+                references.append((json_object, field))
         json_objects.append(json_object)
 
-        object1_id = json_object.get("id")
-        if relationships:
-            for object2_id in relationships:
-                relationship_struct = {
-                    "id": f"relationship--{uuid.uuid4()}",
-                    "object1": object1_id,
-                    "object2": object2_id
-                }
-                json_objects.append(relationship_struct)
+    ids = [json_object.get("id") for json_object in json_objects]
+    for json_object, field in references:
+        json_object[field] = ids[json_object[field]]
+    for i in range(0, len(relationships), 2):
+        object1, object2 = (ids[value] if isinstance(value, int) else value for value in relationships[i:i + 2])
+        # objects_to_Bundle only reads the tag of a relationship id, and
+        # exporting the bundle generates new ones
+        json_objects.append({"id": "relationship--", "object1": object1, "object2": object2})
+
+    return objects_to_Bundle(json_objects, validate, _unpack_uuid(bundle_id))
 
-    # Create the final bundle dictionary
-    bundle_dict = {
-        "id": f"bundle--{bundle.id}",
-        "objects": json_objects
-    }
 
-    # Convert the bundle dictionary to a JSON string
-    json_string = json.dumps(bundle_dict, indent=4)
+# The sidecar index of an NDJSON bundle file is the file's path with this suffix
+NDJSON_INDEX_SUFFIX = ".index"
 
-    # Write the JSON string to the specified file
-    return json_string
 
+def append_ndjson(path, bundles, objects_per_line=False, json_backend=None):
+    """
+    Appends bundles to a newline-delimited json (NDJSON) file, which
+    NdjsonReader reads back, and records where each one is in the file's
+    sidecar index (path + NDJSON_INDEX_SUFFIX).
+
+    By default every bundle is one line, its json document as written by
+    Bundle.dump on a single line. With objects_per_line every bundle is a
+    line {"id": "bundle--<uuid>"} followed by one line per item of its
+    `objects` array (see Bundle.records), so that each line stays small.
+    Both layouts can be mixed in one file.
+
+    The index is itself NDJSON, one line per bundle:
+        {"bundle": "bundle--<uuid>", "offset": <byte offset>, "length": <bytes>,
+         "incidents": ["incident--<uuid>", ...]}
+    If the file has bundles the index does not cover, e.g. because it was
+    written by another tool or the index was deleted, they are indexed first,
+    and an incomplete last line left by an interrupted write is removed. An
+    index that covers more than the file, left behind when the file was
+    deleted or replaced, is rebuilt from the file.
 
+    Args:
+        path (str): The NDJSON file. It is created if needed.
+        bundles (iterable): The Bundle objects to append.
+        objects_per_line (bool): Write one line per object instead of one per
+            bundle.
+        json_backend (str): The json library to encode with, see
+            get_json_backend.
+
+    Returns:
+        list: The index entries of the appended bundles.
+    """
+    backend = get_json_backend(json_backend)
+    _load_ndjson_index(path, backend, repair=True)
+
+    entries = []
+    with open(path, "ab") as fp, open(path + NDJSON_INDEX_SUFFIX, "ab") as index_fp:
+        offset = fp.tell()
+        for bundle in bundles:
+            bundle_id = f"bundle--{bundle.id}"
+            if objects_per_line:
+                lines = [backend.dumps({"id": bundle_id})]
+                lines.extend(backend.dumps(record) for record in bundle.records())
+                text = "\n".join(lines)
+            else:
+                text = io.StringIO()
+                bundle.dump(text, json_backend=json_backend)
+                text = text.getvalue()
+            data = (text + "\n").encode("utf-8")
+            fp.write(data)
+
+            entry = {
+                "bundle": bundle_id,
+                "offset": offset,
+                "length": len(data),
+                "incidents": [f"incident--{incident.id}" for incident in (bundle.objects or {}).get("incident", ())],
+            }
+            index_fp.write((backend.dumps(entry) + "\n").encode("utf-8"))
+            entries.append(entry)
+            offset += len(data)
+    return entries
+
+
+def _load_ndjson_index(path, backend, repair=False):
+    """
+    Returns the entries of the index of an NDJSON bundle file, after indexing
+    the bundles at the end of the file that it does not cover yet. With
+    repair, those entries are added to the index file and an incomplete last
+    line is cut from the NDJSON file, so that it can be appended to.
+
+    An index that covers more than the NDJSON file, e.g. one left behind when
+    the file was deleted or replaced, is stale: it is discarded and the file
+    indexed from the start, and with repair the index file is rewritten.
+    """
+    entries = []
+    index_path = path + NDJSON_INDEX_SUFFIX
+    if os.path.exists(index_path):
+        with open(index_path, "rb") as index_fp:
+            lines = index_fp.readlines()
+        if lines and not lines[-1].endswith(b"\n"):
+            lines.pop()
+            if repair:
+                with open(index_path, "wb") as index_fp:
+                    index_fp.writelines(lines)
+        entries = [backend.loads(line) for line in lines]
+
+    end = entries[-1]["offset"] + entries[-1]["length"] if entries else 0
+    size = os.path.getsize(path) if os.path.exists(path) else None
+    stale = entries and (size is None or size < end)
+    if stale:
+        entries, end = [], 0
+    if size is None:
+        if stale and repair:
+            os.remove(index_path)
+        return entries
+
+    with open(path, "rb") as fp:
+        fp.seek(end)
+        missing, end = _scan_ndjson(fp, end, backend)
+    if repair:
+        if missing or stale:
+            with open(index_path, "wb" if stale else "ab") as index_fp:
+                index_fp.writelines((backend.dumps(entry) + "\n").encode("utf-8") for entry in missing)
+        if os.path.getsize(path) > end:
+            os.truncate(path, end)
+    return entries + missing
+
+
+def _scan_ndjson(fp, offset, backend):
+    """
+    Indexes the bundles of an NDJSON bundle file from its current position,
+    which is at `offset`. Returns the entries and the offset after the last
+    complete line.
+    """
+    entries = []
+    entry = None
+    for line in fp:
+        if not line.endswith(b"\n"):
+            break
+        if line.strip():
+            record = backend.loads(line)
+            record_id = record.get("id") or ""
+            if record_id.startswith("bundle--"):
+                entry = {"bundle": record_id, "offset": offset, "length": 0, "incidents": []}
+                entries.append(entry)
+                for json_object in record.get("objects") or ():
+                    if json_object.get("id", "").startswith("incident--"):
+                        entry["incidents"].append(json_object["id"])
+            elif entry is None:
+                raise ValueError(f"The NDJSON line at byte {offset} is not in a bundle")
+            elif record_id.startswith("incident--"):
+                entry["incidents"].append(record_id)
+        offset += len(line)
+        if entry is not None:
+            entry["length"] = offset - entry["offset"]
+    return entries, offset
+
+
+def _replace_entry(bundles, incidents, entry):
+    """
+    Adds the index entry of a bundle, e.g. an NdjsonReader entry, to
+    bundle id -> entry and incident id -> entry. An earlier entry of the same
+    bundle is replaced, with the incidents only it had, and the bundle moves
+    to the end, where the new copy is.
+    """
+    previous = bundles.pop(entry["bundle"], None)
+    if previous is not None:
+        for incident_id in previous["incidents"]:
+            if incidents.get(incident_id) is previous:
+                del incidents[incident_id]
+    bundles[entry["bundle"]] = entry
+    for incident_id in entry["incidents"]:
+        incidents[incident_id] = entry
+
+
+class NdjsonReader:
+    """
+    Reads the bundles of an NDJSON file written by append_ndjson. The sidecar
+    index is loaded when the reader is created (and built from the file if
+    it is missing or behind), so that get and find_incident read only the
+    lines of the requested bundle.
+
+    Args:
+        path (str): The NDJSON file.
+        validate (bool): As for json_to_Bundle.
+        json_backend (str): The json library to parse with, see
+            get_json_backend.
+
+    Example:
+        >>> with NdjsonReader("corpus.ndjson") as reader:
+        ...     bundle = reader.find_incident("incident--123e4567-e89b-12d3-a456-426614174000")
+    """
+
+    def __init__(self, path, validate=True, json_backend=None):
+        self.path = path
+        self.validate = validate
+        self._backend = get_json_backend(json_backend)
+        self.entries = _load_ndjson_index(path, self._backend)
+        self._bundles = {}
+        self._incidents = {}
+        for entry in self.entries:
+            # a bundle appended again replaces the earlier copy
+            _replace_entry(self._bundles, self._incidents, entry)
+        self._fp = open(path, "rb")
+
+    def __len__(self):
+        return len(self._bundles)
+
+    def __iter__(self):
+        """
+        Yields every bundle in the file, in order; a bundle appended again is
+        read once, its latest copy, at its place.
+        """
+        for entry in list(self._bundles.values()):
+            yield self._read(entry)
+
+    def __contains__(self, bundle_id):
+        return full_id("bundle", bundle_id) in self._bundles
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._fp.close()
+
+    def bundle_ids(self):
+        """Returns the ids of the bundles in the file ("bundle--<uuid>")."""
+        return list(self._bundles)
+
+    def get(self, bundle_id):
+        """
+        Reads one bundle.
+
+        Args:
+            bundle_id (str): Its id, with or without the "bundle--" tag.
+
+        Raises:
+            KeyError: If the file has no such bundle.
+        """
+        return self._read(self._bundles[full_id("bundle", bundle_id)])
+
+    def find_incident(self, incident_id):
+        """
+        Reads the bundle that has an incident.
+
+        Args:
+            incident_id (str): The incident's id, with or without the
+                "incident--" tag.
+
+        Raises:
+            KeyError: If no bundle in the file has the incident.
+        """
+        return self._read(self._incidents[full_id("incident", incident_id)])
+
+    def _read(self, entry):
+        self._fp.seek(entry["offset"])
+        lines = self._fp.read(entry["length"]).splitlines()
+        loads = self._backend.loads
+        record = loads(lines[0])
+        if "objects" in record:
+            json_objects = record["objects"] or ()
+        else:
+            json_objects = (loads(line) for line in lines[1:] if line.strip())
+        return objects_to_Bundle(json_objects, self.validate, split_id(entry["bundle"])[1])
+
+
+def split_id(full_id):
+    """
+    Splits an IIDES id ("<tag>--<uuid>") into its tag and uuid.
+
+    Returns:
+        tuple: (tag, uuid)
+    """
+    separator_index = full_id.find("--")
+    return full_id[:separator_index], full_id[separator_index + 2:]
+
+
+def full_id(tag, value):
+    """
+    Returns an IIDES id with its tag, e.g. "incident--<uuid>" for
+    ("incident", "<uuid>"), leaving ids that already have it as they are.
+    """
+    return value if value.startswith(tag + "--") else f"{tag}--{value}"
+
+
+# Dates repeat a lot across the objects of a corpus, and datetime objects are
+# immutable, so the parsed values are cached and shared between objects.
+DATE_CACHE_SIZE = 4096
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
 def date_str_to_obj(s: str) -> datetime.date:
+    """
+    Parses an ISO 8601 date or datetime string, e.g. a Job hire_date.
+    Results are cached, see DATE_CACHE_SIZE.
+    """
     if s == None:
         return None
 
     return datetime.datetime.fromisoformat(s)
 
 
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
 def datetime_str_to_obj(s: str) -> datetime.datetime:
+    """
+    Parses a "%Y-%m-%dT%H:%M:%SZ" string, e.g. a TTP date, into a naive
+    datetime. Results are cached, see DATE_CACHE_SIZE.
+    """
     if s == None:
         return None
 
-    return datetime.datetime.strptime(s, "%Y-%m-%dT%H:%M:%SZ")
+    # strptime is slow; strings in exactly this layout are parsed by
+    # fromisoformat, and anything else by strptime, which also raises the
+    # usual errors
+    if (len(s) == 20 and s[19] == "Z" and s[10] == "T" and s[4] == s[7] == "-"
+            and s[13] == s[16] == ":"):
+        try:
+            return datetime.datetime.fromisoformat(s[:19])
+        except ValueError:
+            pass
 
+    return datetime.datetime.strptime(s, DATETIME_FORMAT)
 
-def object_to_class(json_object):
+
+def object_to_class(json_object, validate=True):
     """
     Converts a JSON object to its corresponding Python class based on its ID tag.
 
+    The class and the fields to convert are looked up in OBJECT_TYPES, where
+    the classes register themselves with @iides_object. Relationships, and
+    objects that refer to other objects (collusions, org relationships), are
+    not converted: their tag is returned as "relationship" and "Other", and
+    objects_to_Bundle handles them once every object exists.
+
+    json_object is not changed, so it can be kept or imported again: the
+    instance gets copies of its lists, such as Insider.motive, and of the
+    pairs in them.
+
     Args:
         json_object (dict): The JSON object to be converted.
+        validate (bool): Run the class constructor checks. When False the object is
+            built with from_trusted_dict instead.
 
     Returns:
         tuple: A tuple containing the tag and the corresponding Python class instance.
     """
-    full_id = json_object.get("id")
-    separator_index = full_id.find("--")
-    tag = full_id[:separator_index]
-    object_id = full_id[separator_index + 2:]
-
-    json_object["id"] = object_id
-
-    if tag == "accomplice":
-        return tag, Accomplice(**json_object)
-
-    if tag == "charge":
-        return tag, Charge(**json_object)
-
-    if tag == "court-case":
-        return tag, CourtCase(**json_object)
-
-    if tag == "detection":
-        json_object["first_detected"] = datetime_str_to_obj(json_object.get("first_detected"))
-        return tag, Detection(**json_object)
-
-    if tag == "impact":
-        return tag, Impact(**json_object)
+    tag, object_id = split_id(json_object.get("id"))
+    object_type = OBJECT_TYPES.get(tag)
 
-    if tag == "incident":
-        return tag, Incident(**json_object)
+    if object_type is None or object_type.references:
+        return ("relationship" if tag == "relationship" else "Other"), None
 
-    if tag == "insider":
-        predispositions = json_object.get("predispositions")
-        if predispositions:
-            json_object["predispositions"] = [tuple(item) for item in predispositions]
+    # the constructor arguments are a new dict with new lists, json_object is
+    # left as it is
+    values = copy_lists(object_type, json_object)
+    values["id"] = object_id
+    decode_fields(object_type, values)
+    return tag, construct_object(object_type, values, validate)
 
-        concerning_behaviors = json_object.get("concerning_behaviors")
-        if concerning_behaviors:
-            json_object["concerning_behaviors"] = [tuple(item) for item in concerning_behaviors]
 
-        return tag, Insider(**json_object)
-
-    if tag == "job":
-        json_object["hire_date"] = date_str_to_obj(json_object.get("hire_date"))
-        json_object["departure_date"] = date_str_to_obj(json_object.get("departure_date"))
-
-        if json_object.get("hire_date") and json_object.get("departure_date"):
-            json_object["tenure"] = json_object["departure_date"] - json_object["hire_date"]
+def reference_to_class(json_object, index, validate=True):
+    """
+    Converts a JSON object that refers to other objects, such as a collusion
+    between two insiders, to its Python class.
 
-        return tag, Job(**json_object)
+    Args:
+        json_object (dict): The JSON object to be converted.
+        index (dict): (tag, id) -> instance of the objects it may refer to.
+        validate (bool): See object_to_class.
 
-    if tag == "legal-response":
-        json_object["law_enforcement_contacted"] = date_str_to_obj(json_object.get("law_enforcement_contacted"))
-        json_object["insider_arrested"] = date_str_to_obj(json_object.get("insider_arrested"))
-        json_object["insider_charged"] = date_str_to_obj(json_object.get("insider_charged"))
-        json_object["insider_pleads"] = date_str_to_obj(json_object.get("insider_pleads"))
-        json_object["insider_judgment"] = date_str_to_obj(json_object.get("insider_judgment"))
-        json_object["insider_sentenced"] = date_str_to_obj(json_object.get("insider_sentenced"))
-        json_object["insider_charges_dropped"] = date_str_to_obj(json_object.get("insider_charges_dropped"))
-        json_object["insider_charges_dismissed"] = date_str_to_obj(json_object.get("insider_charges_dismissed"))
-        json_object["insider_settled"] = date_str_to_obj(json_object.get("insider_settled"))
+    Returns:
+        tuple: The tag and the instance, or None if the tag is unknown or an
+            object it refers to is missing or of the wrong class.
+    """
+    tag, object_id = split_id(json_object.get("id"))
+    object_type = OBJECT_TYPES.get(tag)
+    if object_type is None:
+        return tag, None
 
-        return tag, LegalResponse(**json_object)
-    
-    if tag == "note":
-        date_str = json_object.get("date")
-        if date_str:
-            json_object["date"] = datetime.datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
-        return tag, Note(**json_object)
+    # these constructors take no extra keyword arguments
+    parameters = signature(object_type.cls.__init__).parameters
+    values = copy_lists(object_type, {key: value for key, value in json_object.items() if key in parameters})
+    values["id"] = object_id
 
-    if tag == "organization":
-        return tag, Organization(**json_object)
+    for field, reference_tag in object_type.references.items():
+        reference = json_object.get(field)
+        referenced = index.get(split_id(reference)) if isinstance(reference, str) else None
+        if not isinstance(referenced, OBJECT_TYPES[reference_tag].cls):
+            return tag, None
+        values[field] = referenced
 
-    if tag == "person":
-        return tag, Person(**json_object)
-        #TODO, fix, insider holds a lot of person attributes, and needs them imported here
+    decode_fields(object_type, values)
+    return tag, construct_object(object_type, values, validate)
 
-    if tag == "response":
-        return tag, Response(**json_object)
 
-    if tag == "sentence":
-        return tag, Sentence(**json_object)
+def copy_lists(object_type, json_object):
+    """
+    Returns a copy of the fields of a json object in which the lists, and the
+    pairs in its dated pairs, are new lists, so that the instance made from
+    it does not share them with the json. decode_fields makes new tuples of
+    the pairs of the tuples fields.
+    """
+    values = {key: list(value) if isinstance(value, list) else value for key, value in json_object.items()}
+    for name in object_type.dated_pairs:
+        value = values.get(name)
+        if value:
+            values[name] = [list(item) if isinstance(item, list) else item for item in value]
+    return values
 
-    if tag == "source":
-        json_object["date"] = datetime_str_to_obj(json_object.get("date"))
-        return tag, Source(**json_object)
 
-    if tag == "sponsor":
-        return tag, Sponsor(**json_object)
+def decode_fields(object_type, values):
+    """
+    Converts the json fields of an object to the Python types of its class,
+    as declared by its ObjectType: dates and datetimes are parsed and pairs
+    become tuples. `values` is changed in place.
+    """
+    for name in object_type.dates:
+        value = values.get(name)
+        if value:
+            values[name] = date_str_to_obj(value)
 
-    if tag == "stressor":
-        date_str = json_object.get("date")
-        if date_str:
-            json_object["date"] = datetime.datetime.fromisoformat(date_str)
-        return tag, Stressor(**json_object)
+    for name in object_type.datetimes:
+        value = values.get(name)
+        if value:
+            values[name] = datetime_str_to_obj(value)
 
-    if tag == "target":
-        return tag, Target(**json_object)
+    for name in object_type.tuples:
+        value = values.get(name)
+        if value:
+            values[name] = [tuple(item) for item in value]
 
-    if tag == "ttp":
-        date_str = json_object.get("date")
-        if date_str:
-            json_object["date"] = datetime.datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
-        return tag, TTP(**json_object)
+    if object_type.derive is not None:
+        object_type.derive(values)
 
-    if tag == "relationship":
-        json_object["id"] = f"{tag}--{object_id}"
-        return "relationship", None
 
-    json_object["id"] = f"{tag}--{object_id}"
-    return "Other", None
+def construct_object(object_type, values, validate=True):
+    """
+    Creates an instance of the class of object_type from its constructor
+    arguments, with validation or through from_trusted_dict.
+    """
+    if validate:
+        return object_type.cls(**values)
+    return object_type.cls.from_trusted_dict(values)
 
 
 def find_class(classes_dict, tag, id):
@@ -374,7 +1075,7 @@ def find_class(classes_dict, tag, id):
     
     return None
 
-def add_relation(classes_dict, id1, id2):
+def add_relation(classes_dict, id1, id2, index=None):
     """
     Adds a relationship between two class instances based on their IDs.
 
@@ -382,23 +1083,22 @@ def add_relation(classes_dict, id1, id2):
         classes_dict (dict): Dictionary containing lists or single instances of classes, keyed by tag.
         id1 (str): The unique identifier of the first class instance.
         id2 (str): The unique identifier of the second class instance.
+        index (dict): Optional (tag, id) -> instance index of classes_dict. When given the
+            instances are looked up in it instead of scanning classes_dict.
 
     Raises:
         ReferenceError: If one of the classes for the specified IDs does not exist.
     """
-    # Extract tag and UUID from id1
-    index1 = id1.find("--")
-    tag1 = id1[:index1]
-    uuid1 = id1[index1 + 2:]
-
-    # Extract tag and UUID from id2
-    index2 = id2.find("--")
-    tag2 = id2[:index2]
-    uuid2 = id2[index2 + 2:]
+    tag1, uuid1 = split_id(id1)
+    tag2, uuid2 = split_id(id2)
 
     # Find the corresponding class instances
-    class1 = find_class(classes_dict, tag1, uuid1)
-    class2 = find_class(classes_dict, tag2, uuid2)
+    if index is not None:
+        class1 = index.get((tag1, uuid1))
+        class2 = index.get((tag2, uuid2))
+    else:
+        class1 = find_class(classes_dict, tag1, uuid1)
+        class2 = find_class(classes_dict, tag2, uuid2)
 
     # Check if either class instance does not exist
     if class1 is None or class2 is None:
@@ -462,8 +1162,8 @@ def anonymize_bundle(bundle):
     Returns:
         Bundle: The anonymized bundle with all personally identifiable information removed.
     """
-    from pyiides.utils.helper_functions import extract_constants
-    import random, string, copy, datetime
+    from pyiides.utils.helper_functions import VOCAB
+    import random, string, datetime
 
     def anonymize_case_number():
         part1 = random.randint(1, 9)
@@ -486,9 +1186,12 @@ def anonymize_bundle(bundle):
     anon_lastname = "Doe"
     anon_victimorg = "Company A"
     anon_orgname = "Company X"
-    random_state = random.choice(extract_constants("state-vocab-us"))
+    random_state = random.choice(VOCAB.ordered_constants("state-vocab-us"))
 
-    anon_bundle = Bundle(objects=copy.deepcopy(bundle.objects))
+    # the clone shares every value with the original, so only the redacted
+    # fields below allocate anything new
+    anon_bundle = bundle.clone()
+    anon_bundle.id = str(uuid.uuid4())
     org_count = len(anon_bundle.objects.get("organization"))
 
     for class_list in anon_bundle.objects.values():
@@ -536,7 +1239,7 @@ def anonymize_bundle(bundle):
                 if hasattr(obj, 'middle_name'):
                     obj.middle_name = anon_middlename
                 if hasattr(obj, 'suffix'):
-                    obj.suffix = random.choice(extract_constants("suffix-vocab"))
+                    obj.suffix = random.choice(VOCAB.ordered_constants("suffix-vocab"))
                 if hasattr(obj, 'alias') and obj.alias:
                     del obj.alias
                 if hasattr(obj, 'city'):
@@ -579,15 +1282,24 @@ def anonymize_bundle(bundle):
             elif isinstance(obj, Response):
                 if hasattr(obj, 'comment'):
                     obj.comment = "Redacted for anonymity."
-                if hasattr(obj, 'technical_controls'):
-                    for control in obj.technical_controls:
-                        control[1] = anonymize_date(reference=date_str_to_obj(control[1]))
-                if hasattr(obj, 'behavioral_controls'):
-                    for control in obj.behavioral_controls:
-                        control[1] = anonymize_date(reference=date_str_to_obj(control[1]))
-                if hasattr(obj, 'investigation_events'):
-                    for event in obj.investigation_events:
-                        event[1] = anonymize_date(reference=date_str_to_obj(event[1]))
+                if hasattr(obj, 'technical_controls') and obj.technical_controls:
+                    # replace the entries instead of editing them, they are shared with the original
+                    obj.technical_controls = [
+                        [control[0], anonymize_date(reference=date_str_to_obj(control[1]))]
+                        for control in obj.technical_controls
+                    ]
+                if hasattr(obj, 'behavioral_controls') and obj.behavioral_controls:
+                    # replace the entries instead of editing them, they are shared with the original
+                    obj.behavioral_controls = [
+                        [control[0], anonymize_date(reference=date_str_to_obj(control[1]))]
+                        for control in obj.behavioral_controls
+                    ]
+                if hasattr(obj, 'investigation_events') and obj.investigation_events:
+                    # replace the entries instead of editing them, they are shared with the original
+                    obj.investigation_events = [
+                        [event[0], anonymize_date(reference=date_str_to_obj(event[1]))]
+                        for event in obj.investigation_events
+                    ]
             elif isinstance(obj, Note):
                 if hasattr(obj, 'date'):
                     obj.date = anonymize_date(reference=obj.date)
@@ -640,9 +1352,5 @@ def anonymize_bundle(bundle):
                     obj.title = "Redacted for anonymity."
                 if hasattr(obj, 'document'):
                     obj.document = "Redacted for anonymity."
-    for anon_list, origin_list in zip(anon_bundle.objects.values(), bundle.objects.values()):
-        for anon_obj, obj, in zip(anon_list, origin_list):
-            print(f"ANONY:{anon_obj}\n----------------------------------------\nORIGINAL:{obj}\n\n")
-    # print(f"{anon_bundle.objects} \n--------------------\n {bundle.objects}")
     print("Anonymized bundle successfully.")
     return anon_bundle
\ No newline at end of file
@@ -0,0 +1,356 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import functools
+
+from pyiides.utils.helper_functions import OBJECT_TYPES, CHANGE_LISTENERS, RelationshipList, instance_dict
+from pyiides.utils.bundle_util import full_id
+from pyiides.utils.table_util import table_columns
+
+"""
+- - - - - - - - - - - - - - - - - - - - -
+
+        In-Memory Corpus
+
+- - - - - - - - - - - - - - - - - - - - -
+"""
+
+# Fields that are not vocabularies but are also indexed, since they are
+# matched by exact value like codes, e.g. the U.S. Code title and section of
+# a charge
+EXTRA_INDEXED_FIELDS = {"charge": ("title", "section")}
+
+
+@functools.lru_cache(maxsize=None)
+def indexed_fields(tag):
+    """
+    Returns the fields of an IIDES type that a Corpus indexes: its
+    vocabulary fields (ObjectType.vocabs) and those of EXTRA_INDEXED_FIELDS.
+
+    Raises:
+        KeyError: If there is no such type.
+    """
+    object_type = OBJECT_TYPES[tag]
+    return tuple(object_type.vocabs) + tuple(
+        field for field in EXTRA_INDEXED_FIELDS.get(tag, ()) if field not in object_type.vocabs)
+
+
+@functools.lru_cache(maxsize=None)
+def _parent_attributes(tag):
+    # the relationships to single objects, e.g. TTP._incident or Job._insider
+    return tuple(column.attribute for column in table_columns(tag)[2:] if column.kind == "reference")
+
+
+def _codes(object_type, field, value):
+    """Returns the codes in the value of an indexed field."""
+    if value is None:
+        return ()
+    return _code_getter(object_type, field)(value)
+
+
+def _code_getter(object_type, field):
+    # the function that returns the codes in a value of the field, other than None
+    if field in object_type.tuples:
+        return lambda value: [code for pair in value for code in pair if code is not None]
+    if field in object_type.dated_pairs:
+        return lambda value: [pair[0] for pair in value]
+    return lambda value: (value,) if isinstance(value, str) else value
+
+
+def related_incidents(obj):
+    """
+    Returns the incidents an IIDES object belongs to: those its
+    relationships to single objects lead to, e.g. a charge to the incident
+    of the response of the legal response of its court case, or, for an
+    object without such relationships, like a sponsor, those of the objects
+    it is related to. An incident belongs to itself.
+    """
+    incidents = []
+    seen = {obj}
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        tag = obj._object_type.tag
+        if tag == "incident":
+            incidents.append(obj)
+            continue
+        attributes = _parent_attributes(tag)
+        if attributes:
+            related = [getattr(obj, attribute, None) for attribute in attributes]
+        else:
+            related = [item for value in instance_dict(obj).values()
+                       if isinstance(value, RelationshipList) for item in value]
+        for parent in related:
+            if parent is not None and parent not in seen:
+                seen.add(parent)
+                stack.append(parent)
+    return incidents
+
+
+class Corpus:
+    """
+    Many bundles in memory, with hash indexes from the values of vocabulary
+    fields to the objects that have them, e.g. TTP.technique -> {ttp, ...},
+    so that queries intersect sets of matching objects instead of scanning
+    every object.
+
+    The fields of indexed_fields are indexed: a list by each code in it, a
+    list of (type, subtype) pairs by both codes of each pair and a list of
+    dated pairs by their codes.
+
+    The indexes follow the append_* and remove_* methods of the objects in the
+    corpus (see helper_functions.CHANGE_LISTENERS): an appended code, e.g.
+    incident.append_outcome("BR"), is indexed, and an object appended to one
+    in the corpus, e.g. incident.append_ttp(ttp), joins the corpus as part of
+    the same bundle. Queries about incidents follow the relationships as they
+    are when the query runs, so incident.remove_ttp(ttp) takes effect at once.
+    Call reindex() after assigning a field, e.g. ttp.technique = "3.2", and
+    add() a bundle again after changing its objects lists.
+
+    Args:
+        bundles (iterable): The Bundle objects to add.
+
+    Example:
+        >>> corpus = Corpus(bundles)
+        >>> ttps = corpus.find("ttp", "technique", "3.2")
+        >>> incidents = corpus.find_incidents(
+        ...     ("ttp", "technique", "3.2"),
+        ...     ("incident", "outcome", "BR"),
+        ...     ("organization", "industry_sector", "11"))
+        >>> bundle = corpus.bundle_of(incidents.pop())
+    """
+
+    def __init__(self, bundles=()):
+        # bundle id -> Bundle
+        self._bundles = {}
+        # bundle id -> the objects of the bundle in the corpus
+        self._members = {}
+        # object -> the id of its bundle (IIDES objects hash by identity)
+        self._bundle_ids = {}
+        # (tag, field) -> {code: set of objects}
+        self._postings = {}
+        # ObjectType -> [(attribute, code getter, {code: set of objects}), ...] of its indexed fields
+        self._fields = {}
+        # object -> [{code: set of objects}, code, ...], the sets it is in, flat
+        self._entries = {}
+        for bundle in bundles:
+            self.add(bundle)
+        CHANGE_LISTENERS.add(self)
+
+    def __len__(self):
+        return len(self._bundles)
+
+    def __contains__(self, bundle_id):
+        return full_id("bundle", bundle_id) in self._bundles
+
+    def __iter__(self):
+        return iter(list(self._bundles.values()))
+
+    def bundle_ids(self):
+        """Returns the ids of the bundles ("bundle--<uuid>"), in the order they were added."""
+        return list(self._bundles)
+
+    def get(self, bundle_id):
+        """
+        Returns a bundle by its id, with or without the "bundle--" tag.
+
+        Raises:
+            KeyError: If the corpus does not have it.
+        """
+        return self._bundles[full_id("bundle", bundle_id)]
+
+    def bundle_of(self, obj):
+        """
+        Returns the bundle an object of the corpus belongs to.
+
+        Raises:
+            KeyError: If the object is not in the corpus.
+        """
+        return self._bundles[self._bundle_ids[obj]]
+
+    def add(self, bundle):
+        """
+        Adds a bundle and indexes its objects. A bundle with the same id is
+        replaced. An object that is already in the corpus, as part of
+        another bundle, stays part of that one.
+        """
+        bundle_id = f"bundle--{bundle.id}"
+        if bundle_id in self._bundles:
+            self.remove(bundle_id)
+        self._bundles[bundle_id] = bundle
+        self._members[bundle_id] = []
+        for class_list in (bundle.objects or {}).values():
+            for obj in class_list:
+                if getattr(obj, "_object_type", None) is not None:
+                    self._join(obj, bundle_id)
+
+    def remove(self, bundle_id):
+        """
+        Removes a bundle and its objects from the indexes.
+
+        Raises:
+            KeyError: If the corpus does not have it.
+        """
+        bundle_id = full_id("bundle", bundle_id)
+        del self._bundles[bundle_id]
+        for obj in self._members.pop(bundle_id):
+            del self._bundle_ids[obj]
+            self._unindex(obj)
+
+    def reindex(self, obj=None):
+        """
+        Indexes an object of the corpus again, after one of its fields was
+        assigned, or, without an object, rebuilds every index.
+
+        Raises:
+            KeyError: If the object is not in the corpus.
+        """
+        if obj is None:
+            self._postings = {}
+            self._fields = {}
+            self._entries = {}
+            for objects in self._members.values():
+                for member in objects:
+                    self._index(member)
+        else:
+            if obj not in self._bundle_ids:
+                raise KeyError(obj)
+            self._unindex(obj)
+            self._index(obj)
+
+    def find(self, tag, field, value):
+        """
+        Returns the objects of a type whose field has a value, or, for a list,
+        contains it.
+
+        Args:
+            tag (str): The type, e.g. "ttp".
+            field (str): One of its indexed_fields, e.g. "technique".
+            value (str): The code, e.g. "3.2".
+
+        Returns:
+            set: The objects.
+
+        Raises:
+            KeyError: If there is no such type, or the field is not indexed.
+        """
+        return set(self._posting(tag, field, value))
+
+    def find_incidents(self, *conditions):
+        """
+        Returns the incidents that meet every condition. A condition is a
+        (tag, field, value) triple, as for find, and an incident meets it if
+        it, or an object that belongs to it (see related_incidents), has the
+        value.
+
+        The sets of objects that match each condition are intersected,
+        smallest first, so the cost depends on how many objects match, not on
+        the size of the corpus.
+
+        Returns:
+            set: The Incident objects. Without conditions, every incident.
+
+        Raises:
+            KeyError: As for find.
+        """
+        if not conditions:
+            return set(self._posting_of_all("incident"))
+        postings = sorted(((tag, self._posting(tag, field, value)) for tag, field, value in conditions),
+                          key=lambda posting: len(posting[1]))
+        incidents = None
+        for tag, objects in postings:
+            if tag == "incident":
+                found = objects
+            else:
+                found = set()
+                members = self._bundle_ids
+                for obj in objects:
+                    found.update(incident for incident in related_incidents(obj) if incident in members)
+            incidents = set(found) if incidents is None else incidents.intersection(found)
+            if not incidents:
+                break
+        return incidents
+
+    def object_changed(self, obj, method_name, args):
+        """Called after an append_* or remove_* method of an object, see CHANGE_LISTENERS."""
+        bundle_id = self._bundle_ids.get(obj)
+        if bundle_id is None:
+            return
+        # methods only append codes, so indexing the current ones is enough
+        self._index(obj)
+        for arg in args:
+            if getattr(arg, "_object_type", None) is not None:
+                self._attach(arg, bundle_id)
+
+    def _posting(self, tag, field, value):
+        if field not in indexed_fields(tag):
+            raise KeyError(f"{tag}.{field} is not indexed")
+        return self._postings.get((tag, field), {}).get(value, ())
+
+    def _posting_of_all(self, tag):
+        return [obj for obj in self._bundle_ids if obj._object_type.tag == tag]
+
+    def _join(self, obj, bundle_id):
+        if obj in self._bundle_ids:
+            return False
+        self._bundle_ids[obj] = bundle_id
+        self._members[bundle_id].append(obj)
+        self._index(obj)
+        return True
+
+    def _attach(self, obj, bundle_id):
+        # the object and the objects related to it that are not in the corpus yet
+        stack = [obj]
+        while stack:
+            obj = stack.pop()
+            if not self._join(obj, bundle_id):
+                continue
+            for value in instance_dict(obj).values():
+                if isinstance(value, RelationshipList):
+                    stack.extend(value)
+                elif getattr(value, "_object_type", None) is not None:
+                    stack.append(value)
+
+    def _indexed_fields(self, object_type):
+        fields = self._fields.get(object_type)
+        if fields is None:
+            tag = object_type.tag
+            fields = self._fields[object_type] = [
+                ("_" + field, _code_getter(object_type, field), self._postings.setdefault((tag, field), {}))
+                for field in indexed_fields(tag)
+            ]
+        return fields
+
+    def _index(self, obj):
+        entries = None
+        for attribute, codes, postings in self._indexed_fields(obj._object_type):
+            value = getattr(obj, attribute, None)
+            if value is None:
+                continue
+            for code in codes(value):
+                objects = postings.get(code)
+                if objects is None:
+                    objects = postings[code] = set()
+                elif obj in objects:
+                    continue
+                objects.add(obj)
+                if entries is None:
+                    entries = self._entries.setdefault(obj, [])
+                entries += postings, code
+
+    def _unindex(self, obj):
+        # the codes it was indexed by, which its fields may no longer have
+        entries = self._entries.pop(obj, ())
+        for postings, code in zip(entries[::2], entries[1::2]):
+            objects = postings.get(code)
+            if objects is not None:
+                objects.discard(obj)
+                if not objects:
+                    del postings[code]
+
@@ -15,10 +15,15 @@ DM24-1597
 """
 
 from string import Formatter
+import re
+from inspect import signature
 import uuid
 from os import path
-from json import load
+from json import load, loads, dumps
+from hashlib import sha256
 from datetime import *
+import functools
+import weakref
 
 """
 - - - - - - - - - - - - - - - - - - - - - 
@@ -89,6 +94,53 @@ def check_tenure(hire_date, departure_date, tenure):
     else:
         return None
 
+def derive_tenure(values):
+    """
+    Sets values["tenure"] to departure_date - hire_date when both are set,
+    like the Job setters do. Used for the Job fields of imported json, which
+    hold the dates but not a timedelta.
+    """
+    if values.get("hire_date") and values.get("departure_date"):
+        values["tenure"] = values["departure_date"] - values["hire_date"]
+
+def date_to_str(value):
+    """
+    Formats a date field for json as an ISO 8601 date, e.g. "2020-01-31".
+    Datetimes keep their time (and offset) unless it is midnight, so that
+    datetime.fromisoformat gives back the same value.
+    """
+    if isinstance(value, datetime) and (value.time() != time() or value.tzinfo is not None):
+        return value.isoformat()
+    return value.isoformat()[:10]
+
+def datetime_to_str(value):
+    """
+    Formats a datetime field for json as "%Y-%m-%dT%H:%M:%SZ", converting
+    aware datetimes to UTC. Naive datetimes are taken to be UTC already, and
+    fractions of a second are dropped.
+    """
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.replace(microsecond=0).isoformat() + "Z"
+
+def duration_to_str(value):
+    """
+    Formats a timedelta field for json as an ISO 8601 duration, e.g.
+    timedelta(days=731, hours=2) -> "P731DT2H".
+    """
+    sign = "-" if value < timedelta(0) else ""
+    value = abs(value)
+    hours, seconds = divmod(value.seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if value.microseconds:
+        seconds = f"{seconds}.{value.microseconds:06d}".rstrip("0")
+    clock = "".join(f"{amount}{unit}" for amount, unit in ((hours, "H"), (minutes, "M"), (seconds, "S")) if amount)
+    if not value.days and not clock:
+        return "P0D"
+    return f"{sign}P" + (f"{value.days}D" if value.days else "") + (f"T{clock}" if clock else "")
+
 """
 - - - - - - - - - - - - - - - - - - - - - 
 
@@ -114,8 +166,7 @@ def check_subtype(t, st):
     elif st == None:
         return 
 
-    i = st.rfind(".")
-    if t != st[:i]:
+    if t != _parent_code(st):
         raise ValueError(f"{st} is not a subtype of {t}") 
     return 
 
@@ -125,20 +176,23 @@ def check_subtype_list(tL, stL):
     subtypes of those types in the type list
     """
     if tL == None or stL == None: return
-    type_set = set(tL)
-    if isinstance(stL, list):
-        for sub_type in stL:
-            i = sub_type.rfind(".")
-            s = sub_type[:i]
-            if s not in type_set:
-                raise ValueError(f"Sub type has no parent type in the type list")
-    elif isinstance(stL, str):
-        i = stL.rfind(".")
-        s = stL[:i]
-        if s not in type_set:
-            raise ValueError(f"Sub type has no parent type in the type list")
-    else: 
+    if isinstance(stL, str):
+        stL = [stL]
+    elif not isinstance(stL, list):
         raise TypeError("Incorrect types passed into check_subtype_list, must be list or str")
+    for sub_type in stL:
+        if _parent_code(sub_type) not in tL:
+            raise ValueError(f"Sub type has no parent type in the type list")
+
+def _parent_code(st):
+    """
+    Returns the parent code of st, using the subtype index for vocabulary
+    constants and the text before the last '.' for anything else.
+    """
+    parent = VOCAB.subtypes.parent(st)
+    if parent is None:
+        parent = st[:st.rfind(".")]
+    return parent
 
 
 """
@@ -149,34 +203,261 @@ def check_subtype_list(tL, stL):
 - - - - - - - - - - - - - - - - - - - - -
 """
 
+VOCAB_FILE_PATH = path.join(path.dirname(__file__), 'vocab.json')
+
+
+class VocabRegistry:
+    """
+    Process-wide cache of the IIDES vocabularies in vocab.json.
+
+    The vocabulary file is read the first time any vocabulary is requested
+    and kept for the rest of the process, so validating objects no longer
+    re-parses the file on every check. Call reload() after vocab.json has
+    been regenerated to pick up the changes.
+
+    Constants are taken from the precompiled vocab_snapshot module when its
+    hash matches vocab.json, which avoids parsing the JSON at start up. If
+    the snapshot is missing or stale the registry falls back to vocab.json.
+
+    Args:
+        vocab_file_path (str): Path to the compiled vocabulary file. Defaults
+            to the vocab.json shipped with pyiides.
+        use_snapshot (bool): Whether the precompiled snapshot may be used.
+
+    Example:
+        >>> from pyiides.utils.helper_functions import VOCAB
+        >>> "F" in VOCAB.constants("incident-type-vocab")
+        True
+    """
+    def __init__(self, vocab_file_path=None, use_snapshot=True):
+        if vocab_file_path is None:
+            vocab_file_path = VOCAB_FILE_PATH
+        self._vocab_file_path = vocab_file_path
+        self._use_snapshot = use_snapshot
+        self._vocab = None
+        self._ordered = None
+        self._constants = None
+        self._subtypes = None
+        self._titles = {}
+        self.loaded_from = None
+
+    @staticmethod
+    def _load_snapshot(raw):
+        try:
+            from pyiides.utils import vocab_snapshot
+        except ImportError:
+            return None
+        if vocab_snapshot.VOCAB_SHA256 != sha256(raw).hexdigest():
+            return None
+        return dict(vocab_snapshot.CONSTANTS)
+
+    def _load(self):
+        with open(self._vocab_file_path, 'rb') as f:
+            raw = f.read()
+
+        ordered = self._load_snapshot(raw) if self._use_snapshot else None
+        if ordered is None:
+            self._vocab = loads(raw)
+            ordered = {
+                name: tuple(item['const'] for item in items)
+                for name, items in self._vocab.items()
+            }
+            self.loaded_from = 'json'
+        else:
+            # the full vocabulary (titles, descriptions) is parsed on demand
+            self._vocab = None
+            self.loaded_from = 'snapshot'
+
+        self._ordered = ordered
+        self._constants = {
+            name: frozenset(consts) for name, consts in ordered.items()
+        }
+        self._subtypes = None
+        self._titles = {}
+
+    @property
+    def vocab(self):
+        """The full vocabulary dictionary, as stored in vocab.json."""
+        if self._vocab is None:
+            with open(self._vocab_file_path, 'r') as f:
+                self._vocab = load(f)
+        return self._vocab
+
+    def names(self):
+        """Returns the names of all known vocabularies."""
+        if self._ordered is None:
+            self._load()
+        return list(self._ordered)
+
+    def constants(self, vocab_name):
+        """
+        Returns the set of valid constants for a vocabulary.
+
+        Raises:
+            NameError: If the vocabulary does not exist.
+        """
+        if self._constants is None:
+            self._load()
+        try:
+            return self._constants[vocab_name]
+        except KeyError:
+            raise NameError(f"Vocabulary '{vocab_name}' not found in VOCAB.")
+
+    def ordered_constants(self, vocab_name):
+        """
+        Returns the constants of a vocabulary in the order they appear in
+        vocab.json.
+
+        Raises:
+            NameError: If the vocabulary does not exist.
+        """
+        if self._ordered is None:
+            self._load()
+        try:
+            return self._ordered[vocab_name]
+        except KeyError:
+            raise NameError(f"Vocabulary '{vocab_name}' not found in VOCAB.")
+
+    def titles(self, vocab_name):
+        """
+        Returns the titles of the constants of a vocabulary, in the order of
+        ordered_constants, e.g. "Access" for tactic "1".
+
+        Raises:
+            NameError: If the vocabulary does not exist.
+        """
+        titles = self._titles.get(vocab_name)
+        if titles is None:
+            self.ordered_constants(vocab_name)
+            titles = self._titles[vocab_name] = tuple(item.get('title') for item in self.vocab[vocab_name])
+        return titles
+
+    @property
+    def subtypes(self):
+        """The SubtypeIndex built from the hierarchical vocabularies."""
+        if self._subtypes is None:
+            self._subtypes = SubtypeIndex(self)
+        return self._subtypes
+
+    def reload(self):
+        """Re-reads vocab.json, replacing everything cached so far."""
+        self._load()
+
+    def __contains__(self, vocab_name):
+        if self._constants is None:
+            self._load()
+        return vocab_name in self._constants
+
+
+# parent vocabulary -> vocabulary of its subtypes
+VOCAB_HIERARCHY = {
+    'incident-type-vocab': 'incident-subtype-vocab',
+    'tactic-vocab': 'technique-vocab',
+    'stressor-category-vocab': 'stressor-subcategory-vocab',
+    'predisposition-type-vocab': 'predisposition-subtype-vocab',
+    'concerning-behavior-vocab': 'cb-subtype-vocab',
+    'target-asset-vocab': 'target-category-vocab',
+    'target-category-vocab': 'target-subcategory-vocab',
+    'job-function-vocab': 'occupation-vocab',
+    'industry-sector-vocab': 'industry-subsector-vocab',
+}
+
+
+class SubtypeIndex:
+    """
+    Parent/child index over the hierarchical IIDES vocabularies.
+
+    Subtype constants are built by appending '.<n>' to the parent constant
+    (e.g. technique "3.2" belongs to tactic "3"). The index is computed once
+    from the registry so that subtype checks and query expansion are plain
+    dictionary lookups.
+
+    Args:
+        registry (VocabRegistry): The registry to read constants from.
+        hierarchy (dict): Maps a parent vocabulary name to the name of its
+            subtype vocabulary. Defaults to VOCAB_HIERARCHY.
+
+    Example:
+        >>> VOCAB.subtypes.is_child('tactic-vocab', '3', '3.2')
+        True
+        >>> sorted(VOCAB.subtypes.descendants('target-asset-vocab', '1'))
+        ['1.1', '1.1.1', '1.1.2', '1.1.3']
+    """
+    def __init__(self, registry, hierarchy=None):
+        if hierarchy is None:
+            hierarchy = VOCAB_HIERARCHY
+        self._hierarchy = dict(hierarchy)
+        self._parents = {}
+        self._children = {}
+        self._descendants = {}
+
+        for parent_vocab, child_vocab in self._hierarchy.items():
+            children = {}
+            for const in registry.ordered_constants(child_vocab):
+                parent = const[:const.rfind('.')]
+                self._parents[const] = parent
+                children.setdefault(parent, []).append(const)
+            for const in registry.ordered_constants(parent_vocab):
+                self._children[(parent_vocab, const)] = frozenset(children.get(const, ()))
+
+        for key in self._children:
+            self._descendants[key] = frozenset(self._collect_descendants(*key))
+
+    def _collect_descendants(self, vocab_name, code):
+        child_vocab = self._hierarchy.get(vocab_name)
+        found = set()
+        for child in self._children.get((vocab_name, code), ()):
+            found.add(child)
+            found.update(self._collect_descendants(child_vocab, child))
+        return found
+
+    def child_vocab(self, vocab_name):
+        """Returns the name of the subtype vocabulary of vocab_name, if any."""
+        return self._hierarchy.get(vocab_name)
+
+    def parent(self, code):
+        """Returns the parent constant of a subtype constant, or None if unknown."""
+        return self._parents.get(code)
+
+    def children(self, vocab_name, code):
+        """Returns the direct subtypes of code in vocabulary vocab_name."""
+        return self._children.get((vocab_name, code), frozenset())
+
+    def descendants(self, vocab_name, code):
+        """Returns every subtype below code in vocabulary vocab_name."""
+        return self._descendants.get((vocab_name, code), frozenset())
+
+    def is_child(self, vocab_name, code, child):
+        """Returns True if child is a direct subtype of code in vocab_name."""
+        return child in self._children.get((vocab_name, code), ())
+
+
+VOCAB = VocabRegistry()
+
+
 def extract_constants(vocab_name):
     """
-    Extracts the 'const' values from a list of dictionaries.
+    Extracts the 'const' values of a vocabulary.
 
     Args:
-        vocab_list (list): A list of dictionaries, each containing a 'const' key.
+        vocab_name (str): The name of the vocabulary, e.g. 'state-vocab-us'.
 
     Returns:
-        list: A list of 'const' values.
+        list: A list of 'const' values, in vocab.json order.
     """
-    vocab_file_path = path.join(path.dirname(__file__), 'vocab.json')
-    with open(vocab_file_path, 'r') as f:
-        vocab = load(f)
-    if vocab_name not in vocab:
-        raise NameError(f"Vocabulary '{vocab_name}' not found in VOCAB.")
-    return [item['const'] for item in vocab[vocab_name]]
+    return list(VOCAB.ordered_constants(vocab_name))
 
 def check_vocab(const, vocab_name):
     """
     const: str, list
      -> the constant or list that we wish to validate corresponds to the vocab_name
-    vocab_name: str 
+    vocab_name: str
      -> the vocab we want to check the values to
     """
     if const is None:
         return True
-    
-    vocab_set = set(extract_constants(vocab_name))
+
+    vocab_set = VOCAB.constants(vocab_name)
 
     if isinstance(const, list):
         if vocab_name in ['technical-control-vocab', 'investigation-vocab', 'behavioral-control-vocab']:
@@ -185,15 +466,13 @@ def check_vocab(const, vocab_name):
                     raise ValueError(f"{const} is not in the vocab")
                 check_vocab(item[0], vocab_name)
             return
-        if set(const) > vocab_set:
-            raise ValueError(f"{const} is not in the vocab for {vocab_set}")
         for elem in const:
             if elem not in vocab_set:
-                raise ValueError(f"{const} is not in the vocab for {vocab_set}")
+                raise ValueError(f"{const} is not in the vocab for {vocab_name}")
     elif isinstance(const, str):
-        if set([const]) > vocab_set or const not in vocab_set:
-            raise ValueError(f"{const} is not in the vocab for {vocab_set}")
-    return 
+        if const not in vocab_set:
+            raise ValueError(f"{const} is not in the vocab for {vocab_name}")
+    return
 
 def check_uuid(uuid_str) -> None:
     """
@@ -235,17 +514,28 @@ def check_tuple_list(L, vocab0, vocab1):
     """
     if L == None: return
     if isinstance(L, tuple):
-        check_vocab(L[0], vocab0)
-        check_vocab(L[1], vocab1)
-        check_subtype(L[0], L[1])
+        _check_pair(L, vocab0, vocab1)
     elif isinstance(L, list):
         for elem in L:
             check_type(elem, tuple)
-            check_vocab(elem[0], vocab0)
-            check_vocab(elem[1], vocab1)
-            check_subtype(elem[0], elem[1])
+            _check_pair(elem, vocab0, vocab1)
     else:
         raise TypeError("Input to this function must be a tuple or a list of tuples")
+
+def _check_pair(pair, vocab0, vocab1):
+    """
+    Validates a single (type, subtype) tuple for check_tuple_list
+    """
+    subtypes = VOCAB.subtypes
+    # a valid pair of known constants is one lookup in the subtype index;
+    # anything else goes through the full checks for the right error
+    if (isinstance(pair[0], str) and isinstance(pair[1], str)
+            and subtypes.child_vocab(vocab0) == vocab1
+            and subtypes.is_child(vocab0, pair[0], pair[1])):
+        return
+    check_vocab(pair[0], vocab0)
+    check_vocab(pair[1], vocab1)
+    check_subtype(pair[0], pair[1])
     
 def check_iides(objects):
     """
@@ -273,3 +563,884 @@ def check_iides(objects):
         # When it's not a list or dict, assume it's an individual object.
         if not hasattr(objects, 'id'):
             raise TypeError("One or more objects failed to parse: Missing ID")
+
+"""
+- - - - - - - - - - - - - - - - - - - - -
+
+        Relationship Collection
+
+- - - - - - - - - - - - - - - - - - - - -
+"""
+
+class RelationshipList(list):
+    """
+    The list behind the one-to-many side of a relationship, e.g.
+    Incident.ttps or Insider.jobs. It is a regular list that keeps insertion
+    order and holds every object at most once: appending an object that is
+    already in it does nothing.
+
+    Membership tests and appends are O(1) through a hash index of the
+    objects (IIDES objects hash by identity). remove() also avoids scanning
+    the whole list: each object remembers the position it was appended at
+    and how many removals had moved other objects by then. A removal moves
+    the objects after it one step forward, so the object can only have moved
+    back by the number of such removals since. Removing objects in the order
+    they were added, in reverse order, or removing the last one is O(1).
+
+    Any other change to the list (insert, sort, slice assignment, ...) keeps
+    working like on a list, and rebuilds the index afterwards.
+
+    Example:
+        >>> ttps = RelationshipList([ttp1, ttp2])
+        >>> ttp2 in ttps  # no scan
+        True
+    """
+    __slots__ = ('_positions', '_removed')
+
+    def __init__(self, iterable=()):
+        super().__init__()
+        self._positions = {}
+        self._removed = 0
+        self.extend(iterable)
+
+    def __reduce__(self):
+        # copy and pickle the items, not the index
+        return (self.__class__, (list(self),))
+
+    def __contains__(self, item):
+        return item in self._positions
+
+    def index(self, item, *args):
+        if not args and item in self._positions:
+            return self._locate(item)
+        return list.index(self, item, *args)
+
+    def count(self, item):
+        return 1 if item in self._positions else 0
+
+    def append(self, item):
+        if item not in self._positions:
+            self._positions[item] = (len(self), self._removed)
+            list.append(self, item)
+
+    def extend(self, iterable):
+        for item in iterable:
+            self.append(item)
+
+    def __iadd__(self, iterable):
+        self.extend(iterable)
+        return self
+
+    def remove(self, item):
+        if item not in self._positions:
+            raise ValueError(f"{item!r} is not in list")
+        self._delete(self._locate(item))
+
+    def pop(self, index=-1):
+        if index < 0:
+            index += len(self)
+        item = list.__getitem__(self, index)
+        self._delete(index)
+        return item
+
+    def clear(self):
+        list.clear(self)
+        self._positions.clear()
+        self._removed = 0
+
+    def _locate(self, item):
+        position, removed = self._positions[item]
+        if position < len(self) and list.__getitem__(self, position) is item:
+            return position
+        return list.index(self, item, max(0, position - (self._removed - removed)), position)
+
+    def _delete(self, index):
+        item = list.__getitem__(self, index)
+        list.__delitem__(self, index)
+        del self._positions[item]
+        # removing the last object does not move any of the others
+        if index < len(self):
+            self._removed += 1
+
+    def _reindex(self):
+        # also drops any duplicates the change introduced
+        items = list(self)
+        self.clear()
+        self.extend(items)
+
+    def insert(self, index, item):
+        list.insert(self, index, item)
+        self._reindex()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._reindex()
+
+    def reverse(self):
+        list.reverse(self)
+        self._reindex()
+
+    def __setitem__(self, index, value):
+        list.__setitem__(self, index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._reindex()
+
+    def __imul__(self, n):
+        list.__imul__(self, n)
+        self._reindex()
+        return self
+
+"""
+- - - - - - - - - - - - - - - - - - - - -
+
+        Vocabulary Bitmasks
+
+- - - - - - - - - - - - - - - - - - - - -
+"""
+
+class CodeMask:
+    """
+    A list of the codes of one vocabulary stored as an integer bitmask, the
+    compact form of fields such as Incident.outcome or TTP.device (see
+    compact_codes). Bit i of mask is set when the i-th constant of the
+    vocabulary, in vocab.json order, is in the list. Each vocabulary has its
+    own subclass, made by code_mask_type.
+
+    It reads like the list it replaces: iteration, len(), in, indexing,
+    tolist() and == with a list or another mask. append, extend and remove
+    change it in place, so the append_* methods keep working. Unlike a list,
+    the codes are always in vocabulary order and each appears once. any_of
+    and all_of test several codes with a single bitwise operation.
+
+    Example:
+        >>> Outcome = code_mask_type("outcome-type-vocab")
+        >>> outcome = Outcome.from_codes(["DC", "BR"])
+        >>> outcome.tolist()
+        ['BR', 'DC']
+        >>> outcome.any_of(["BR", "MD"]), outcome.all_of(["BR", "MD"])
+        (True, False)
+    """
+    __slots__ = ('mask',)
+
+    # set on the subclass of each vocabulary by code_mask_type
+    vocab = None
+    constants = ()
+    bits = {}
+
+    __hash__ = None
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    @classmethod
+    def from_codes(cls, codes):
+        """Returns the mask of codes, see mask_of."""
+        return cls(cls.mask_of(codes))
+
+    @classmethod
+    def mask_of(cls, codes):
+        """
+        Returns the integer bitmask of codes: a list (or any iterable) of
+        codes, a single code, a CodeMask of the same vocabulary or an int.
+
+        Raises:
+            ValueError: If a code is not in the vocabulary, or the mask is
+                of another vocabulary.
+        """
+        if isinstance(codes, CodeMask):
+            if codes.vocab != cls.vocab:
+                raise ValueError(f"Cannot combine codes of {codes.vocab} with {cls.vocab}")
+            return codes.mask
+        if isinstance(codes, int):
+            return codes
+        if isinstance(codes, str):
+            codes = (codes,)
+        bits = cls.bits
+        mask = 0
+        for code in codes:
+            bit = bits.get(code)
+            if bit is None:
+                raise ValueError(f"{code} is not in the vocab for {cls.vocab}")
+            mask |= bit
+        return mask
+
+    def tolist(self):
+        """Returns the codes, in vocabulary order."""
+        constants = self.constants
+        mask = self.mask
+        codes = []
+        while mask:
+            low = mask & -mask
+            codes.append(constants[low.bit_length() - 1])
+            mask ^= low
+        return codes
+
+    def copy(self):
+        return self.__class__(self.mask)
+
+    def any_of(self, codes):
+        """Whether any of the codes (see mask_of) is in the list."""
+        return self.mask & self.mask_of(codes) != 0
+
+    def all_of(self, codes):
+        """Whether all of the codes (see mask_of) are in the list."""
+        mask = self.mask_of(codes)
+        return self.mask & mask == mask
+
+    def append(self, code):
+        self.mask |= self.mask_of((code,))
+
+    def extend(self, codes):
+        self.mask |= self.mask_of(codes)
+
+    def remove(self, code):
+        bit = self.bits.get(code, 0)
+        if not self.mask & bit:
+            raise ValueError(f"{code!r} is not in list")
+        self.mask ^= bit
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __len__(self):
+        return bin(self.mask).count("1")
+
+    def __bool__(self):
+        return self.mask != 0
+
+    def __contains__(self, code):
+        return self.mask & self.bits.get(code, 0) != 0
+
+    def __getitem__(self, index):
+        return self.tolist()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, CodeMask):
+            return self.vocab == other.vocab and self.mask == other.mask
+        if isinstance(other, (list, tuple)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CodeMask({self.vocab!r}, {self.tolist()!r})"
+
+    def __reduce__(self):
+        return (_code_mask, (self.vocab, self.mask))
+
+# vocabulary name -> its CodeMask subclass
+_CODE_MASK_TYPES = {}
+
+def code_mask_type(vocab_name):
+    """
+    Returns the CodeMask subclass of a vocabulary, whose bits follow the
+    order of its constants in vocab.json.
+
+    Raises:
+        NameError: If the vocabulary does not exist.
+    """
+    cls = _CODE_MASK_TYPES.get(vocab_name)
+    if cls is None:
+        constants = tuple(VOCAB.ordered_constants(vocab_name))
+        cls = _CODE_MASK_TYPES[vocab_name] = type("CodeMask", (CodeMask,), {
+            "__slots__": (),
+            "vocab": vocab_name,
+            "constants": constants,
+            "bits": {code: 1 << position for position, code in enumerate(constants)},
+        })
+    return cls
+
+def _code_mask(vocab_name, mask):
+    # unpickles a CodeMask
+    return code_mask_type(vocab_name)(mask)
+
+def compact_codes(obj):
+    """
+    Replaces the lists of vocabulary codes of an IIDES object, the
+    code_lists of its ObjectType (e.g. Incident.outcome), with CodeMasks.
+    They take less memory and answer any_of / all_of queries with bitwise
+    operations. The object exports to the same json, with the codes in
+    vocabulary order; expand_codes turns the masks back into lists.
+
+    Raises:
+        ValueError: If a list has a code that is not in its vocabulary.
+    """
+    object_type = obj._object_type
+    for name in object_type.code_lists:
+        attribute = "_" + name
+        value = getattr(obj, attribute, None)
+        if value is not None and not isinstance(value, CodeMask):
+            setattr(obj, attribute, code_mask_type(object_type.vocabs[name]).from_codes(value))
+
+def expand_codes(obj):
+    """Replaces the CodeMasks of an IIDES object (see compact_codes) with lists of their codes."""
+    for name in obj._object_type.code_lists:
+        attribute = "_" + name
+        value = getattr(obj, attribute, None)
+        if isinstance(value, CodeMask):
+            setattr(obj, attribute, value.tolist())
+
+"""
+- - - - - - - - - - - - - - - - - - - - -
+
+        IIDES Object Types
+
+- - - - - - - - - - - - - - - - - - - - -
+"""
+
+# tag -> ObjectType, filled in by the @iides_object class decorator
+OBJECT_TYPES = {}
+
+# Objects told about every call of an append_* or remove_* method of an IIDES
+# object, through their object_changed(obj, method_name, args) method, with
+# the positional arguments followed by the values of the keyword ones, e.g.
+# corpus_util.Corpus to keep its indexes current. Held weakly, so a listener
+# stops listening once it is garbage collected.
+CHANGE_LISTENERS = weakref.WeakSet()
+
+def _notify_changes(method):
+    """Wraps an append_* or remove_* method to tell CHANGE_LISTENERS about its calls."""
+    @functools.wraps(method)
+    def notifying(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if CHANGE_LISTENERS:
+            # the arguments given by keyword too, e.g. append_ttp(item=ttp)
+            values = args + tuple(kwargs.values()) if kwargs else args
+            for listener in list(CHANGE_LISTENERS):
+                listener.object_changed(self, method.__name__, values)
+        return result
+    notifying._notifies_changes = True
+    return notifying
+
+class ObjectType:
+    """
+    Describes how the objects of one IIDES class are stored in json: the tag
+    of their ids and the fields that have to be converted. bundle_util's
+    object_to_class imports objects with it and to_dict exports them.
+
+    Args:
+        tag (str): The tag of the ids, e.g. "ttp" for "ttp--<uuid>".
+        cls (type): The IIDES class.
+        dates (tuple): Date fields, e.g. Job.hire_date. Imported with
+            date_str_to_obj and exported with date_to_str.
+        datetimes (tuple): "%Y-%m-%dT%H:%M:%SZ" fields, e.g. TTP.date.
+            Imported with datetime_str_to_obj and exported with
+            datetime_to_str.
+        durations (tuple): timedelta fields, e.g. Job.tenure. Exported with
+            duration_to_str; on import they are derived from other fields by
+            `derive`.
+        tuples (tuple): Lists of (type, subtype) pairs, e.g.
+            Insider.predispositions, which json stores as lists.
+        dated_pairs (tuple): Lists of [code, date] pairs, e.g.
+            Response.technical_controls. They are imported as they are, and
+            dates in them are exported with date_to_str.
+        code_lists (tuple): Lists of vocabulary codes, e.g. Incident.outcome,
+            which compact_codes can store as a CodeMask. export_fields
+            exports a CodeMask as the list of its codes.
+        references (dict): Fields that hold another object, mapped to its
+            tag, e.g. {"insider1": "insider"} for Collusion. They are exported
+            as that object's id, and objects that have them are built by
+            objects_to_Bundle once the objects they refer to exist.
+        derive (callable): Called with the converted fields of an imported
+            object, to set fields computed from others, e.g. derive_tenure.
+        vocabs (dict): Fields that hold vocabulary constants, mapped to the
+            vocabulary, e.g. {"tactic": "tactic-vocab"} for TTP. For a list
+            of dated pairs it is the vocabulary of the codes, and for a list
+            of (type, subtype) pairs a (type vocab, subtype vocab) pair.
+            Subclasses inherit the vocabs of their parent, e.g. Insider
+            those of Person.
+        kinds (dict): The table_util column kind of the fields that are not
+            strings and not declared above, e.g. {"sequence_num": "int",
+            "observed": "bool"} for TTP: "int", "float", "bool", "list" or
+            "date". Subclasses inherit the kinds of their parent.
+        parents (tuple): The relationships to a single object, which are not
+            constructor arguments, e.g. ("incident",) for TTP, whose
+            attribute _incident holds the incident it belongs to. They are
+            the foreign keys of table_util. Subclasses inherit the parents
+            of their parent.
+    """
+    __slots__ = ('tag', 'cls', 'dates', 'datetimes', 'durations', 'tuples', 'dated_pairs',
+                 'code_lists', 'references', 'derive', 'vocabs', 'kinds', 'parents', 'encoders')
+
+    def __init__(self, tag, cls, dates=(), datetimes=(), durations=(), tuples=(), dated_pairs=(),
+                 code_lists=(), references=None, derive=None, vocabs=None, kinds=None, parents=()):
+        self.tag = tag
+        self.cls = cls
+        self.dates = tuple(dates)
+        self.datetimes = tuple(datetimes)
+        self.durations = tuple(durations)
+        self.tuples = tuple(tuples)
+        self.dated_pairs = tuple(dated_pairs)
+        self.code_lists = tuple(code_lists)
+        self.references = dict(references or {})
+        self.derive = derive
+        self.vocabs = dict(vocabs or {})
+        self.kinds = dict(kinds or {})
+        self.parents = tuple(parents)
+        # (attribute, function) pairs that export_fields applies
+        self.encoders = (
+            tuple(("_" + name, date_to_str) for name in self.dates)
+            + tuple(("_" + name, datetime_to_str) for name in self.datetimes)
+            + tuple(("_" + name, duration_to_str) for name in self.durations)
+            + tuple(("_" + name, _encode_dated_pairs) for name in self.dated_pairs)
+            + tuple(("_" + name, _reference_encoder(tag)) for name, tag in self.references.items())
+        )
+
+    def __repr__(self):
+        return f"ObjectType(tag={self.tag!r}, cls={self.cls.__name__})"
+
+def iides_object(tag, **fields):
+    """
+    Class decorator that registers an IIDES class under the tag of its ids,
+    with the fields that are converted to and from json. The keyword
+    arguments are those of ObjectType.
+
+    The first class registered for a tag keeps it, so that importing a copy
+    of the classes (e.g. development/base) does not replace the pyiides
+    ones. To replace one on purpose, assign OBJECT_TYPES[tag] directly.
+
+    The append_* and remove_* methods of the class, including inherited ones,
+    are wrapped to notify CHANGE_LISTENERS.
+
+    Example:
+        >>> @iides_object("ttp", datetimes=("date",))
+        ... class TTP:
+        ...     ...
+        >>> OBJECT_TYPES["ttp"].cls
+        <class 'TTP'>
+    """
+    def register(cls):
+        parent = getattr(cls, "_object_type", None)
+        if parent is None:
+            object_type = ObjectType(tag, cls, **fields)
+        else:
+            vocabs = dict(parent.vocabs, **fields.get("vocabs", {}))
+            kinds = dict(parent.kinds, **fields.get("kinds", {}))
+            parents = tuple(dict.fromkeys(tuple(fields.get("parents", ())) + parent.parents))
+            object_type = ObjectType(tag, cls, **dict(fields, vocabs=vocabs, kinds=kinds, parents=parents))
+        OBJECT_TYPES.setdefault(tag, object_type)
+        cls._object_type = object_type
+        for name in dir(cls):
+            if name.startswith(("append_", "remove_")):
+                method = getattr(cls, name)
+                if callable(method) and not getattr(method, "_notifies_changes", False):
+                    setattr(cls, name, _notify_changes(method))
+        return cls
+    return register
+
+def _encode_dated_pairs(pairs):
+    return [
+        [code, date_to_str(day) if isinstance(day, (date, datetime)) else day]
+        for code, day in pairs
+    ]
+
+def _reference_encoder(tag):
+    return lambda obj: f"{tag}--{obj.id}"
+
+def export_fields(obj, relationships=()):
+    """
+    Returns the json fields of an IIDES object, as used by to_dict: every
+    attribute without its leading underscore, except the given relationship
+    attributes, with the id prefixed by the tag and the fields declared in
+    the object's ObjectType converted.
+
+    Args:
+        obj: An instance of a class registered with @iides_object.
+        relationships (set): Attributes to leave out, e.g. {'_incident'}.
+
+    Returns:
+        dict: The fields, in attribute order.
+    """
+    object_type = obj._object_type
+    fields = instance_dict(obj)
+    if "_id" in fields:
+        fields["_id"] = f"{object_type.tag}--{fields['_id']}"
+    for attr, encode in object_type.encoders:
+        value = fields.get(attr)
+        if value is not None:
+            fields[attr] = encode(value)
+    if _CODE_MASK_TYPES:
+        # only once compact_codes has been used
+        for name in object_type.code_lists:
+            value = fields.get("_" + name)
+            if isinstance(value, CodeMask):
+                fields["_" + name] = value.tolist()
+    return {
+        key.lstrip('_'): value
+        for key, value in fields.items()
+        if key not in relationships
+    }
+
+"""
+- - - - - - - - - - - - - - - - - - - - -
+
+        JSON Backends
+
+- - - - - - - - - - - - - - - - - - - - -
+"""
+
+def encode_json_default(value):
+    """
+    The `default` of every json backend: converts dates, datetimes and times
+    with isoformat and timedeltas with duration_to_str. The fields declared
+    in an ObjectType are already strings by then (see export_fields), so this
+    only sees values that were added to an object by hand.
+
+    Raises:
+        TypeError: For any other type, as json.dumps does.
+    """
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return duration_to_str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class JsonBackend:
+    """
+    Encodes and decodes json with the standard library. The subclasses wrap
+    faster libraries and fall back to it for values those cannot encode; use
+    get_json_backend to get one.
+
+    Indented output is laid out as json.dumps(value, indent=indent) does.
+    Unindented output uses `separators`, and only the standard library
+    escapes non-ASCII characters. With canonical=True the keys are sorted,
+    the output is on one line with "," and ":" and characters are not
+    escaped, and the text is the same with every backend (as long as all
+    floats are finite: json writes NaN where the others write null or fail).
+    """
+    name = "json"
+    separators = (", ", ": ")
+    ensure_ascii = True
+
+    def dumps(self, value, indent=None, canonical=False):
+        """Returns `value` as json text. `indent` is ignored when canonical."""
+        if canonical:
+            return dumps(value, default=encode_json_default, ensure_ascii=False,
+                         sort_keys=True, separators=(",", ":"))
+        return dumps(value, default=encode_json_default, ensure_ascii=self.ensure_ascii, indent=indent,
+                     separators=self.separators if indent is None else None)
+
+    def loads(self, s):
+        """Returns the value of the json text `s` (str or bytes)."""
+        return loads(s)
+
+    def __repr__(self):
+        return f"<JsonBackend {self.name}>"
+
+# Numbers that json writes in exponent notation (1e16, 1e-05), which the
+# libraries may write as 1e16 or 0.00001. Canonical text containing one, or a
+# \u escape, is made with json instead.
+_EXPONENT_NUMBER = re.compile(r'[:,\[]-?(?:[0-9]+(?:\.[0-9]+)?[eE]|0\.0000)')
+
+def _canonical_mismatch(text):
+    # the "," also catches a number at the start of the text
+    return "\\u" in text or _EXPONENT_NUMBER.search("," + text) is not None
+
+class _FastJsonBackend(JsonBackend):
+    separators = (",", ":")
+    ensure_ascii = False
+    # what the library raises for values it cannot handle, e.g. integers
+    # beyond 64 bits, which json can
+    errors = (TypeError, ValueError, OverflowError)
+
+    def dumps(self, value, indent=None, canonical=False):
+        try:
+            text = self._dumps(value, indent, canonical)
+        except self.errors:
+            return super().dumps(value, indent, canonical)
+        if canonical and _canonical_mismatch(text):
+            return super().dumps(value, indent, canonical)
+        return text
+
+    def loads(self, s):
+        try:
+            return self._loads(s)
+        except self.errors:
+            return super().loads(s)
+
+def _reindent(text, indent):
+    """Re-indents json text that is indented by 2 spaces, as json.dumps would with `indent`."""
+    if indent == 2:
+        return text
+    if not isinstance(indent, str):
+        indent = " " * indent
+    # mark each level with a NUL, which json text cannot contain, one level
+    # per pass, then replace the marks
+    text = text.replace("\n  ", "\n\0")
+    while "\0  " in text:
+        text = text.replace("\0  ", "\0\0")
+    return text.replace("\0", indent)
+
+class _OrjsonBackend(_FastJsonBackend):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def _dumps(self, value, indent, canonical):
+        # orjson writes dates, datetimes and times itself, the same way as isoformat
+        orjson = self._orjson
+        if canonical:
+            return orjson.dumps(value, default=encode_json_default, option=orjson.OPT_SORT_KEYS).decode()
+        if indent is None:
+            return orjson.dumps(value, default=encode_json_default).decode()
+        return _reindent(orjson.dumps(value, default=encode_json_default, option=orjson.OPT_INDENT_2).decode(), indent)
+
+    def _loads(self, s):
+        return self._orjson.loads(s)
+
+class _MsgspecBackend(_FastJsonBackend):
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder(enc_hook=encode_json_default)
+        self._sorted_encoder = msgspec.json.Encoder(enc_hook=encode_json_default, order="sorted")
+        self._decoder = msgspec.json.Decoder()
+        self.errors = _FastJsonBackend.errors + (msgspec.MsgspecError,)
+
+    def _dumps(self, value, indent, canonical):
+        # msgspec writes UTC datetimes with "Z" and has its own timedelta format
+        value = _isoformat_dates(value)
+        if canonical:
+            return self._sorted_encoder.encode(value).decode()
+        text = self._encoder.encode(value)
+        if indent is None:
+            return text.decode()
+        return _reindent(self._msgspec.json.format(text, indent=2).decode(), indent)
+
+    def _loads(self, s):
+        return self._decoder.decode(s)
+
+def _isoformat_dates(value):
+    if isinstance(value, dict):
+        return {key: _isoformat_dates(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_isoformat_dates(item) for item in value]
+    if isinstance(value, (date, time, timedelta)):
+        return encode_json_default(value)
+    return value
+
+class _UjsonBackend(_FastJsonBackend):
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def _dumps(self, value, indent, canonical):
+        ujson = self._ujson
+        options = dict(default=encode_json_default, ensure_ascii=False, escape_forward_slashes=False)
+        if canonical:
+            return ujson.dumps(value, sort_keys=True, **options)
+        if indent is None:
+            return ujson.dumps(value, **options)
+        return _reindent(ujson.dumps(value, indent=2, **options), indent)
+
+    def _loads(self, s):
+        return self._ujson.loads(s)
+
+class _DefaultJsonBackend(JsonBackend):
+    """
+    The backend used when none is chosen, see get_json_backend. It parses,
+    and writes canonical text, with the fastest library installed, since
+    those give the same results with every library. Other text is written
+    with json, because the other libraries lay it out differently, e.g. they
+    do not escape non-ASCII characters and write 1e+20 as 1e20. The default
+    output is then the same whatever is installed.
+    """
+    name = "default"
+
+    def __init__(self, fast):
+        self.fast = fast
+
+    def dumps(self, value, indent=None, canonical=False):
+        if canonical:
+            return self.fast.dumps(value, canonical=True)
+        return super().dumps(value, indent)
+
+    def loads(self, s):
+        return self.fast.loads(s)
+
+    def __repr__(self):
+        return f"<JsonBackend default, parsing with {self.fast.name}>"
+
+# name -> backend class, in the order get_json_backend tries them
+JSON_BACKENDS = {
+    "orjson": _OrjsonBackend,
+    "msgspec": _MsgspecBackend,
+    "ujson": _UjsonBackend,
+    "json": JsonBackend,
+}
+_json_backends = {}
+_json_backend = None
+_installed_json_backend = None
+
+def get_json_backend(name=None):
+    """
+    Returns a json backend by name. For None it is the one chosen with
+    set_json_backend, or else the default one: it parses, and writes
+    canonical text, with the first of JSON_BACKENDS that is installed (json
+    when none of the others are), and writes other text with json, so that
+    the default output does not depend on what is installed.
+
+    Args:
+        name (str): "orjson", "msgspec", "ujson", "json" or None.
+
+    Returns:
+        JsonBackend: The backend.
+
+    Raises:
+        ImportError: If the library of the backend is not installed.
+        ValueError: If the name is unknown.
+
+    Example:
+        >>> get_json_backend("json").dumps({"b": 1, "a": [1, 2]}, canonical=True)
+        '{"a":[1,2],"b":1}'
+    """
+    global _installed_json_backend
+    if name is None:
+        name = _json_backend
+    if name is None:
+        if _installed_json_backend is None:
+            for name in JSON_BACKENDS:
+                try:
+                    _installed_json_backend = _DefaultJsonBackend(get_json_backend(name))
+                    break
+                except ImportError:
+                    continue
+        return _installed_json_backend
+    backend = _json_backends.get(name)
+    if backend is None:
+        if name not in JSON_BACKENDS:
+            raise ValueError(f"Unknown json backend {name!r}, expected one of {', '.join(JSON_BACKENDS)}")
+        backend = _json_backends[name] = JSON_BACKENDS[name]()
+    return backend
+
+def set_json_backend(name=None):
+    """
+    Sets the json backend used when none is given, e.g. by Bundle.dump and
+    bundle_util.Bundle_to_json. None goes back to the default one.
+
+    Raises:
+        ImportError: If the library of the backend is not installed.
+        ValueError: If the name is unknown.
+    """
+    global _json_backend
+    if name is not None:
+        get_json_backend(name)
+    _json_backend = name
+
+"""
+- - - - - - - - - - - - - - - - - - - - -
+
+        Trusted Construction Helper Functions
+
+- - - - - - - - - - - - - - - - - - - - -
+"""
+
+_TRUSTED_LAYOUTS = {}
+_SLOT_NAMES = {}
+
+def slot_names(cls):
+    """
+    Returns the attribute slots of cls and its base classes, base classes
+    first, which is also the order __init__ assigns them in. Classes without
+    __slots__ have none.
+    """
+    names = _SLOT_NAMES.get(cls)
+    if names is None:
+        names = []
+        for klass in reversed(cls.__mro__):
+            for name in klass.__dict__.get('__slots__', ()):
+                if name not in ('__dict__', '__weakref__') and name not in names:
+                    names.append(name)
+        names = _SLOT_NAMES[cls] = tuple(names)
+    return names
+
+def instance_dict(obj):
+    """
+    Returns a new dict of the attributes of obj, like obj.__dict__.copy() but
+    including the attributes stored in slots. Extra attributes, which are
+    kept in __dict__, come last.
+    """
+    names = slot_names(type(obj))
+    if not names:
+        return obj.__dict__.copy()
+
+    fields = {}
+    for name in names:
+        try:
+            fields[name] = getattr(obj, name)
+        except AttributeError:
+            pass
+    fields.update(getattr(obj, '__dict__', {}))
+    return fields
+
+def _trusted_layout(cls):
+    """
+    Returns the (attribute, argument) pairs an instance of cls is made of,
+    in the order __init__ creates them. Attributes that are not constructor
+    arguments (relationships) are paired with None.
+
+    The layout is taken from a prototype built with every argument set to
+    None, which all IIDES classes accept.
+    """
+    arguments = set()
+    for klass in cls.__mro__:
+        init = klass.__dict__.get('__init__')
+        if init is not None:
+            arguments.update(signature(init).parameters)
+    required = {
+        name: None
+        for name, param in list(signature(cls.__init__).parameters.items())[1:]
+        if param.default is param.empty
+        and param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)
+    }
+    prototype = cls(**required)
+    return tuple(
+        (attr, attr[1:] if attr[1:] in arguments else None)
+        for attr in instance_dict(prototype)
+    )
+
+def trusted_instance(cls, values):
+    """
+    Creates an instance of cls directly from a dictionary of constructor
+    arguments without running any of the type, vocabulary or uuid checks.
+
+    Only use this for data that has already been validated, e.g. a bundle
+    that PyIIDES exported itself. Missing arguments are set to None, a
+    missing id is generated, and keys that are not constructor arguments
+    are ignored, the same as **kwargs in the regular constructors.
+
+    Args:
+        cls (type): The IIDES class to instantiate.
+        values (dict): Constructor arguments, keyed by argument name.
+
+    Returns:
+        object: The new instance of cls.
+
+    Example:
+        >>> ttp = trusted_instance(TTP, {"id": "...", "tactic": "3", "technique": "3.2"})
+    """
+    layout = _TRUSTED_LAYOUTS.get(cls)
+    if layout is None:
+        layout = _TRUSTED_LAYOUTS[cls] = _trusted_layout(cls)
+
+    obj = cls.__new__(cls)
+    get = values.get
+    if slot_names(cls):
+        for attr, argument in layout:
+            setattr(obj, attr, get(argument) if argument is not None else None)
+    else:
+        obj.__dict__.update({
+            attr: (get(argument) if argument is not None else None)
+            for attr, argument in layout
+        })
+    if getattr(obj, '_id', '') is None:
+        obj._id = str(uuid.uuid4())
+    return obj
@@ -0,0 +1,391 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import bisect
+import functools
+import gzip
+import heapq
+import math
+import os
+import re
+
+from pyiides.utils.helper_functions import OBJECT_TYPES, get_json_backend
+from pyiides.utils.bundle_util import full_id
+from pyiides.utils.corpus_util import related_incidents
+
+"""
+- - - - - - - - - - - - - - - - - - - - -
+
+        Full-Text Search
+
+- - - - - - - - - - - - - - - - - - - - -
+"""
+
+# The free text fields that are indexed, where a type has them, e.g.
+# Incident.summary, TTP.description or Note.comment
+TEXT_FIELDS = ("summary", "brief_summary", "description", "nature_of_offense", "comment")
+
+INDEX_FORMAT = "iides-text-index"
+INDEX_VERSION = 1
+
+_TOKEN = re.compile(r"\w+")
+_QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+
+@functools.lru_cache(maxsize=None)
+def text_fields(tag):
+    """
+    Returns the fields of TEXT_FIELDS that an IIDES type has.
+
+    Raises:
+        KeyError: If there is no such type.
+    """
+    object_type = OBJECT_TYPES[tag]
+    return tuple(field for field in TEXT_FIELDS if hasattr(object_type.cls, field))
+
+
+def tokenize(text):
+    """
+    Returns the terms of a text: its runs of letters, digits and
+    underscores, case folded, e.g. ["usb", "drive", "s"] for "USB drive's".
+    """
+    return _TOKEN.findall(text.casefold())
+
+
+class SearchHit:
+    """
+    One incident found by TextIndex.search.
+
+    Args:
+        incident_id (str): The incident id, "incident--<uuid>".
+        bundle_id (str): The id of its bundle, "bundle--<uuid>".
+        score (float): Its BM25 score for the query, higher for a better match.
+    """
+    __slots__ = ('incident_id', 'bundle_id', 'score')
+
+    def __init__(self, incident_id, bundle_id, score):
+        self.incident_id = incident_id
+        self.bundle_id = bundle_id
+        self.score = score
+
+    def __repr__(self):
+        return f"SearchHit({self.incident_id!r}, {self.bundle_id!r}, {self.score:.3f})"
+
+
+class TextIndex:
+    """
+    An inverted index of the free text of incidents, for keyword search
+    ranked with BM25. Each incident is a document with the text of its
+    TEXT_FIELDS and those of the objects that belong to it (see
+    corpus_util.related_incidents), e.g. the descriptions of its TTPs and
+    the comments of its notes. Every term of the documents has the
+    positions of its occurrences in each document, for phrase queries.
+
+    Bundles are added one at a time, and the index can be saved to a file
+    and loaded back, so a large archive is indexed once and searched without
+    reading its bundles; the hits give the incident and bundle ids to load,
+    e.g. with BundleArchive.get. Objects that belong to no incident of their
+    bundle are not indexed.
+
+    A query is words, "quoted phrases" and prefixes ending with *, e.g.
+        exfiltrat* "source code" usb
+    Words are tokenized as the text is, so e-mail is the phrase "e mail". By
+    default an incident must match every part of the query; with
+    match="any" it must match one.
+
+    Args:
+        bundles (iterable): Bundles to add.
+        k1 (float): The BM25 term frequency saturation.
+        b (float): The BM25 document length normalization.
+
+    Example:
+        >>> index = TextIndex(bundles)
+        >>> index.search('"source code" exfiltrat*', limit=5)
+        [SearchHit('incident--...', 'bundle--...', 7.412), ...]
+        >>> index.save("incidents.idx")
+        >>> index = TextIndex.load("incidents.idx")
+    """
+
+    def __init__(self, bundles=(), k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        # document number -> [incident id, bundle id, length, terms]
+        self._documents = {}
+        self._bundles = {}
+        # term -> {document number: [positions]}
+        self._postings = {}
+        self._next = 0
+        self._length = 0
+        self._terms = None
+        self._norms = None
+        for bundle in bundles:
+            self.add(bundle)
+
+    def __len__(self):
+        """The number of documents, i.e. incidents."""
+        return len(self._documents)
+
+    def __contains__(self, bundle_id):
+        return full_id("bundle", bundle_id) in self._bundles
+
+    def bundle_ids(self):
+        """Returns the ids of the bundles added, "bundle--<uuid>", in order."""
+        return list(self._bundles)
+
+    def add(self, bundle):
+        """Indexes the incidents of a bundle, replacing those of a bundle with the same id."""
+        bundle_id = full_id("bundle", bundle.id)
+        if bundle_id in self._bundles:
+            self.remove(bundle_id)
+        texts = {incident: [] for incident in (bundle.objects or {}).get("incident", ())}
+        for objects in (bundle.objects or {}).values():
+            for obj in objects:
+                fields = text_fields(obj._object_type.tag)
+                values = [value for value in (getattr(obj, field) for field in fields) if value]
+                if values:
+                    for incident in related_incidents(obj):
+                        if incident in texts:
+                            texts[incident].extend(values)
+        documents = self._bundles[bundle_id] = []
+        for incident, values in texts.items():
+            documents.append(self._add_document(f"incident--{incident.id}", bundle_id, values))
+        self._terms = self._norms = None
+
+    def _add_document(self, incident_id, bundle_id, texts):
+        number = self._next
+        self._next += 1
+        positions = {}
+        get = positions.get
+        start = 0
+        for text in texts:
+            terms = _TOKEN.findall(text.casefold())
+            for position, term in enumerate(terms, start):
+                found = get(term)
+                if found is None:
+                    positions[term] = [position]
+                else:
+                    found.append(position)
+            # a gap between two texts, so that a phrase is never found across them
+            start += len(terms) + 1
+        postings = self._postings
+        for term, found in positions.items():
+            documents = postings.get(term)
+            if documents is None:
+                documents = postings[term] = {}
+            documents[number] = found
+        length = sum(map(len, positions.values()))
+        self._documents[number] = [incident_id, bundle_id, length, tuple(positions)]
+        self._length += length
+        return number
+
+    def remove(self, bundle_id):
+        """
+        Removes the incidents of a bundle from the index.
+
+        Raises:
+            KeyError: If the bundle was not added.
+        """
+        documents = self._bundles.pop(full_id("bundle", bundle_id))
+        postings = self._postings
+        for number in documents:
+            _, _, length, terms = self._documents.pop(number)
+            self._length -= length
+            for term in terms:
+                found = postings[term]
+                del found[number]
+                if not found:
+                    del postings[term]
+        self._terms = self._norms = None
+
+    def _expand(self, prefix):
+        # the terms that start with the prefix
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+        terms = self._terms
+        start = bisect.bisect_left(terms, prefix)
+        end = start
+        while end < len(terms) and terms[end].startswith(prefix):
+            end += 1
+        return terms[start:end]
+
+    def _occurrences(self, term, prefix):
+        # {document number: positions} of a term, or of every term with the
+        # prefix; the positions are only counted and looked up, so need no order
+        if not prefix:
+            return self._postings.get(term, {})
+        occurrences = {}
+        for expanded in self._expand(term):
+            for number, positions in self._postings[expanded].items():
+                found = occurrences.get(number)
+                occurrences[number] = positions if found is None else found + positions
+        return occurrences
+
+    def _matches(self, terms):
+        """
+        Returns {document number: occurrences} of a phrase, a list of (term,
+        prefix) pairs; a single term is a phrase of one.
+        """
+        postings = [self._occurrences(term, prefix) for term, prefix in terms]
+        if len(postings) == 1:
+            return {number: len(positions) for number, positions in postings[0].items()}
+        numbers = set(min(postings, key=len))
+        for occurrences in postings:
+            numbers.intersection_update(occurrences)
+        matches = {}
+        for number in numbers:
+            # the positions where the phrase starts: those of the first term
+            # that the second follows, and so on
+            starts = set(postings[0][number])
+            for i, occurrences in enumerate(postings[1:], 1):
+                starts.intersection_update([position - i for position in occurrences[number]])
+                if not starts:
+                    break
+            else:
+                matches[number] = len(starts)
+        return matches
+
+    def parse(self, query):
+        """
+        Returns the parts of a query: for each word or quoted phrase, its
+        list of (term, prefix) pairs, where prefix is True for a term that
+        ended with *.
+        """
+        parts = []
+        for phrase, word in _QUERY.findall(query):
+            text = phrase or word
+            terms = [(term, False) for term in tokenize(text)]
+            if terms and text.endswith("*"):
+                terms[-1] = (terms[-1][0], True)
+            if terms:
+                parts.append(terms)
+        return parts
+
+    def search(self, query, limit=10, match="all"):
+        """
+        Returns the incidents that match a query (see TextIndex), from the
+        best match, as SearchHit objects. The score of an incident is the
+        sum of the BM25 scores of the parts of the query it matches, where
+        the frequency of a phrase or prefix is its number of occurrences.
+
+        Args:
+            query (str): The query.
+            limit (int): The most hits to return, or None for all.
+            match (str): "all" for the incidents that match every part of
+                the query, "any" for those that match one.
+
+        Raises:
+            ValueError: If match is not "all" or "any".
+        """
+        if match not in ("all", "any"):
+            raise ValueError(f'match must be "all" or "any", not {match!r}')
+        matches = [self._matches(terms) for terms in self.parse(query)]
+        if not matches:
+            return []
+        if match == "all":
+            numbers = set(min(matches, key=len))
+            for found in matches:
+                numbers.intersection_update(found)
+        else:
+            numbers = set().union(*matches)
+
+        count = len(self._documents)
+        weight = self.k1 + 1
+        norms = self._length_norms()
+        scores = dict.fromkeys(numbers, 0.0)
+        for found in matches:
+            idf = math.log(1 + (count - len(found) + 0.5) / (len(found) + 0.5)) * weight
+            for number in numbers.intersection(found) if match == "any" else numbers:
+                frequency = found[number]
+                scores[number] += idf * frequency / (frequency + norms[number])
+        if limit is None:
+            best = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        else:
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        documents = self._documents
+        return [SearchHit(documents[number][0], documents[number][1], score) for number, score in best]
+
+    def _length_norms(self):
+        # the BM25 length normalization of each document, k1 * (1 - b + b * length / average length)
+        if self._norms is None:
+            k1, b = self.k1, self.b
+            average = self._length / len(self._documents) if self._documents else 0
+            self._norms = {
+                number: k1 * (1 - b + b * document[2] / average) if average else k1
+                for number, document in self._documents.items()
+            }
+        return self._norms
+
+    def save(self, path, json_backend=None):
+        """
+        Writes the index to a file, as gzip compressed json, replacing the
+        file only once it is complete.
+
+        Args:
+            path (str): The file.
+            json_backend (str): The json library to encode with, see
+                get_json_backend.
+        """
+        postings = {}
+        for term, documents in self._postings.items():
+            flat = postings[term] = []
+            for number, positions in documents.items():
+                flat.append(number)
+                flat.append(positions)
+        data = {
+            "format": INDEX_FORMAT, "version": INDEX_VERSION, "k1": self.k1, "b": self.b,
+            "bundles": {bundle_id: [[number] + self._documents[number][:3] for number in documents]
+                        for bundle_id, documents in self._bundles.items()},
+            "postings": postings,
+        }
+        text = get_json_backend(json_backend).dumps(data)
+        temporary = f"{path}.tmp"
+        # the fastest level: the higher ones take several times longer than
+        # encoding, for files about a tenth smaller
+        with gzip.open(temporary, "wt", encoding="utf-8", compresslevel=1) as f:
+            f.write(text)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path, json_backend=None):
+        """
+        Reads an index written by save.
+
+        Args:
+            path (str): The file.
+            json_backend (str): The json library to parse with, see
+                get_json_backend.
+
+        Raises:
+            ValueError: If the file is not a saved TextIndex, or of another
+                version.
+        """
+        try:
+            with gzip.open(path, "rb") as f:
+                data = get_json_backend(json_backend).loads(f.read())
+        except (OSError, EOFError, ValueError) as e:
+            raise ValueError(f"{path} is not a text index") from e
+        if not isinstance(data, dict) or data.get("format") != INDEX_FORMAT:
+            raise ValueError(f"{path} is not a text index")
+        if data["version"] != INDEX_VERSION:
+            raise ValueError(f"Unsupported text index version {data['version']}, expected {INDEX_VERSION}")
+
+        index = cls(k1=data["k1"], b=data["b"])
+        terms = {}
+        for term, flat in data["postings"].items():
+            iterator = iter(flat)
+            documents = index._postings[term] = dict(zip(iterator, iterator))
+            for number in documents:
+                terms.setdefault(number, []).append(term)
+        for bundle_id, documents in data["bundles"].items():
+            index._bundles[bundle_id] = [number for number, *_ in documents]
+            for number, incident_id, bundle_id, length in documents:
+                index._documents[number] = [incident_id, bundle_id, length, tuple(terms.get(number, ()))]
+                index._length += length
+                index._next = max(index._next, number + 1)
+        return index
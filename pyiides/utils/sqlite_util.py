@@ -0,0 +1,408 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import functools
+import json
+import sqlite3
+
+from pyiides.utils.helper_functions import OBJECT_TYPES
+from pyiides.utils.bundle_util import objects_to_Bundle, full_id, split_id
+from pyiides.utils.table_util import table_columns
+
+"""
+- - - - - - - - - - - - - - - - - - - - -
+
+        SQLite Bundle Store
+
+- - - - - - - - - - - - - - - - - - - - -
+"""
+
+# Incremented when the tables change; stored as the database's user_version
+STORE_VERSION = 1
+
+# SQLite type of each kind of column, see table_util.Column
+_SQL_TYPES = {
+    "string": "TEXT",
+    "int": "INTEGER",
+    "float": "REAL",
+    "bool": "INTEGER",
+    "date": "TEXT",
+    "datetime": "TEXT",
+    "duration": "TEXT",
+    "list": "TEXT",
+    "tuples": "TEXT",
+    "dated_pairs": "TEXT",
+    "reference": "TEXT",
+}
+
+# kinds stored as json text
+_JSON_KINDS = {"list", "tuples", "dated_pairs"}
+
+
+def table_name(tag):
+    """Returns the name of the SQLite table of an IIDES type, e.g. "legal_response"."""
+    return tag.replace("-", "_")
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class _TableLayout:
+    """How the objects of one IIDES type are stored: columns, code tables and the SQL to use them."""
+
+    def __init__(self, tag):
+        object_type = OBJECT_TYPES[tag]
+        self.tag = tag
+        self.table = table_name(tag)
+        self.columns = table_columns(tag)
+        # fields: (name, kind) of the columns filled from the object's json
+        self.fields = [(column.name, column.kind) for column in self.columns[2:] if column.attribute[1:] == column.name]
+        # foreign keys: (name, attribute) of the relationship columns
+        self.foreign_keys = [(column.name, column.attribute) for column in self.columns[2:]
+                             if column.attribute[1:] != column.name]
+        # vocabulary lists get a table of their codes, e.g. incident_incident_type
+        self.code_tables = {
+            name: f"{self.table}_{name}" for name, kind in self.fields
+            if kind == "list" and name in object_type.vocabs
+        }
+        self.vocab_columns = [name for name, kind in self.fields
+                              if kind != "list" and isinstance(object_type.vocabs.get(name), str)]
+        # references: (column, attribute, pk column, table) of every column that refers to an object
+        references = [(name, "_" + name, object_type.references[name]) for name, kind in self.fields
+                      if kind == "reference"]
+        references += [(name, attribute, attribute[1:].replace("_", "-")) for name, attribute in self.foreign_keys]
+        self.references = [
+            (name, attribute, (name[:-3] if name.endswith("_id") else name) + "_pk", table_name(related_tag))
+            for name, attribute, related_tag in references if related_tag in OBJECT_TYPES
+        ]
+
+        names = (["pk", "id", "bundle_id"] + [name for name, _ in self.fields] + [name for name, _ in self.foreign_keys]
+                 + [pk_name for _, _, pk_name, _ in self.references] + ["extra"])
+        self.insert = (f"INSERT INTO {_quote(self.table)} ({', '.join(map(_quote, names))}) "
+                       f"VALUES ({', '.join('?' * len(names))})")
+        self.select = (f"SELECT {', '.join(map(_quote, names))} FROM {_quote(self.table)} "
+                       f"WHERE bundle_id = ? ORDER BY pk")
+
+    def create_statements(self):
+        lines = [
+            # not the id: a bundle can have two objects with the same id, and bundles can share objects
+            "pk INTEGER PRIMARY KEY",
+            "id TEXT NOT NULL",
+            "bundle_id TEXT NOT NULL REFERENCES bundle(id) ON DELETE CASCADE",
+        ]
+        lines += [f"{_quote(name)} {_SQL_TYPES[kind]}" for name, kind in self.fields]
+        lines += [f"{_quote(name)} TEXT" for name, _ in self.foreign_keys]
+        # deferred, so the objects of a bundle can be inserted in any order
+        lines += [f"{_quote(pk_name)} INTEGER REFERENCES {_quote(table)}(pk) DEFERRABLE INITIALLY DEFERRED"
+                  for _, _, pk_name, table in self.references]
+        lines.append("extra TEXT")
+        statements = [f"CREATE TABLE IF NOT EXISTS {_quote(self.table)} (\n    " + ",\n    ".join(lines) + "\n)"]
+
+        indexed = ["id", "bundle_id"] + [pk_name for _, _, pk_name, _ in self.references] + self.vocab_columns
+        for name in indexed:
+            statements.append(f"CREATE INDEX IF NOT EXISTS {_quote(f'{self.table}__{name}')} "
+                              f"ON {_quote(self.table)}({_quote(name)})")
+        for name, code_table in self.code_tables.items():
+            statements.append(
+                f"CREATE TABLE IF NOT EXISTS {_quote(code_table)} (\n"
+                f"    object_pk INTEGER NOT NULL REFERENCES {_quote(self.table)}(pk) "
+                f"ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,\n"
+                f"    bundle_id TEXT NOT NULL,\n"
+                f"    code TEXT\n)")
+            statements.append(f"CREATE INDEX IF NOT EXISTS {_quote(code_table + '__code')} ON {_quote(code_table)}(code)")
+            statements.append(f"CREATE INDEX IF NOT EXISTS {_quote(code_table + '__object_pk')} "
+                              f"ON {_quote(code_table)}(object_pk)")
+        return statements
+
+    def row(self, obj, pk, bundle_id, pks):
+        """
+        Returns the row of an object and {code table: [(object pk, bundle id, code), ...]}.
+        pks maps id() of each object of the bundle to its pk.
+        """
+        json_object, _ = obj.to_dict()
+        object_id = json_object.pop("id")
+        row = [pk, object_id, bundle_id]
+        for name, kind in self.fields:
+            value = json_object.pop(name, None)
+            if value is not None and kind in _JSON_KINDS:
+                value = json.dumps(value)
+            row.append(value)
+        for name, attribute in self.foreign_keys:
+            related = getattr(obj, attribute, None)
+            row.append(f"{related._object_type.tag}--{related.id}" if related is not None else None)
+        for name, attribute, _, _ in self.references:
+            related = getattr(obj, attribute, None)
+            if related is None:
+                row.append(None)
+            elif id(related) in pks:
+                row.append(pks[id(related)])
+            else:
+                raise ValueError(f"{object_id} refers to {related._object_type.tag}--{related.id}, "
+                                 f"which is not in {bundle_id}")
+        # fields that have no column, e.g. attributes set on the object that __init__ does not take
+        row.append(json.dumps(json_object) if json_object else None)
+
+        codes = {}
+        for name, code_table in self.code_tables.items():
+            values = getattr(obj, "_" + name, None)
+            if values:
+                codes[code_table] = [(pk, bundle_id, code) for code in values]
+        return row, codes
+
+    def json_objects(self, row):
+        """Returns the json object of a row and the relationship records of its foreign keys."""
+        json_object = {"id": row[1]}
+        position = 3
+        for name, kind in self.fields:
+            value = row[position]
+            if value is not None:
+                if kind in _JSON_KINDS:
+                    value = json.loads(value)
+                elif kind == "bool":
+                    value = bool(value)
+            json_object[name] = value
+            position += 1
+        relationships = [
+            {"id": "relationship--", "object1": related_id, "object2": row[1]}
+            for related_id in row[position:position + len(self.foreign_keys)]
+            if related_id is not None
+        ]
+        extra = row[-1]
+        if extra is not None:
+            json_object.update(json.loads(extra))
+        return json_object, relationships
+
+
+@functools.lru_cache(maxsize=None)
+def _layout(tag):
+    return _TableLayout(tag)
+
+
+class BundleStore:
+    """
+    A persistent store of IIDES bundles in an SQLite database, so that
+    questions about many bundles are answered with SQL instead of importing
+    every bundle.
+
+    Every IIDES type has a table named after its tag ("-" replaced by "_",
+    e.g. legal_response) with the columns of table_util.table_columns: "id",
+    "bundle_id", a column per field and a "<name>_id" column per relationship
+    to a single object, e.g. ttp.incident_id. Ids are full ids, e.g.
+    "ttp--<uuid>". Since bundles can share objects, and a bundle can even have
+    two objects with the same id, the key of a row is an integer "pk", and
+    every relationship also has a "<name>_pk" foreign key column, e.g.
+    ttp.incident_pk, that refers to the row of the related object in the
+    same bundle. The bundle table has the bundle ids. Field values are stored
+    as in json: dates as text, booleans as 0/1 and lists as json text. Every
+    vocabulary list also has a table of its codes, e.g.
+    incident_incident_type(object_pk, bundle_id, code), so that it can be
+    filtered with an index. The id, bundle_id, foreign key and vocabulary
+    columns and the codes are indexed. Fields that have no column, such as
+    other attributes set on an object, are kept as json in "extra".
+
+    Args:
+        path (str): The SQLite database file, created if needed. ":memory:"
+            keeps the store in memory.
+
+    Raises:
+        ValueError: If the database was written by an incompatible version.
+
+    Example:
+        >>> with BundleStore("incidents.db") as store:
+        ...     store.add_all(bundles)
+        ...     for bundle_id in store.find_bundles("ttp", "tactic", "3"):
+        ...         bundle = store.get(bundle_id)
+        ...     counts = store.connection.execute(
+        ...         "SELECT code, count(*) FROM incident_incident_type GROUP BY code").fetchall()
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        try:
+            self.connection.execute("PRAGMA foreign_keys = ON")
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, STORE_VERSION):
+                raise ValueError(f"Unsupported bundle store version {version}, expected {STORE_VERSION}")
+            if version == 0:
+                self._create_tables()
+        except Exception:
+            self.connection.close()
+            raise
+
+    def _create_tables(self):
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS bundle (id TEXT PRIMARY KEY)")
+            for tag in OBJECT_TYPES:
+                for statement in _layout(tag).create_statements():
+                    self.connection.execute(statement)
+            self.connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT count(*) FROM bundle").fetchone()[0]
+
+    def __contains__(self, bundle_id):
+        return self.connection.execute(
+            "SELECT 1 FROM bundle WHERE id = ?", (full_id("bundle", bundle_id),)).fetchone() is not None
+
+    def __iter__(self):
+        """Yields every bundle, loading one at a time."""
+        for bundle_id in self.bundle_ids():
+            yield self.get(bundle_id)
+
+    def bundle_ids(self):
+        """Returns the ids of the stored bundles ("bundle--<uuid>"), in the order they were added."""
+        return [bundle_id for (bundle_id,) in self.connection.execute("SELECT id FROM bundle ORDER BY rowid")]
+
+    def add(self, bundle):
+        """Stores one bundle, see add_all."""
+        self.add_all([bundle])
+
+    def add_all(self, bundles):
+        """
+        Stores bundles in a single transaction: either all of them are
+        stored or, if one fails, none. A bundle that is already stored is
+        replaced.
+
+        Args:
+            bundles (iterable): The Bundle objects.
+
+        Raises:
+            ValueError: If a relationship refers to an object that is not in
+                its bundle.
+        """
+        bundles = list(bundles)
+        bundle_ids = [(f"bundle--{bundle.id}",) for bundle in bundles]
+        connection = self.connection
+        try:
+            connection.executemany("DELETE FROM bundle WHERE id = ?", bundle_ids)
+            connection.executemany("INSERT INTO bundle (id) VALUES (?)", bundle_ids)
+
+            next_pks = {}
+            rows = {}
+            codes = {}
+            for bundle, (bundle_id,) in zip(bundles, bundle_ids):
+                # number the objects first, so that relationships can refer to objects of any table
+                objects = []
+                pks = {}
+                for class_list in (bundle.objects or {}).values():
+                    for obj in class_list:
+                        object_type = getattr(obj, "_object_type", None)
+                        if object_type is None:
+                            continue
+                        layout = _layout(object_type.tag)
+                        if layout not in next_pks:
+                            next_pks[layout] = connection.execute(
+                                f"SELECT coalesce(max(pk), 0) + 1 FROM {_quote(layout.table)}").fetchone()[0]
+                        pk = next_pks[layout]
+                        next_pks[layout] += 1
+                        pks.setdefault(id(obj), pk)
+                        objects.append((layout, obj, pk))
+                for layout, obj, pk in objects:
+                    row, object_codes = layout.row(obj, pk, bundle_id, pks)
+                    rows.setdefault(layout, []).append(row)
+                    for code_table, triples in object_codes.items():
+                        codes.setdefault(code_table, []).extend(triples)
+
+            for layout, table_rows in rows.items():
+                connection.executemany(layout.insert, table_rows)
+            for code_table, triples in codes.items():
+                connection.executemany(
+                    f"INSERT INTO {_quote(code_table)} (object_pk, bundle_id, code) VALUES (?, ?, ?)", triples)
+            # the foreign keys are checked here, and a failed commit leaves the transaction open
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+
+    def remove(self, bundle_id):
+        """
+        Deletes a bundle and its objects.
+
+        Raises:
+            KeyError: If no such bundle is stored.
+        """
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM bundle WHERE id = ?", (full_id("bundle", bundle_id),))
+        if cursor.rowcount == 0:
+            raise KeyError(bundle_id)
+
+    def get(self, bundle_id, validate=True):
+        """
+        Loads one bundle from its rows.
+
+        Args:
+            bundle_id (str): Its id, with or without the "bundle--" tag.
+            validate (bool): As for json_to_Bundle. The store only has
+                bundles that were valid when they were added, so False is
+                safe unless the database was changed by other means.
+
+        Raises:
+            KeyError: If no such bundle is stored.
+        """
+        bundle_id = full_id("bundle", bundle_id)
+        if bundle_id not in self:
+            raise KeyError(bundle_id)
+        json_objects = []
+        relationships = []
+        for tag in OBJECT_TYPES:
+            layout = _layout(tag)
+            for row in self.connection.execute(layout.select, (bundle_id,)):
+                json_object, object_relationships = layout.json_objects(row)
+                json_objects.append(json_object)
+                relationships += object_relationships
+        return objects_to_Bundle(json_objects + relationships, validate, split_id(bundle_id)[1])
+
+    def find_incident(self, incident_id, validate=True):
+        """
+        Loads the bundle that has an incident, the one added last if several
+        have it.
+
+        Raises:
+            KeyError: If no stored bundle has the incident.
+        """
+        row = self.connection.execute(
+            "SELECT bundle_id FROM incident WHERE id = ? ORDER BY pk DESC LIMIT 1",
+            (full_id("incident", incident_id),)).fetchone()
+        if row is None:
+            raise KeyError(incident_id)
+        return self.get(row[0], validate)
+
+    def find_bundles(self, tag, field, value):
+        """
+        Returns the ids of the bundles with an object of a type whose field
+        has a value, or, for a vocabulary list such as Incident.incident_type,
+        contains it. Vocabulary fields are indexed.
+
+        Args:
+            tag (str): The type, e.g. "ttp".
+            field (str): A column of its table, e.g. "tactic".
+            value: The value, e.g. "3".
+
+        Raises:
+            KeyError: If there is no such type or column.
+        """
+        layout = _layout(tag)
+        if field in layout.code_tables:
+            query = f"SELECT DISTINCT bundle_id FROM {_quote(layout.code_tables[field])} WHERE code = ?"
+        elif field in [column.name for column in layout.columns]:
+            query = f"SELECT DISTINCT bundle_id FROM {_quote(layout.table)} WHERE {_quote(field)} = ?"
+        else:
+            raise KeyError(field)
+        return [bundle_id for (bundle_id,) in self.connection.execute(query, (value,))]
@@ -0,0 +1,392 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import functools
+import itertools
+import operator
+
+from pyiides.utils.helper_functions import OBJECT_TYPES, VOCAB
+from pyiides.utils.corpus_util import _parent_attributes, related_incidents
+
+"""
+- - - - - - - - - - - - - - - - - - - - -
+
+        Corpus Statistics
+
+- - - - - - - - - - - - - - - - - - - - -
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def field_vocab(tag, field):
+    """
+    Returns the vocabulary of a vocabulary field of an IIDES type, e.g.
+    "tactic-vocab" for ("ttp", "tactic"). The statistics of a (type,
+    subtype) field, like Insider.predispositions, are of its types.
+
+    Raises:
+        KeyError: If there is no such type or it has no such vocabulary field.
+    """
+    vocab = OBJECT_TYPES[tag].vocabs[field]
+    return vocab[0] if isinstance(vocab, tuple) else vocab
+
+
+# The most (row, code) pairs _unique_pairs flags in an array of bools rather
+# than sorts, about as fast as the sort of a million pairs
+DENSE_LIMIT = 1 << 24
+
+
+def _join(keys_a, values_a, keys_b, values_b):
+    """
+    Returns the values of every pair of entries of a and b with the same
+    key, as two arrays; keys_b must be sorted.
+    """
+    import numpy as np
+
+    start = np.searchsorted(keys_b, keys_a, "left")
+    lengths = np.searchsorted(keys_b, keys_a, "right") - start
+    left = np.repeat(values_a, lengths)
+    # the entries of b of each key of a are start, start + 1, ..., start + length - 1
+    offsets = np.repeat(start - (np.cumsum(lengths) - lengths), lengths)
+    right = values_b[offsets + np.arange(left.size)]
+    return left, right
+
+
+def _unique_pairs(rows, codes, size):
+    """Returns the distinct (row, code) pairs, sorted by row, as two arrays."""
+    import numpy as np
+
+    keys = rows * size + codes
+    end = (int(rows.max()) + 1) * size if rows.size else 0
+    if end <= max(DENSE_LIMIT, 8 * keys.size):
+        # a flag for every possible pair, which is sorted without sorting
+        flags = np.zeros(end, dtype=bool)
+        flags[keys] = True
+        keys = np.flatnonzero(flags)
+    else:
+        keys = np.unique(keys)
+    return keys // size, keys % size
+
+
+class CodeCounts:
+    """
+    Counts by vocabulary code, as computed by CorpusStats. counts is a NumPy
+    array with an entry for each constant of the vocabulary, in vocab.json
+    order, or, for a cross-tabulation, a matrix with a row for each constant
+    of the first vocabulary and a column for each constant of the second.
+    The constants and titles of each axis are in codes and titles.
+
+    Example:
+        >>> tactics = stats.counts("ttp", "tactic")
+        >>> tactics["3"], tactics.most_common(1)
+        (412, [('3', 'Execution', 412)])
+    """
+    __slots__ = ('counts', 'vocabs')
+
+    def __init__(self, counts, vocabs):
+        self.counts = counts
+        self.vocabs = tuple(vocabs)
+
+    @property
+    def codes(self):
+        """The constants of each axis, in vocab.json order."""
+        return tuple(VOCAB.ordered_constants(vocab) for vocab in self.vocabs)
+
+    @property
+    def titles(self):
+        """The titles of the constants of each axis, as in codes."""
+        return tuple(VOCAB.titles(vocab) for vocab in self.vocabs)
+
+    def __getitem__(self, codes):
+        """The count of a code, or of a (row code, column code) pair of a cross-tabulation."""
+        if not isinstance(codes, tuple):
+            codes = (codes,)
+        if len(codes) != len(self.vocabs):
+            raise KeyError(codes)
+        try:
+            index = tuple(constants.index(code) for constants, code in zip(self.codes, codes))
+        except ValueError:
+            raise KeyError(codes) from None
+        return int(self.counts[index])
+
+    def to_dict(self):
+        """
+        Returns the counts as a dictionary of code to count, or, for a
+        cross-tabulation, of row code to a dictionary of column code to count.
+        """
+        if len(self.vocabs) == 1:
+            return dict(zip(self.codes[0], self.counts.tolist()))
+        columns = self.codes[1]
+        return {code: dict(zip(columns, row)) for code, row in zip(self.codes[0], self.counts.tolist())}
+
+    def most_common(self, n=None):
+        """
+        Returns the n largest counts, or all the counts other than 0, from
+        the largest, as (code, title, count) triples; for a cross-tabulation
+        the code and title are (row, column) pairs.
+        """
+        import numpy as np
+
+        flat = self.counts.ravel()
+        order = np.argsort(-flat, kind="stable")
+        order = order[flat[order] > 0][:n]
+        codes, titles = self.codes, self.titles
+        result = []
+        for index in zip(*np.unravel_index(order, self.counts.shape)):
+            code = tuple(axis_codes[i] for axis_codes, i in zip(codes, index))
+            title = tuple(axis_titles[i] for axis_titles, i in zip(titles, index))
+            if len(index) == 1:
+                code, title = code[0], title[0]
+            result.append((code, title, int(self.counts[index])))
+        return result
+
+    def __eq__(self, other):
+        if not isinstance(other, CodeCounts):
+            return NotImplemented
+        return self.vocabs == other.vocabs and (self.counts == other.counts).all()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CodeCounts({', '.join(map(repr, self.vocabs))}, {self.counts.tolist()!r})"
+
+
+class CorpusStats:
+    """
+    Counts and cross-tabulations of the vocabulary fields of many bundles,
+    computed with NumPy: how many incidents have TTPs of each tactic, how
+    many have both a given tactic and a victim organization of a given
+    industry sector, which outcomes occur together.
+
+    Each field is packed, the first time it is used, into two integer
+    arrays with an entry for each (object, code) of the field: the row of
+    the object and the position of the code in its vocabulary, in
+    vocab.json order. Each type of object also gets the rows of the
+    incidents its objects belong to (see corpus_util.related_incidents),
+    joined from the rows of its parents, e.g. a TTP's incident. Packing
+    reads each field of the objects in one pass that numpy.fromiter turns
+    into an array; the statistics after that are sorts, joins and bincounts
+    of these arrays. Codes that are not in the vocabulary are not counted.
+
+    The objects of a type are those in the lists of its tag in the bundles'
+    objects, e.g. bundle.objects["ttp"], read the first time the type is
+    used: a change to them after that is not seen.
+
+    Args:
+        bundles (iterable): The bundles, e.g. a Corpus.
+
+    Raises:
+        ImportError: If numpy is not installed.
+
+    Example:
+        >>> stats = CorpusStats(bundles)
+        >>> stats.counts("ttp", "tactic").most_common(3)
+        >>> stats.crosstab(("ttp", "tactic"), ("organization", "industry_sector"))
+        >>> stats.cooccurrence("incident", "outcome")
+    """
+
+    def __init__(self, bundles):
+        import numpy  # noqa: F401, raises ImportError early
+
+        self._bundles = list(filter(None, map(operator.attrgetter("objects"), bundles)))
+        self._objects = {}
+        self._rows = {}
+        self._codes = {}
+        self._links = {}
+
+    @property
+    def incidents(self):
+        """The number of incidents."""
+        return len(self._tag_objects("incident"))
+
+    def objects(self, tag):
+        """The number of objects of an IIDES type."""
+        return len(self._tag_objects(tag))
+
+    def _tag_objects(self, tag):
+        # the objects of the type, from the lists of their tag in the bundles
+        objects = self._objects.get(tag)
+        if objects is None:
+            objects = self._objects[tag] = list(itertools.chain.from_iterable(
+                filter(None, map(operator.methodcaller("get", tag), self._bundles))))
+        return objects
+
+    def _field_codes(self, tag, field):
+        # the (object row, code position) of every code of the field
+        key = (tag, field)
+        packed = self._codes.get(key)
+        if packed is None:
+            import numpy as np
+
+            position = {code: i for i, code in enumerate(VOCAB.ordered_constants(field_vocab(tag, field)))}.get
+            objects = self._tag_objects(tag)
+            values = list(map(getattr, objects, itertools.repeat("_" + field), itertools.repeat(None)))
+            if set(map(type, values)) <= {str, type(None)}:
+                # a field of single codes: one code, or none, per object
+                codes = np.fromiter(map(position, values, itertools.repeat(-1)), np.int64, len(values))
+                rows = np.arange(len(values))
+            else:
+                values = [(value,) if isinstance(value, str) else value or () for value in values]
+                lengths = np.fromiter(map(len, values), np.int64, len(values))
+                flat = itertools.chain.from_iterable(values)
+                object_type = OBJECT_TYPES[tag]
+                if field in object_type.tuples or field in object_type.dated_pairs:
+                    # (type, subtype) pairs are counted by type, dated pairs by code
+                    flat = map(operator.itemgetter(0), flat)
+                codes = np.fromiter(map(position, flat, itertools.repeat(-1)), np.int64, int(lengths.sum()))
+                rows = np.repeat(np.arange(len(values)), lengths)
+            known = codes >= 0
+            packed = self._codes[key] = (rows[known], codes[known])
+        return packed
+
+    def _object_rows(self, tag):
+        # {object: row} of the objects of the type
+        rows = self._rows.get(tag)
+        if rows is None:
+            rows = self._rows[tag] = {obj: row for row, obj in enumerate(self._tag_objects(tag))}
+        return rows
+
+    def _incident_links(self, tag):
+        # the distinct (object row, incident row) of every incident of every
+        # object of the type, sorted by object row; (None, incident rows) when
+        # they are one to one
+        links = self._links.get(tag)
+        if links is None:
+            links, _ = self._link_parents(tag, ())
+        return links
+
+    def _link_parents(self, tag, active):
+        # (links, cut) of _incident_links: the incidents of an object are those
+        # of its parents, e.g. a response's those of its incident and of its
+        # legal response. The types in active are being linked further up:
+        # they are cycles, e.g. a legal response's response, and are skipped,
+        # which leaves out nothing from the type at the top of the cycle, but
+        # the links of the others are incomplete and only kept if cut, the
+        # skipped types other than the type itself, is empty
+        import numpy as np
+
+        links = self._links.get(tag)
+        if links is not None:
+            return links, set()
+        objects = self._tag_objects(tag)
+        attributes = _parent_attributes(tag)
+        cut = set()
+        if tag == "incident":
+            rows, incidents = None, np.arange(len(objects))
+        elif not attributes:
+            # objects without relationships to single objects, like sponsors,
+            # are few: follow each of their relationships
+            incident_rows = self._object_rows("incident")
+            pairs = [(row, incident_rows[incident]) for row, obj in enumerate(objects)
+                     for incident in related_incidents(obj) if incident in incident_rows]
+            rows = np.fromiter((row for row, _ in pairs), np.int64, len(pairs))
+            incidents = np.fromiter((incident for _, incident in pairs), np.int64, len(pairs))
+        else:
+            # join the rows of the parents of each type with their links
+            row_parts, incident_parts = [], []
+            for attribute in attributes:
+                parents = list(map(getattr, objects, itertools.repeat(attribute), itertools.repeat(None)))
+                for cls in set(map(type, parents)):
+                    if not hasattr(cls, "_object_type"):
+                        continue
+                    parent_tag = cls._object_type.tag
+                    if parent_tag == tag or parent_tag in active:
+                        cut.add(parent_tag)
+                        continue
+                    (parent_links, parent_incidents), parent_cut = self._link_parents(parent_tag, active + (tag,))
+                    cut |= parent_cut
+                    parent_rows = np.fromiter(map(self._object_rows(parent_tag).get, parents, itertools.repeat(-1)),
+                                              np.int64, len(parents))
+                    child_rows = np.flatnonzero(parent_rows >= 0)
+                    if parent_links is None:
+                        row_parts.append(child_rows)
+                        incident_parts.append(parent_incidents[parent_rows[child_rows]])
+                    else:
+                        left, right = _join(parent_rows[child_rows], child_rows, parent_links, parent_incidents)
+                        row_parts.append(left)
+                        incident_parts.append(right)
+            rows = np.concatenate(row_parts) if row_parts else np.zeros(0, np.int64)
+            incidents = np.concatenate(incident_parts) if incident_parts else np.zeros(0, np.int64)
+            if len(row_parts) > 1:
+                rows, incidents = _unique_pairs(rows, incidents, max(self.incidents, 1))
+        if rows is not None and np.array_equal(rows, np.arange(len(objects))):
+            # every object belongs to a single incident, the usual case: the
+            # incident rows are then indexed by object row, without a join
+            rows = None
+        cut.discard(tag)
+        if not cut:
+            self._links[tag] = (rows, incidents)
+        return (rows, incidents), cut
+
+    def _unit_codes(self, tag, field, per):
+        # the distinct (unit row, code position) of the field, sorted by unit row
+        if per not in ("incident", "object"):
+            raise ValueError(f'per must be "incident" or "object", not {per!r}')
+        rows, codes = self._field_codes(tag, field)
+        if per == "incident" and tag != "incident":
+            link_rows, incidents = self._incident_links(tag)
+            if link_rows is None:
+                rows = incidents[rows]
+            else:
+                rows, codes = _join(link_rows, incidents, rows, codes)
+        return _unique_pairs(rows, codes, len(VOCAB.ordered_constants(field_vocab(tag, field))))
+
+    def counts(self, tag, field, per="incident"):
+        """
+        Returns the CodeCounts of a vocabulary field: for each code, the
+        number of incidents with an object of the type that has it, or, with
+        per="object", the number of objects that have it.
+
+        Raises:
+            KeyError: If the type has no such vocabulary field.
+            ValueError: If per is not "incident" or "object".
+        """
+        import numpy as np
+
+        vocab = field_vocab(tag, field)
+        _, codes = self._unit_codes(tag, field, per)
+        return CodeCounts(np.bincount(codes, minlength=len(VOCAB.ordered_constants(vocab))), (vocab,))
+
+    def crosstab(self, rows, columns, per="incident"):
+        """
+        Returns the cross-tabulation of two vocabulary fields, each a (tag,
+        field) pair: the CodeCounts matrix of the number of incidents that
+        have both the code of the row, in the first field, and the code of
+        the column, in the second, e.g. of TTP tactics by the industry
+        sectors of the organizations of the incidents. With per="object"
+        both fields are of the same type and the counts are of its objects.
+
+        Raises:
+            KeyError: If a type has no such vocabulary field.
+            ValueError: If per is not "incident" or "object", or is "object"
+                and the fields are of different types.
+        """
+        import numpy as np
+
+        if per == "object" and rows[0] != columns[0]:
+            raise ValueError(f"cannot count objects of {rows[0]} and {columns[0]} together")
+        row_vocab, column_vocab = field_vocab(*rows), field_vocab(*columns)
+        shape = (len(VOCAB.ordered_constants(row_vocab)), len(VOCAB.ordered_constants(column_vocab)))
+        row_units, row_codes = self._unit_codes(*rows, per)
+        column_units, column_codes = self._unit_codes(*columns, per)
+        row_codes, column_codes = _join(row_units, row_codes, column_units, column_codes)
+        counts = np.bincount(row_codes * shape[1] + column_codes, minlength=shape[0] * shape[1])
+        return CodeCounts(counts.reshape(shape), (row_vocab, column_vocab))
+
+    def cooccurrence(self, tag, field, per="incident"):
+        """
+        Returns the co-occurrence matrix of a vocabulary field: the number
+        of incidents (or objects, with per="object") that have both codes.
+        It is symmetric and its diagonal is counts(tag, field, per).
+
+        Raises:
+            KeyError: If the type has no such vocabulary field.
+            ValueError: If per is not "incident" or "object".
+        """
+        return self.crosstab((tag, field), (tag, field), per)
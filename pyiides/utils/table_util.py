@@ -0,0 +1,319 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import datetime
+import functools
+import inspect
+import os
+
+from pyiides.utils.helper_functions import OBJECT_TYPES, CodeMask, date_to_str
+
+"""
+- - - - - - - - - - - - - - - - - - - - -
+
+        Columnar Export
+
+- - - - - - - - - - - - - - - - - - - - -
+"""
+
+# file extension of each format write_tables accepts
+TABLE_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+class Column:
+    """
+    One column of the table of an IIDES type, see table_columns.
+
+    Args:
+        name (str): The column name.
+        attribute (str): The instance attribute it is read from, e.g. "_tactic".
+        kind (str): How the value is stored: "string", "int", "float", "bool",
+            "date", "datetime", "duration", "list", "tuples" (a list of (type,
+            subtype) pairs), "dated_pairs" (a list of [code, date] pairs) or
+            "reference" (the id of another object).
+    """
+    __slots__ = ('name', 'attribute', 'kind')
+
+    def __init__(self, name, attribute, kind):
+        self.name = name
+        self.attribute = attribute
+        self.kind = kind
+
+    def __repr__(self):
+        return f"Column({self.name!r}, {self.kind!r})"
+
+
+def _field_kind(object_type, name):
+    """Returns the column kind of the constructor argument name of an IIDES type."""
+    if name in object_type.kinds:
+        return object_type.kinds[name]
+    if name in object_type.references:
+        return "reference"
+    for kind, fields in (("tuples", object_type.tuples), ("dated_pairs", object_type.dated_pairs),
+                         ("date", object_type.dates), ("datetime", object_type.datetimes),
+                         ("duration", object_type.durations), ("list", object_type.code_lists)):
+        if name in fields:
+            return kind
+    return "string"
+
+
+@functools.lru_cache(maxsize=None)
+def table_columns(tag):
+    """
+    Returns the columns of the table of an IIDES type: "id", "bundle_id", a
+    column for every argument of the class's __init__ (those of its base
+    classes after its own), and a "<name>_id" foreign key column for every
+    relationship to a single object, e.g. "incident_id" for TTP. Relationships
+    to many objects, e.g. Incident.ttps, are not stored: they are the foreign
+    keys of the other table. Ids are full ids, e.g. "ttp--<uuid>".
+
+    The kind of a column comes from the object's ObjectType: its kinds, or else
+    the references, tuples, dated_pairs, dates, datetimes, durations and
+    code_lists it declares. Other arguments are strings. The foreign keys are
+    its parents.
+
+    Args:
+        tag (str): The tag of the type, e.g. "ttp".
+
+    Returns:
+        list: The Column objects, in table order.
+
+    Raises:
+        KeyError: If no class is registered for the tag.
+    """
+    object_type = OBJECT_TYPES[tag]
+    columns = [Column("id", "_id", "string"), Column("bundle_id", None, "string")]
+    seen = {"id"}
+    for cls in object_type.cls.__mro__:
+        if "__init__" not in cls.__dict__ or not hasattr(cls, "_object_type"):
+            continue
+        for parameter in inspect.signature(cls.__dict__["__init__"]).parameters.values():
+            name = parameter.name
+            if name in seen or name == "self" or parameter.kind is parameter.VAR_KEYWORD:
+                continue
+            seen.add(name)
+            columns.append(Column(name, "_" + name, _field_kind(object_type, name)))
+    foreign_keys = [Column(parent + "_id", "_" + parent, "reference") for parent in object_type.parents]
+    return columns + foreign_keys
+
+
+def _arrow_types():
+    import pyarrow as pa
+
+    return {
+        "string": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "date": pa.date32(),
+        "datetime": pa.timestamp("us", tz="UTC"),
+        "duration": pa.duration("us"),
+        "list": pa.list_(pa.string()),
+        "tuples": pa.list_(pa.struct([("type", pa.string()), ("subtype", pa.string())])),
+        "dated_pairs": pa.list_(pa.struct([("code", pa.string()), ("date", pa.string())])),
+        "reference": pa.string(),
+    }
+
+
+def table_schema(tag):
+    """
+    Returns the pyarrow schema of the table of an IIDES type, see
+    table_columns. Dates are date32, datetimes UTC timestamps (the json
+    datetimes are UTC), vocabulary lists lists of strings, (type, subtype)
+    pairs structs of "type" and "subtype" and dated pairs structs of "code"
+    and "date", with the date as in json ("YYYY-MM-DD"), since these dates
+    are not always complete.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    import pyarrow as pa
+
+    types = _arrow_types()
+    return pa.schema([(column.name, types[column.kind]) for column in table_columns(tag)])
+
+
+def _full_id(obj):
+    return f"{obj._object_type.tag}--{obj.id}"
+
+
+def _tuples(pairs):
+    return [{"type": pair[0], "subtype": pair[1]} for pair in pairs]
+
+
+def _dated_pairs(pairs):
+    # the dates are kept as in json, where they are not always valid, e.g. "2001-11-00"
+    return [
+        {"code": code, "date": date_to_str(day) if isinstance(day, (datetime.date, datetime.datetime)) else day}
+        for code, day in pairs
+    ]
+
+
+def _list(values):
+    # lists of codes can be stored as CodeMasks, see helper_functions.compact_codes
+    return values.tolist() if isinstance(values, CodeMask) else values
+
+
+# conversion of the attribute values that pyarrow does not take as they are
+_CONVERTERS = {
+    "list": _list,
+    "reference": _full_id,
+    "tuples": _tuples,
+    "dated_pairs": _dated_pairs,
+}
+
+
+class _TableBuffer:
+    """Collects the rows of one table column by column, until they are flushed."""
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.columns = table_columns(tag)
+        self.schema = table_schema(tag)
+        self.values = [[] for _ in self.columns]
+        self.rows = 0
+        # the first two columns are "id" and "bundle_id"
+        self.ids, self.bundle_ids = self.values[:2]
+        self.readers = [
+            (values, column.attribute, _CONVERTERS.get(column.kind))
+            for values, column in zip(self.values[2:], self.columns[2:])
+        ]
+
+    def append(self, obj, bundle_id):
+        self.ids.append(f"{self.tag}--{obj.id}")
+        self.bundle_ids.append(bundle_id)
+        for values, attribute, convert in self.readers:
+            value = getattr(obj, attribute, None)
+            if value is not None and convert is not None:
+                value = convert(value)
+            values.append(value)
+        self.rows += 1
+
+    def flush(self):
+        """Returns the collected rows as a pyarrow RecordBatch and starts over."""
+        import pyarrow as pa
+
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(self.values, self.schema)],
+            schema=self.schema)
+        for values in self.values:
+            values.clear()
+        self.rows = 0
+        return batch
+
+
+def _iter_rows(bundles):
+    """Yields (tag, object, bundle id) for every registered object in the bundles."""
+    for bundle in bundles:
+        bundle_id = f"bundle--{bundle.id}"
+        for class_list in (bundle.objects or {}).values():
+            for obj in class_list:
+                object_type = getattr(obj, "_object_type", None)
+                if object_type is not None:
+                    yield object_type.tag, obj, bundle_id
+
+
+def Bundles_to_tables(bundles):
+    """
+    Converts bundles to one pyarrow Table per IIDES type, for analysis with
+    pyarrow, pandas (Table.to_pandas()) or other Arrow tools. The columns are
+    those of table_columns: "bundle_id" and the foreign keys, e.g.
+    "incident_id" of the "ttp" table, join the tables. Extra attributes given
+    to a constructor as **kwargs are not exported. Needs the pyarrow package.
+
+    The whole result is in memory; write_tables writes large corpora to
+    files in bounded memory.
+
+    Args:
+        bundles (iterable): The Bundle objects.
+
+    Returns:
+        dict: {tag: pyarrow.Table} for every registered type, with no rows
+            for types that the bundles do not have.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+
+    Example:
+        >>> tables = Bundles_to_tables(bundles)
+        >>> tables["ttp"].group_by("tactic").aggregate([("id", "count")])
+    """
+    import pyarrow as pa
+
+    buffers = {tag: _TableBuffer(tag) for tag in OBJECT_TYPES}
+    for tag, obj, bundle_id in _iter_rows(bundles):
+        buffers[tag].append(obj, bundle_id)
+    return {tag: pa.Table.from_batches([buffer.flush()]) for tag, buffer in buffers.items()}
+
+
+def write_tables(bundles, directory, file_format="parquet", batch_size=10000):
+    """
+    Writes bundles as one file per IIDES type, "<tag>.parquet" or
+    "<tag>.arrow" (the Arrow IPC file format, also read as Feather v2), with
+    the columns of Bundles_to_tables. The bundles are read one at a time and
+    every `batch_size` rows of a type are written out, as a Parquet row group
+    or an Arrow record batch, so memory stays bounded however many bundles
+    there are; pass a generator to avoid holding them all, e.g.
+    (json_to_Bundle(data) for data in documents). Needs the pyarrow package.
+
+    Args:
+        bundles (iterable): The Bundle objects.
+        directory (str): The directory to write to. It is created if needed,
+            and files already in it are replaced.
+        file_format (str): "parquet" or "arrow".
+        batch_size (int): The number of rows of a type to collect before
+            writing them.
+
+    Returns:
+        dict: {tag: path} of the written files, one for every registered
+            type, with no rows for types that the bundles do not have.
+
+    Raises:
+        ValueError: If the format is not one of TABLE_FORMATS or batch_size is
+            not positive.
+        ImportError: If pyarrow is not installed.
+
+    Example:
+        >>> paths = write_tables(bundles, "tables")
+        >>> pyarrow.parquet.read_table(paths["incident"])
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if file_format not in TABLE_FORMATS:
+        raise ValueError(f"Unknown table format {file_format!r}, expected one of {list(TABLE_FORMATS)}")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    os.makedirs(directory, exist_ok=True)
+
+    paths = {}
+    writers = {}
+    buffers = {}
+    try:
+        for tag in OBJECT_TYPES:
+            paths[tag] = os.path.join(directory, tag + TABLE_FORMATS[file_format])
+            buffers[tag] = _TableBuffer(tag)
+            if file_format == "parquet":
+                writers[tag] = pq.ParquetWriter(paths[tag], buffers[tag].schema)
+            else:
+                writers[tag] = pa.ipc.new_file(paths[tag], buffers[tag].schema)
+
+        for tag, obj, bundle_id in _iter_rows(bundles):
+            buffer = buffers[tag]
+            buffer.append(obj, bundle_id)
+            if buffer.rows >= batch_size:
+                writers[tag].write_batch(buffer.flush())
+
+        for tag, buffer in buffers.items():
+            if buffer.rows:
+                writers[tag].write_batch(buffer.flush())
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return paths
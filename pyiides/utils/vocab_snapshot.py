@@ -0,0 +1,72 @@
+"""
+Precompiled snapshot of the constants in vocab.json.
+
+Generated by development/gen_vocab.py, do not edit by hand. VOCAB_SHA256 is
+the hash of the vocab.json this snapshot was built from; the vocabulary
+registry ignores the snapshot whenever the hash does not match.
+"""
+
+VOCAB_SHA256 = 'a7063adb44a991c68e2f5ec7f13e907f30e85ee82b437db91b6612da1088914f'
+
+CONSTANTS = {
+    'country-vocab': ('AD', 'AE', 'AF', 'AG', 'AI', 'AL', 'AM', 'AO', 'AQ', 'AR', 'AS', 'AT', 'AU', 'AW', 'AX', 'AZ', 'BA', 'BB', 'BD', 'BE', 'BF', 'BG', 'BH', 'BI', 'BJ', 'BL', 'BM', 'BN', 'BO', 'BQ', 'BR', 'BS', 'BT', 'BV', 'BW', 'BY', 'BZ', 'CA', 'CC', 'CD', 'CF', 'CG', 'CH', 'CI', 'CK', 'CL', 'CM', 'CN', 'CO', 'CR', 'CU', 'CV', 'CW', 'CX', 'CY', 'CZ', 'DE', 'DJ', 'DK', 'DM', 'DO', 'DZ', 'EC', 'EE', 'EG', 'EH', 'ER', 'ES', 'ET', 'FI', 'FJ', 'FK', 'FM', 'FO', 'FR', 'GA', 'GB', 'GD', 'GE', 'GF', 'GG', 'GH', 'GI', 'GL', 'GM', 'GN', 'GP', 'GQ', 'GR', 'GS', 'GT', 'GU', 'GW', 'GY', 'HK', 'HM', 'HN', 'HR', 'HT', 'HU', 'ID', 'IE', 'IL', 'IM', 'IN', 'IO', 'IQ', 'IR', 'IS', 'IT', 'JE', 'JM', 'JO', 'JP', 'KE', 'KG', 'KH', 'KI', 'KM', 'KN', 'KP', 'KR', 'KW', 'KY', 'KZ', 'LA', 'LB', 'LC', 'LI', 'LK', 'LR', 'LS', 'LT', 'LU', 'LV', 'LY', 'MA', 'MC', 'MD', 'ME', 'MF', 'MG', 'MH', 'MK', 'ML', 'MM', 'MN', 'MO', 'MP', 'MQ', 'MR', 'MS', 'MT', 'MU', 'MV', 'MW', 'MX', 'MY', 'MZ', 'NA', 'NC', 'NE', 'NF', 'NG', 'NI', 'NL', 'NO', 'NP', 'NR', 'NU', 'NZ', 'OM', 'PA', 'PE', 'PF', 'PG', 'PH', 'PK', 'PL', 'PM', 'PN', 'PR', 'PS', 'PT', 'PW', 'PY', 'QA', 'RE', 'RO', 'RS', 'RU', 'RW', 'SA', 'SB', 'SC', 'SD', 'SE', 'SG', 'SH', 'SI', 'SJ', 'SK', 'SL', 'SM', 'SN', 'SO', 'SR', 'SS', 'ST', 'SV', 'SX', 'SY', 'SZ', 'TC', 'TD', 'TF', 'TG', 'TH', 'TJ', 'TK', 'TL', 'TM', 'TN', 'TO', 'TR', 'TT', 'TV', 'TW', 'TZ', 'UA', 'UG', 'UM', 'US', 'UY', 'UZ', 'VA', 'VC', 'VE', 'VG', 'VI', 'VN', 'VU', 'WF', 'WS', 'YE', 'YT', 'ZA', 'ZM', 'ZW'),
+    'insider-relationship-vocab': ('1', '2', '3', '4', '5', '6', '8', '9'),
+    'state-vocab-us': ('AL', 'AK', 'AS', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'GU', 'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND', 'MP', 'OH', 'OK', 'OR', 'PA', 'PR', 'RI', 'SC', 'SD', 'TN', 'TX', 'VI', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY'),
+    'charge-plea-vocab': ('1', '2', '3', '4'),
+    'charge-disposition-vocab': ('1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11'),
+    'court-type-vocab': ('1', '2', '3'),
+    'case-type-vocab': ('1', '2'),
+    'detection-team-vocab': ('LE', 'OR', 'CU', 'CO', 'AU', 'SR', 'IR', 'ST', 'MG', 'II', 'RR'),
+    'detection-method-vocab': ('1', '2', '3', '4', '5'),
+    'detection-log-vocab': ('AC', 'AU', 'BR', 'DB', 'EM', 'FS', 'IS', 'RA', 'SF', 'VD', 'WB'),
+    'impact-metric-vocab': ('1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12', '13', '14', '15', '16'),
+    'incident-status-vocab': ('P', 'I', 'R', 'C'),
+    'cia-vocab': ('C', 'I', 'A'),
+    'outcome-type-vocab': ('BR', 'DC', 'DD', 'DM', 'DR', 'DS', 'MD', 'ML', 'MS', 'NN', 'OT', 'PD', 'RO', 'SI', 'SD', 'IT'),
+    'incident-type-vocab': ('F', 'S', 'E', 'V', 'U'),
+    'incident-subtype-vocab': ('F.1', 'F.2', 'F.3', 'S.1', 'S.2', 'E.1', 'E.2', 'V.1', 'V.2', 'U.1', 'U.2'),
+    'incident-role-vocab': ('1', '2', '3', '4'),
+    'motive-vocab': ('1', '2', '3', '4', '5', '6', '7', '8', '99'),
+    'psych-issues-vocab': ('1', '2', '3', '4', '5', '6', '99'),
+    'predisposition-type-vocab': ('1', '2', '3', '4'),
+    'predisposition-subtype-vocab': ('1.1', '1.2', '1.3', '1.4', '1.5', '1.6', '1.7', '2.1', '2.2', '2.3', '2.4', '2.5', '2.6', '2.7', '3.1', '3.2', '3.3', '4.1', '4.2', '4.3', '4.4'),
+    'concerning-behavior-vocab': ('1', '2', '3', '4', '5', '6', '7'),
+    'cb-subtype-vocab': ('1.1', '1.2', '1.3', '2.1', '2.2', '2.3', '2.4', '2.5', '2.6', '3.1', '3.2', '3.3', '3.4', '3.5', '3.6', '3.7', '3.8', '3.9', '3.10', '3.11', '3.12', '3.13', '4.1', '4.2', '4.3', '5.1', '5.2', '5.3', '5.4', '5.5', '5.6', '6.1', '6.2', '6.3', '6.4', '7.1'),
+    'job-function-vocab': ('11', '13', '15', '17', '19', '21', '22', '23', '25', '27', '29', '31', '33', '35', '37', '39', '41', '43', '45', '47', '49', '51', '53', '55', '99'),
+    'occupation-vocab': ('11.1', '11.2', '11.3', '11.9', '13.1', '13.2', '15.1', '15.2', '17.1', '17.2', '17.3', '19.1', '19.2', '19.3', '19.4', '19.5', '21.1', '21.2', '23.1', '23.2', '25.2', '25.3', '25.4', '25.9', '27.1', '27.2', '27.3', '27.4', '29.1', '29.2', '29.9', '31.1', '31.2', '31.9', '33.1', '33.2', '33.3', '33.9', '35.1', '35.2', '35.3', '35.9', '37.1', '37.2', '37.3', '39.1', '39.2', '39.3', '39.4', '39.5', '39.6', '39.7', '39.9', '41.1', '41.2', '41.3', '41.4', '41.9', '43.1', '43.2', '43.3', '43.4', '43.5', '43.6', '43.9', '45.1', '45.2', '45.3', '45.4', '47.1', '47.2', '47.3', '47.4', '47.5', '49.1', '49.2', '49.3', '49.9', '51.1', '51.2', '51.3', '51.4', '51.5', '51.6', '51.7', '51.8', '51.9', '53.1', '53.2', '53.3', '53.4', '53.5', '53.6', '53.7', '55.1', '55.2', '55.3', '99.1', '99.9'),
+    'access-auth-vocab': ('1', '2', '3', '4', '5', '6', '7', '8', '9'),
+    'employment-type-vocab': ('CTR', 'FLT', 'PRT', 'INT', 'TMP', 'VOL', 'OTH'),
+    'industry-sector-vocab': ('11', '21', '22', '23', '31', '42', '44', '48', '51', '52', '53', '54', '55', '56', '61', '62', '71', '72', '92', '81', '99'),
+    'industry-subsector-vocab': ('11.1', '11.2', '11.3', '11.4', '11.5', '21.1', '21.2', '21.3', '22.1', '23.6', '23.7', '23.8', '31.1', '31.2', '31.3', '31.4', '31.5', '31.6', '31.21', '31.22', '31.23', '31.24', '31.25', '31.26', '31.27', '31.31', '31.32', '31.33', '31.34', '31.35', '31.36', '31.37', '31.39', '42.3', '42.4', '42.5', '44.1', '44.4', '44.5', '44.9', '44.55', '44.56', '44.57', '44.58', '44.59', '48.1', '48.2', '48.3', '48.4', '48.5', '48.6', '48.7', '48.8', '48.91', '48.92', '48.93', '51.2', '51.3', '51.6', '51.7', '51.8', '51.9', '52.1', '52.2', '52.3', '52.4', '52.5', '53.1', '53.2', '53.3', '54.1', '55.1', '56.1', '56.2', '61.1', '62.1', '62.2', '62.3', '62.4', '71.1', '71.2', '71.3', '72.1', '72.2', '81.1', '81.2', '81.3', '81.4', '92.1', '92.2', '92.3', '92.4', '92.5', '92.6', '92.7', '92.811', '92.812'),
+    'org-role-vocab': ('B', 'V', 'S', 'T', 'O'),
+    'suffix-vocab': ('Jr', 'Sr', 'III', 'IV'),
+    'residency-vocab': ('N', 'P', 'R'),
+    'gender-vocab': ('F', 'M', 'N', 'O'),
+    'education-vocab': ('4', '5', '8', '2', '7', '6', '3', '1'),
+    'marital-status-vocab': ('1', '2', '3', '4', '5'),
+    'technical-control-vocab': ('1', '2'),
+    'behavioral-control-vocab': ('1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12'),
+    'investigation-vocab': ('1', '2', '3', '4', '5', '6'),
+    'investigator-vocab': ('1', '2', '3', '4', '5', '6', '7', '99'),
+    'sentence-type-vocab': ('1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12', '13', '14', '15', '16'),
+    'sentence-metric-vocab': ('1', '2', '3', '4', '5'),
+    'source-type-vocab': ('1', '2', '3', '4', '5', '6', '7', '99'),
+    'source-file-type-vocab': ('html', 'log', 'pdf', 'txt', 'docx', 'png', 'xlsx', 'video', 'other'),
+    'sponsor-type-vocab': ('OC', 'SS', 'FN', 'CE', 'OT'),
+    'stressor-category-vocab': ('1', '2', '3', '4'),
+    'stressor-subcategory-vocab': ('1.1', '1.2', '1.3', '1.4', '1.5', '1.6', '1.7', '1.8', '1.9', '1.10', '1.11', '1.12', '2.1', '2.2', '2.3', '2.4', '2.5', '2.6', '2.7', '2.8', '2.9', '2.10', '2.11', '2.12', '2.13', '3.1', '3.2', '3.3', '3.4', '4.1', '4.2', '4.3', '4.4', '4.5', '4.6'),
+    'target-asset-vocab': ('1', '2', '3', '4', '5', '6'),
+    'target-category-vocab': ('1.1', '2.1', '2.2', '2.3', '3.1', '4.1', '4.2', '4.3', '4.4', '4.5', '5.1', '5.2', '5.3', '5.4', '6.1'),
+    'target-subcategory-vocab': ('1.1.1', '1.1.2', '1.1.3', '2.1.1', '2.1.2', '2.2.1', '2.2.2', '2.2.3', '2.2.4', '2.2.5', '2.2.6', '2.3.1', '2.3.2', '3.1.1', '3.1.2', '3.1.3', '3.1.4', '3.1.5', '3.1.6', '3.1.7', '3.1.8', '3.1.9', '3.1.10', '3.1.11', '3.1.12', '3.1.13', '3.1.14', '4.1.1', '4.1.2', '4.1.3', '4.1.4', '4.1.5', '4.2.1', '4.3.1', '4.3.2', '4.3.3', '4.4.1', '4.4.2', '4.4.3', '4.4.4', '4.5.1', '4.5.2', '5.1.1', '5.1.2', '5.1.3', '5.1.4', '5.1.5', '5.1.6', '5.1.7', '5.1.8', '5.1.9', '5.1.10', '5.1.11', '5.1.12', '5.2.1', '5.2.2', '5.2.3', '5.2.4', '5.3.1', '5.3.2', '5.4.1', '5.4.2', '5.4.3'),
+    'target-format-vocab': ('1', '2', '3', '4', '5'),
+    'target-owner-vocab': ('C', 'E', 'O', 'T', 'Z'),
+    'target-sensitivity-vocab': ('1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12', '13', '14', '15', '16', '17', '18', '19', '20', '21', '22', '23', '24', '25', '26'),
+    'tactic-vocab': ('1', '2', '3', '4', '5', '6', '7', '8', '9'),
+    'technique-vocab': ('1.1', '1.2', '1.3', '1.4', '1.5', '1.6', '1.7', '1.8', '1.9', '1.10', '1.11', '1.12', '1.13', '1.14', '2.1', '2.2', '2.3', '2.4', '3.1', '3.2', '3.3', '3.4', '3.5', '3.6', '3.7', '4.1', '4.2', '4.3', '4.4', '4.5', '4.6', '4.7', '4.8', '4.9', '4.10', '4.11', '4.12', '4.13', '5.1', '5.2', '5.3', '5.4', '6.1', '6.2', '6.3', '6.4', '6.5', '6.6', '6.7', '6.8', '6.9', '6.10', '7.1', '7.2', '7.3', '7.4', '7.5', '7.6', '7.7', '7.8', '7.9', '7.10', '8.1', '8.2', '8.3', '8.4', '8.5', '8.6', '9.1', '9.2', '9.3', '9.4', '9.5'),
+    'attack-location-vocab': ('1', '2', '3', '4'),
+    'attack-hours-vocab': ('1', '2'),
+    'device-vocab': ('1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '99'),
+    'channel-vocab': ('1', '2', '3', '4', '5', '6', '7', '9'),
+    'recruitment-vocab': ('1', '2', '3', '4', '5', '9'),
+    'org-relationship-vocab': ('C', 'P', 'S', 'V', 'T', 'O'),
+}
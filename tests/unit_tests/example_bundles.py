@@ -0,0 +1,42 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import json
+import os
+from pyiides import Bundle
+from pyiides.utils.bundle_util import json_to_Bundle
+
+# Shared by the unit tests: the example bundles in Examples/, and small
+# helpers to look at or build bundles without the code under test.
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', '..', 'Examples')
+
+def load_example(i):
+    """The json of Examples/example<i>.json."""
+    with open(os.path.join(EXAMPLES, f'example{i}.json')) as f:
+        return json.load(f)
+
+def load_bundles(validate=True):
+    """The four example bundles."""
+    return [json_to_Bundle(load_example(i), validate=validate) for i in range(1, 5)]
+
+def iter_objects(bundles, tag=None):
+    """Yields (bundle, object) for every object of the bundles, or of the type."""
+    for bundle in bundles:
+        objects = bundle.objects or {}
+        for class_list in (objects.values() if tag is None else [objects.get(tag, ())]):
+            for obj in class_list:
+                yield bundle, obj
+
+def bundle_of(*objects):
+    """A bundle of the objects, listed by their tags."""
+    by_tag = {}
+    for obj in objects:
+        by_tag.setdefault(obj._object_type.tag, []).append(obj)
+    return Bundle(objects=by_tag)
@@ -0,0 +1,158 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import unittest
+import io
+import json
+import os
+import tempfile
+import uuid
+from unittest import mock
+from pyiides.utils import archive_util
+from pyiides.utils.bundle_util import Bundle_to_json, json_stream_to_Bundle
+from pyiides.utils.archive_util import BundleArchive
+from tests.unit_tests.example_bundles import load_bundles
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class TestBundleArchive(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "bundles.iidesarc")
+        self.bundles = load_bundles()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameBundle(self, restored, bundle):
+        self.assertEqual(restored.id, bundle.id)
+        self.assertEqual(Bundle_to_json(restored, deterministic_ids=True),
+                         Bundle_to_json(bundle, deterministic_ids=True))
+
+    def write(self, compression="gzip"):
+        with BundleArchive(self.path, "w", compression=compression) as archive:
+            for bundle in self.bundles:
+                archive.add(bundle)
+
+    def check_round_trip(self, compression):
+        self.write(compression)
+        with BundleArchive(self.path) as archive:
+            self.assertEqual(len(archive), 4)
+            for restored, bundle in zip(archive, self.bundles):
+                self.assertSameBundle(restored, bundle)
+            for bundle in reversed(self.bundles):
+                self.assertIn(bundle.id, archive)
+                self.assertSameBundle(archive.get(bundle.id, validate=False), bundle)
+                for incident in bundle.objects["incident"]:
+                    self.assertSameBundle(archive.find_incident(incident.id), bundle)
+
+    def test_gzip(self):
+        self.check_round_trip("gzip")
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.assertLess(len(data), sum(len(Bundle_to_json(bundle)) for bundle in self.bundles) / 2)
+
+    @unittest.skipUnless(zstandard, "zstandard is not installed")
+    def test_zstd(self):
+        self.check_round_trip("zstd")
+
+    def test_table_of_contents(self):
+        self.write()
+        with BundleArchive(self.path) as archive:
+            self.assertEqual(archive.bundle_ids(), [f"bundle--{bundle.id}" for bundle in self.bundles])
+            for member, bundle in zip(archive.members, self.bundles):
+                self.assertEqual(member["compression"], "gzip")
+                self.assertEqual(member["objects"], {tag: len(objects) for tag, objects in bundle.objects.items()})
+                self.assertEqual(member["incidents"], [f"incident--{incident.id}" for incident in bundle.objects["incident"]])
+                text = io.StringIO()
+                bundle.dump(text)
+                self.assertEqual(member["size"], len(text.getvalue().encode("utf-8")))
+            self.assertIs(archive.member(self.bundles[0].id), archive.members[0])
+
+    def test_open(self):
+        self.write()
+        with BundleArchive(self.path) as archive:
+            for bundle in self.bundles:
+                with archive.open(f"bundle--{bundle.id}") as stream:
+                    restored = json_stream_to_Bundle(stream)
+                self.assertEqual(Bundle_to_json(restored, deterministic_ids=True).replace(restored.id, bundle.id),
+                                 Bundle_to_json(bundle, deterministic_ids=True))
+
+    def test_streaming(self):
+        self.write()
+        with mock.patch.object(archive_util, "STREAM_SIZE", 0), BundleArchive(self.path) as archive:
+            for bundle in self.bundles:
+                self.assertSameBundle(archive.get(bundle.id), bundle)
+
+    def test_append(self):
+        with BundleArchive(self.path, "a") as archive:
+            archive.add(self.bundles[0])
+        compression = "zstd" if zstandard else "gzip"
+        with BundleArchive(self.path, "a") as archive:
+            self.assertEqual(len(archive), 1)
+            for bundle in self.bundles[1:]:
+                archive.add(bundle, compression=compression)
+            # reading in between does not disturb adding
+            self.assertSameBundle(archive.get(self.bundles[1].id), self.bundles[1])
+        with BundleArchive(self.path) as archive:
+            self.assertEqual([member["compression"] for member in archive.members], ["gzip"] + [compression] * 3)
+            for restored, bundle in zip(archive, self.bundles):
+                self.assertSameBundle(restored, bundle)
+
+    def test_add_again(self):
+        self.write()
+        changed = load_bundles()[1]
+        changed.id = self.bundles[1].id
+        removed = changed.objects["incident"].pop()
+        for mode in ("a", "w"):
+            with BundleArchive(self.path, mode) as archive:
+                if mode == "w":
+                    for bundle in self.bundles:
+                        archive.add(bundle)
+                archive.add(changed)
+                self.assertEqual(len(archive), 4)
+            with BundleArchive(self.path) as archive:
+                self.assertEqual(len(archive.members), 5)
+                # the latest copy, at its place
+                ids = [bundle.id for bundle in self.bundles[:1] + self.bundles[2:] + [changed]]
+                self.assertEqual(archive.bundle_ids(), [f"bundle--{bundle_id}" for bundle_id in ids])
+                self.assertEqual([bundle.id for bundle in archive], ids)
+                self.assertEqual(len(archive), 4)
+                self.assertSameBundle(archive.get(changed.id), changed)
+                with self.assertRaises(KeyError):
+                    archive.find_incident(removed.id)
+
+    def test_errors(self):
+        self.write()
+        with BundleArchive(self.path) as archive:
+            with self.assertRaises(KeyError):
+                archive.get(str(uuid.uuid4()))
+            with self.assertRaises(KeyError):
+                archive.find_incident(str(uuid.uuid4()))
+            with self.assertRaises(ValueError):
+                archive.add(self.bundles[0])
+        with self.assertRaises(ValueError):
+            BundleArchive(self.path, "x")
+        with self.assertRaises(ValueError):
+            BundleArchive(self.path, "a", compression="bz2")
+
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(ValueError):
+            BundleArchive(self.path)
+        with open(self.path, "w") as f:
+            json.dump({"objects": []}, f)
+        with self.assertRaises(ValueError):
+            BundleArchive(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
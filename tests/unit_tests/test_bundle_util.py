@@ -0,0 +1,719 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import unittest
+import contextlib
+import copy
+import datetime
+import io
+import json
+import os
+import tempfile
+import uuid
+from unittest import mock
+from pyiides import Bundle, Insider, TTP, Job, Collusion, OrgRelationship
+from pyiides.utils import bundle_util
+from pyiides.utils.helper_functions import instance_dict, iides_object, export_fields, OBJECT_TYPES, \
+    date_to_str, datetime_to_str, duration_to_str, JSON_BACKENDS, get_json_backend, set_json_backend, encode_json_default
+from pyiides.utils.bundle_util import json_to_Bundle, json_stream_to_Bundle, iter_json_objects, Bundle_to_json, anonymize_bundle, \
+    date_str_to_obj, datetime_str_to_obj, object_to_class, json_str_to_Bundle, append_ndjson, NdjsonReader, \
+    NDJSON_INDEX_SUFFIX
+from tests.unit_tests.example_bundles import EXAMPLES, load_example
+
+class TestTrustedImport(unittest.TestCase):
+    def test_from_trusted_dict(self):
+        ttp = TTP.from_trusted_dict({
+            "id": "123e4567-e89b-12d3-a456-426614174000",
+            "tactic": "3",
+            "technique": "3.2",
+            "not_a_field": "ignored"
+        })
+        self.assertEqual(ttp.id, "123e4567-e89b-12d3-a456-426614174000")
+        self.assertEqual(ttp.technique, "3.2")
+        self.assertIsNone(ttp.description)
+        self.assertIsNone(ttp.incident)
+        self.assertFalse(hasattr(ttp, "_not_a_field"))
+        self.assertEqual(list(instance_dict(ttp)), list(instance_dict(TTP())))
+
+    def test_from_trusted_dict_skips_checks(self):
+        # the caller vouches for the data, so nothing is validated
+        ttp = TTP.from_trusted_dict({"tactic": "not-a-tactic"})
+        self.assertEqual(ttp.tactic, "not-a-tactic")
+        self.assertIsInstance(ttp.id, str)
+
+    def test_from_trusted_dict_subclass(self):
+        insider = Insider.from_trusted_dict({"incident_role": "1", "first_name": "Jane"})
+        self.assertEqual(insider.first_name, "Jane")
+        self.assertEqual(insider.incident_role, "1")
+        self.assertEqual(list(instance_dict(insider)), list(instance_dict(Insider(incident_role="1"))))
+
+    def test_import_without_validation(self):
+        for i in range(1, 5):
+            validated = json_to_Bundle(load_example(i))
+            trusted = json_to_Bundle(load_example(i), validate=False)
+            self.assertIsInstance(trusted, Bundle)
+            self.assertEqual(validated.objects.keys(), trusted.objects.keys())
+            for tag in validated.objects:
+                for a, b in zip(validated.objects[tag], trusted.objects[tag]):
+                    self.assertIs(type(a), type(b))
+                    self.assertEqual(a.to_dict(), b.to_dict())
+
+class TestBundleIndex(unittest.TestCase):
+    def test_get(self):
+        data = load_example(1)
+        bundle = json_to_Bundle(data)
+        for obj in load_example(1)["objects"]:
+            tag = obj["id"].split("--")[0]
+            if tag in ("bundle", "relationship"):
+                continue
+            found = bundle.get(obj["id"])
+            self.assertIsNotNone(found, obj["id"])
+            self.assertEqual(found.id, obj["id"].split("--")[1])
+        self.assertIsNone(bundle.get("ttp--00000000-0000-0000-0000-000000000000"))
+
+    def test_get_after_append(self):
+        for validate in (True, False):
+            bundle = json_to_Bundle(load_example(1), validate=validate)
+            ttp = TTP(tactic="3", technique="3.2")
+            bundle.objects["ttp"].append(ttp)
+            self.assertIs(bundle.get(f"ttp--{ttp.id}"), ttp)
+
+            bundle.objects = {"ttp": [ttp]}
+            self.assertIsNone(bundle.get(f"ttp--{load_example(1)['objects'][1]['id'].split('--')[1]}"))
+            self.assertIs(bundle.get(f"ttp--{ttp.id}"), ttp)
+
+    def test_get_without_reindex(self):
+        bundle = json_to_Bundle(load_example(1))
+        missing = "ttp--00000000-0000-0000-0000-000000000000"
+        with mock.patch.object(Bundle, "reindex") as reindex:
+            # a miss on an unchanged bundle, and objects appended or in a new list
+            self.assertIsNone(bundle.get(missing))
+            ttps = [TTP(tactic="3", technique="3.2") for _ in range(3)]
+            bundle.objects["ttp"].append(ttps[0])
+            bundle.objects["ttp"].extend(ttps[1:2])
+            bundle.objects["extra"] = [ttps[2]]
+            self.assertIs(bundle.get(f"ttp--{ttps[1].id}"), ttps[1])
+            self.assertIs(bundle.get(f"ttp--{ttps[0].id}"), ttps[0])
+            self.assertIs(bundle.get(f"extra--{ttps[2].id}"), ttps[2])
+            self.assertIsNone(bundle.get(missing))
+            reindex.assert_not_called()
+
+    def test_get_after_insert(self):
+        bundle = json_to_Bundle(load_example(1))
+        ttps = bundle.objects["ttp"]
+        inserted, appended = TTP(tactic="3", technique="3.2"), TTP(tactic="3", technique="3.2")
+        ttps.insert(0, inserted)
+        self.assertIs(bundle.get(f"ttp--{inserted.id}"), inserted)
+        # the same number of objects, the last one replaced
+        removed = ttps.pop()
+        ttps.append(appended)
+        self.assertIs(bundle.get(f"ttp--{appended.id}"), appended)
+        self.assertIsNone(bundle.get(f"ttp--{removed.id}"))
+        # a list replaced
+        bundle.objects["ttp"] = [removed]
+        self.assertIs(bundle.get(f"ttp--{removed.id}"), removed)
+        self.assertIsNone(bundle.get(f"ttp--{appended.id}"))
+        # an id changed, found stale under the old id
+        insider = bundle.objects["insider"][0]
+        old_id = insider.id
+        insider.id = str(uuid.uuid4())
+        self.assertIsNone(bundle.get(f"insider--{old_id}"))
+        self.assertIs(bundle.get(f"insider--{insider.id}"), insider)
+
+    def test_org_relationship(self):
+        for i in (2, 3):
+            records = [o for o in load_example(i)["objects"] if o["id"].startswith("org-relationship--")]
+            bundle = json_to_Bundle(load_example(i))
+            for record in records:
+                relationship = bundle.get(record["id"])
+                self.assertIsInstance(relationship, OrgRelationship)
+                exported, _ = relationship.to_dict()
+                self.assertEqual(exported["org1"], record["org1"])
+                self.assertEqual(exported["org2"], record["org2"])
+
+    def test_collusion(self):
+        insider1, insider2 = Insider(incident_role="1"), Insider(incident_role="2")
+        collusion = Collusion(insider1=insider1, insider2=insider2, relationship="1", recruitment="1")
+        data = {
+            "id": "bundle--" + Bundle().id,
+            "objects": [insider1.to_dict()[0], insider2.to_dict()[0], collusion.to_dict()[0]]
+        }
+        bundle = json_to_Bundle(data)
+        imported = bundle.get(f"collusion--{collusion.id}")
+        self.assertIsInstance(imported, Collusion)
+        self.assertIs(imported.insider1, bundle.get(f"insider--{insider1.id}"))
+        self.assertIs(imported.insider2, bundle.get(f"insider--{insider2.id}"))
+
+class TestStreamingImport(unittest.TestCase):
+    def read_example(self, i):
+        with open(os.path.join(EXAMPLES, f'example{i}.json'), 'rb') as f:
+            return f.read()
+
+    def test_iter_json_objects(self):
+        for i in range(1, 5):
+            raw = self.read_example(i)
+            expected = json.loads(raw)["objects"]
+            self.assertEqual(list(iter_json_objects(io.BytesIO(raw), "json")), expected)
+            self.assertEqual(list(iter_json_objects(io.StringIO(raw.decode()), "json")), expected)
+
+    def test_values_split_across_chunks(self):
+        raw = self.read_example(1)
+        with mock.patch.object(bundle_util._JsonObjectsReader, "CHUNK_SIZE", 7):
+            self.assertEqual(list(iter_json_objects(io.BytesIO(raw), "json")), json.loads(raw)["objects"])
+            text = '{"count": 12345, "objects": [{"n": 1.5e3}, {"a": []}], "other": [1, {"b": 2}]}'
+            self.assertEqual(list(iter_json_objects(io.StringIO(text), "json")), [{"n": 1500.0}, {"a": []}])
+
+    def test_empty_and_missing_objects(self):
+        self.assertEqual(list(iter_json_objects(io.StringIO('{}'), "json")), [])
+        self.assertEqual(list(iter_json_objects(io.StringIO('{"objects": []}'), "json")), [])
+        self.assertEqual(list(iter_json_objects(io.StringIO('{"id": "bundle--1"}'), "json")), [])
+
+    def test_malformed(self):
+        for text in ('[]', '{"objects": [{"a": 1}', '{"objects": [{"a": 1} {"b": 2}]}', ''):
+            with self.assertRaises(ValueError):
+                list(iter_json_objects(io.StringIO(text), "json"))
+        with self.assertRaises(ValueError):
+            iter_json_objects(io.StringIO('{}'), "not-a-backend")
+
+    def test_stream_matches_json_to_Bundle(self):
+        backends = ["json"]
+        try:
+            import ijson
+            backends.append("ijson")
+        except ImportError:
+            pass
+        for backend in backends:
+            for i in range(1, 5):
+                expected = json_to_Bundle(load_example(i))
+                streamed = json_stream_to_Bundle(io.BytesIO(self.read_example(i)), backend=backend)
+                self.assertEqual(expected.objects.keys(), streamed.objects.keys())
+                for tag in expected.objects:
+                    for a, b in zip(expected.objects[tag], streamed.objects[tag]):
+                        self.assertEqual(a.to_dict(), b.to_dict())
+
+class TestBundleDump(unittest.TestCase):
+    def test_dump_matches_json_dumps(self):
+        for i in range(1, 5):
+            bundle = json_to_Bundle(load_example(i))
+            for indent in (None, 0, 2, 4, "\t"):
+                out = io.StringIO()
+                bundle.dump(out, indent=indent, json_backend="json")
+                # relationship ids are generated on every export, so compare
+                # against the parsed output re-serialized by json itself
+                self.assertEqual(out.getvalue(), json.dumps(json.loads(out.getvalue()), indent=indent))
+
+    def test_Bundle_to_json(self):
+        for i in range(1, 5):
+            bundle = json_to_Bundle(load_example(i))
+            exported = json.loads(Bundle_to_json(bundle))
+            self.assertEqual(exported["id"], f"bundle--{bundle.id}")
+            expected = json.loads(json.dumps([o.to_dict()[0] for objects in bundle.objects.values() for o in objects]))
+            self.assertEqual([o for o in exported["objects"] if not o["id"].startswith("relationship--")], expected)
+
+    def test_empty_bundle(self):
+        for objects in ({}, None):
+            bundle = Bundle(objects=objects)
+            for indent in (None, 4):
+                out = io.StringIO()
+                bundle.dump(out, indent=indent, json_backend="json")
+                self.assertEqual(out.getvalue(), json.dumps({"id": f"bundle--{bundle.id}", "objects": []}, indent=indent))
+
+    def test_deterministic_ids(self):
+        for i in range(1, 5):
+            bundle = json_to_Bundle(load_example(i))
+            first = Bundle_to_json(bundle, deterministic_ids=True)
+            self.assertEqual(first, Bundle_to_json(bundle, deterministic_ids=True))
+            self.assertNotEqual(Bundle_to_json(bundle), Bundle_to_json(bundle))
+
+            for record in json.loads(first)["objects"]:
+                if record["id"].startswith("relationship--"):
+                    expected = uuid.uuid5(uuid.NAMESPACE_OID, record["object1"] + record["object2"])
+                    self.assertEqual(record["id"], f"relationship--{expected}")
+
+    def test_export_is_repeatable(self):
+        job = Job(job_function="15", occupation="15.1")
+        self.assertEqual(job.to_dict(), job.to_dict())
+        self.assertEqual(job.to_dict()[0]["id"], f"job--{job.id}")
+
+def installed_json_backends():
+    backends = []
+    for name in JSON_BACKENDS:
+        try:
+            backends.append(get_json_backend(name))
+        except ImportError:
+            pass
+    return backends
+
+class TestJsonBackends(unittest.TestCase):
+    VALUES = [
+        {"b": 1, "a": [1.5, 0.1, -0.0, 1e16, 1e-05, 5e-324, 1.2345678901234568e+17]},
+        {"big": 2 ** 70, "small": -2 ** 63, "flag": True, "none": None},
+        {"text": "tab\tq\"\\/ \x7f \x1f \x00 \u2028 é 😀", "é": "1e5, [2e3"},
+        {"dates": [datetime.date(2020, 1, 2), datetime.datetime(2020, 1, 2, 3, 4, 5, 6)],
+         "aware": datetime.datetime(2020, 1, 2, tzinfo=datetime.timezone.utc),
+         "tenure": datetime.timedelta(days=731, hours=2)},
+        [], {}, "string", 1e16, 0.00001,
+    ]
+
+    def test_canonical_values(self):
+        reference = get_json_backend("json")
+        for backend in installed_json_backends():
+            for value in self.VALUES:
+                with self.subTest(backend=backend.name, value=value):
+                    self.assertEqual(backend.dumps(value, canonical=True), reference.dumps(value, canonical=True))
+
+    def test_canonical_bundles(self):
+        for i in range(1, 5):
+            bundle = json_to_Bundle(load_example(i))
+            expected = Bundle_to_json(bundle, json_backend="json", canonical=True)
+            self.assertNotIn("\n", expected)
+            self.assertEqual(json.loads(expected), json.loads(Bundle_to_json(bundle, deterministic_ids=True, json_backend="json")))
+            for backend in installed_json_backends():
+                with self.subTest(example=i, backend=backend.name):
+                    self.assertEqual(Bundle_to_json(bundle, json_backend=backend.name, canonical=True), expected)
+
+    def test_layouts(self):
+        bundle = json_to_Bundle(load_example(2))
+        for backend in installed_json_backends():
+            for indent in (None, 0, 2, 4, "\t"):
+                with self.subTest(backend=backend.name, indent=indent):
+                    out = io.StringIO()
+                    bundle.dump(out, indent=indent, deterministic_ids=True, json_backend=backend.name)
+                    text = out.getvalue()
+                    self.assertEqual(json.loads(text), json.loads(Bundle_to_json(bundle, deterministic_ids=True)))
+                    if indent is not None:
+                        self.assertEqual(text, json.dumps(json.loads(text), indent=indent, ensure_ascii=backend.ensure_ascii))
+
+    def test_loads(self):
+        text = json.dumps(load_example(1))
+        for backend in installed_json_backends():
+            with self.subTest(backend=backend.name):
+                self.assertEqual(backend.loads(text), json.loads(text))
+                self.assertEqual(backend.loads(text.encode()), json.loads(text))
+                self.assertEqual(backend.loads("18446744073709551616"), 2 ** 64)
+                with self.assertRaises(ValueError):
+                    backend.loads("{")
+
+    def test_json_str_to_Bundle(self):
+        for i in range(1, 5):
+            with open(os.path.join(EXAMPLES, f'example{i}.json'), 'rb') as f:
+                bundle = json_str_to_Bundle(f.read())
+            expected = json_to_Bundle(load_example(i))
+            # json_to_Bundle gives every bundle a new id
+            self.assertEqual(json.loads(Bundle_to_json(bundle, canonical=True))["objects"],
+                             json.loads(Bundle_to_json(expected, canonical=True))["objects"])
+
+    def test_encode_json_default(self):
+        self.assertEqual(encode_json_default(datetime.datetime(2020, 1, 2, 3, 4)), "2020-01-02T03:04:00")
+        self.assertEqual(encode_json_default(datetime.date(2020, 1, 2)), "2020-01-02")
+        self.assertEqual(encode_json_default(datetime.timedelta(days=1, seconds=1)), "P1DT1S")
+        with self.assertRaises(TypeError):
+            encode_json_default(object())
+        for backend in installed_json_backends():
+            with self.assertRaises(TypeError):
+                backend.dumps({"a": object()})
+
+    def test_select_backend(self):
+        default = get_json_backend()
+        self.assertEqual(default.name, "default")
+        self.assertIs(default.fast, installed_json_backends()[0])
+        with self.assertRaises(ValueError):
+            get_json_backend("simplejson")
+        try:
+            set_json_backend("json")
+            self.assertEqual(get_json_backend().name, "json")
+            bundle = json_to_Bundle(load_example(1))
+            self.assertEqual(Bundle_to_json(bundle, deterministic_ids=True),
+                             json.dumps(json.loads(Bundle_to_json(bundle, deterministic_ids=True)), indent=4))
+        finally:
+            set_json_backend(None)
+        self.assertIs(get_json_backend(), default)
+
+    def test_default_output(self):
+        # the same text as json writes, whichever libraries are installed
+        backend = get_json_backend()
+        for value in self.VALUES + [1e20, {"text": "é 😀"}]:
+            with self.subTest(value=value):
+                reference = get_json_backend("json")
+                self.assertEqual(backend.dumps(value), reference.dumps(value))
+                self.assertEqual(backend.dumps(value, indent=4), reference.dumps(value, indent=4))
+                self.assertEqual(backend.dumps(value, canonical=True), reference.dumps(value, canonical=True))
+        self.assertEqual(backend.loads('{"a": 1e20}'), {"a": 1e20})
+        bundle = json_to_Bundle(load_example(1))
+        bundle.objects["incident"][0].summary = "Café, 1e+20 😀"
+        for indent in (None, 4):
+            out, reference = io.StringIO(), io.StringIO()
+            bundle.dump(out, indent=indent, deterministic_ids=True)
+            bundle.dump(reference, indent=indent, deterministic_ids=True, json_backend="json")
+            self.assertEqual(out.getvalue(), reference.getvalue())
+        self.assertIn("Caf\\u00e9", Bundle_to_json(bundle))
+
+class TestNdjson(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "bundles.ndjson")
+        self.bundles = [json_to_Bundle(load_example(i)) for i in range(1, 5)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameBundle(self, restored, bundle):
+        self.assertEqual(restored.id, bundle.id)
+        self.assertEqual(Bundle_to_json(restored, deterministic_ids=True),
+                         Bundle_to_json(bundle, deterministic_ids=True))
+
+    def test_round_trip(self):
+        # both layouts in one file
+        entries = append_ndjson(self.path, self.bundles[:2])
+        entries += append_ndjson(self.path, self.bundles[2:], objects_per_line=True)
+        with open(self.path, "rb") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2 + 2 + sum(1 for bundle in self.bundles[2:] for _ in bundle.records()))
+        self.assertEqual(entries[0]["offset"], 0)
+        self.assertEqual(entries[-1]["offset"] + entries[-1]["length"], os.path.getsize(self.path))
+
+        with NdjsonReader(self.path) as reader:
+            self.assertEqual(len(reader), 4)
+            self.assertEqual(reader.entries, entries)
+            for restored, bundle in zip(reader, self.bundles):
+                self.assertSameBundle(restored, bundle)
+
+    def test_random_access(self):
+        append_ndjson(self.path, self.bundles[:2], objects_per_line=True)
+        append_ndjson(self.path, self.bundles[2:])
+        with NdjsonReader(self.path, validate=False) as reader:
+            self.assertEqual(reader.bundle_ids(), [f"bundle--{bundle.id}" for bundle in self.bundles])
+            for bundle in reversed(self.bundles):
+                self.assertIn(bundle.id, reader)
+                self.assertSameBundle(reader.get(bundle.id), bundle)
+                self.assertSameBundle(reader.get(f"bundle--{bundle.id}"), bundle)
+                for incident in bundle.objects["incident"]:
+                    self.assertSameBundle(reader.find_incident(incident.id), bundle)
+                    self.assertSameBundle(reader.find_incident(f"incident--{incident.id}"), bundle)
+            with self.assertRaises(KeyError):
+                reader.get(str(uuid.uuid4()))
+            with self.assertRaises(KeyError):
+                reader.find_incident(str(uuid.uuid4()))
+
+    def test_index(self):
+        entries = append_ndjson(self.path, self.bundles[:2])
+        entries += append_ndjson(self.path, self.bundles[2:], objects_per_line=True)
+        with open(self.path + NDJSON_INDEX_SUFFIX) as f:
+            self.assertEqual([json.loads(line) for line in f], entries)
+        self.assertEqual(entries[0]["incidents"], [f"incident--{incident.id}" for incident in self.bundles[0].objects["incident"]])
+
+        # a missing index is built from the file, and a partial one completed
+        os.remove(self.path + NDJSON_INDEX_SUFFIX)
+        with NdjsonReader(self.path) as reader:
+            self.assertEqual(reader.entries, entries)
+        with open(self.path + NDJSON_INDEX_SUFFIX, "w") as f:
+            f.write(json.dumps(entries[0]) + "\n" + json.dumps(entries[1])[:10])
+        with NdjsonReader(self.path) as reader:
+            self.assertEqual(reader.entries, entries)
+
+    def test_stale_index(self):
+        # the file deleted, or replaced by a shorter one, with its index left behind
+        append_ndjson(self.path, self.bundles)
+        os.remove(self.path)
+        entries = append_ndjson(self.path, self.bundles[:1])
+        with NdjsonReader(self.path) as reader:
+            self.assertEqual(reader.entries, entries)
+            self.assertEqual(len(reader), 1)
+            self.assertSameBundle(reader.get(self.bundles[0].id), self.bundles[0])
+            with self.assertRaises(KeyError):
+                reader.get(self.bundles[1].id)
+        with open(self.path + NDJSON_INDEX_SUFFIX) as f:
+            self.assertEqual([json.loads(line) for line in f], entries)
+
+        append_ndjson(self.path, self.bundles[1:])
+        with open(self.path, "wb") as f:
+            f.write(b"")
+        with NdjsonReader(self.path) as reader:
+            self.assertEqual(reader.entries, [])
+        append_ndjson(self.path, self.bundles[1:2])
+        with NdjsonReader(self.path) as reader:
+            self.assertEqual(reader.bundle_ids(), [f"bundle--{self.bundles[1].id}"])
+            self.assertSameBundle(reader.get(self.bundles[1].id), self.bundles[1])
+
+    def test_append_again(self):
+        append_ndjson(self.path, self.bundles)
+        changed = json_to_Bundle(load_example(2))
+        changed.id = self.bundles[1].id
+        removed = changed.objects["incident"].pop()
+        append_ndjson(self.path, [changed])
+        with NdjsonReader(self.path) as reader:
+            self.assertEqual(len(reader.entries), 5)
+            self.assertEqual(len(reader), 4)
+            # the latest copy, at its place
+            ids = [bundle.id for bundle in self.bundles[:1] + self.bundles[2:] + [changed]]
+            self.assertEqual(reader.bundle_ids(), [f"bundle--{bundle_id}" for bundle_id in ids])
+            self.assertEqual([bundle.id for bundle in reader], ids)
+            self.assertSameBundle(reader.get(changed.id), changed)
+            with self.assertRaises(KeyError):
+                reader.find_incident(removed.id)
+
+    def test_interrupted_write(self):
+        append_ndjson(self.path, self.bundles[:1])
+        with open(self.path, "a") as f:
+            f.write('{"id": "bundle--')
+        append_ndjson(self.path, self.bundles[1:2])
+        with NdjsonReader(self.path) as reader:
+            self.assertEqual(len(reader), 2)
+            self.assertSameBundle(reader.get(self.bundles[1].id), self.bundles[1])
+
+    def test_not_in_a_bundle(self):
+        with open(self.path, "w") as f:
+            f.write(json.dumps({"id": f"ttp--{uuid.uuid4()}"}) + "\n")
+        with self.assertRaises(ValueError):
+            NdjsonReader(self.path)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+@unittest.skipUnless(msgpack, "msgpack is not installed")
+class TestMsgpack(unittest.TestCase):
+    def test_round_trip(self):
+        for i in range(1, 5):
+            bundle = json_to_Bundle(load_example(i))
+            data = bundle.to_msgpack()
+            for validate in (True, False):
+                with self.subTest(example=i, validate=validate):
+                    restored = Bundle.from_msgpack(data, validate)
+                    self.assertEqual(restored.id, bundle.id)
+                    self.assertEqual(Bundle_to_json(restored, deterministic_ids=True),
+                                     Bundle_to_json(bundle, deterministic_ids=True))
+
+    def test_compact(self):
+        for i in range(1, 5):
+            bundle = json_to_Bundle(load_example(i))
+            data = bundle.to_msgpack()
+            self.assertLess(len(data), len(Bundle_to_json(bundle, canonical=True)))
+            _, _, bundle_id, codes, types, objects, relationships = msgpack.unpackb(data)
+            self.assertEqual(bundle_id, uuid.UUID(bundle.id).bytes)
+            self.assertEqual(len(codes), len(set(codes)))
+            self.assertEqual(len(objects), sum(len(objects) for objects in bundle.objects.values()))
+            for record in objects:
+                self.assertIsInstance(record, list)
+                tag, fields, kinds = types[record[0]]
+                self.assertEqual(len(record), len(fields) + 1)
+                self.assertEqual(len(record[fields.index("id") + 1]), 16)
+            self.assertTrue(all(isinstance(position, int) for position in relationships))
+
+        ttp = TTP(tactic="3", technique="3.2")
+        _, _, _, codes, types, objects, _ = msgpack.unpackb(Bundle(objects={"ttp": [ttp]}).to_msgpack())
+        tag, fields, kinds = types[0]
+        self.assertEqual(tag, "ttp")
+        self.assertEqual([codes[objects[0][fields.index(field) + 1]] for field in ("tactic", "technique")], ["3", "3.2"])
+
+    def test_irregular_objects(self):
+        insider_id = str(uuid.uuid4())
+        data = {"objects": [
+            {"id": f"ttp--{uuid.uuid4()}", "tactic": "3", "location": ["1", None]},
+            # not a vocab code, an id that is not a lowercase uuid, and a reference
+            # to an object outside the bundle: kept as they are
+            {"id": f"ttp--{uuid.uuid4()}", "tactic": 3},
+            {"id": f"ttp--{str(uuid.uuid4()).upper()}", "tactic": "not-a-code"},
+            {"id": f"insider--{insider_id}", "predispositions": [["1", "1.1"]]},
+            {"id": f"collusion--{uuid.uuid4()}", "insider1": f"insider--{insider_id}",
+             "insider2": f"insider--{insider_id}", "relationship": "1"},
+        ]}
+        bundle = json_to_Bundle(data, validate=False)
+        restored = Bundle.from_msgpack(bundle.to_msgpack(), validate=False)
+        self.assertEqual(Bundle_to_json(restored, deterministic_ids=True), Bundle_to_json(bundle, deterministic_ids=True))
+        self.assertIs(restored.objects["collusion"][0].insider1, restored.objects["insider"][0])
+
+    def test_not_a_bundle(self):
+        for data in (msgpack.packb([1, 2, 3]), msgpack.packb({"objects": []})):
+            with self.assertRaises(ValueError):
+                Bundle.from_msgpack(data)
+        data = msgpack.unpackb(Bundle().to_msgpack())
+        data[1] = bundle_util.MSGPACK_VERSION + 1
+        with self.assertRaises(ValueError):
+            Bundle.from_msgpack(msgpack.packb(data))
+
+class TestBundleClone(unittest.TestCase):
+    def test_clone(self):
+        for i in range(1, 5):
+            bundle = json_to_Bundle(load_example(i))
+            clone = bundle.clone()
+            self.assertEqual(clone.id, bundle.id)
+            self.assertEqual(Bundle_to_json(clone, deterministic_ids=True), Bundle_to_json(bundle, deterministic_ids=True))
+
+            originals = {id(obj) for objects in bundle.objects.values() for obj in objects}
+            for tag, objects in clone.objects.items():
+                for original, copied in zip(bundle.objects[tag], objects):
+                    self.assertIsNot(original, copied)
+                    self.assertIs(type(original), type(copied))
+                    # values are shared, relationships point into the clone
+                    for attr, value in instance_dict(copied).items():
+                        if isinstance(value, list):
+                            self.assertFalse(any(id(item) in originals for item in value), attr)
+                        else:
+                            self.assertNotIn(id(value), originals, attr)
+                            if id(value) not in originals and not hasattr(value, "id"):
+                                self.assertIs(value, getattr(original, attr))
+
+    def test_clone_is_independent(self):
+        bundle = json_to_Bundle(load_example(1))
+        before = Bundle_to_json(bundle, deterministic_ids=True)
+        clone = bundle.clone()
+
+        incident = clone.objects["incident"][0]
+        incident.summary = "changed"
+        incident.cia_effect.append("A")
+        del incident.ttps[0].incident
+        clone.objects["ttp"].append(TTP(tactic="3", technique="3.2"))
+
+        self.assertEqual(Bundle_to_json(bundle, deterministic_ids=True), before)
+        self.assertIs(bundle.objects["ttp"][0].incident, bundle.objects["incident"][0])
+
+    def test_anonymize_leaves_original_unchanged(self):
+        for i in (1, 2, 4):
+            bundle = json_to_Bundle(load_example(i))
+            before = Bundle_to_json(bundle, deterministic_ids=True)
+            with contextlib.redirect_stdout(io.StringIO()):
+                anonymized = anonymize_bundle(bundle)
+            self.assertEqual(Bundle_to_json(bundle, deterministic_ids=True), before)
+            self.assertNotEqual(anonymized.id, bundle.id)
+            for insider in anonymized.objects.get("insider", []):
+                self.assertEqual(insider.last_name, "Doe")
+            for original, anonymous in zip(bundle.objects["incident"], anonymized.objects["incident"]):
+                self.assertEqual(anonymous.summary, "Redacted for anonymity.")
+                self.assertEqual(anonymous.incident_type, original.incident_type)
+
+class TestDateParsing(unittest.TestCase):
+    def test_datetime_fast_path(self):
+        for s in ("2020-01-02T03:04:05Z", "1999-12-31T23:59:59Z", "2024-02-29T00:00:00Z"):
+            self.assertEqual(datetime_str_to_obj(s), datetime.datetime.strptime(s, "%Y-%m-%dT%H:%M:%SZ"))
+            self.assertIsNone(datetime_str_to_obj(s).tzinfo)
+
+    def test_datetime_fallback(self):
+        # strptime also accepts single digit fields
+        self.assertEqual(datetime_str_to_obj("2020-1-2T3:04:05Z"), datetime.datetime(2020, 1, 2, 3, 4, 5))
+        for s in ("2023-02-29T00:00:00Z", "2020-01-02T03:04:05+00", "2020-01-02 03:04:05Z", "2020-01-02T03:04:5aZ"):
+            with self.assertRaises(ValueError):
+                datetime_str_to_obj(s)
+        self.assertIsNone(datetime_str_to_obj(None))
+
+    def test_cached(self):
+        s = "2011-11-11T11:11:11Z"
+        self.assertIs(datetime_str_to_obj(s), datetime_str_to_obj(s))
+        self.assertIs(date_str_to_obj("2011-11-11"), date_str_to_obj("2011-11-11"))
+        self.assertEqual(date_str_to_obj("2011-11-11"), datetime.datetime(2011, 11, 11))
+        self.assertLessEqual(datetime_str_to_obj.cache_info().currsize, bundle_util.DATE_CACHE_SIZE)
+
+class TestObjectTypes(unittest.TestCase):
+    def test_registered(self):
+        import pyiides
+        for name in pyiides.__all__:
+            cls = getattr(pyiides, name)
+            if cls is not Bundle:
+                self.assertIs(OBJECT_TYPES[cls._object_type.tag].cls, cls, name)
+        self.assertEqual(OBJECT_TYPES["ttp"].datetimes, ("date",))
+
+    def test_vocabs(self):
+        from pyiides.utils.helper_functions import VOCAB
+        for tag, object_type in OBJECT_TYPES.items():
+            for field, vocabs in object_type.vocabs.items():
+                self.assertIsInstance(getattr(object_type.cls, field, None), property, (tag, field))
+                for vocab in vocabs if isinstance(vocabs, tuple) else (vocabs,):
+                    self.assertIn(vocab, VOCAB, (tag, field))
+        self.assertEqual(OBJECT_TYPES["ttp"].vocabs["tactic"], "tactic-vocab")
+        # inherited from Person
+        self.assertEqual(OBJECT_TYPES["insider"].vocabs["gender"], "gender-vocab")
+        self.assertEqual(OBJECT_TYPES["accomplice"].vocabs["gender"], "gender-vocab")
+        self.assertNotIn("incident_role", OBJECT_TYPES["person"].vocabs)
+
+    def test_new_type(self):
+        @iides_object("test-object", dates=("day",), references={"ttp": "ttp"})
+        class TestObject:
+            def __init__(self, id=None, day=None, ttp=None, **kwargs):
+                self._id = id
+                self._day = day
+                self._ttp = ttp
+
+            @property
+            def id(self):
+                return self._id
+
+        self.addCleanup(OBJECT_TYPES.pop, "test-object")
+        ttp = TTP()
+        obj = TestObject(id=str(uuid.uuid4()), day=datetime.datetime(2020, 1, 31), ttp=ttp)
+        self.assertEqual(export_fields(obj), {"id": f"test-object--{obj.id}", "day": "2020-01-31", "ttp": f"ttp--{ttp.id}"})
+
+        values = json.loads(json.dumps(export_fields(obj)))
+        tag, imported = bundle_util.reference_to_class(values, {("ttp", ttp.id): ttp})
+        self.assertEqual(tag, "test-object")
+        self.assertEqual(imported.id, obj.id)
+        self.assertEqual(imported._day, obj._day)
+        self.assertIs(imported._ttp, ttp)
+        # objects with references wait for objects_to_Bundle
+        self.assertEqual(object_to_class(values)[0], "Other")
+
+    def test_field_formats(self):
+        self.assertEqual(date_to_str(datetime.datetime(2020, 1, 31)), "2020-01-31")
+        self.assertEqual(date_to_str(datetime.date(2020, 1, 31)), "2020-01-31")
+        self.assertEqual(date_to_str(datetime.datetime(2020, 1, 31, 12)), "2020-01-31T12:00:00")
+        self.assertEqual(datetime_to_str(datetime.datetime(2020, 1, 31, 12, 30, 5, 10)), "2020-01-31T12:30:05Z")
+        eastern = datetime.timezone(datetime.timedelta(hours=-5))
+        self.assertEqual(datetime_to_str(datetime.datetime(2020, 1, 31, 22, tzinfo=eastern)), "2020-02-01T03:00:00Z")
+        self.assertEqual(duration_to_str(datetime.timedelta(days=731)), "P731D")
+        self.assertEqual(duration_to_str(datetime.timedelta(days=1, hours=2, seconds=3.5)), "P1DT2H3.5S")
+        self.assertEqual(duration_to_str(datetime.timedelta(0)), "P0D")
+
+    def test_export_round_trip(self):
+        # exported dates are imported back as the same values
+        for i in range(1, 5):
+            bundle = json_to_Bundle(load_example(i))
+            exported = json.loads(Bundle_to_json(bundle))
+            reimported = json.loads(Bundle_to_json(json_to_Bundle(exported)))
+            objects = lambda data: [obj for obj in data["objects"] if not obj["id"].startswith("relationship--")]
+            self.assertEqual(objects(reimported), objects(exported), i)
+
+        ttp = json_to_Bundle(load_example(1)).objects["ttp"][0]
+        self.assertRegex(ttp.to_dict()[0]["date"], r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ$")
+
+class TestNonMutatingImport(unittest.TestCase):
+    def test_input_unchanged(self):
+        for i in range(1, 5):
+            data = load_example(i)
+            original = copy.deepcopy(data)
+            first = json_to_Bundle(data)
+            self.assertEqual(data, original, i)
+            json_to_Bundle(data, validate=False)
+            self.assertEqual(data, original, i)
+
+            # the same json can be imported again, with the same ids
+            second = json_to_Bundle(data)
+            self.assertEqual(
+                {tag: [obj.id for obj in objects] for tag, objects in second.objects.items()},
+                {tag: [obj.id for obj in objects] for tag, objects in first.objects.items()})
+
+    def test_input_unchanged_by_changes(self):
+        for validate in (True, False):
+            data = load_example(1)
+            original = copy.deepcopy(data)
+            bundle = json_to_Bundle(data, validate=validate)
+            incident = bundle.objects["incident"][0]
+            incident.append_outcome("DD")
+            incident.outcome.append("BR")
+            for insider in bundle.objects["insider"]:
+                (insider.motive or []).append("1")
+                if insider.predispositions:
+                    insider.predispositions.append(("1", "1.1"))
+            for response in bundle.objects.get("response", ()):
+                for pair in response.technical_controls or ():
+                    pair[0] = "changed"
+                (response.investigated_by or []).append("1")
+            self.assertEqual(data, original, validate)
+
+if __name__ == '__main__':
+    unittest.main()
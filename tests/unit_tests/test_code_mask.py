@@ -0,0 +1,145 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import unittest
+import copy
+import json
+import pickle
+from pyiides import Incident, TTP
+from pyiides.utils.helper_functions import VOCAB, OBJECT_TYPES, CodeMask, code_mask_type, compact_codes, expand_codes
+from pyiides.utils.bundle_util import json_to_Bundle, Bundle_to_json
+from tests.unit_tests.example_bundles import load_bundles
+
+class TestCodeMask(unittest.TestCase):
+    def setUp(self):
+        self.Outcome = code_mask_type("outcome-type-vocab")
+
+    def test_bits_follow_vocab_order(self):
+        constants = VOCAB.ordered_constants("outcome-type-vocab")
+        self.assertIs(code_mask_type("outcome-type-vocab"), self.Outcome)
+        self.assertTrue(issubclass(self.Outcome, CodeMask))
+        self.assertEqual(self.Outcome.constants, tuple(constants))
+        for position, code in enumerate(constants):
+            self.assertEqual(self.Outcome.from_codes([code]).mask, 1 << position)
+        with self.assertRaises(NameError):
+            code_mask_type("not-a-vocab")
+
+    def test_reads_like_a_list(self):
+        outcome = self.Outcome.from_codes(["DC", "BR", "DC"])
+        self.assertEqual(outcome.tolist(), ["BR", "DC"])
+        self.assertEqual(list(outcome), ["BR", "DC"])
+        self.assertEqual(len(outcome), 2)
+        self.assertIn("BR", outcome)
+        self.assertNotIn("MD", outcome)
+        self.assertNotIn("not a code", outcome)
+        self.assertEqual(outcome[0], "BR")
+        self.assertEqual(outcome[-1], "DC")
+        self.assertEqual(outcome, ["BR", "DC"])
+        self.assertNotEqual(outcome, ["DC", "BR"])
+        self.assertEqual(outcome, self.Outcome.from_codes(["BR", "DC"]))
+        self.assertNotEqual(outcome, code_mask_type("cia-vocab")(outcome.mask))
+        self.assertTrue(outcome)
+        self.assertFalse(self.Outcome())
+        self.assertEqual(repr(outcome), "CodeMask('outcome-type-vocab', ['BR', 'DC'])")
+
+    def test_changes(self):
+        outcome = self.Outcome()
+        outcome.append("MD")
+        outcome.extend(["BR", "DC"])
+        self.assertEqual(outcome, ["BR", "DC", "MD"])
+        outcome.remove("DC")
+        self.assertEqual(outcome, ["BR", "MD"])
+        with self.assertRaises(ValueError):
+            outcome.remove("DC")
+        with self.assertRaises(ValueError):
+            outcome.append("not a code")
+
+    def test_queries(self):
+        outcome = self.Outcome.from_codes(["BR", "DC"])
+        self.assertTrue(outcome.any_of(["MD", "DC"]))
+        self.assertFalse(outcome.any_of(["MD", "ML"]))
+        self.assertTrue(outcome.all_of(["DC", "BR"]))
+        self.assertFalse(outcome.all_of(["BR", "MD"]))
+        self.assertTrue(outcome.any_of("BR"))
+        query = self.Outcome.from_codes(["BR"])
+        self.assertTrue(outcome.all_of(query))
+        self.assertTrue(outcome.all_of(query.mask))
+        self.assertFalse(outcome.any_of([]))
+        self.assertTrue(outcome.all_of([]))
+        with self.assertRaises(ValueError):
+            outcome.any_of(code_mask_type("cia-vocab").from_codes(["C"]))
+        with self.assertRaises(ValueError):
+            outcome.any_of(["not a code"])
+
+    def test_copy(self):
+        outcome = self.Outcome.from_codes(["BR", "DC"])
+        for clone in (outcome.copy(), copy.copy(outcome), copy.deepcopy(outcome), pickle.loads(pickle.dumps(outcome))):
+            self.assertIs(clone.__class__, self.Outcome)
+            self.assertEqual(clone, outcome)
+            clone.append("MD")
+            self.assertNotIn("MD", outcome)
+
+class TestCompactCodes(unittest.TestCase):
+    def test_object(self):
+        incident = Incident(cia_effect=["C"], outcome=["DC", "BR"], status="P")
+        json_object = incident.to_dict()[0]
+        compact_codes(incident)
+        self.assertIsInstance(incident.outcome, CodeMask)
+        self.assertIsInstance(incident.cia_effect, CodeMask)
+        self.assertIsNone(incident.incident_type)
+        self.assertEqual(incident.outcome, ["BR", "DC"])
+        self.assertEqual(incident.to_dict()[0], dict(json_object, outcome=["BR", "DC"]))
+
+        # the append_* methods keep working
+        incident.append_outcome("MD")
+        self.assertTrue(incident.outcome.all_of(["BR", "MD"]))
+
+        expand_codes(incident)
+        self.assertEqual(incident.outcome, ["BR", "DC", "MD"])
+        self.assertIs(type(incident.outcome), list)
+
+        ttp = TTP(device=["1"])
+        ttp._device.append("not a code")
+        with self.assertRaises(ValueError):
+            compact_codes(ttp)
+
+    def test_bundle(self):
+        for bundle in load_bundles():
+            compact = bundle.clone()
+            compact.compact_codes()
+            masks = 0
+            for tag, class_list in bundle.objects.items():
+                for obj, compact_obj in zip(class_list, compact.objects[tag]):
+                    for name in OBJECT_TYPES[tag].code_lists:
+                        value = getattr(obj, "_" + name)
+                        if value is not None:
+                            masks += 1
+                            self.assertIsInstance(getattr(compact_obj, "_" + name), CodeMask)
+                            self.assertEqual(set(getattr(compact_obj, "_" + name)), set(value))
+
+            # the same json, with the codes in vocabulary order
+            expanded = compact.clone()
+            expanded.expand_codes()
+            self.assertEqual(Bundle_to_json(compact, deterministic_ids=True),
+                             Bundle_to_json(expanded, deterministic_ids=True))
+            restored = json_to_Bundle(json.loads(Bundle_to_json(compact)))
+            restored.id = compact.id
+            self.assertEqual(Bundle_to_json(restored, deterministic_ids=True),
+                             Bundle_to_json(expanded, deterministic_ids=True))
+            self.assertGreater(masks, 0)
+
+            # a clone has its own masks
+            incident = compact.clone().objects["incident"][0]
+            if incident.outcome is not None:
+                code = next(code for code in incident.outcome.constants if code not in incident.outcome)
+                incident.append_outcome(code)
+                self.assertNotIn(code, compact.objects["incident"][0].outcome)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import unittest
+import uuid
+from pyiides import (Bundle, Incident, Insider, Job, Organization, TTP, Response, LegalResponse, CourtCase, Charge,
+                     Sponsor)
+from pyiides.utils.helper_functions import OBJECT_TYPES
+from pyiides.utils.corpus_util import Corpus, indexed_fields, _codes
+from tests.unit_tests.example_bundles import load_bundles, iter_objects, bundle_of
+
+def scan(bundles, tag, field, value):
+    """The objects find should return, by looking at every object."""
+    object_type = OBJECT_TYPES[tag]
+    return {
+        obj for _, obj in iter_objects(bundles, tag)
+        if value in _codes(object_type, field, getattr(obj, "_" + field, None))
+    }
+
+def incident_bundle(outcome, technique, sector):
+    incident = Incident(outcome=[outcome])
+    ttp = TTP(technique=technique)
+    organization = Organization(industry_sector=sector)
+    incident.append_ttp(ttp)
+    incident.append_organization(organization)
+    return bundle_of(incident, ttp, organization)
+
+class TestCorpus(unittest.TestCase):
+    def setUp(self):
+        self.bundles = load_bundles()
+        self.corpus = Corpus(self.bundles)
+
+    def test_find(self):
+        self.assertEqual(len(self.corpus), 4)
+        self.assertEqual(self.corpus.bundle_ids(), [f"bundle--{bundle.id}" for bundle in self.bundles])
+        checked = 0
+        for tag in OBJECT_TYPES:
+            object_type = OBJECT_TYPES[tag]
+            for field in indexed_fields(tag):
+                values = {code for bundle in self.bundles for obj in bundle.objects.get(tag, ())
+                          for code in _codes(object_type, field, getattr(obj, "_" + field, None))}
+                for value in values:
+                    with self.subTest(tag=tag, field=field, value=value):
+                        self.assertEqual(self.corpus.find(tag, field, value), scan(self.bundles, tag, field, value))
+                        checked += 1
+        self.assertGreater(checked, 50)
+        self.assertEqual(self.corpus.find("ttp", "technique", "not a code"), set())
+        self.assertIn("title", indexed_fields("charge"))
+        with self.assertRaises(KeyError):
+            self.corpus.find("ttp", "comment", "x")
+        with self.assertRaises(KeyError):
+            self.corpus.find("not-a-type", "tactic", "1")
+
+    def test_find_incidents(self):
+        bundles = [incident_bundle("BR", "3.2", "11"), incident_bundle("BR", "3.2", "21"),
+                   incident_bundle("DC", "3.2", "11"), incident_bundle("BR", "1.1", "11")]
+        corpus = Corpus(bundles)
+        incidents = corpus.find_incidents(("ttp", "technique", "3.2"), ("incident", "outcome", "BR"),
+                                          ("organization", "industry_sector", "11"))
+        self.assertEqual(incidents, set(bundles[0].objects["incident"]))
+        self.assertIs(corpus.bundle_of(incidents.pop()), bundles[0])
+        self.assertEqual(len(corpus.find_incidents(("ttp", "technique", "3.2"))), 3)
+        self.assertEqual(corpus.find_incidents(("ttp", "technique", "3.2"), ("ttp", "technique", "not a code")), set())
+        self.assertEqual(len(corpus.find_incidents()), 4)
+
+        for bundle in self.bundles:
+            for ttp in bundle.objects.get("ttp", ()):
+                self.assertIn(ttp.incident, self.corpus.find_incidents(("ttp", "tactic", ttp.tactic)))
+
+    def test_related_objects(self):
+        # a charge belongs to an incident through its court case, legal response and response
+        incident = Incident()
+        response = Response()
+        response.incident = incident
+        legal_response = LegalResponse()
+        legal_response.response = response
+        court_case = CourtCase()
+        court_case.legal_response = legal_response
+        charge = Charge("18 U.S.C.", section="1030")
+        court_case.append_charge(charge)
+        # a sponsor through its insiders
+        sponsor = Sponsor(sponsor_type="SS")
+        insider = Insider(incident_role="1")
+        insider.incident = incident
+        sponsor.append_insider(insider)
+        bundle = Bundle(objects={"incident": [incident], "response": [response], "legal-response": [legal_response],
+                                 "court-case": [court_case], "charge": [charge], "sponsor": [sponsor],
+                                 "insider": [insider]})
+        corpus = Corpus([bundle])
+        self.assertEqual(corpus.find("charge", "section", "1030"), {charge})
+        self.assertEqual(corpus.find_incidents(("charge", "title", "18 U.S.C."), ("charge", "section", "1030")),
+                         {incident})
+        self.assertEqual(corpus.find_incidents(("sponsor", "sponsor_type", "SS")), {incident})
+
+    def test_append_and_remove(self):
+        bundle = incident_bundle("BR", "3.2", "11")
+        corpus = Corpus([bundle])
+        incident = bundle.objects["incident"][0]
+
+        incident.append_outcome("DC")
+        self.assertEqual(corpus.find("incident", "outcome", "DC"), {incident})
+
+        # an object appended to one in the corpus joins it, with the objects related to it
+        insider = Insider(incident_role="1")
+        job = Job(job_function="11")
+        insider.append_job(job)
+        incident.append_insider(insider)
+        self.assertEqual(corpus.find("insider", "incident_role", "1"), {insider})
+        self.assertEqual(corpus.find("job", "job_function", "11"), {job})
+        self.assertIs(corpus.bundle_of(job), bundle)
+        self.assertEqual(corpus.find_incidents(("job", "job_function", "11")), {incident})
+        ttp = TTP(technique="1.1", location=["2"])
+        incident.append_ttp(ttp)
+        self.assertEqual(corpus.find_incidents(("ttp", "technique", "1.1")), {incident})
+        ttp.append_location("1")
+        self.assertEqual(corpus.find("ttp", "location", "1"), {ttp})
+
+        # removed objects stay in the corpus, but no longer belong to the incident
+        incident.remove_ttp(ttp)
+        self.assertEqual(corpus.find("ttp", "technique", "1.1"), {ttp})
+        self.assertEqual(corpus.find_incidents(("ttp", "technique", "1.1")), set())
+        incident.remove_insider(insider)
+        self.assertEqual(corpus.find_incidents(("job", "job_function", "11")), set())
+
+        # by keyword too
+        ttp = TTP(technique="2.1")
+        incident.append_ttp(item=ttp)
+        self.assertIs(ttp.incident, incident)
+        self.assertEqual(corpus.find_incidents(("ttp", "technique", "2.1")), {incident})
+        incident.append_outcome(item="DD")
+        self.assertEqual(corpus.find("incident", "outcome", "DD"), {incident})
+
+        # objects outside the corpus are not indexed
+        Incident(outcome=["BR"]).append_outcome("DM")
+        self.assertEqual(corpus.find("incident", "outcome", "DM"), set())
+
+    def test_reindex(self):
+        ttp = self.bundles[0].objects["ttp"][0]
+        old = ttp.tactic
+        new = "1" if old != "1" else "2"
+        ttp.tactic = new
+        self.assertNotIn(ttp, self.corpus.find("ttp", "tactic", new))
+        self.corpus.reindex(ttp)
+        self.assertIn(ttp, self.corpus.find("ttp", "tactic", new))
+        self.assertNotIn(ttp, self.corpus.find("ttp", "tactic", old))
+        with self.assertRaises(KeyError):
+            self.corpus.reindex(TTP())
+
+        ttp.tactic = old
+        self.corpus.reindex()
+        self.assertEqual(self.corpus.find("ttp", "tactic", old), scan(self.bundles, "ttp", "tactic", old))
+
+    def test_add_and_remove_bundles(self):
+        bundle = self.bundles[1]
+        ttp = bundle.objects["ttp"][0]
+        self.corpus.add(bundle)
+        self.assertEqual(len(self.corpus), 4)
+        self.assertIn(ttp, self.corpus.find("ttp", "tactic", ttp.tactic))
+
+        self.corpus.remove(bundle.id)
+        self.assertNotIn(bundle.id, self.corpus)
+        self.assertNotIn(ttp, self.corpus.find("ttp", "tactic", ttp.tactic))
+        with self.assertRaises(KeyError):
+            self.corpus.bundle_of(ttp)
+        with self.assertRaises(KeyError):
+            self.corpus.get(bundle.id)
+        with self.assertRaises(KeyError):
+            self.corpus.remove(str(uuid.uuid4()))
+
+        # changes after the removal are ignored
+        bundle.objects["incident"][0].append_outcome("DD")
+        self.assertEqual(self.corpus.find("incident", "outcome", "DD"), scan(self.bundles[:1] + self.bundles[2:],
+                                                                             "incident", "outcome", "DD"))
+        self.corpus.add(bundle)
+        self.assertIs(self.corpus.get(f"bundle--{bundle.id}"), bundle)
+        self.assertIn(ttp, self.corpus.find("ttp", "tactic", ttp.tactic))
+
+    def test_remove_drops_postings(self):
+        # a code no object has any more is dropped, not left with an empty set
+        ttp = self.bundles[0].objects["ttp"][0]
+        ttp.tactic = "1" if ttp.tactic != "1" else "2"
+        self.corpus.reindex(ttp)
+        self.assertTrue(all(self.corpus._postings[("ttp", "tactic")].values()))
+        for bundle_id in self.corpus.bundle_ids():
+            self.corpus.remove(bundle_id)
+        self.assertEqual({key: postings for key, postings in self.corpus._postings.items() if postings}, {})
+        self.assertEqual(self.corpus._entries, {})
+        self.assertEqual(self.corpus.find("ttp", "tactic", ttp.tactic), set())
+
+if __name__ == '__main__':
+    unittest.main()
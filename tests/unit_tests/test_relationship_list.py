@@ -0,0 +1,92 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import unittest
+import copy
+import pickle
+from pyiides import Incident, TTP, Organization, Job
+from pyiides.utils.helper_functions import RelationshipList
+
+class TestRelationshipList(unittest.TestCase):
+    def setUp(self):
+        self.ttps = [TTP() for _ in range(5)]
+
+    def test_is_an_ordered_set(self):
+        ttps = RelationshipList(self.ttps + self.ttps[:2])
+        self.assertIsInstance(ttps, list)
+        self.assertListEqual(ttps, self.ttps)
+        ttps.append(self.ttps[0])
+        self.assertEqual(len(ttps), 5)
+        self.assertIn(self.ttps[3], ttps)
+        self.assertNotIn(TTP(), ttps)
+        self.assertEqual(ttps.count(self.ttps[1]), 1)
+
+    def test_remove(self):
+        ttps = RelationshipList(self.ttps)
+        ttps.remove(self.ttps[2])
+        ttps.remove(self.ttps[0])
+        self.assertListEqual(ttps, [self.ttps[1], self.ttps[3], self.ttps[4]])
+        self.assertEqual(ttps.index(self.ttps[4]), 2)
+        self.assertEqual(ttps.pop(0), self.ttps[1])
+        self.assertEqual(ttps.pop(), self.ttps[4])
+        self.assertListEqual(ttps, [self.ttps[3]])
+        with self.assertRaises(ValueError):
+            ttps.remove(self.ttps[0])
+        # removed objects can be added again, at the end
+        ttps.append(self.ttps[0])
+        self.assertListEqual(ttps, [self.ttps[3], self.ttps[0]])
+
+    def test_other_list_changes(self):
+        ttps = RelationshipList(self.ttps)
+        ttps.insert(0, self.ttps[4])
+        self.assertListEqual(ttps, [self.ttps[4]] + self.ttps[:4])
+        ttps.reverse()
+        del ttps[0]
+        ttps[0] = self.ttps[0]
+        self.assertListEqual(ttps, [self.ttps[0], self.ttps[1], self.ttps[4]])
+        for ttp in list(ttps):
+            ttps.remove(ttp)
+        self.assertListEqual(ttps, [])
+
+    def test_copy(self):
+        ttps = RelationshipList(self.ttps)
+        for clone in (copy.copy(ttps), copy.deepcopy(ttps), pickle.loads(pickle.dumps(ttps))):
+            self.assertIsInstance(clone, RelationshipList)
+            self.assertEqual(len(clone), 5)
+            self.assertIn(clone[0], clone)
+
+    def test_relationships(self):
+        incident = Incident()
+        incident.ttps = self.ttps
+        self.assertIsInstance(incident.ttps, RelationshipList)
+        for ttp in self.ttps:
+            incident.append_ttp(ttp)
+        self.assertListEqual(incident.ttps, self.ttps)
+        incident.remove_ttp(self.ttps[1])
+        self.assertNotIn(self.ttps[1], incident.ttps)
+        self.assertIsNone(self.ttps[1].incident)
+        # assigning the current list keeps the relationships
+        incident.ttps = incident.ttps
+        self.assertEqual(len(incident.ttps), 4)
+        self.assertTrue(all(ttp.incident is incident for ttp in incident.ttps))
+
+    def test_moving_children(self):
+        org1, org2 = Organization(), Organization()
+        jobs = [Job(job_function=None, occupation=None) for _ in range(3)]
+        for job in jobs:
+            job.organization = org1
+        jobs[1].organization = org2
+        self.assertListEqual(org1.jobs, [jobs[0], jobs[2]])
+        self.assertListEqual(org2.jobs, [jobs[1]])
+        org2.append_job(jobs[0])
+        self.assertListEqual(org1.jobs, [jobs[2]])
+        self.assertListEqual(org2.jobs, [jobs[1], jobs[0]])
+
+if __name__ == '__main__':
+    unittest.main()
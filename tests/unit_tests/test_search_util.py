@@ -0,0 +1,176 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import unittest
+import datetime
+import gzip
+import json
+import math
+import os
+import tempfile
+import uuid
+from pyiides import Incident, Note, TTP
+from pyiides.utils.corpus_util import related_incidents
+from pyiides.utils.search_util import TextIndex, text_fields, tokenize
+from tests.unit_tests.example_bundles import load_bundles, iter_objects, bundle_of
+
+def scan(bundles, term):
+    """The ids of the incidents with the term, by tokenizing the text of every object."""
+    found = set()
+    for bundle, obj in iter_objects(bundles):
+        if any(term in tokenize(getattr(obj, field) or "") for field in text_fields(obj._object_type.tag)):
+            incidents = bundle.objects.get("incident", ())
+            found.update(f"incident--{incident.id}" for incident in related_incidents(obj) if incident in incidents)
+    return found
+
+def incident_bundle(summary, comment=None, description=None, note=None):
+    incident = Incident(summary=summary, comment=comment)
+    objects = [incident]
+    if description is not None:
+        ttp = TTP(description=description)
+        ttp.incident = incident
+        objects.append(ttp)
+    if note is not None:
+        note = Note("analyst", datetime.datetime(2020, 1, 2), note)
+        incident.append_note(note)
+        objects.append(note)
+    return bundle_of(*objects)
+
+def hits(results):
+    return [(hit.incident_id, hit.bundle_id, round(hit.score, 9)) for hit in results]
+
+class TestTextIndex(unittest.TestCase):
+    def setUp(self):
+        self.bundles = [
+            incident_bundle("The insider copied source code to a USB drive.", comment="Found in an audit",
+                            description="Exfiltration over e-mail", note="Source code was recovered"),
+            incident_bundle("The insider deleted the system logs.", description="Sabotage of the source"),
+            incident_bundle("Fraudulent payments", comment="code review missed it"),
+        ]
+        self.ids = [f"incident--{bundle.objects['incident'][0].id}" for bundle in self.bundles]
+        self.index = TextIndex(self.bundles)
+
+    def search(self, query, **kwargs):
+        return [hit.incident_id for hit in self.index.search(query, **kwargs)]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("The USB drive's e-mail, 2020"), ["the", "usb", "drive", "s", "e", "mail", "2020"])
+        self.assertEqual(text_fields("incident"), ("summary", "brief_summary", "comment"))
+        self.assertEqual(text_fields("note"), ("comment",))
+        self.assertEqual(text_fields("collusion"), ())
+
+    def test_search(self):
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(set(self.search("insider")), set(self.ids[:2]))
+        self.assertEqual(self.search("USB"), [self.ids[0]])
+        # the text of the objects of an incident: a TTP description and a note
+        self.assertEqual(self.search("exfiltration"), [self.ids[0]])
+        self.assertEqual(self.search("recovered"), [self.ids[0]])
+        self.assertEqual(self.search("insider code"), [self.ids[0]])
+        self.assertEqual(set(self.search("insider code", match="any")), set(self.ids))
+        self.assertEqual(self.search("nothing"), [])
+        self.assertEqual(self.search(""), [])
+        self.assertEqual(self.search("insider", limit=1), self.search("insider")[:1])
+
+    def test_phrases_and_prefixes(self):
+        self.assertEqual(self.search('"source code"'), [self.ids[0]])
+        self.assertEqual(self.search('"code source"'), [])
+        self.assertEqual(self.search("e-mail"), [self.ids[0]])
+        # not across two fields: the summary ends with "drive" and the comment starts with "found"
+        self.assertEqual(self.search('"drive found"'), [])
+        self.assertEqual(set(self.search("sour*")), set(self.ids[:2]))
+        self.assertEqual(self.search('"source co*"'), [self.ids[0]])
+        self.assertEqual(set(self.search("s*")), set(self.ids[:2]))
+        self.assertEqual(self.search("sourcex*"), [])
+
+    def test_ranking(self):
+        # two occurrences rank above one, in documents of the same length
+        bundles = [incident_bundle("source code review"), incident_bundle("code code review")]
+        index = TextIndex(bundles)
+        results = index.search("code")
+        self.assertEqual([hit.bundle_id for hit in results], [f"bundle--{bundle.id}" for bundle in reversed(bundles)])
+        # BM25, with every document of the average length
+        idf = math.log(1 + (2 - 2 + 0.5) / (2 + 0.5))
+        self.assertAlmostEqual(results[0].score, idf * 2 * 2.2 / (2 + 1.2))
+        self.assertAlmostEqual(results[1].score, idf * 1 * 2.2 / (1 + 1.2))
+
+        results = self.index.search("insider audit", match="any")
+        self.assertEqual(results[0].incident_id, self.ids[0])
+        self.assertGreater(results[0].score, results[1].score)
+        # a rarer term weighs more
+        usb, = self.index.search("usb")
+        insider = [hit for hit in self.index.search("insider") if hit.incident_id == self.ids[0]][0]
+        self.assertGreater(usb.score, insider.score)
+
+    def test_examples(self):
+        bundles = load_bundles()
+        index = TextIndex(bundles)
+        for term in ("insider", "the", "email", "fbi", "employee", "data"):
+            with self.subTest(term=term):
+                self.assertEqual({hit.incident_id for hit in index.search(term, limit=None)}, scan(bundles, term))
+
+    def test_add_and_remove(self):
+        bundle = self.bundles[0]
+        before = hits(self.index.search("insider"))
+        self.index.add(bundle)
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(hits(self.index.search("insider")), before)
+
+        self.index.remove(bundle.id)
+        self.assertNotIn(bundle.id, self.index)
+        self.assertEqual(self.search("usb"), [])
+        self.assertEqual(self.search("sou*"), [self.ids[1]])
+        with self.assertRaises(KeyError):
+            self.index.remove(bundle.id)
+        self.index.add(bundle)
+        self.assertEqual(self.index.bundle_ids(), [f"bundle--{b.id}" for b in self.bundles[1:] + self.bundles[:1]])
+        self.assertEqual(sorted(hits(self.index.search("insider"))), sorted(before))
+
+        # the same as an index made from scratch
+        fresh = TextIndex(self.bundles)
+        for query in ("insider", "code", '"source code"', "s*"):
+            self.assertEqual(sorted(hits(self.index.search(query, match="any"))),
+                             sorted(hits(fresh.search(query, match="any"))))
+
+    def test_save_and_load(self):
+        bundles = load_bundles()
+        index = TextIndex(bundles)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "incidents.idx")
+            index.save(path)
+            loaded = TextIndex.load(path)
+            self.assertEqual(len(loaded), len(index))
+            self.assertEqual(loaded.bundle_ids(), index.bundle_ids())
+            for query in ("insider", '"the insider"', "emp*", "fbi data"):
+                self.assertEqual(hits(loaded.search(query, limit=None)), hits(index.search(query, limit=None)))
+
+            # and it can still be changed
+            loaded.remove(bundles[0].id)
+            loaded.add(self.bundles[0])
+            self.assertEqual(loaded.search("usb")[0].incident_id, self.ids[0])
+            loaded.save(path)
+            self.assertEqual(len(TextIndex.load(path)), len(index) - len(bundles[0].objects["incident"]) + 1)
+
+            with gzip.open(path, "wt") as f:
+                json.dump({"format": "iides-text-index", "version": 99}, f)
+            with self.assertRaises(ValueError):
+                TextIndex.load(path)
+            with open(path, "w") as f:
+                f.write("not an index")
+            with self.assertRaises(ValueError):
+                TextIndex.load(path)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.index.search("insider", match="some")
+        with self.assertRaises(KeyError):
+            self.index.remove(str(uuid.uuid4()))
+
+if __name__ == '__main__':
+    unittest.main()
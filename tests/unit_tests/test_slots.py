@@ -0,0 +1,80 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import unittest
+import copy
+import pickle
+import weakref
+from inspect import signature
+import pyiides
+from pyiides import TTP, Insider, Job
+from pyiides.utils.helper_functions import instance_dict, slot_names
+
+def new_instance(cls):
+    # every IIDES class accepts None for its required arguments
+    return cls(**{
+        name: None
+        for name, param in list(signature(cls.__init__).parameters.items())[1:]
+        if param.default is param.empty and param.kind is param.POSITIONAL_OR_KEYWORD
+    })
+
+class TestSlots(unittest.TestCase):
+    def test_all_attributes_are_slotted(self):
+        for name in pyiides.__all__:
+            cls = getattr(pyiides, name)
+            obj = new_instance(cls)
+            self.assertEqual(obj.__dict__, {}, name)
+            self.assertEqual(tuple(instance_dict(obj)), slot_names(cls), name)
+
+    def test_subclass_slots(self):
+        self.assertIn("_first_name", slot_names(Insider))
+        self.assertEqual(slot_names(Insider)[:len(slot_names(pyiides.Person))], slot_names(pyiides.Person))
+        insider = Insider(incident_role="1", first_name="Jane")
+        self.assertEqual(insider.to_dict()[0]["first_name"], "Jane")
+
+    def test_extra_attributes(self):
+        ttp = TTP(tactic="3", technique="3.2")
+        ttp.custom_field = "custom"
+        self.assertEqual(ttp.__dict__, {"custom_field": "custom"})
+        exported, _ = ttp.to_dict()
+        self.assertEqual(exported["custom_field"], "custom")
+        self.assertEqual(list(exported)[-1], "custom_field")
+
+    def test_weak_references(self):
+        for name in pyiides.__all__:
+            obj = new_instance(getattr(pyiides, name))
+            self.assertIs(weakref.ref(obj)(), obj, name)
+        ttp = TTP()
+        objects = weakref.WeakSet([ttp])
+        attributes = weakref.WeakKeyDictionary({ttp: 1})
+        self.assertIn(ttp, objects)
+        self.assertEqual(attributes[ttp], 1)
+        del ttp
+        self.assertEqual(len(objects), 0)
+        self.assertEqual(len(attributes), 0)
+
+    def test_validation(self):
+        ttp = TTP()
+        with self.assertRaises(ValueError):
+            ttp.tactic = "not-a-tactic"
+        with self.assertRaises(TypeError):
+            ttp.incident = Job()
+
+    def test_copy_and_pickle(self):
+        insider = Insider(incident_role="1", first_name="Jane")
+        job = Job(job_function="15", occupation="15.1")
+        insider.append_job(job)
+        insider.custom_field = 1
+        for clone in (copy.deepcopy(insider), pickle.loads(pickle.dumps(insider))):
+            self.assertEqual(clone.to_dict(), insider.to_dict())
+            self.assertIs(clone.jobs[0].insider, clone)
+            self.assertEqual(clone.custom_field, 1)
+
+if __name__ == '__main__':
+    unittest.main()
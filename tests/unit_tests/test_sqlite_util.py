@@ -0,0 +1,181 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import unittest
+import json
+import os
+import sqlite3
+import tempfile
+import uuid
+from pyiides import Bundle, Incident, TTP
+from pyiides.utils.helper_functions import OBJECT_TYPES
+from pyiides.utils.bundle_util import Bundle_to_json
+from pyiides.utils.sqlite_util import BundleStore, table_name
+from tests.unit_tests.example_bundles import load_bundles
+
+def exported_objects(bundle):
+    """The json objects of a bundle, in a canonical order, without relationship ids."""
+    objects = json.loads(Bundle_to_json(bundle, canonical=True))["objects"]
+    for json_object in objects:
+        if json_object["id"].startswith("relationship--"):
+            json_object["id"] = "relationship--"
+    return sorted(json.dumps(json_object, sort_keys=True) for json_object in objects)
+
+class TestBundleStore(unittest.TestCase):
+    def setUp(self):
+        self.bundles = load_bundles()
+        self.store = BundleStore()
+        self.store.add_all(self.bundles)
+
+    def tearDown(self):
+        self.store.close()
+
+    def count(self, table):
+        return self.store.connection.execute(f'SELECT count(*) FROM "{table}"').fetchone()[0]
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(self.store.bundle_ids(), [f"bundle--{bundle.id}" for bundle in self.bundles])
+        for bundle in self.bundles:
+            for validate in (True, False):
+                with self.subTest(bundle=bundle.id, validate=validate):
+                    restored = self.store.get(bundle.id, validate)
+                    self.assertEqual(restored.id, bundle.id)
+                    self.assertEqual(exported_objects(restored), exported_objects(bundle))
+        for restored, bundle in zip(self.store, self.bundles):
+            self.assertEqual(restored.id, bundle.id)
+
+    def test_tables(self):
+        for tag in OBJECT_TYPES:
+            self.assertEqual(self.count(table_name(tag)),
+                             sum(len(bundle.objects.get(tag, ())) for bundle in self.bundles))
+        bundle = self.bundles[0]
+        ttp = bundle.objects["ttp"][0]
+        row = self.store.connection.execute(
+            "SELECT ttp.bundle_id, incident_id, incident.id, tactic FROM ttp JOIN incident ON incident_pk = incident.pk "
+            "WHERE ttp.id = ?", (f"ttp--{ttp.id}",)).fetchone()
+        self.assertEqual(row, (f"bundle--{bundle.id}", f"incident--{ttp.incident.id}", f"incident--{ttp.incident.id}",
+                               ttp.tactic))
+        codes = self.store.connection.execute(
+            "SELECT code FROM incident_incident_type JOIN incident ON object_pk = pk WHERE id = ?",
+            (f"incident--{bundle.objects['incident'][0].id}",)).fetchall()
+        self.assertEqual([code for (code,) in codes], bundle.objects["incident"][0].incident_type or [])
+
+    def test_indexes(self):
+        indexed = {
+            (table, column)
+            for (table,) in self.store.connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            for (index, *_) in self.store.connection.execute(f'SELECT name FROM pragma_index_list("{table}")')
+            for (_, _, column) in self.store.connection.execute(f'PRAGMA index_info("{index}")')
+        }
+        for table, column in [("incident_incident_type", "code"), ("ttp", "tactic"), ("ttp", "technique"),
+                              ("insider", "incident_role"), ("organization", "industry_sector"),
+                              ("ttp", "bundle_id"), ("ttp", "incident_pk"),
+                              ("collusion", "insider1_pk")]:
+            self.assertIn((table, column), indexed)
+        plan = self.store.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM ttp WHERE tactic = '3'").fetchall()
+        self.assertIn("USING INDEX", plan[0][-1])
+
+    def test_find(self):
+        bundle = self.bundles[1]
+        incident = bundle.objects["incident"][0]
+        self.assertEqual(self.store.find_incident(incident.id).id, bundle.id)
+        self.assertEqual(self.store.find_incident(f"incident--{incident.id}").id, bundle.id)
+        with self.assertRaises(KeyError):
+            self.store.find_incident(str(uuid.uuid4()))
+        with self.assertRaises(KeyError):
+            self.store.get(str(uuid.uuid4()))
+
+        ttp = bundle.objects["ttp"][0]
+        self.assertIn(f"bundle--{bundle.id}", self.store.find_bundles("ttp", "tactic", ttp.tactic))
+        for code in incident.incident_type or ():
+            self.assertIn(f"bundle--{bundle.id}", self.store.find_bundles("incident", "incident_type", code))
+        self.assertEqual(self.store.find_bundles("ttp", "tactic", "not a code"), [])
+        with self.assertRaises(KeyError):
+            self.store.find_bundles("ttp", "not_a_field", "1")
+
+    def test_replace_and_remove(self):
+        objects = self.count("ttp")
+        self.store.add(self.bundles[0])
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(self.count("ttp"), objects)
+
+        for bundle in self.bundles:
+            self.store.remove(bundle.id)
+        self.assertEqual(len(self.store), 0)
+        for (table,) in self.store.connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'"):
+            self.assertEqual(self.count(table), 0, table)
+        with self.assertRaises(KeyError):
+            self.store.remove(self.bundles[0].id)
+
+    def test_transaction(self):
+        # the second bundle has a TTP of an incident it does not have: nothing is stored
+        ttp = TTP(tactic="1")
+        ttp.incident = Incident()
+        bundles = [Bundle(objects={"ttp": [TTP(tactic="1")]}), Bundle(objects={"ttp": [ttp]})]
+        with self.assertRaises(ValueError):
+            self.store.add_all(bundles)
+        self.assertEqual(len(self.store), 4)
+        self.assertNotIn(bundles[0].id, self.store)
+
+        # the foreign keys are checked when a transaction commits
+        bundle_id = self.store.bundle_ids()[0]
+        with self.assertRaises(sqlite3.IntegrityError), self.store.connection:
+            self.store.connection.execute(
+                "INSERT INTO ttp (id, bundle_id, incident_pk) VALUES ('ttp--x', ?, -1)", (bundle_id,))
+        self.assertEqual(self.store.connection.execute("SELECT count(*) FROM ttp WHERE id = 'ttp--x'").fetchone()[0], 0)
+        # the store is still usable
+        self.store.add(bundles[0])
+        self.assertIn(bundles[0].id, self.store)
+
+    def test_shared_objects(self):
+        # a copy of a bundle, with the same objects under another bundle id
+        copy = self.bundles[0].clone()
+        copy.id = str(uuid.uuid4())
+        self.store.add(copy)
+        self.assertEqual(exported_objects(self.store.get(copy.id)), exported_objects(self.bundles[0]))
+        incident = copy.objects["incident"][0]
+        self.assertEqual(self.store.find_incident(incident.id).id, copy.id)
+
+    def test_duplicate_ids(self):
+        # a bundle can have two objects with the same id, as in example2.json
+        incident = Incident()
+        ttp1, ttp2 = TTP(tactic="1"), TTP(tactic="2")
+        ttp2.id = ttp1.id
+        ttp1.incident = ttp2.incident = incident
+        bundle = Bundle(objects={"incident": [incident], "ttp": [ttp1, ttp2]})
+        self.store.add(bundle)
+        self.assertEqual(exported_objects(self.store.get(bundle.id)), exported_objects(bundle))
+
+    def test_extra_fields(self):
+        ttp = TTP(tactic="1")
+        ttp.custom = "value"
+        bundle = Bundle(objects={"ttp": [ttp]})
+        self.store.add(bundle)
+        row = self.store.connection.execute("SELECT extra FROM ttp WHERE id = ?", (f"ttp--{ttp.id}",)).fetchone()
+        self.assertEqual(json.loads(row[0]), {"custom": "value"})
+
+    def test_persistent(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bundles.db")
+            with BundleStore(path) as store:
+                store.add_all(self.bundles)
+            with BundleStore(path) as store:
+                self.assertEqual(len(store), 4)
+                self.assertEqual(exported_objects(store.get(self.bundles[2].id)), exported_objects(self.bundles[2]))
+
+            connection = sqlite3.connect(path)
+            connection.execute("PRAGMA user_version = 99")
+            connection.close()
+            with self.assertRaises(ValueError):
+                BundleStore(path)
+
+if __name__ == '__main__':
+    unittest.main()
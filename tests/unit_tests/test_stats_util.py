@@ -0,0 +1,193 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import unittest
+from pyiides import Incident, Insider, Organization, TTP, Sponsor, Accomplice, Job
+from pyiides.utils.helper_functions import VOCAB
+from pyiides.utils.corpus_util import related_incidents
+from pyiides.utils.stats_util import CorpusStats, field_vocab
+from tests.unit_tests.example_bundles import load_bundles, iter_objects, bundle_of
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+FIELDS = [("ttp", "tactic"), ("ttp", "technique"), ("ttp", "location"), ("incident", "outcome"),
+          ("incident", "incident_type"), ("organization", "industry_sector"), ("insider", "predispositions"),
+          ("response", "technical_controls"), ("sponsor", "sponsor_type"), ("job", "job_function")]
+
+def codes(obj, field):
+    """The codes of a field that CorpusStats counts, by looking at the object."""
+    value = getattr(obj, field)
+    if value is None:
+        return set()
+    if isinstance(value, str):
+        value = [value]
+    constants = VOCAB.ordered_constants(field_vocab(obj._object_type.tag, field))
+    return {code if isinstance(code, str) else code[0] for code in value} & set(constants)
+
+def scan(bundles, tag, field, per="incident"):
+    """The sets of codes of each incident, or object, by looking at every object."""
+    units = {}
+    for _, obj in iter_objects(bundles, tag):
+        for unit in (related_incidents(obj) if per == "incident" else [obj]):
+            units.setdefault(unit, set()).update(codes(obj, field))
+    return units
+
+def count(units, constants):
+    return [sum(code in unit for unit in units.values()) for code in constants]
+
+def crosstab(rows, columns, row_constants, column_constants):
+    return [[sum(row in rows[unit] and column in columns[unit] for unit in rows.keys() & columns.keys())
+             for column in column_constants] for row in row_constants]
+
+def shared_sponsor_bundle():
+    """Two incidents whose insiders have the same sponsor, and a TTP of neither."""
+    sponsor = Sponsor(sponsor_type="SS")
+    incidents, insiders, organizations = [], [], []
+    for outcome, sector in (("BR", "11"), ("DC", "21")):
+        incident = Incident(outcome=[outcome, "ML"])
+        insider = Insider(incident_role="1")
+        insider.incident = incident
+        sponsor.append_insider(insider)
+        organization = Organization(industry_sector=sector)
+        organization.incident = incident
+        incidents.append(incident)
+        insiders.append(insider)
+        organizations.append(organization)
+    ttp = TTP(tactic="1", location=["1", "2"])
+    # as read without validation
+    ttp._location.append("not a code")
+    return bundle_of(*incidents, *insiders, sponsor, ttp, *organizations)
+
+@unittest.skipUnless(numpy, "numpy is not installed")
+class TestCorpusStats(unittest.TestCase):
+    def setUp(self):
+        self.bundles = load_bundles() + [shared_sponsor_bundle()]
+        self.stats = CorpusStats(self.bundles)
+
+    def test_counts(self):
+        self.assertEqual(self.stats.incidents, sum(len(bundle.objects.get("incident", ())) for bundle in self.bundles))
+        for tag, field in FIELDS:
+            constants = VOCAB.ordered_constants(field_vocab(tag, field))
+            for per in ("incident", "object"):
+                with self.subTest(tag=tag, field=field, per=per):
+                    counts = self.stats.counts(tag, field, per)
+                    self.assertEqual(counts.vocabs, (field_vocab(tag, field),))
+                    self.assertEqual(counts.counts.tolist(), count(scan(self.bundles, tag, field, per), constants))
+
+    def test_crosstab(self):
+        pairs = [(("ttp", "tactic"), ("organization", "industry_sector")),
+                 (("sponsor", "sponsor_type"), ("incident", "outcome")),
+                 (("insider", "predispositions"), ("ttp", "location"))]
+        for rows, columns in pairs:
+            with self.subTest(rows=rows, columns=columns):
+                result = self.stats.crosstab(rows, columns)
+                expected = crosstab(scan(self.bundles, *rows), scan(self.bundles, *columns),
+                                    *(VOCAB.ordered_constants(field_vocab(*field)) for field in (rows, columns)))
+                self.assertEqual(result.counts.tolist(), expected)
+        result = self.stats.crosstab(("ttp", "tactic"), ("ttp", "location"), per="object")
+        expected = crosstab(scan(self.bundles, "ttp", "tactic", "object"), scan(self.bundles, "ttp", "location", "object"),
+                            VOCAB.ordered_constants("tactic-vocab"), VOCAB.ordered_constants("attack-location-vocab"))
+        self.assertEqual(result.counts.tolist(), expected)
+
+    def test_cooccurrence(self):
+        for tag, field in FIELDS:
+            with self.subTest(tag=tag, field=field):
+                matrix = self.stats.cooccurrence(tag, field).counts
+                self.assertTrue((matrix == matrix.T).all())
+                self.assertEqual(matrix.diagonal().tolist(), self.stats.counts(tag, field).counts.tolist())
+        outcomes = self.stats.cooccurrence("incident", "outcome")
+        self.assertEqual(outcomes["BR", "ML"], sum(1 for units in scan(self.bundles, "incident", "outcome").values()
+                                                   if {"BR", "ML"} <= units))
+
+    def test_related_incidents(self):
+        # the sponsor counts for both incidents, the TTP of no incident only for itself
+        bundle = shared_sponsor_bundle()
+        stats = CorpusStats([bundle])
+        self.assertEqual(stats.counts("sponsor", "sponsor_type")["SS"], 2)
+        self.assertEqual(stats.counts("sponsor", "sponsor_type", per="object")["SS"], 1)
+        self.assertEqual(stats.crosstab(("sponsor", "sponsor_type"), ("incident", "outcome"))["SS", "ML"], 2)
+        self.assertEqual(stats.counts("ttp", "tactic").counts.sum(), 0)
+        self.assertEqual(stats.counts("ttp", "location", per="object").to_dict(), {"1": 1, "2": 1, "3": 0, "4": 0})
+
+    def test_incident_links(self):
+        # a job of an insider of one incident and of an accomplice of the other
+        bundle = shared_sponsor_bundle()
+        insiders = bundle.objects["insider"]
+        accomplice = Accomplice(relationship_to_insider="1")
+        accomplice.insider = insiders[1]
+        job = Job(job_function="11")
+        job.insider = insiders[0]
+        job.accomplice = accomplice
+        bundle.objects.update(accomplice=[accomplice], job=[job])
+        bundles = self.bundles + [bundle]
+        tags = sorted({tag for bundle in bundles for tag in bundle.objects})
+        # linked in either order, as the cycles, e.g. response and legal
+        # response, are cut at the type linked first
+        for order in (tags, tags[::-1]):
+            stats = CorpusStats(bundles)
+            incident_rows = {incident: row for row, incident in enumerate(stats._tag_objects("incident"))}
+            for tag in order:
+                with self.subTest(tag=tag, first=order[0]):
+                    rows, incidents = stats._incident_links(tag)
+                    if rows is None:
+                        rows = range(len(incidents))
+                    expected = {(row, incident_rows[incident]) for row, obj in enumerate(stats._tag_objects(tag))
+                                for incident in related_incidents(obj)}
+                    self.assertEqual(set(zip(rows, incidents.tolist())), expected)
+                    self.assertEqual(list(rows), sorted(rows))
+        self.assertEqual(stats.counts("job", "job_function")["11"], 2)
+
+    def test_code_masks(self):
+        expected = {field: self.stats.counts(*field) for field in FIELDS}
+        # not the last bundle, which has a code that is not in its vocabulary
+        for bundle in self.bundles[:-1]:
+            bundle.compact_codes()
+        stats = CorpusStats(self.bundles)
+        for field in FIELDS:
+            self.assertEqual(stats.counts(*field), expected[field], field)
+
+    def test_code_counts(self):
+        tactics = self.stats.counts("ttp", "tactic")
+        self.assertEqual(tactics.codes, (VOCAB.ordered_constants("tactic-vocab"),))
+        self.assertEqual(tactics.titles, (VOCAB.titles("tactic-vocab"),))
+        self.assertEqual(tactics.titles[0][tactics.codes[0].index("7")], "Data Exfiltration")
+        self.assertEqual(tactics.most_common(1), [("7", "Data Exfiltration", tactics["7"])])
+        self.assertEqual([count for _, _, count in tactics.most_common()],
+                         sorted((count for count in tactics.counts.tolist() if count), reverse=True))
+        self.assertEqual(list(tactics.to_dict()), list(VOCAB.ordered_constants("tactic-vocab")))
+
+        table = self.stats.crosstab(("sponsor", "sponsor_type"), ("incident", "outcome"))
+        self.assertEqual(table.to_dict()["SS"]["BR"], table["SS", "BR"])
+        (code, title, count), = table.most_common(1)
+        self.assertEqual(code, ("SS", "ML"))
+        self.assertEqual(title[0], VOCAB.titles("sponsor-type-vocab")[VOCAB.ordered_constants("sponsor-type-vocab").index("SS")])
+        self.assertEqual(count, 2)
+        self.assertTrue(repr(tactics).startswith("CodeCounts('tactic-vocab', ["))
+        for key in ("not a code", ("7", "11")):
+            with self.assertRaises(KeyError):
+                tactics[key]
+
+    def test_errors(self):
+        with self.assertRaises(KeyError):
+            self.stats.counts("ttp", "not_a_field")
+        with self.assertRaises(KeyError):
+            self.stats.counts("not a type", "tactic")
+        with self.assertRaises(ValueError):
+            self.stats.counts("ttp", "tactic", per="bundle")
+        with self.assertRaises(ValueError):
+            self.stats.crosstab(("ttp", "tactic"), ("incident", "outcome"), per="object")
+        empty = CorpusStats([])
+        self.assertEqual(empty.incidents, 0)
+        self.assertEqual(empty.crosstab(("ttp", "tactic"), ("incident", "outcome")).counts.sum(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import unittest
+import datetime
+import tempfile
+from pyiides import Bundle, Incident, Insider, Response, TTP, Collusion
+from pyiides.utils.helper_functions import OBJECT_TYPES, slot_names
+from pyiides.utils.table_util import table_columns, table_schema, Bundles_to_tables, write_tables
+from tests.unit_tests.example_bundles import load_bundles
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+class TestTableColumns(unittest.TestCase):
+    def test_columns(self):
+        kinds = {column.name: column.kind for column in table_columns("ttp")}
+        self.assertEqual(list(kinds)[:2], ["id", "bundle_id"])
+        self.assertEqual(kinds["date"], "datetime")
+        self.assertEqual(kinds["sequence_num"], "int")
+        self.assertEqual(kinds["observed"], "bool")
+        self.assertEqual(kinds["tactic"], "string")
+        self.assertEqual(kinds["location"], "list")
+        self.assertEqual(kinds["incident_id"], "reference")
+
+    def test_inherited_columns(self):
+        names = [column.name for column in table_columns("insider")]
+        # the insider's own fields, then those of Person, then the foreign keys
+        self.assertLess(names.index("incident_role"), names.index("first_name"))
+        self.assertIn("age", names)
+        self.assertIn("incident_id", names)
+        self.assertIn("sponsor_id", names)
+        # relationships to many objects are foreign keys of the other table
+        self.assertNotIn("jobs_id", names)
+        self.assertNotIn("ttps_id", [column.name for column in table_columns("incident")])
+
+    def test_converted_columns(self):
+        kinds = {column.name: column.kind for column in table_columns("insider")}
+        self.assertEqual(kinds["predispositions"], "tuples")
+        kinds = {column.name: column.kind for column in table_columns("response")}
+        self.assertEqual(kinds["technical_controls"], "dated_pairs")
+        self.assertEqual(kinds["legal_response_id"], "reference")
+        kinds = {column.name: column.kind for column in table_columns("collusion")}
+        self.assertEqual(kinds["insider1"], "reference")
+        kinds = {column.name: column.kind for column in table_columns("job")}
+        self.assertEqual(kinds["hire_date"], "date")
+        self.assertEqual(kinds["tenure"], "duration")
+
+    def test_declared_columns(self):
+        # kinds and parents are inherited, like vocabs
+        self.assertEqual(OBJECT_TYPES["accomplice"].kinds["age"], "int")
+        self.assertEqual(OBJECT_TYPES["note"].kinds["date"], "date")
+        for tag, object_type in OBJECT_TYPES.items():
+            attributes = slot_names(object_type.cls)
+            for column in table_columns(tag)[2:]:
+                self.assertIn(column.attribute, attributes, (tag, column))
+            names = [column.name for column in table_columns(tag)]
+            for name in object_type.kinds:
+                self.assertIn(name, names, (tag, name))
+
+@unittest.skipUnless(pyarrow, "pyarrow is not installed")
+class TestTables(unittest.TestCase):
+    def test_schema(self):
+        schema = table_schema("ttp")
+        self.assertEqual(schema.names, [column.name for column in table_columns("ttp")])
+        self.assertEqual(schema.field("date").type, pyarrow.timestamp("us", tz="UTC"))
+        self.assertEqual(schema.field("location").type, pyarrow.list_(pyarrow.string()))
+
+    def test_Bundles_to_tables(self):
+        bundles = load_bundles()
+        tables = Bundles_to_tables(bundles)
+        self.assertEqual(set(tables), set(OBJECT_TYPES))
+        for tag, table in tables.items():
+            self.assertEqual(table.schema, table_schema(tag))
+            self.assertEqual(table.num_rows, sum(len(bundle.objects.get(tag, ())) for bundle in bundles))
+
+        incidents = tables["incident"].to_pylist()
+        self.assertEqual({row["id"] for row in incidents},
+                         {f"incident--{incident.id}" for bundle in bundles for incident in bundle.objects["incident"]})
+        self.assertEqual({row["bundle_id"] for row in incidents}, {f"bundle--{bundle.id}" for bundle in bundles})
+        incident_ids = {row["id"] for row in incidents}
+        for ttp in tables["ttp"].to_pylist():
+            self.assertIn(ttp["incident_id"], incident_ids)
+
+    def test_values(self):
+        incident = Incident(incident_type=["F"])
+        insider = Insider(incident_role="1", age=30, predispositions=[("1", "1.1")])
+        insider.incident = incident
+        ttp = TTP(date=datetime.datetime(2020, 1, 2, 3, 4, 5), tactic="3", location=["1"])
+        ttp.incident = incident
+        response = Response(technical_controls=[["1", datetime.date(2020, 1, 2)]])
+        bundle = Bundle(objects={"incident": [incident], "insider": [insider], "ttp": [ttp], "response": [response]})
+        tables = Bundles_to_tables([bundle])
+
+        row = tables["ttp"].to_pylist()[0]
+        self.assertEqual(row["id"], f"ttp--{ttp.id}")
+        self.assertEqual(row["incident_id"], f"incident--{incident.id}")
+        self.assertEqual(row["date"], datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc))
+        self.assertEqual(row["location"], ["1"])
+        self.assertIsNone(row["technique"])
+        row = tables["insider"].to_pylist()[0]
+        self.assertEqual(row["age"], 30)
+        self.assertEqual(row["predispositions"], [{"type": "1", "subtype": "1.1"}])
+        row = tables["response"].to_pylist()[0]
+        self.assertEqual(row["technical_controls"], [{"code": "1", "date": "2020-01-02"}])
+        self.assertIsNone(row["incident_id"])
+
+    def test_code_masks(self):
+        incident = Incident(outcome=["BR", "DC"])
+        ttp = TTP(device=["1"])
+        ttp.incident = incident
+        bundle = Bundle(objects={"incident": [incident], "ttp": [ttp]})
+        tables = Bundles_to_tables([bundle])
+        bundle.compact_codes()
+        for tag, table in Bundles_to_tables([bundle]).items():
+            self.assertTrue(table.equals(tables[tag]), tag)
+
+    def test_references(self):
+        insider1, insider2 = Insider(incident_role="1"), Insider(incident_role="2")
+        collusion = Collusion(insider1, insider2, relationship="1", recruitment="1")
+        bundle = Bundle(objects={"insider": [insider1, insider2], "collusion": [collusion]})
+        row = Bundles_to_tables([bundle])["collusion"].to_pylist()[0]
+        self.assertEqual(row["insider1"], f"insider--{insider1.id}")
+        self.assertEqual(row["insider2"], f"insider--{insider2.id}")
+
+    def test_write_tables(self):
+        bundles = load_bundles()
+        tables = Bundles_to_tables(bundles)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_tables(iter(bundles), directory, batch_size=2)
+            self.assertEqual(set(paths), set(OBJECT_TYPES))
+            for tag, path in paths.items():
+                self.assertTrue(path.endswith(f"{tag}.parquet"))
+                self.assertTrue(pyarrow.parquet.read_table(path).equals(tables[tag]))
+            rows = tables["ttp"].num_rows
+            self.assertEqual(pyarrow.parquet.ParquetFile(paths["ttp"]).num_row_groups, (rows + 1) // 2)
+
+            paths = write_tables(bundles, directory, file_format="arrow", batch_size=3)
+            for tag, path in paths.items():
+                self.assertTrue(path.endswith(f"{tag}.arrow"))
+                with pyarrow.ipc.open_file(path) as reader:
+                    self.assertTrue(reader.read_all().equals(tables[tag]))
+
+    def test_write_tables_errors(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                write_tables([], directory, file_format="csv")
+            with self.assertRaises(ValueError):
+                write_tables([], directory, batch_size=0)
+
+if __name__ == '__main__':
+    unittest.main()
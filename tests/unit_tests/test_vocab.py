@@ -0,0 +1,136 @@
+"""
+License:
+PyIIDES
+Copyright 2024 Carnegie Mellon University.
+NO WARRANTY. THIS CARNEGIE MELLON UNIVERSITY AND SOFTWARE ENGINEERING INSTITUTE MATERIAL IS FURNISHED ON AN "AS-IS" BASIS. CARNEGIE MELLON UNIVERSITY MAKES NO WARRANTIES OF ANY KIND, EITHER EXPRESSED OR IMPLIED, AS TO ANY MATTER INCLUDING, BUT NOT LIMITED TO, WARRANTY OF FITNESS FOR PURPOSE OR MERCHANTABILITY, EXCLUSIVITY, OR RESULTS OBTAINED FROM USE OF THE MATERIAL. CARNEGIE MELLON UNIVERSITY DOES NOT MAKE ANY WARRANTY OF ANY KIND WITH RESPECT TO FREEDOM FROM PATENT, TRADEMARK, OR COPYRIGHT INFRINGEMENT.
+Licensed under a MIT (SEI)-style license, please see license.txt or contact permission@sei.cmu.edu for full terms.
+[DISTRIBUTION STATEMENT A] This material has been approved for public release and unlimited distribution.  Please see Copyright notice for non-US Government use and distribution.
+DM24-1597
+"""
+import unittest
+from unittest import mock
+from pyiides.utils import helper_functions
+from pyiides.utils.helper_functions import VOCAB, VocabRegistry, check_vocab, extract_constants, check_subtype, check_subtype_list, check_tuple_list
+
+class TestVocabRegistry(unittest.TestCase):
+    def test_constants(self):
+        constants = VOCAB.constants("incident-type-vocab")
+        self.assertIsInstance(constants, frozenset)
+        self.assertEqual(constants, {"F", "S", "E", "V", "U"})
+
+    def test_ordered_constants(self):
+        self.assertEqual(VOCAB.ordered_constants("cia-vocab"), ("C", "I", "A"))
+        self.assertEqual(extract_constants("cia-vocab"), ["C", "I", "A"])
+
+    def test_extract_constants_returns_copy(self):
+        constants = extract_constants("cia-vocab")
+        constants.append("X")
+        self.assertEqual(extract_constants("cia-vocab"), ["C", "I", "A"])
+
+    def test_unknown_vocab(self):
+        self.assertNotIn("not-a-vocab", VOCAB)
+        with self.assertRaises(NameError):
+            VOCAB.constants("not-a-vocab")
+        with self.assertRaises(NameError):
+            check_vocab("1", "not-a-vocab")
+
+    def test_loads_once(self):
+        registry = VocabRegistry(use_snapshot=False)
+        with mock.patch.object(helper_functions, "loads", wraps=helper_functions.loads) as loads:
+            registry.constants("cia-vocab")
+            registry.constants("motive-vocab")
+            registry.ordered_constants("suffix-vocab")
+            self.assertEqual(loads.call_count, 1)
+
+            registry.reload()
+            self.assertEqual(loads.call_count, 2)
+
+    def test_names_loads_once(self):
+        registry = VocabRegistry()
+        with mock.patch.object(registry, "_load", wraps=registry._load) as load:
+            names = registry.names()
+            subtypes = registry.subtypes
+            self.assertEqual(registry.names(), names)
+            registry.constants("cia-vocab")
+            self.assertEqual(load.call_count, 1)
+        self.assertEqual(registry.loaded_from, "snapshot")
+        self.assertIs(registry.subtypes, subtypes)
+
+    def test_snapshot_matches_json(self):
+        snapshot = VocabRegistry()
+        snapshot.constants("cia-vocab")
+        self.assertEqual(snapshot.loaded_from, "snapshot")
+
+        parsed = VocabRegistry(use_snapshot=False)
+        parsed.constants("cia-vocab")
+        self.assertEqual(parsed.loaded_from, "json")
+
+        self.assertEqual(snapshot.names(), parsed.names())
+        for name in parsed.names():
+            self.assertEqual(snapshot.ordered_constants(name), parsed.ordered_constants(name))
+
+    def test_stale_snapshot_falls_back_to_json(self):
+        from pyiides.utils import vocab_snapshot
+        registry = VocabRegistry()
+        with mock.patch.object(vocab_snapshot, "VOCAB_SHA256", "0" * 64):
+            registry.constants("cia-vocab")
+        self.assertEqual(registry.loaded_from, "json")
+
+    def test_check_vocab(self):
+        self.assertIsNone(check_vocab("F", "incident-type-vocab"))
+        self.assertIsNone(check_vocab(["C", "I"], "cia-vocab"))
+        with self.assertRaises(ValueError):
+            check_vocab("X", "incident-type-vocab")
+        with self.assertRaises(ValueError):
+            check_vocab(["C", "X"], "cia-vocab")
+
+class TestSubtypeIndex(unittest.TestCase):
+    def test_parent(self):
+        self.assertEqual(VOCAB.subtypes.parent("3.2"), "3")
+        self.assertEqual(VOCAB.subtypes.parent("F.1"), "F")
+        self.assertEqual(VOCAB.subtypes.parent("4.1.1"), "4.1")
+        self.assertIsNone(VOCAB.subtypes.parent("not-a-code"))
+
+    def test_children(self):
+        self.assertEqual(VOCAB.subtypes.children("incident-type-vocab", "F"), {"F.1", "F.2", "F.3"})
+        self.assertTrue(VOCAB.subtypes.is_child("tactic-vocab", "3", "3.2"))
+        self.assertFalse(VOCAB.subtypes.is_child("tactic-vocab", "2", "3.2"))
+        self.assertFalse(VOCAB.subtypes.is_child("tactic-vocab", "3", "3"))
+        self.assertEqual(VOCAB.subtypes.children("cia-vocab", "C"), frozenset())
+
+    def test_descendants(self):
+        descendants = VOCAB.subtypes.descendants("target-asset-vocab", "4")
+        self.assertIn("4.1", descendants)
+        self.assertIn("4.1.1", descendants)
+        for code in descendants:
+            self.assertTrue(code.startswith("4."))
+        self.assertEqual(VOCAB.subtypes.descendants("tactic-vocab", "3"),
+                         VOCAB.subtypes.children("tactic-vocab", "3"))
+
+    def test_check_subtype(self):
+        self.assertIsNone(check_subtype("3.1", "3.1.1"))
+        with self.assertRaises(ValueError):
+            check_subtype("S", "F.1")
+        with self.assertRaises(ReferenceError):
+            check_subtype(None, "F.1")
+
+    def test_check_subtype_list(self):
+        self.assertIsNone(check_subtype_list(["F", "S"], ["F.1", "S.2"]))
+        self.assertIsNone(check_subtype_list(["F"], "F.2"))
+        with self.assertRaises(ValueError):
+            check_subtype_list(["F"], ["S.1"])
+        with self.assertRaises(TypeError):
+            check_subtype_list(["F"], 1)
+
+    def test_check_tuple_list(self):
+        self.assertIsNone(check_tuple_list([("1", "1.1")], "predisposition-type-vocab", "predisposition-subtype-vocab"))
+        self.assertIsNone(check_tuple_list(("3", "3.1"), "concerning-behavior-vocab", "cb-subtype-vocab"))
+        with self.assertRaises(ValueError):
+            check_tuple_list([("1", "2.1")], "predisposition-type-vocab", "predisposition-subtype-vocab")
+        with self.assertRaises(ValueError):
+            check_tuple_list([("X", "X.1")], "predisposition-type-vocab", "predisposition-subtype-vocab")
+        with self.assertRaises(TypeError):
+            check_tuple_list(["1"], "predisposition-type-vocab", "predisposition-subtype-vocab")
+
+if __name__ == '__main__':
+    unittest.main()